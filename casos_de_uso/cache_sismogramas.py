@@ -0,0 +1,173 @@
+# casos_de_uso/cache_sismogramas.py
+
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from utilidades.importacion_diferida import modulo_diferido
+
+_traza = logging.getLogger(__name__)
+
+np = modulo_diferido("numpy")
+
+EXTENSION_IMAGEN = ".png"
+
+
+def huella_contenido(*arreglos) -> str:
+    """Hash del contenido de los arreglos (sin copiarlos si ya son contiguos)"""
+    h = hashlib.blake2b(digest_size=16)
+    for arreglo in arreglos:
+        if arreglo is None:
+            h.update(b"\0")
+            continue
+        arreglo = np.ascontiguousarray(arreglo)
+        h.update(str(arreglo.dtype).encode())
+        h.update(len(arreglo).to_bytes(8, "little"))
+        h.update(arreglo.view(np.uint8).data)
+    return h.hexdigest()
+
+
+class CacheSismogramas:
+    """
+    Imágenes PNG de sismogramas ya dibujados, por clave (ver clave()).
+
+    Se guardan en memoria y, si se indica un directorio, también en disco para
+    las sesiones siguientes. Cada nivel es un LRU con un presupuesto de bytes:
+    al excederlo se descartan las imágenes usadas hace más tiempo (en disco,
+    el orden de uso es la fecha de modificación del archivo, que se actualiza
+    en cada acierto). Al guardar una imagen nueva para un evento se descartan
+    las anteriores del mismo evento, que correspondían a otra versión de sus series.
+    """
+
+    PRESUPUESTO_MEMORIA_BYTES = 32 * 1024 * 1024
+    PRESUPUESTO_DISCO_BYTES = 256 * 1024 * 1024
+
+    def __init__(self, directorio=None, presupuesto_memoria=None, presupuesto_disco=None):
+        self.directorio = directorio
+        self.presupuesto_memoria = presupuesto_memoria if presupuesto_memoria is not None else self.PRESUPUESTO_MEMORIA_BYTES
+        self.presupuesto_disco = presupuesto_disco if presupuesto_disco is not None else self.PRESUPUESTO_DISCO_BYTES
+        self._lock = threading.Lock()
+        self._memoria = OrderedDict()   # clave -> bytes PNG
+        self._bytes_memoria = 0
+        self._disco = OrderedDict()     # clave -> tamaño del archivo
+        self._bytes_disco = 0
+        self._claves_por_evento = {}    # id_sismo -> clave vigente
+        if directorio:
+            os.makedirs(directorio, exist_ok=True)
+            self._indexar_disco()
+
+    @staticmethod
+    def clave(id_sismo, huella, parametros) -> str:
+        """Clave de una imagen: evento, huella de las series y parámetros del dibujo"""
+        texto = f"{huella}|{sorted(parametros.items())!r}"
+        return f"{id_sismo}-{hashlib.blake2b(texto.encode(), digest_size=12).hexdigest()}"
+
+    @staticmethod
+    def _evento_de(clave):
+        return clave.rsplit("-", 1)[0]
+
+    def _ruta(self, clave):
+        return os.path.join(self.directorio, clave + EXTENSION_IMAGEN)
+
+    def _indexar_disco(self):
+        archivos = []
+        for entrada in os.scandir(self.directorio):
+            if entrada.is_file() and entrada.name.endswith(EXTENSION_IMAGEN):
+                info = entrada.stat()
+                archivos.append((info.st_mtime, entrada.name[:-len(EXTENSION_IMAGEN)], info.st_size))
+        for _, clave, tamano in sorted(archivos):
+            self._disco[clave] = tamano
+            self._bytes_disco += tamano
+            self._claves_por_evento[self._evento_de(clave)] = clave
+        self._desalojar_disco()
+
+    # === CONSULTA Y ALTA ===
+
+    def obtener(self, clave):
+        """PNG guardado bajo la clave, o None"""
+        with self._lock:
+            imagen = self._memoria.get(clave)
+            if imagen is not None:
+                self._memoria.move_to_end(clave)
+                return imagen
+            if clave not in self._disco:
+                return None
+            try:
+                with open(self._ruta(clave), "rb") as archivo:
+                    imagen = archivo.read()
+                os.utime(self._ruta(clave))
+            except OSError as e:
+                _traza.warning("No se pudo leer el sismograma %s del disco: %s", clave, e)
+                self._bytes_disco -= self._disco.pop(clave)
+                return None
+            self._disco.move_to_end(clave)
+            self._guardar_en_memoria(clave, imagen)
+            return imagen
+
+    def __contains__(self, clave):
+        with self._lock:
+            return clave in self._memoria or clave in self._disco
+
+    def guardar(self, clave, imagen):
+        with self._lock:
+            id_sismo = self._evento_de(clave)
+            anterior = self._claves_por_evento.get(id_sismo)
+            if anterior is not None and anterior != clave:
+                self._descartar(anterior)
+            self._claves_por_evento[id_sismo] = clave
+
+            self._guardar_en_memoria(clave, imagen)
+            if self.directorio:
+                try:
+                    temporal = self._ruta(clave) + ".tmp"
+                    with open(temporal, "wb") as archivo:
+                        archivo.write(imagen)
+                    os.replace(temporal, self._ruta(clave))
+                except OSError as e:
+                    _traza.warning("No se pudo guardar el sismograma %s en disco: %s", clave, e)
+                    return
+                self._bytes_disco -= self._disco.pop(clave, 0)
+                self._disco[clave] = len(imagen)
+                self._bytes_disco += len(imagen)
+                self._desalojar_disco()
+
+    def invalidarEvento(self, id_sismo):
+        """Descarta las imágenes del evento"""
+        with self._lock:
+            clave = self._claves_por_evento.pop(id_sismo, None)
+            if clave is not None:
+                self._descartar(clave)
+
+    # === DESALOJO ===
+
+    def _guardar_en_memoria(self, clave, imagen):
+        self._bytes_memoria -= len(self._memoria.pop(clave, b""))
+        self._memoria[clave] = imagen
+        self._bytes_memoria += len(imagen)
+        # Siempre se conserva la imagen recién guardada, aunque exceda el presupuesto
+        while self._bytes_memoria > self.presupuesto_memoria and len(self._memoria) > 1:
+            _clave, descartada = self._memoria.popitem(last=False)
+            self._bytes_memoria -= len(descartada)
+
+    def _desalojar_disco(self):
+        while self._bytes_disco > self.presupuesto_disco and len(self._disco) > 1:
+            clave, _tamano = next(iter(self._disco.items()))
+            self._borrar_archivo(clave)
+
+    def _descartar(self, clave):
+        self._bytes_memoria -= len(self._memoria.pop(clave, b""))
+        if clave in self._disco:
+            self._borrar_archivo(clave)
+
+    def _borrar_archivo(self, clave):
+        self._bytes_disco -= self._disco.pop(clave)
+        try:
+            os.remove(self._ruta(clave))
+        except OSError:
+            pass
+        _traza.debug("-> CacheSismogramas: descartado %s", clave)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._memoria.keys() | self._disco.keys())
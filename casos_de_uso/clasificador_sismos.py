@@ -0,0 +1,295 @@
+# casos_de_uso/clasificador_sismos.py
+#
+# Clasificación, alcance y origen de los eventos a partir de reglas con umbrales.
+#
+# Las reglas son datos (reglas_clasificacion.json, o REGLAS_POR_DEFECTO): para
+# cada atributo, una lista ordenada de reglas {"valor": ..., "si": condiciones}
+# y un valor por defecto. Las condiciones comparan rasgos del evento con
+# umbrales ({"magnitud": {">=": 5, "<": 6}, "profundidad": {">=": 70}}); una
+# regla se cumple si se cumplen todas sus condiciones y gana la primera que se
+# cumple. Un rasgo sin dato (NaN) no cumple ninguna comparación; {"falta": true}
+# pregunta justamente por eso.
+#
+# Los rasgos de todo el catálogo se arman como columnas (un arreglo por rasgo) y
+# cada regla se evalúa sobre todas las filas a la vez con operaciones vectoriales:
+# reclasificar el catálogo tras cambiar una regla cuesta unas pocas pasadas sobre
+# arreglos, no una llamada por evento.
+
+import hashlib
+import json
+import logging
+import math
+from operator import eq, ge, gt, le, lt, ne
+from modelos.indice_espacial import RADIO_TIERRA_KM
+from utilidades.importacion_diferida import modulo_diferido
+
+_traza = logging.getLogger(__name__)
+
+np = modulo_diferido("numpy")
+
+ATRIBUTOS = ("clasificacion", "alcance", "origen")
+
+# Rasgos que pueden usar las reglas; los que no se conocen valen NaN
+RASGOS = (
+    "magnitud",                 # valor de magnitud del evento
+    "profundidad",              # profundidad del hipocentro, en km
+    "distancia_estacion_km",    # distancia del epicentro a la estación más cercana
+    "estaciones_en_radio",      # estaciones a no más de 'radio_estaciones_km' del epicentro
+    "pico_velocidad",           # mayor valor absoluto de velocidad de onda registrado
+    "frecuencia_media",         # frecuencia de onda media de las series del evento
+)
+
+_OPERADORES = {"<": lt, "<=": le, ">": gt, ">=": ge, "==": eq, "!=": ne}
+
+REGLAS_POR_DEFECTO = {
+    "radio_estaciones_km": 150.0,
+    "clasificacion": {
+        "por_defecto": "Sin clasificar",
+        "reglas": [
+            {"valor": "Gran terremoto", "si": {"magnitud": {">=": 8.0}}},
+            {"valor": "Mayor", "si": {"magnitud": {">=": 7.0}}},
+            {"valor": "Fuerte", "si": {"magnitud": {">=": 6.0}}},
+            {"valor": "Moderado", "si": {"magnitud": {">=": 5.0}}},
+            {"valor": "Leve", "si": {"magnitud": {">=": 4.0}}},
+            {"valor": "Menor", "si": {"magnitud": {">=": 2.0}}},
+            {"valor": "Micro", "si": {"magnitud": {"<": 2.0}}},
+        ],
+    },
+    "alcance": {
+        "por_defecto": "Local",
+        "reglas": [
+            {"valor": "Internacional", "si": {"magnitud": {">=": 7.0}}},
+            {"valor": "Nacional", "si": {"magnitud": {">=": 5.5}}},
+            {"valor": "Nacional", "si": {"magnitud": {">=": 4.0}, "profundidad": {">=": 70.0}}},
+            {"valor": "Regional", "si": {"magnitud": {">=": 4.0}}},
+            {"valor": "Regional", "si": {"estaciones_en_radio": {">=": 3}}},
+        ],
+    },
+    "origen": {
+        "por_defecto": "Tectónico",
+        "reglas": [
+            {"valor": "Explosión", "si": {"profundidad": {"<": 2.0}, "frecuencia_media": {">=": 20.0}}},
+            {"valor": "Volcánico", "si": {"profundidad": {"<": 20.0}, "frecuencia_media": {"<": 5.0}}},
+        ],
+    },
+}
+
+
+class ReglasSismo:
+    """
+    Reglas de clasificación validadas. 'firma' identifica su contenido: si
+    cambia, las clasificaciones guardadas con otra firma están desactualizadas.
+    """
+
+    __slots__ = ("definicion", "radio_estaciones_km", "firma")
+
+    def __init__(self, definicion=None):
+        definicion = REGLAS_POR_DEFECTO if definicion is None else definicion
+        self.radio_estaciones_km = float(definicion.get("radio_estaciones_km", REGLAS_POR_DEFECTO["radio_estaciones_km"]))
+        for atributo in ATRIBUTOS:
+            self._validar(atributo, definicion.get(atributo))
+        self.definicion = definicion
+        texto = json.dumps(definicion, sort_keys=True, ensure_ascii=False)
+        self.firma = hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _validar(atributo, reglas):
+        if not isinstance(reglas, dict) or "por_defecto" not in reglas:
+            raise ValueError(f"Reglas de '{atributo}': falta 'por_defecto'")
+        for posicion, regla in enumerate(reglas.get("reglas", ())):
+            if "valor" not in regla or not isinstance(regla.get("si"), dict):
+                raise ValueError(f"Regla {posicion} de '{atributo}': se esperaba 'valor' y 'si'")
+            for rasgo, condiciones in regla["si"].items():
+                if rasgo not in RASGOS:
+                    raise ValueError(f"Regla {posicion} de '{atributo}': rasgo desconocido '{rasgo}'")
+                for operador in condiciones:
+                    if operador not in _OPERADORES and operador != "falta":
+                        raise ValueError(f"Regla {posicion} de '{atributo}': operador desconocido '{operador}'")
+
+    def valores(self, atributo):
+        """Valores posibles del atributo: el de cada regla, en orden, y al final el valor por defecto"""
+        reglas = self.definicion[atributo]
+        return [regla["valor"] for regla in reglas.get("reglas", ())] + [reglas["por_defecto"]]
+
+
+class Clasificaciones:
+    """
+    Resultado de clasificar un lote de eventos: por atributo, el índice del
+    valor asignado a cada evento (en el mismo orden que 'ids').
+    """
+
+    __slots__ = ("ids", "_valores", "_indices")
+
+    def __init__(self, ids, valores, indices):
+        self.ids = ids
+        self._valores = valores     # atributo -> lista de valores posibles
+        self._indices = indices     # atributo -> arreglo de índices en esa lista
+
+    def columna(self, atributo):
+        """Valor del atributo para cada evento"""
+        valores = self._valores[atributo]
+        return [valores[i] for i in self._indices[atributo].tolist()]
+
+    def filas(self):
+        """Tuplas (id_sismo, clasificacion, alcance, origen)"""
+        return list(zip(self.ids, *(self.columna(atributo) for atributo in ATRIBUTOS)))
+
+    def conteo(self, atributo):
+        """Cantidad de eventos por valor del atributo"""
+        valores = self._valores[atributo]
+        cantidades = np.bincount(self._indices[atributo], minlength=len(valores))
+        resultado = {}
+        for valor, cantidad in zip(valores, cantidades.tolist()):
+            resultado[valor] = resultado.get(valor, 0) + cantidad
+        return resultado
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def rasgos_de_onda(resumenes):
+    """
+    (pico_velocidad, frecuencia_media) a partir de los resúmenes de las series de
+    un evento (SerieTemporal.getResumen); NaN si las series no tienen ese tipo de dato.
+    """
+    pico_velocidad = math.nan
+    suma_frecuencias, muestras_frecuencia = 0.0, 0
+    for resumen in resumenes:
+        velocidad = resumen.get("velocidad_onda")
+        if velocidad is not None and not abs(velocidad["pico"]) <= pico_velocidad:
+            pico_velocidad = abs(velocidad["pico"])
+        frecuencia = resumen.get("frecuencia_onda")
+        if frecuencia is not None:
+            suma_frecuencias += frecuencia["media"] * frecuencia["cantidad"]
+            muestras_frecuencia += frecuencia["cantidad"]
+    frecuencia_media = suma_frecuencias / muestras_frecuencia if muestras_frecuencia else math.nan
+    return pico_velocidad, frecuencia_media
+
+
+def _columna(valores):
+    """Arreglo float de una secuencia con None (que pasa a NaN)"""
+    return np.array(valores, dtype=float)
+
+
+class ClasificadorSismos:
+    """Evalúa las reglas sobre lotes de eventos; las distancias a estaciones salen del registro"""
+
+    def __init__(self, reglas=None, registro_estaciones=()):
+        self.reglas = reglas or ReglasSismo()
+        self.registro_estaciones = registro_estaciones
+
+    @property
+    def firma(self):
+        return self.reglas.firma
+
+    def _rasgos_de_estaciones(self, latitudes, longitudes):
+        """Distancia a la estación más cercana y estaciones en el radio, por epicentro (haversine vectorial)"""
+        distancia = np.full(len(latitudes), np.inf)
+        en_radio = np.zeros(len(latitudes))
+        fi = np.radians(latitudes)
+        lambda_ = np.radians(longitudes)
+        coseno = np.cos(fi)
+        limite = math.sin(min(self.reglas.radio_estaciones_km / RADIO_TIERRA_KM, math.pi) / 2) ** 2
+        a = np.empty(len(latitudes))
+        auxiliar = np.empty(len(latitudes))
+        hay_estaciones = False
+        for estacion in self.registro_estaciones:
+            if estacion.latitud is None or estacion.longitud is None:
+                continue
+            hay_estaciones = True
+            fi_e, lambda_e = math.radians(estacion.latitud), math.radians(estacion.longitud)
+            # a = sin²(Δφ/2) + cos φ · cos φe · sin²(Δλ/2), sin arreglos temporales por estación
+            np.subtract(fi, fi_e, out=a)
+            a *= 0.5
+            np.sin(a, out=a)
+            np.square(a, out=a)
+            np.subtract(lambda_, lambda_e, out=auxiliar)
+            auxiliar *= 0.5
+            np.sin(auxiliar, out=auxiliar)
+            np.square(auxiliar, out=auxiliar)
+            auxiliar *= coseno
+            auxiliar *= math.cos(fi_e)
+            a += auxiliar
+            en_radio += a <= limite
+            np.minimum(distancia, a, out=distancia)
+        if not hay_estaciones:
+            return np.full(len(latitudes), np.nan), np.full(len(latitudes), np.nan)
+        # Sólo la mínima se convierte a kilómetros
+        np.minimum(distancia, 1.0, out=distancia)
+        np.sqrt(distancia, out=distancia)
+        np.arcsin(distancia, out=distancia)
+        distancia *= 2 * RADIO_TIERRA_KM
+        # Sin epicentro no hay distancias
+        sin_epicentro = np.isnan(fi) | np.isnan(lambda_)
+        distancia[sin_epicentro] = np.nan
+        en_radio[sin_epicentro] = np.nan
+        return distancia, en_radio
+
+    def rasgos(self, magnitudes, profundidades, latitudes, longitudes, picos_velocidad=None, frecuencias_medias=None):
+        """Columnas de rasgos de un lote de eventos (secuencias alineadas; None o NaN: sin dato)"""
+        latitudes, longitudes = _columna(latitudes), _columna(longitudes)
+        distancia, en_radio = self._rasgos_de_estaciones(latitudes, longitudes)
+        sin_dato = np.full(len(latitudes), np.nan)
+        return {
+            "magnitud": _columna(magnitudes),
+            "profundidad": _columna(profundidades),
+            "distancia_estacion_km": distancia,
+            "estaciones_en_radio": en_radio,
+            "pico_velocidad": sin_dato if picos_velocidad is None else _columna(picos_velocidad),
+            "frecuencia_media": sin_dato if frecuencias_medias is None else _columna(frecuencias_medias),
+        }
+
+    def evaluar(self, ids, rasgos):
+        """Clasificaciones del lote: para cada atributo, la primera regla que cumple cada evento"""
+        cantidad = len(ids)
+        valores, indices = {}, {}
+        for atributo in ATRIBUTOS:
+            reglas = self.reglas.definicion[atributo].get("reglas", ())
+            # Las filas que ninguna regla reclama quedan con el valor por defecto (el último)
+            resultado = np.full(cantidad, len(reglas), dtype=np.int32)
+            pendientes = np.ones(cantidad, dtype=bool)
+            for posicion, regla in enumerate(reglas):
+                cumple = pendientes.copy()
+                for rasgo, condiciones in regla["si"].items():
+                    columna = rasgos[rasgo]
+                    for operador, umbral in condiciones.items():
+                        if operador == "falta":
+                            cumple &= np.isnan(columna) == bool(umbral)
+                        else:
+                            cumple &= _OPERADORES[operador](columna, umbral)
+                            if operador == "!=":
+                                # NaN != umbral da verdadero: un rasgo sin dato no cumple ninguna comparación
+                                cumple &= ~np.isnan(columna)
+                resultado[cumple] = posicion
+                pendientes &= ~cumple
+                if not pendientes.any():
+                    break
+            valores[atributo] = self.reglas.valores(atributo)
+            indices[atributo] = resultado
+        return Clasificaciones(list(ids), valores, indices)
+
+    def clasificar(self, ids, magnitudes, profundidades, latitudes, longitudes,
+                   picos_velocidad=None, frecuencias_medias=None):
+        """Rasgos y evaluación de un lote de eventos en una sola llamada"""
+        rasgos = self.rasgos(magnitudes, profundidades, latitudes, longitudes, picos_velocidad, frecuencias_medias)
+        clasificaciones = self.evaluar(ids, rasgos)
+        _traza.debug("Clasificador: %s eventos clasificados", len(clasificaciones))
+        return clasificaciones
+
+    def clasificarEventos(self, eventos, rasgos_onda=None):
+        """
+        Clasifica EventoSismico ya materializados; 'rasgos_onda' es un dict
+        id_sismo -> (pico_velocidad, frecuencia_media) con los rasgos conocidos.
+        """
+        rasgos_onda = rasgos_onda or {}
+        sin_dato = (math.nan, math.nan)
+        ondas = [rasgos_onda.get(evento.id_sismo, sin_dato) for evento in eventos]
+        return self.clasificar(
+            [evento.id_sismo for evento in eventos],
+            [evento.valorMagnitud for evento in eventos],
+            [evento.profundidad for evento in eventos],
+            [evento.latitudEpicentro for evento in eventos],
+            [evento.longitudEpicentro for evento in eventos],
+            [onda[0] for onda in ondas],
+            [onda[1] for onda in ondas],
+        )
@@ -0,0 +1,246 @@
+# casos_de_uso/detector_sta_lta.py
+#
+# Detección automática de eventos sobre trazas continuas de velocidad de onda:
+#
+# 1. Por estación, el cociente STA/LTA clásico (energía media en una ventana
+#    corta sobre la de una ventana larga, ambas terminando en cada muestra)
+#    se calcula con sumas acumuladas: cada promedio es la diferencia de dos
+#    elementos del vector acumulado, sin recorrer las muestras en Python.
+# 2. Los disparos de cada estación (el cociente supera el umbral de activación
+#    y luego baja del de desactivación) salen de los cruces de ambos umbrales,
+#    también con operaciones vectoriales.
+# 3. Coincidencia: los disparos de todas las estaciones se recorren por instante
+#    de activación; los que se superponen forman una detección, que se acepta
+#    si la registraron al menos 'minimo_estaciones' estaciones distintas.
+#
+# Cada detección aceptada se convierte en un EventoSismico "Auto-Detectado"
+# con un recorte de la traza de cada estación involucrada.
+
+import logging
+from modelos.evento_sismico import EventoSismico
+from modelos.serie_temporal import SerieTemporal
+from utilidades.importacion_diferida import modulo_diferido
+
+_traza = logging.getLogger(__name__)
+
+np = modulo_diferido("numpy")
+
+UN_SEGUNDO_US = 1_000_000
+
+
+def sta_lta(valores, muestras_sta, muestras_lta):
+    """
+    Cociente STA/LTA de la traza. Las primeras muestras_lta - 1 posiciones,
+    sin ventana larga completa, valen 0. Las muestras NaN cuentan como 0.
+    """
+    cantidad = len(valores)
+    cociente = np.zeros(cantidad)
+    if not 0 < muestras_sta < muestras_lta <= cantidad:
+        return cociente
+    # Energía de la traza sin su valor medio; acumulada[k] es la suma de las k primeras muestras
+    acumulada = np.empty(cantidad + 1)
+    acumulada[0] = 0.0
+    media = valores.mean()
+    if np.isnan(media):
+        # Hay muestras faltantes: la media es la de las presentes y las faltantes cuentan como 0
+        presentes = valores[~np.isnan(valores)]
+        if len(presentes) == 0:
+            return cociente
+        np.subtract(valores, presentes.mean(), out=acumulada[1:])
+        np.nan_to_num(acumulada, copy=False)
+    else:
+        np.subtract(valores, media, out=acumulada[1:])
+    np.square(acumulada, out=acumulada)
+    np.cumsum(acumulada, out=acumulada)
+
+    # Cada suma de ventana es la diferencia de dos elementos de 'acumulada'; la corta
+    # se calcula directamente sobre el tramo del resultado
+    fin = acumulada[muestras_lta:]
+    cociente_valido = cociente[muestras_lta - 1:]
+    np.subtract(fin, acumulada[muestras_lta - muestras_sta:cantidad + 1 - muestras_sta], out=cociente_valido)
+    lta = fin - acumulada[:cantidad + 1 - muestras_lta]
+    lta *= muestras_sta / muestras_lta
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(cociente_valido, lta, out=cociente_valido)
+    cociente_valido[~(lta > 0)] = 0.0     # ventana larga sin energía (traza plana)
+    return cociente
+
+
+def disparos(cociente, umbral_activacion, umbral_desactivacion):
+    """
+    Pares (inicio, fin) de índices de cada disparo: desde que el cociente supera
+    el umbral de activación hasta que baja del de desactivación (o hasta la última
+    muestra si no llega a bajar).
+    """
+    if len(cociente) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+    arriba = cociente > umbral_activacion
+    encendidos = np.flatnonzero(arriba[1:] & ~arriba[:-1]) + 1
+    if arriba[0]:
+        encendidos = np.concatenate(([0], encendidos))
+    abajo = cociente < umbral_desactivacion
+    apagados = np.flatnonzero(abajo[1:] & ~abajo[:-1]) + 1
+
+    # Cada activación termina en el primer cruce hacia abajo posterior; las activaciones
+    # que ocurren antes de que termine la anterior comparten su fin y se descartan
+    posiciones = np.searchsorted(apagados, encendidos)
+    fines = np.append(apagados, len(cociente) - 1)[posiciones]
+    nuevos = np.ones(len(fines), dtype=bool)
+    nuevos[1:] = fines[1:] != fines[:-1]
+    return np.column_stack((encendidos[nuevos], fines[nuevos]))
+
+
+class Disparo:
+    """Disparo STA/LTA de una estación, entre dos instantes en microsegundos (datetime64[us] como entero)"""
+
+    __slots__ = ("codigo_estacion", "inicio", "fin", "pico")
+
+    def __init__(self, codigo_estacion, inicio, fin, pico):
+        self.codigo_estacion = codigo_estacion
+        self.inicio = inicio
+        self.fin = fin
+        self.pico = pico            # máximo del cociente STA/LTA durante el disparo
+
+    def __repr__(self):
+        return f"Disparo({self.codigo_estacion!r}, {_fecha(self.inicio)}, pico={self.pico:.1f})"
+
+
+class Deteccion:
+    """Disparos superpuestos de varias estaciones; 'disparos' queda ordenado por instante de activación"""
+
+    __slots__ = ("inicio", "fin", "disparos")
+
+    def __init__(self, disparos):
+        self.disparos = disparos
+        self.inicio = disparos[0].inicio
+        self.fin = max(disparo.fin for disparo in disparos)
+
+    def estaciones(self):
+        """Códigos de las estaciones involucradas, en el orden en que dispararon"""
+        return list(dict.fromkeys(disparo.codigo_estacion for disparo in self.disparos))
+
+    def __repr__(self):
+        return f"Deteccion({_fecha(self.inicio)}, estaciones={self.estaciones()})"
+
+
+def _fecha(instante_us):
+    return np.datetime64(int(instante_us), "us").item()
+
+
+class DetectorStaLta:
+    """
+    Detector STA/LTA con coincidencia entre estaciones. Los parámetros por
+    defecto son los habituales para sismos locales registrados a 100 Hz.
+    """
+
+    TIPO_DATO = "velocidad_onda"
+
+    def __init__(self, segundos_sta=1.0, segundos_lta=30.0, umbral_activacion=3.5, umbral_desactivacion=1.5,
+                 minimo_estaciones=3, segundos_antes=10.0, segundos_despues=20.0):
+        self.segundos_sta = segundos_sta
+        self.segundos_lta = segundos_lta
+        self.umbral_activacion = umbral_activacion
+        self.umbral_desactivacion = umbral_desactivacion
+        self.minimo_estaciones = minimo_estaciones
+        # Recorte de cada traza que se guarda con el evento, alrededor de la detección
+        self.segundos_antes = segundos_antes
+        self.segundos_despues = segundos_despues
+
+    @staticmethod
+    def _tasa_muestreo(serie):
+        """Tasa de la serie; si el intervalo no es constante (huecos), la del intervalo mediano"""
+        tasa = serie.getTasaMuestreo()
+        if tasa is None and serie.cantidadMuestras() > 1:
+            intervalo = float(np.median(np.diff(serie.tiempos.view(np.int64))))
+            tasa = UN_SEGUNDO_US / intervalo if intervalo > 0 else None
+        return tasa
+
+    def detectarDisparos(self, codigo_estacion, serie):
+        """Disparos de la traza continua de una estación"""
+        valores = serie.getValores(self.TIPO_DATO)
+        tasa = self._tasa_muestreo(serie)
+        if valores is None or tasa is None:
+            _traza.warning("Estación %s: la traza no tiene %s o su muestreo es irregular", codigo_estacion, self.TIPO_DATO)
+            return []
+        muestras_sta = max(1, round(self.segundos_sta * tasa))
+        muestras_lta = max(muestras_sta + 1, round(self.segundos_lta * tasa))
+        cociente = sta_lta(valores, muestras_sta, muestras_lta)
+        indices = disparos(cociente, self.umbral_activacion, self.umbral_desactivacion)
+        tiempos = serie.tiempos.view(np.int64)
+        resultado = [
+            Disparo(codigo_estacion, int(tiempos[inicio]), int(tiempos[fin]),
+                    float(cociente[inicio:fin + 1].max()))
+            for inicio, fin in indices
+        ]
+        _traza.debug("Estación %s: %s disparos", codigo_estacion, len(resultado))
+        return resultado
+
+    def coincidencias(self, disparos_por_estacion):
+        """Detecciones: grupos de disparos superpuestos de al menos 'minimo_estaciones' estaciones"""
+        todos = sorted(
+            (disparo for lista in disparos_por_estacion for disparo in lista),
+            key=lambda disparo: disparo.inicio
+        )
+        detecciones = []
+        i = 0
+        while i < len(todos):
+            grupo = [todos[i]]
+            fin = todos[i].fin
+            j = i + 1
+            while j < len(todos) and todos[j].inicio <= fin:
+                grupo.append(todos[j])
+                fin = max(fin, todos[j].fin)
+                j += 1
+            if len({disparo.codigo_estacion for disparo in grupo}) >= self.minimo_estaciones:
+                detecciones.append(Deteccion(grupo))
+            i = j
+        return detecciones
+
+    def detectar(self, trazas):
+        """Detecciones sobre las trazas continuas {código de estación: SerieTemporal}"""
+        disparos_por_estacion = [self.detectarDisparos(codigo, serie) for codigo, serie in trazas.items()]
+        detecciones = self.coincidencias(disparos_por_estacion)
+        _traza.info("Detector STA/LTA: %s disparos, %s detecciones en %s estaciones",
+                    sum(map(len, disparos_por_estacion)), len(detecciones), len(trazas))
+        return detecciones
+
+    # === EVENTOS ===
+
+    def _recorte(self, codigo_estacion, serie, deteccion):
+        """Tramo de la serie alrededor de la detección, como una SerieTemporal nueva"""
+        tiempos = serie.tiempos
+        enteros = tiempos.view(np.int64)
+        desde = np.searchsorted(enteros, deteccion.inicio - int(self.segundos_antes * UN_SEGUNDO_US))
+        hasta = np.searchsorted(enteros, deteccion.fin + int(self.segundos_despues * UN_SEGUNDO_US), side="right")
+        return SerieTemporal(
+            tiempos[desde:hasta].copy(),
+            {tipo: columna[desde:hasta].copy() for tipo, columna in serie.valores.items()},
+            codigo_estacion,
+        )
+
+    def crearEventos(self, detecciones, trazas, registro_estaciones=None, prefijo="AUTO"):
+        """
+        Un EventoSismico "Auto-Detectado" por detección, con el recorte de la traza
+        de cada estación involucrada (en el orden en que dispararon). Sin
+        localización, el epicentro provisorio es la estación que disparó primero
+        (si está en el registro) y la magnitud queda sin calcular.
+        """
+        eventos = []
+        usados = set()
+        for deteccion in detecciones:
+            fecha = _fecha(deteccion.inicio)
+            codigos = deteccion.estaciones()
+            id_sismo = f"{prefijo}-{fecha:%Y%m%d-%H%M%S}-{codigos[0]}"
+            while id_sismo in usados:
+                id_sismo += "+"
+            usados.add(id_sismo)
+
+            primera = registro_estaciones.obtener(codigos[0]) if registro_estaciones is not None else None
+            latitud, longitud = primera.getCoordenadas() if primera is not None else (None, None)
+            evento = EventoSismico(
+                id_sismo, fecha, None, estado_inicial="Auto-Detectado",
+                latitud_epicentro=latitud, longitud_epicentro=longitud,
+            )
+            evento.series_temporales = [self._recorte(codigo, trazas[codigo], deteccion) for codigo in codigos]
+            eventos.append(evento)
+        return eventos
@@ -1,42 +1,283 @@
 # casos_de_uso/generar_sismograma.py
 
-import matplotlib.pyplot as plt
-import numpy as np
+import io
+import logging
+from casos_de_uso.piramide_decimacion import PiramideDecimacion
+from casos_de_uso.cache_sismogramas import CacheSismogramas, huella_contenido
+from utilidades.importacion_diferida import modulo_diferido
+
+_traza = logging.getLogger(__name__)
+
+# matplotlib y NumPy se importan recién al preparar o mostrar el primer sismograma
+matplotlib = modulo_diferido("matplotlib")
+plt = modulo_diferido("matplotlib.pyplot")
+np = modulo_diferido("numpy")
+backend_agg = modulo_diferido("matplotlib.backends.backend_agg")
+modulo_figura = modulo_diferido("matplotlib.figure")
+
+# Claves bajo las que cada serie guarda sus datos derivados (ver SerieTemporal.getDerivado)
+CLAVE_PIRAMIDE = "sismograma.piramide"
+CLAVE_HUELLA = "sismograma.huella"
+
+
+def _construir_piramide(serie):
+    velocidades = serie.getValores("velocidad_onda")
+    tiempos_segundos = serie.getTiemposSegundos()
+    if velocidades is None:
+        amplitudes = np.zeros(len(tiempos_segundos))
+    else:
+        amplitudes = np.nan_to_num(velocidades, nan=0.0)  # 0 si la muestra no tiene velocidad
+    return PiramideDecimacion(tiempos_segundos, amplitudes)
+
+
+def _huella_serie(serie):
+    """Huella de lo que se grafica de la serie: instantes y velocidades"""
+    return huella_contenido(serie.tiempos, serie.getValores("velocidad_onda"))
+
+
+def _conectar_cursor(ax):
+    """
+    Línea vertical que sigue al mouse a través de todas las filas. Se dibuja con
+    blitting: se restaura el fondo guardado en el último dibujo completo y sólo
+    se repinta el cursor, sin redibujar las trazas.
+    """
+    canvas = ax.figure.canvas
+    cursor = ax.axvline(np.nan, color="firebrick", linewidth=0.8, animated=True)
+    estado = {"fondo": None}
+
+    def al_dibujar(evento):
+        estado["fondo"] = canvas.copy_from_bbox(ax.bbox)
+
+    def al_mover(evento):
+        if estado["fondo"] is None or evento.inaxes is not ax:
+            return
+        canvas.restore_region(estado["fondo"])
+        cursor.set_xdata([evento.xdata, evento.xdata])
+        ax.draw_artist(cursor)
+        canvas.blit(ax.bbox)
+
+    canvas.mpl_connect("draw_event", al_dibujar)
+    canvas.mpl_connect("motion_notify_event", al_mover)
+
 
 class SismogramaGenerator:
     """
     Componente que encapsula la lógica del Caso de Uso N°18: Generar Sismograma.
+
+    Muestra todas las series del evento apiladas, una fila por estación, sobre
+    un eje de tiempo común (segundos desde la primera muestra del evento) y
+    compartido: desplazar o hacer zoom mueve todas las filas a la vez.
+
+    Ninguna serie se dibuja completa: cada una grafica unos PUNTOS_POR_PIXEL
+    puntos por píxel de ancho tomados de su pirámide de decimación min/max, y al
+    cambiar el rango visible se vuelve a consultar el nivel que corresponde.
+
+    Con una CacheSismogramas, preparar() deja rasterizado el sismograma completo
+    y generar_y_mostrar() muestra esa imagen sin volver a dibujar; un clic sobre
+    ella abre el gráfico interactivo.
     """
+
+    PUNTOS_POR_PIXEL = 2
+    ANCHO_FIGURA = 10
+    ALTO_FILA = 1.2
+    ALTO_MINIMO = 4
+    ALTO_MAXIMO = 10
+    # Fracción de la separación entre filas que ocupa el pico de cada traza normalizada
+    ALTURA_TRAZA = 0.45
+    DPI = 100
+    COLOR = 'royalblue'
+    # Cambiar al modificar el dibujo, para no reutilizar imágenes con el aspecto anterior
+    VERSION_DIBUJO = 2
+
+    @staticmethod
+    def obtenerPiramide(serie):
+        """Pirámide de la serie; se construye una sola vez mientras la serie no cambie"""
+        return serie.getDerivado(CLAVE_PIRAMIDE, _construir_piramide)
+
     @staticmethod
-    def generar_y_mostrar(sismo):
-        if not sismo.series_temporales or not sismo.series_temporales[0].muestras:
-            print("ADVERTENCIA: No se encontraron datos de series temporales para graficar.")
+    def _filas(sismo, estaciones=None):
+        """
+        Filas a graficar: (etiqueta, series con muestras). 'estaciones' agrupa las
+        series por código de estación (ver clasificarMuestrasPorEstacionSismologica);
+        sin ella, cada serie ocupa su propia fila.
+        """
+        if estaciones is None:
+            estaciones = {f"Serie {i + 1}": [serie] for i, serie in enumerate(sismo.series_temporales or ())}
+        filas = []
+        for etiqueta, series in estaciones.items():
+            series = [serie for serie in series if serie.cantidadMuestras() > 0]
+            if series:
+                filas.append((etiqueta, series))
+        return filas
+
+    @staticmethod
+    def _inicio_comun(filas):
+        """Instante de la primera muestra del evento, origen del eje de tiempo común"""
+        return min(serie.tiempos[0] for _, series in filas for serie in series)
+
+    @staticmethod
+    def _desplazamiento(serie, inicio):
+        """Segundos entre el inicio común y la primera muestra de la serie"""
+        return float((serie.tiempos[0] - inicio) / np.timedelta64(1, "s"))
+
+    @staticmethod
+    def _titulo(sismo):
+        return f"Sismograma - Evento: {sismo.id_sismo}\nMagnitud: {sismo.getValorMagnitud()} Richter"
+
+    @classmethod
+    def _tamano_figura(cls, cantidad_filas):
+        alto = min(max(cls.ALTO_FILA * cantidad_filas, cls.ALTO_MINIMO), cls.ALTO_MAXIMO)
+        return (cls.ANCHO_FIGURA, alto)
+
+    @classmethod
+    def claveImagen(cls, sismo, filas):
+        """Clave del sismograma en la cache: evento, contenido de las series y parámetros del dibujo"""
+        inicio = cls._inicio_comun(filas)
+        huella = [
+            (etiqueta, [(serie.getDerivado(CLAVE_HUELLA, _huella_serie), cls._desplazamiento(serie, inicio))
+                        for serie in series])
+            for etiqueta, series in filas
+        ]
+        parametros = {
+            "titulo": cls._titulo(sismo),
+            "tamano": cls._tamano_figura(len(filas)),
+            "dpi": cls.DPI,
+            "puntos_por_pixel": cls.PUNTOS_POR_PIXEL,
+            "color": cls.COLOR,
+            "altura_traza": cls.ALTURA_TRAZA,
+            "version": cls.VERSION_DIBUJO,
+            "matplotlib": matplotlib.__version__,
+        }
+        return CacheSismogramas.clave(sismo.id_sismo, repr(huella), parametros)
+
+    @classmethod
+    def preparar(cls, sismo, cache=None, estaciones=None):
+        """
+        Construye de antemano las pirámides de las series a graficar y, con una
+        cache, rasteriza el sismograma si aún no está en ella. No usa pyplot ni la
+        interfaz, de modo que puede correr fuera del hilo principal.
+        """
+        filas = cls._filas(sismo, estaciones)
+        if not filas:
             return
+        for _, series in filas:
+            for serie in series:
+                cls.obtenerPiramide(serie)
+        if cache is None:
+            return
+        clave = cls.claveImagen(sismo, filas)
+        if clave in cache:
+            return
+        figura = modulo_figura.Figure(figsize=cls._tamano_figura(len(filas)), dpi=cls.DPI)
+        backend_agg.FigureCanvasAgg(figura)
+        cls._dibujar(figura, sismo, filas)
+        imagen = io.BytesIO()
+        figura.savefig(imagen, format="png", dpi=cls.DPI)
+        cache.guardar(clave, imagen.getvalue())
+        _traza.debug("Sismograma de %s rasterizado (%d bytes)", sismo.id_sismo, imagen.tell())
+
+    @classmethod
+    def _puntos(cls, ax):
+        return max(int(ax.bbox.width * cls.PUNTOS_POR_PIXEL), 2)
+
+    @classmethod
+    def _dibujar(cls, figura, sismo, filas):
+        """
+        Dibuja el sismograma completo en la figura. Devuelve los ejes y las trazas
+        (línea, pirámide, desplazamiento, escala, base) para actualizarlas al
+        cambiar el rango.
+
+        Con una sola fila la amplitud se grafica en sus unidades. Con varias, las
+        filas comparten unos mismos ejes (una "sección de registro"): cada fila se
+        normaliza a su pico y se desplaza verticalmente, de modo que el costo de
+        dibujar no crece con ejes y marcas por estación.
+        """
+        ax = figura.gca()
+        inicio = cls._inicio_comun(filas)
+        varias = len(filas) > 1
+        trazas = []
+        dibujadas = 0
+        for fila, (etiqueta, series) in enumerate(filas):
+            piramides = [cls.obtenerPiramide(serie) for serie in series]
+            base = -float(fila) if varias else 0.0
+            escala = 1.0
+            if varias:
+                pico = max(max(abs(minimo), abs(maximo)) for minimo, maximo in (p.extremos() for p in piramides))
+                escala = cls.ALTURA_TRAZA / pico if pico > 0 else 1.0
+            for serie, piramide in zip(series, piramides):
+                desplazamiento = cls._desplazamiento(serie, inicio)
+                tiempos, amplitudes = piramide.consultar(puntos=cls._puntos(ax))
+                linea, = ax.plot(tiempos + desplazamiento, amplitudes * escala + base, color=cls.COLOR, linewidth=0.8)
+                trazas.append((linea, piramide, desplazamiento, escala, base))
+                dibujadas += len(tiempos)
+        _traza.debug("Sismograma de %s: %d puntos dibujados en %d fila(s)", sismo.id_sismo, dibujadas, len(filas))
+
+        ax.set_title(cls._titulo(sismo))
+        ax.set_xlabel("Tiempo (segundos desde la primera muestra del evento)")
+        if varias:
+            ax.set_yticks([-float(fila) for fila in range(len(filas))], [etiqueta for etiqueta, _ in filas], fontsize=8)
+            ax.set_ylim(-len(filas) + 0.5, 0.5)
+            ax.set_ylabel("Estación (velocidad de onda normalizada)")
+        else:
+            ax.set_ylabel("Amplitud (velocidad de onda)")
+        ax.grid(True)
+        figura.tight_layout()
+        return ax, trazas
+
+    @classmethod
+    def _actualizar(cls, ax, trazas):
+        """
+        Vuelve a consultar las pirámides de todas las filas para el rango y el ancho visibles.
+
+        El desplazamiento y el zoom sí redibujan la figura completa: al cambiar el
+        rango se mueven también las marcas, las etiquetas y la grilla, así que un
+        fondo guardado antes no sirve para hacer blitting de las trazas, y la barra
+        de herramientas de matplotlib ya pide draw_idle() en cada paso del
+        desplazamiento (este pedido se junta con ese en un único dibujo). Lo que se
+        abarata es el dibujo en sí, que recibe unos pocos puntos por píxel de cada traza.
+        """
+        desde, hasta = ax.get_xlim()
+        puntos = cls._puntos(ax)
+        for linea, piramide, desplazamiento, escala, base in trazas:
+            tiempos, amplitudes = piramide.consultar(desde - desplazamiento, hasta - desplazamiento, puntos)
+            linea.set_data(tiempos + desplazamiento, amplitudes * escala + base)
+        ax.figure.canvas.draw_idle()
+
+    @classmethod
+    def generar_y_mostrar(cls, sismo, cache=None, estaciones=None):
+        filas = cls._filas(sismo, estaciones)
+        if not filas:
+            _traza.warning("ADVERTENCIA: No se encontraron datos de series temporales para graficar.")
+            return
+
+        if cache is not None:
+            imagen = cache.obtener(cls.claveImagen(sismo, filas))
+            if imagen is not None:
+                cls._mostrar_imagen(sismo, imagen, filas)
+                return
+        cls._mostrar_interactivo(sismo, filas)
+
+    @classmethod
+    def _mostrar_interactivo(cls, sismo, filas):
+        figura = plt.figure(figsize=cls._tamano_figura(len(filas)), dpi=cls.DPI)
+        ax, trazas = cls._dibujar(figura, sismo, filas)
+        ax.callbacks.connect("xlim_changed", lambda ax: cls._actualizar(ax, trazas))
+        figura.canvas.mpl_connect("resize_event", lambda evento: cls._actualizar(ax, trazas))
+        _conectar_cursor(ax)
+        plt.show(block=False)
+
+    @classmethod
+    def _mostrar_imagen(cls, sismo, imagen, filas):
+        """Muestra el sismograma rasterizado; un clic lo reemplaza por el gráfico interactivo"""
+        pixeles = plt.imread(io.BytesIO(imagen), format="png")
+        alto, ancho = pixeles.shape[:2]
+        figura = plt.figure(figsize=(ancho / cls.DPI, alto / cls.DPI), dpi=cls.DPI)
+        figura.figimage(pixeles)
+        figura.canvas.manager.set_window_title(f"Sismograma {sismo.id_sismo} (clic para explorar)")
+
+        def explorar(evento):
+            plt.close(figura)
+            cls._mostrar_interactivo(sismo, filas)
 
-        # Extraer los datos de la estructura de objetos
-        tiempos_dt = [muestra.fecha_hora_muestra for muestra in sismo.series_temporales[0].muestras]
-        amplitudes = []
-        
-        # Buscamos el detalle específico de 'velocidad_onda'
-        for muestra in sismo.series_temporales[0].muestras:
-            valor_velocidad = 0 # Valor por defecto si no se encuentra
-            for detalle in muestra.detalles:
-                if detalle.tipo_dato == "velocidad_onda":
-                    valor_velocidad = detalle.valor
-                    break
-            amplitudes.append(valor_velocidad)
-
-        # Convertimos las fechas a segundos desde el inicio para el eje X
-        inicio = tiempos_dt[0]
-        tiempos_segundos = [(t - inicio).total_seconds() for t in tiempos_dt]
-
-        plt.figure(figsize=(10, 4))
-        plt.plot(tiempos_segundos, amplitudes, color='royalblue')
-
-        titulo = f"Sismograma - Evento: {sismo.id_sismo}\nMagnitud: {sismo.getValorMagnitud()} Richter"
-        plt.title(titulo)
-        plt.xlabel("Tiempo (segundos desde el inicio de la muestra)")
-        plt.ylabel("Amplitud (velocidad de onda)")
-        plt.grid(True)
-        plt.tight_layout()
-        plt.show(block=False)
\ No newline at end of file
+        figura.canvas.mpl_connect("button_press_event", explorar)
+        plt.show(block=False)
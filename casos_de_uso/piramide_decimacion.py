@@ -0,0 +1,93 @@
+# casos_de_uso/piramide_decimacion.py
+
+from utilidades.importacion_diferida import modulo_diferido
+
+np = modulo_diferido("numpy")
+
+
+class PiramideDecimacion:
+    """
+    Pirámide de decimación min/max de una señal, para graficar series largas.
+
+    El nivel k agrupa las muestras en bloques de factor**k y guarda, por bloque,
+    el índice de la muestra mínima y el de la máxima. Como los valores se leen
+    siempre de la señal original por índice, los picos que se dibujan son
+    exactamente los de la señal, en sus instantes reales, a cualquier zoom.
+
+    consultar() elige el nivel más fino que entregue a lo sumo la cantidad de
+    puntos pedida (típicamente el doble del ancho en píxeles) dentro del rango
+    visible. Construirla cuesta O(n) y ocupa menos de la mitad de los índices
+    de la señal original.
+    """
+
+    def __init__(self, tiempos, valores, factor=4, bloques_minimos=256):
+        self.tiempos = np.asarray(tiempos, dtype=np.float64)
+        self.valores = np.asarray(valores)
+        self.factor = factor
+        tipo_indice = np.int32 if len(self.valores) < 2**31 else np.int64
+
+        # niveles[k - 1] = (tamaño de bloque, índices de mínimos, índices de máximos)
+        self.niveles = []
+        indices_min = indices_max = np.arange(len(self.valores), dtype=tipo_indice)
+        tamano_bloque = 1
+        while len(indices_min) > bloques_minimos:
+            indices_min = self._reducir(indices_min, np.argmin)
+            indices_max = self._reducir(indices_max, np.argmax)
+            tamano_bloque *= factor
+            self.niveles.append((tamano_bloque, indices_min, indices_max))
+
+    def _reducir(self, indices, seleccionar):
+        """Agrupa 'indices' de a 'factor' y conserva, por grupo, el del valor extremo"""
+        sobrante = (-len(indices)) % self.factor
+        if sobrante:
+            # El último grupo se completa repitiendo su último índice (no altera el extremo)
+            indices = np.concatenate([indices, np.repeat(indices[-1:], sobrante)])
+        grupos = indices.reshape(-1, self.factor)
+        elegidos = seleccionar(self.valores[grupos], axis=1)
+        return grupos[np.arange(len(grupos)), elegidos]
+
+    def __len__(self):
+        return len(self.valores)
+
+    def getTamanoBytes(self) -> int:
+        return sum(minimos.nbytes + maximos.nbytes for _, minimos, maximos in self.niveles)
+
+    def extremos(self):
+        """(mínimo, máximo) exactos de la señal, leídos del nivel más grueso"""
+        if len(self.valores) == 0:
+            return (0.0, 0.0)
+        if not self.niveles:
+            return (float(self.valores.min()), float(self.valores.max()))
+        _, minimos, maximos = self.niveles[-1]
+        return (float(self.valores[minimos].min()), float(self.valores[maximos].max()))
+
+    def consultar(self, desde=None, hasta=None, puntos=2000):
+        """
+        Tiempos y valores a dibujar en [desde, hasta] con a lo sumo ~'puntos' puntos.
+        Incluye una muestra a cada lado del rango para que la línea llegue a los bordes.
+        """
+        cantidad = len(self.valores)
+        if cantidad == 0:
+            return self.tiempos, self.valores
+        inicio = 0 if desde is None else max(int(np.searchsorted(self.tiempos, desde, "left")) - 1, 0)
+        fin = cantidad if hasta is None else min(int(np.searchsorted(self.tiempos, hasta, "right")) + 1, cantidad)
+
+        # Sin niveles la señal tiene a lo sumo 'bloques_minimos' muestras: se dibuja entera
+        if fin - inicio <= puntos or not self.niveles:
+            return self.tiempos[inicio:fin], self.valores[inicio:fin]
+
+        # Nivel más fino con a lo sumo puntos / 2 bloques en el rango (cada bloque aporta 2 puntos)
+        nivel = None
+        for tamano_bloque, minimos, maximos in self.niveles:
+            nivel = (tamano_bloque, minimos, maximos)
+            if (fin - inicio) / tamano_bloque <= puntos / 2:
+                break
+        tamano_bloque, minimos, maximos = nivel
+
+        bloque_inicio = inicio // tamano_bloque
+        bloque_fin = -(-fin // tamano_bloque)
+        minimos = minimos[bloque_inicio:bloque_fin]
+        maximos = maximos[bloque_inicio:bloque_fin]
+        # En cada bloque, el mínimo y el máximo se dibujan en el orden en que ocurrieron
+        indices = np.column_stack([np.minimum(minimos, maximos), np.maximum(minimos, maximos)]).ravel()
+        return self.tiempos[indices], self.valores[indices]
@@ -0,0 +1,292 @@
+# gestor/administrador_bloqueos.py
+
+import contextlib
+import heapq
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+from modelos.estado import BLOQUEADO_EN_REVISION, PENDIENTE_DE_REVISION
+
+_traza = logging.getLogger(__name__)
+
+
+class Concesion:
+    """
+    Bloqueo de un evento otorgado a un titular (la estación de revisión) hasta
+    'vence' (según el reloj del administrador). 'analista' es el nombre que se
+    informa a los demás; 'clave' identifica al titular en la base de datos.
+    """
+
+    __slots__ = ("id_sismo", "titular", "analista", "vence", "estado_previo", "evento", "ficha", "clave")
+
+    def __init__(self, id_sismo, titular, analista, vence, estado_previo, evento, ficha, clave=None):
+        self.id_sismo = id_sismo
+        self.titular = titular
+        self.analista = analista
+        self.vence = vence
+        self.estado_previo = estado_previo
+        self.evento = evento
+        self.ficha = ficha          # distingue esta concesión de otras anteriores sobre el mismo evento
+        self.clave = clave
+
+    def __repr__(self):
+        estado_previo = self.estado_previo.nombre if self.estado_previo else None
+        return f"Concesion({self.id_sismo!r}, {self.analista!r}, estado_previo={estado_previo!r})"
+
+
+class AdministradorBloqueos:
+    """
+    Bloqueos "Bloqueado en Revisión" de las estaciones de revisión.
+
+    - adquirir() es un compare-and-set: sólo otorga el bloqueo si no hay una
+      concesión vigente de otro titular sobre el evento y el estado actual del
+      evento es alguno de los esperados; recién entonces lo pasa a Bloqueado en
+      Revisión. Con 'base_datos' la decisión la toma un UPDATE condicional sobre
+      las columnas bloqueado_por/vence de la base, que comparten todas las
+      estaciones (de este u otros procesos); sin ella, los bloqueos valen dentro
+      del proceso.
+    - finalizar() verifica que la concesión siga vigente, registra el resultado
+      de la revisión y la libera en un solo paso.
+    - Cada concesión vence tras 'duracion_concesion' segundos salvo que se renueve.
+      Los vencimientos se guardan en un heap; un único hilo duerme hasta el más
+      próximo (las entradas de concesiones renovadas o liberadas se descartan
+      al salir del heap), sin recorrer los bloqueos vigentes.
+    - Ese hilo no toca los eventos: avisa a los observadores registrados con
+      alVencer(), que piden vencer() en el hilo principal. Recién ahí el evento
+      vuelve al estado que tenía antes del bloqueo, si nadie lo tomó mientras tanto.
+    """
+
+    DURACION_CONCESION = 15 * 60.0
+
+    _compartido = None
+    _lock_compartido = threading.Lock()
+
+    def __init__(self, duracion_concesion=None, reloj=None, base_datos=None):
+        self.duracion_concesion = duracion_concesion if duracion_concesion is not None else self.DURACION_CONCESION
+        self.base_datos = base_datos
+        # Los vencimientos guardados en la base se comparan entre procesos: reloj del sistema
+        self._reloj = reloj or (time.time if base_datos is not None else time.monotonic)
+        self._estacion = f"{socket.gethostname()}:{os.getpid()}"
+        self._condicion = threading.Condition()
+        self._concesiones = {}          # id_sismo -> Concesion vigente de este administrador
+        self._vencimientos = []         # heap de (vence, ficha, id_sismo)
+        self._fichas = itertools.count(1)
+        self._observadores = []
+        self._hilo = None
+
+    @classmethod
+    def compartido(cls):
+        """Instancia del proceso, compartida por los gestores sin base de datos que no reciben una propia"""
+        with cls._lock_compartido:
+            if cls._compartido is None:
+                cls._compartido = cls()
+            return cls._compartido
+
+    def alVencer(self, observador):
+        """
+        Registra un invocable observador(concesion), llamado desde el hilo de
+        vencimientos; debe pasar la concesión a vencer() en el hilo principal.
+        """
+        self._observadores.append(observador)
+
+    def quitarObservador(self, observador):
+        self._observadores.remove(observador)
+
+    def _transaccion(self):
+        return self.base_datos.transaccion() if self.base_datos is not None else contextlib.nullcontext()
+
+    def _clave(self, titular, analista):
+        """Identifica al titular ante las demás estaciones; el analista va antes del '#'"""
+        return f"{analista or ''}#{self._estacion}:{id(titular):x}"
+
+    # === ADQUISICIÓN Y LIBERACIÓN ===
+
+    def adquirir(self, evento, titular, analista=None, estados_esperados=None, duracion=None):
+        """
+        Bloquea el evento para el titular. Devuelve la Concesion, o None si otro
+        titular tiene una concesión vigente o el evento ya no está en alguno de
+        los 'estados_esperados'. Si el mismo titular ya lo tenía, la renueva; una
+        concesión vencida que aún no se revirtió pasa al nuevo titular con su estado previo.
+        """
+        duracion = self.duracion_concesion if duracion is None else duracion
+        with self._condicion:
+            ahora = self._reloj()
+            actual = self._concesiones.get(evento.id_sismo)
+            if actual is not None and actual.titular is not titular and ahora < actual.vence:
+                _traza.info("Evento %s ya bloqueado por %s", evento.id_sismo, actual.analista)
+                return None
+
+            estado_previo = evento.estadoActual.actual
+            heredada = actual is not None and estado_previo is BLOQUEADO_EN_REVISION
+            if heredada:
+                estado_previo = actual.estado_previo
+            elif estado_previo is BLOQUEADO_EN_REVISION and self._vencidaEnBase(evento.id_sismo, ahora):
+                # Bloqueo vencido de otra estación (o de una sesión que terminó sin liberarlo)
+                heredada = True
+                historial = evento.historial_estados
+                estado_previo = historial[-2].actual if len(historial) > 1 else PENDIENTE_DE_REVISION
+            elif estados_esperados is not None and estado_previo not in estados_esperados:
+                _traza.info("Evento %s en estado '%s': no se puede bloquear", evento.id_sismo, estado_previo.nombre)
+                return None
+
+            if actual is not None and actual.titular is titular:
+                concesion = actual
+            else:
+                concesion = Concesion(evento.id_sismo, titular, analista, 0.0, estado_previo, evento, 0,
+                                      self._clave(titular, analista))
+            vence = ahora + duracion
+            with self._transaccion():
+                if self.base_datos is not None and not self.base_datos.adquirirBloqueo(
+                        evento.id_sismo, concesion.clave, vence, ahora, estados_esperados):
+                    _traza.info("Evento %s bloqueado por otra estación", evento.id_sismo)
+                    return None
+                if not heredada:
+                    evento.cambiarEstadoEventoSismicoABloqueadoEnRevision()
+            self._concesiones[evento.id_sismo] = concesion
+            self._programar(concesion, vence)
+            _traza.debug("Evento %s bloqueado por %s hasta %.0f", evento.id_sismo, analista, concesion.vence)
+            return concesion
+
+    def renovar(self, concesion, duracion=None) -> bool:
+        """Extiende una concesión vigente; False si ya venció o fue liberada"""
+        with self._condicion:
+            ahora = self._reloj()
+            if not self._vigenteEnProceso(concesion, ahora):
+                return False
+            vence = ahora + (self.duracion_concesion if duracion is None else duracion)
+            if self.base_datos is not None and not self.base_datos.renovarBloqueo(
+                    concesion.id_sismo, concesion.clave, vence, ahora):
+                return False
+            self._programar(concesion, vence)
+            return True
+
+    def liberar(self, concesion, revertir=False) -> bool:
+        """
+        Libera una concesión vigente. Con 'revertir' el evento vuelve a su estado
+        previo (el analista abandonó la revisión); si no, se asume que quien la
+        libera ya registró el resultado de la revisión.
+        """
+        with self._condicion, self._transaccion():
+            if not self.esVigente(concesion):
+                return False
+            self._quitar(concesion)
+            if revertir:
+                self._revertir(concesion)
+            return True
+
+    def finalizar(self, concesion, registrar) -> bool:
+        """
+        Si la concesión sigue vigente, invoca registrar() (el cambio de estado que
+        cierra la revisión) y la libera, sin que otra estación ni el vencimiento
+        se intercalen. False, sin registrar nada, si venció o la tomó otro.
+        """
+        with self._condicion, self._transaccion():
+            if not self.esVigente(concesion):
+                return False
+            registrar()
+            self._quitar(concesion)
+            return True
+
+    def esVigente(self, concesion) -> bool:
+        """La concesión es la vigente para su evento y no venció (aunque el hilo aún no la procese)"""
+        with self._condicion:
+            ahora = self._reloj()
+            if not self._vigenteEnProceso(concesion, ahora):
+                return False
+            return self.base_datos is None or self.base_datos.tieneBloqueo(concesion.id_sismo, concesion.clave, ahora)
+
+    def _vigenteEnProceso(self, concesion, ahora) -> bool:
+        return (
+            concesion is not None
+            and self._concesiones.get(concesion.id_sismo) is concesion
+            and ahora < concesion.vence
+        )
+
+    def concesionDe(self, id_sismo):
+        """Concesión vigente sobre el evento, de esta u otra estación (sólo con su analista y vencimiento), o None"""
+        with self._condicion:
+            ahora = self._reloj()
+            concesion = self._concesiones.get(id_sismo)
+            if concesion is not None and ahora < concesion.vence:
+                return concesion
+        if self.base_datos is None:
+            return None
+        bloqueo = self.base_datos.bloqueoDe(id_sismo)
+        if bloqueo is None or bloqueo[1] < ahora:
+            return None
+        clave, vence = bloqueo
+        return Concesion(id_sismo, None, clave.rpartition("#")[0], vence, None, None, 0, clave)
+
+    def _vencidaEnBase(self, id_sismo, ahora) -> bool:
+        if self.base_datos is None:
+            return False
+        bloqueo = self.base_datos.bloqueoDe(id_sismo)
+        return bloqueo is not None and bloqueo[1] < ahora
+
+    def _quitar(self, concesion):
+        del self._concesiones[concesion.id_sismo]
+        if self.base_datos is not None:
+            self.base_datos.liberarBloqueo(concesion.id_sismo, concesion.clave)
+
+    # === VENCIMIENTOS ===
+
+    def vencer(self, concesion) -> bool:
+        """
+        Revierte el evento de una concesión vencida a su estado previo (hilo
+        principal). False si entre tanto se renovó, se liberó o la tomó otro titular.
+        """
+        with self._condicion, self._transaccion():
+            if self._concesiones.get(concesion.id_sismo) is not concesion or self._reloj() < concesion.vence:
+                return False
+            del self._concesiones[concesion.id_sismo]
+            if self.base_datos is not None and not self.base_datos.liberarBloqueo(concesion.id_sismo, concesion.clave):
+                return False  # otra estación tomó el evento después del vencimiento
+            self._revertir(concesion)
+            return True
+
+    def _programar(self, concesion, vence):
+        concesion.vence = vence
+        # Una entrada nueva por cada programación: las anteriores quedan obsoletas y se descartan
+        concesion.ficha = next(self._fichas)
+        heapq.heappush(self._vencimientos, (concesion.vence, concesion.ficha, concesion.id_sismo))
+        if self._hilo is None:
+            self._hilo = threading.Thread(target=self._atender_vencimientos, name="AdministradorBloqueos", daemon=True)
+            self._hilo.start()
+        self._condicion.notify()
+
+    def _atender_vencimientos(self):
+        while True:
+            vencidas = []
+            with self._condicion:
+                while not vencidas:
+                    if not self._vencimientos:
+                        self._condicion.wait()
+                        continue
+                    vence, ficha, id_sismo = self._vencimientos[0]
+                    espera = vence - self._reloj()
+                    if espera > 0:
+                        self._condicion.wait(espera)
+                        continue
+                    heapq.heappop(self._vencimientos)
+                    concesion = self._concesiones.get(id_sismo)
+                    if concesion is None or concesion.ficha != ficha:
+                        continue  # concesión liberada o renovada después de esta entrada
+                    vencidas.append(concesion)
+
+            for concesion in vencidas:
+                _traza.warning("Venció el bloqueo de %s sobre el evento %s", concesion.analista, concesion.id_sismo)
+                for observador in list(self._observadores):
+                    try:
+                        observador(concesion)
+                    except Exception as e:
+                        _traza.error("Error al notificar el vencimiento de %s: %s", concesion.id_sismo, e)
+
+    @staticmethod
+    def _revertir(concesion):
+        """Devuelve el evento al estado previo al bloqueo, si sigue bloqueado"""
+        evento = concesion.evento
+        if evento.estadoActual.actual is BLOQUEADO_EN_REVISION:
+            evento.cambiarEstadoEventoSismico(concesion.estado_previo.nombre)
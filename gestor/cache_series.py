@@ -0,0 +1,50 @@
+# gestor/cache_series.py
+
+import logging
+from collections import OrderedDict
+
+_traza = logging.getLogger(__name__)
+
+
+class CacheSeries:
+    """
+    LRU de los eventos abiertos recientemente cuyas series están cargadas.
+    El total de bytes de las series retenidas se mantiene dentro de un
+    presupuesto; al superarlo se liberan las series de los eventos usados
+    hace más tiempo (se volverán a cargar si se seleccionan de nuevo).
+    """
+
+    def __init__(self, presupuesto_bytes: int):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.bytes_en_uso = 0
+        self._eventos = OrderedDict()  # id_sismo -> (evento, bytes)
+
+    def abrir(self, evento):
+        """Asegura que las series del evento estén cargadas y lo marca como el más reciente"""
+        if evento.id_sismo in self._eventos:
+            self._eventos.move_to_end(evento.id_sismo)
+            return evento.series_temporales
+
+        series = evento.cargarSeries()
+        if not evento.esSeriesDiferidas():
+            return series  # series residentes: no se pueden liberar, no se contabilizan
+
+        tamano = evento.getTamanoSeriesBytes()
+        self._eventos[evento.id_sismo] = (evento, tamano)
+        self.bytes_en_uso += tamano
+        self._desalojar()
+        return series
+
+    def _desalojar(self):
+        # Siempre se conserva el evento recién abierto, aunque exceda el presupuesto
+        while self.bytes_en_uso > self.presupuesto_bytes and len(self._eventos) > 1:
+            _id_sismo, (evento, tamano) = self._eventos.popitem(last=False)
+            evento.liberarSeries()
+            self.bytes_en_uso -= tamano
+            _traza.debug("-> CacheSeries: liberadas las series de %s (%s bytes)", evento.id_sismo, tamano)
+
+    def __contains__(self, id_sismo):
+        return id_sismo in self._eventos
+
+    def __len__(self):
+        return len(self._eventos)
@@ -1,11 +1,38 @@
 # gestor/gestorRegistroResultadoRevisionManual.py
 
-import json
+import logging
+import math
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from datetime import datetime
 from modelos.evento_sismico import EventoSismico
 from modelos.sesion import Sesion
-from modelos.estado import Estado
+from modelos.estado import Estado, AUTO_DETECTADO, PENDIENTE_DE_REVISION
+from modelos.catalogo_eventos import CatalogoEventos
+from modelos.registro_estaciones import RegistroEstaciones
+from modelos.indice_espacial import IndiceEspacial
 from casos_de_uso.generar_sismograma import SismogramaGenerator
+from casos_de_uso.cache_sismogramas import CacheSismogramas
+from casos_de_uso.detector_sta_lta import DetectorStaLta
+from casos_de_uso.clasificador_sismos import ClasificadorSismos, ReglasSismo, ATRIBUTOS, rasgos_de_onda
+from persistencia.lector_json import (
+    leer_cabeceras_json, CargadorSeriesJson, leer_estaciones_json, leer_reglas_clasificacion_json,
+)
+from persistencia.almacen_ondas import AlmacenOndas
+from persistencia.base_datos_eventos import (
+    BaseDatosEventos, entradas_desde_json, entradas_desde_fragmentos, entradas_desde_almacen, entrada_desde_evento,
+)
+from persistencia.catalogo_fragmentado import es_catalogo_fragmentado, firma_catalogo, leer_fragmentos
+from persistencia.diario_estados import DiarioEstados
+from utilidades import perfil_arranque
+from .cache_series import CacheSeries
+from .administrador_bloqueos import AdministradorBloqueos
+from .tarea_segundo_plano import TareaSegundoPlano, TareaCancelada
+from .listado_eventos import ListadoEventos, fila_de_evento
+
+_traza = logging.getLogger(__name__)
 
 class GestorRegistroResultadoRevisionManual:
     """
@@ -14,29 +41,389 @@ class GestorRegistroResultadoRevisionManual:
     método intermedio para series temporales y clasificación por estación.
     """
     
-    def __init__(self, pantalla):
+    # Estados cuyos eventos se listan para revisión manual
+    ESTADOS_PENDIENTES_DE_REVISION = (AUTO_DETECTADO, PENDIENTE_DE_REVISION)
+
+    # Bytes de series temporales que se mantienen cargados para eventos ya abiertos
+    PRESUPUESTO_CACHE_SERIES_BYTES = 256 * 1024 * 1024
+
+    # Mecanismos de persistencia de los cambios de estado:
+    # - base de datos SQLite con el catálogo (se consultan sólo los eventos necesarios)
+    # - diario binario de sólo agregado, sobre el catálogo cargado en memoria
+    PERSISTENCIA_BASE_DATOS = "base_datos"
+    PERSISTENCIA_DIARIO = "diario"
+    EXTENSION_BASE_DATOS = ".db"
+    EXTENSION_DIARIO = ".diario"
+    EXTENSION_CACHE_SISMOGRAMAS = ".sismogramas"
+    # Registro de estaciones de la red (por defecto, junto al catálogo)
+    NOMBRE_REGISTRO_ESTACIONES = "estaciones.json"
+    # Reglas de clasificación, alcance y origen (por defecto, junto al catálogo)
+    NOMBRE_REGLAS_CLASIFICACION = "reglas_clasificacion.json"
+    # Celda de la grilla del índice de epicentros: con catálogos densos, celdas chicas
+    # mantienen pocas comparaciones por consulta
+    TAMANO_CELDA_EPICENTROS_GRADOS = 0.1
+
+    def __init__(self, pantalla, ruta_sismos="sismos.json", presupuesto_cache_series=None, ruta_almacen=None,
+                 ruta_base_datos=None, persistencia=PERSISTENCIA_BASE_DATOS, administrador_bloqueos=None,
+                 segundo_plano=False, ruta_cache_sismogramas=None, ruta_estaciones=None, ruta_reglas=None,
+                 procesos_carga=None):
         self.pantalla = pantalla
-        self.eventos_sismicos_en_memoria = []
+        # Archivo JSON o directorio de fragmentos con el mismo esquema (ver persistencia.catalogo_fragmentado)
+        if es_catalogo_fragmentado(ruta_sismos):
+            # Sin la barra final, los archivos derivados quedan junto al directorio y no dentro
+            ruta_sismos = os.path.normpath(ruta_sismos)
+        self.ruta_sismos = ruta_sismos
+        # Procesos que leen los fragmentos de un catálogo en directorio (por defecto, uno por núcleo)
+        self.procesos_carga = procesos_carga
+        # Almacén binario de ondas generado con persistencia.almacen_ondas (por defecto, junto al catálogo)
+        self.ruta_almacen = ruta_almacen or os.path.splitext(ruta_sismos)[0]
+        # Base SQLite con el catálogo y el historial de estados (por defecto, junto al catálogo;
+        # ":memory:" la mantiene sólo durante la ejecución)
+        self.ruta_base_datos = ruta_base_datos or os.path.splitext(ruta_sismos)[0] + self.EXTENSION_BASE_DATOS
+        self.ruta_diario = os.path.splitext(ruta_sismos)[0] + self.EXTENSION_DIARIO
+        # Eventos ya materializados, indexados por id y por estado actual
+        self.eventos_sismicos_en_memoria = CatalogoEventos()
         self.seleccionado = None
-        self._cargar_datos_desde_json()
-        print("-> Creada instancia del Gestor con referencia a la Pantalla.")
+        # Series del evento seleccionado agrupadas por código de estación
+        self.clasificacion_estaciones = {}
+        # Valores alcanzados por cada serie del evento seleccionado (ver SerieTemporal.getResumen)
+        self.resumenes_series = []
+        # Listado de eventos pendientes que muestra la pantalla; se mantiene al día con
+        # los cambios de estado del catálogo en lugar de volver a buscarlo
+        self.listado_eventos = None
+        # Bloqueo "Bloqueado en Revisión" del evento seleccionado, compartido con las demás
+        # estaciones (se asigna al abrir la persistencia)
+        self.administrador_bloqueos = administrador_bloqueos
+        self.concesion = None
+        # Con 'segundo_plano' la preparación del evento seleccionado corre en un hilo aparte y
+        # sus resultados vuelven a la pantalla con pantalla.ejecutarEnHiloPrincipal()
+        self.segundo_plano = segundo_plano
+        self._ejecutor = None
+        self._tarea = None              # preparación lanzada desde el hilo principal
+        self._tarea_en_curso = None     # la misma tarea, vista desde el hilo que la ejecuta
+        self.cache_series = CacheSeries(
+            presupuesto_cache_series if presupuesto_cache_series is not None
+            else self.PRESUPUESTO_CACHE_SERIES_BYTES
+        )
+        # Sismogramas ya rasterizados, en memoria y en disco (por defecto, junto al catálogo)
+        self.cache_sismogramas = CacheSismogramas(
+            ruta_cache_sismogramas or os.path.splitext(ruta_sismos)[0] + self.EXTENSION_CACHE_SISMOGRAMAS
+        )
+        self.ruta_estaciones = ruta_estaciones or os.path.join(
+            os.path.dirname(ruta_sismos), self.NOMBRE_REGISTRO_ESTACIONES
+        )
+        with perfil_arranque.medir("Cargar registro de estaciones"):
+            self.registro_estaciones = self._cargar_registro_estaciones()
+        self.ruta_reglas = ruta_reglas or os.path.join(
+            os.path.dirname(ruta_sismos), self.NOMBRE_REGLAS_CLASIFICACION
+        )
+        self.clasificador = ClasificadorSismos(self._cargar_reglas(), self.registro_estaciones)
+        # Rasgos de onda (pico de velocidad, frecuencia media) de los eventos ya procesados;
+        # con base de datos se guardan en ella, con el diario sólo duran la sesión
+        self.rasgos_onda = {}
+        # Índice espacial de epicentros; se arma en la primera consulta
+        self._indice_epicentros = None
+        with perfil_arranque.medir("Abrir almacén de ondas"):
+            self.almacen = self._abrir_almacen_ondas()
+        self.base_datos = None
+        self.diario = None
+        if persistencia == self.PERSISTENCIA_DIARIO:
+            # Estado vigente de cada evento: última instantánea más la cola del diario
+            with perfil_arranque.medir("Recuperar diario de estados"):
+                self.diario = DiarioEstados(self.ruta_diario)
+            with perfil_arranque.medir("Cargar cabeceras del catálogo"):
+                if self.almacen:
+                    self._cargar_datos_desde_almacen(self.almacen)
+                else:
+                    self._cargar_datos_desde_json()
+            self.eventos_sismicos_en_memoria.agregarObservador(self.diario.registrarCambioEstado)
+            with perfil_arranque.medir("Clasificar catálogo"):
+                self.clasificarCatalogo()
+        else:
+            with perfil_arranque.medir("Abrir base de datos"):
+                self.base_datos = BaseDatosEventos(self.ruta_base_datos)
+            with perfil_arranque.medir("Sincronizar catálogo con la base"):
+                self._sincronizar_base_datos()
+            # Las clasificaciones guardadas sirven mientras no cambien las reglas ni el catálogo
+            if self.base_datos.getFirmaReglas() != self.clasificador.firma:
+                with perfil_arranque.medir("Clasificar catálogo"):
+                    self.clasificarCatalogo()
+            # Cada cambio de estado de un evento materializado se escribe en la base
+            self.eventos_sismicos_en_memoria.agregarObservador(self.base_datos.registrarCambioEstado)
+        if self.administrador_bloqueos is None:
+            # Con base de datos los bloqueos se registran en ella y valen para todas las
+            # estaciones que la abren; con el diario, para las del proceso
+            self.administrador_bloqueos = (
+                AdministradorBloqueos(base_datos=self.base_datos) if self.base_datos is not None
+                else AdministradorBloqueos.compartido()
+            )
+        self.administrador_bloqueos.alVencer(self._bloqueoVencido)
+        # Después de la persistencia: el listado refleja cambios ya registrados
+        self.eventos_sismicos_en_memoria.agregarObservador(self._cambioEstadoEvento)
+        _traza.debug("-> Creada instancia del Gestor con referencia a la Pantalla.")
+
+    def _abrir_almacen_ondas(self):
+        """Abre el almacén binario si existe y corresponde a la versión actual del catálogo"""
+        if not AlmacenOndas.existe(self.ruta_almacen):
+            return None
+        try:
+            almacen = AlmacenOndas(self.ruta_almacen)
+            if os.path.exists(self.ruta_sismos) and almacen.origen != firma_catalogo(self.ruta_sismos):
+                _traza.warning(">> GESTOR: ADVERTENCIA - El almacén '%s' no corresponde a '%s'; se usa el JSON.", self.ruta_almacen, self.ruta_sismos)
+                return None
+            return almacen
+        except Exception as e:
+            _traza.error(">> GESTOR: ERROR al abrir el almacén '%s': %s", self.ruta_almacen, e)
+            return None
+
+    def _cargar_registro_estaciones(self):
+        """Estaciones de la red; sin registro, las series se muestran sin estación asociada"""
+        if not os.path.exists(self.ruta_estaciones):
+            _traza.warning(">> GESTOR: ADVERTENCIA - No se encontró el registro de estaciones '%s'.", self.ruta_estaciones)
+            return RegistroEstaciones()
+        try:
+            registro = RegistroEstaciones(leer_estaciones_json(self.ruta_estaciones))
+        except (OSError, ValueError) as e:
+            _traza.error(">> GESTOR: ERROR al leer el registro de estaciones '%s': %s", self.ruta_estaciones, e)
+            return RegistroEstaciones()
+        _traza.debug("-> Registro de estaciones: %s estaciones", len(registro))
+        return registro
+
+    def _cargar_reglas(self):
+        """Reglas de clasificación del archivo; si no está o es inválido, las reglas por defecto"""
+        if not os.path.exists(self.ruta_reglas):
+            _traza.debug("-> Sin archivo de reglas '%s': se usan las reglas por defecto", self.ruta_reglas)
+            return ReglasSismo()
+        try:
+            return ReglasSismo(leer_reglas_clasificacion_json(self.ruta_reglas))
+        except (OSError, ValueError) as e:
+            _traza.error(">> GESTOR: ERROR al leer las reglas '%s': %s", self.ruta_reglas, e)
+            return ReglasSismo()
+
+    def _agregar_evento_cargado(self, cabecera, cargador):
+        """Agrega al catálogo en memoria un evento, con los cambios de estado recuperados del diario"""
+        evento = self._crear_evento_desde_datos(cabecera, cargador)
+        self.diario.restaurarEvento(evento)
+        self.eventos_sismicos_en_memoria.agregar(evento)
+
+    def _cargar_datos_desde_almacen(self, almacen):
+        """Carga las cabeceras desde el índice del almacén; las series se mapean al seleccionarse"""
+        for cabecera in almacen.cabeceras():
+            self._agregar_evento_cargado(cabecera, almacen.cargadorSeries(cabecera["id_sismo"]))
 
     def _cargar_datos_desde_json(self):
+        """
+        Carga sólo las cabeceras del catálogo (id, fecha, magnitud, estado, ...).
+        Cada evento recibe un cargador que relee su fragmento del archivo, de modo
+        que las series temporales se decodifican recién al seleccionarlo.
+        Un catálogo en directorio se lee con un pool de procesos, un fragmento por tarea.
+        """
+        try:
+            if es_catalogo_fragmentado(self.ruta_sismos):
+                for cabecera, fuente, _series in leer_fragmentos(self.ruta_sismos, self.procesos_carga):
+                    self._agregar_evento_cargado(cabecera, self._cargadorJson(fuente))
+                return
+            for cabecera, inicio, longitud in leer_cabeceras_json(self.ruta_sismos):
+                self._agregar_evento_cargado(cabecera, CargadorSeriesJson(self.ruta_sismos, inicio, longitud))
+        except FileNotFoundError:
+            _traza.warning(">> GESTOR: ADVERTENCIA - No se encontró '%s'.", self.ruta_sismos)
+        except Exception as e:
+            _traza.error(">> GESTOR: ERROR al cargar '%s': %s", self.ruta_sismos, e)
+
+    def _sincronizar_base_datos(self):
+        """
+        Importa el catálogo JSON a la base de datos si cambió desde la última
+        importación (o el almacén de ondas si no hay JSON y la base está vacía).
+        Mientras el catálogo no cambie, el arranque no lee ningún evento.
+        """
         try:
-            with open("sismos.json", "r", encoding="utf-8") as f: 
-                data = json.load(f)
-            for sismo_data in data:
-                self.eventos_sismicos_en_memoria.append(EventoSismico(
-                    id_sismo=sismo_data["id_sismo"],
-                    fecha=datetime.fromisoformat(sismo_data["fecha_hora_ocurrencia"]),
-                    magnitud=sismo_data["valor_magnitud"],
-                    estado_inicial=sismo_data["estado_inicial"],
-                    series_data=sismo_data.get("series_temporales", [])
-                ))
-        except FileNotFoundError: 
-            print(">> GESTOR: ADVERTENCIA - No se encontró 'sismos.json'.")
-        except Exception as e: 
-            print(f">> GESTOR: ERROR al cargar 'sismos.json': {e}")
+            if not os.path.exists(self.ruta_sismos):
+                if self.base_datos.cantidadEventos() > 0:
+                    return
+                if self.almacen:
+                    self.base_datos.importarEventos(entradas_desde_almacen(self.almacen))
+                else:
+                    _traza.warning(">> GESTOR: ADVERTENCIA - No se encontró '%s'.", self.ruta_sismos)
+                return
+
+            firma = firma_catalogo(self.ruta_sismos)
+            if self.base_datos.getOrigen() == firma:
+                return
+            _traza.info(">> GESTOR: Importando '%s' a la base de datos '%s'", self.ruta_sismos, self.ruta_base_datos)
+            if es_catalogo_fragmentado(self.ruta_sismos):
+                entradas = entradas_desde_fragmentos(self.ruta_sismos, self.procesos_carga)
+            else:
+                entradas = entradas_desde_json(self.ruta_sismos)
+            nuevos = self.base_datos.importarEventos(entradas, firma)
+            _traza.info(">> GESTOR: %s eventos nuevos importados", nuevos)
+        except Exception as e:
+            _traza.error(">> GESTOR: ERROR al importar '%s': %s", self.ruta_sismos, e)
+
+    def _cargadorSeries(self, id_sismo, fuente):
+        """Cargador diferido de las series: almacén de ondas si lo contiene, si no el fragmento del JSON"""
+        if self.almacen is not None and id_sismo in self.almacen:
+            return self.almacen.cargadorSeries(id_sismo)
+        if fuente is not None:
+            return self._cargadorJson(fuente)
+        return None
+
+    def _cargadorJson(self, fuente):
+        """Cargador de (inicio, longitud) en el catálogo, o de (inicio, longitud, fragmento) en su directorio"""
+        inicio, longitud, *fragmento = fuente
+        ruta = os.path.join(self.ruta_sismos, *fragmento) if fragmento else self.ruta_sismos
+        return CargadorSeriesJson(ruta, inicio, longitud)
+
+    def _materializarEvento(self, cabecera, fuente, cambios_estado):
+        """
+        EventoSismico de una fila de la base de datos. Si el evento ya está en
+        memoria se reutiliza: sus cambios de estado se escriben en la base a
+        medida que ocurren, por lo que ambas copias coinciden.
+        """
+        evento = self.eventos_sismicos_en_memoria.obtener(cabecera["id_sismo"])
+        if evento is None:
+            evento = self._crear_evento_desde_datos(cabecera, self._cargadorSeries(cabecera["id_sismo"], fuente))
+            evento.restaurarHistorialEstados(cambios_estado)
+            clasificacion = self.base_datos.clasificacionDe(evento.id_sismo)
+            if clasificacion is not None:
+                evento.asignarClasificacion(*clasificacion)
+            else:
+                self._clasificarEventos([evento])
+            self.eventos_sismicos_en_memoria.agregar(evento)
+        return evento
+
+    def obtenerEvento(self, id_sismo):
+        """Evento con el id indicado (desde memoria o desde la base de datos), o None"""
+        evento = self.eventos_sismicos_en_memoria.obtener(id_sismo)
+        if evento is None and self.base_datos is not None:
+            fila = self.base_datos.obtenerEvento(id_sismo)
+            if fila is not None:
+                evento = self._materializarEvento(*fila)
+        return evento
+
+    def _crear_evento_desde_datos(self, sismo_data, cargador_series=None):
+        """Construye un EventoSismico a partir de un elemento del catálogo JSON"""
+        return EventoSismico(
+            id_sismo=sismo_data["id_sismo"],
+            fecha=datetime.fromisoformat(sismo_data["fecha_hora_ocurrencia"]),
+            magnitud=sismo_data["valor_magnitud"],
+            estado_inicial=sismo_data["estado_inicial"],
+            series_data=sismo_data.get("series_temporales", []),
+            latitud_epicentro=sismo_data.get("latitud_epicentro"),
+            longitud_epicentro=sismo_data.get("longitud_epicentro"),
+            profundidad=sismo_data.get("profundidad"),
+            cargador_series=cargador_series
+        )
+
+    # === DETECCIÓN AUTOMÁTICA ===
+
+    def detectarEventos(self, trazas, detector=None):
+        """
+        Corre el detector STA/LTA sobre trazas continuas {código de estación: SerieTemporal}
+        y registra cada detección como un evento Auto-Detectado. Devuelve los eventos.
+        """
+        _traza.info(">> GESTOR: detectarEventos(%s estaciones)", len(trazas))
+        detector = detector or DetectorStaLta()
+        eventos = detector.crearEventos(detector.detectar(trazas), trazas, self.registro_estaciones)
+        self.registrarEventosDetectados(eventos)
+        return eventos
+
+    def registrarEventosDetectados(self, eventos):
+        """
+        Incorpora eventos creados por el sistema: quedan en el catálogo en memoria
+        (con sus series) y, con base de datos, también en ella. Los pendientes de
+        revisión aparecen en el listado que se está mostrando.
+        """
+        eventos = [evento for evento in eventos if self.obtenerEvento(evento.id_sismo) is None]
+        if self.base_datos is not None:
+            self.base_datos.agregarEventos(entrada_desde_evento(evento) for evento in eventos)
+        # Las series de los eventos detectados ya están en memoria: sus rasgos de onda entran en la clasificación
+        for evento in eventos:
+            self._guardarRasgosOnda(evento.id_sismo, rasgos_de_onda(serie.getResumen() for serie in evento.series_temporales))
+        self._clasificarEventos(eventos)
+        for evento in eventos:
+            self.eventos_sismicos_en_memoria.agregar(evento)
+            if self._indice_epicentros is not None and evento.latitudEpicentro is not None \
+                    and evento.longitudEpicentro is not None:
+                self._indice_epicentros.agregar(evento.id_sismo, evento.latitudEpicentro, evento.longitudEpicentro)
+            self._cambioEstadoEvento(evento, None, evento.estadoActual.actual)
+        _traza.info(">> GESTOR: %s eventos detectados registrados", len(eventos))
+
+    # === CLASIFICACIÓN ===
+
+    def clasificarCatalogo(self):
+        """
+        Aplica las reglas de clasificación, alcance y origen a todo el catálogo
+        en una única evaluación vectorial y guarda el resultado de cada evento
+        (en la base de datos, o en los eventos del catálogo en memoria).
+        Los rasgos de onda (pico de velocidad, frecuencia media) de los eventos
+        ya revisados se guardan en la base; con el diario de estados valen sólo
+        durante la sesión (el diario registra cambios de estado, no rasgos), así
+        que tras reiniciar esos eventos se clasifican sin ellos hasta volver a
+        prepararlos. Devuelve la cantidad de eventos clasificados.
+        """
+        _traza.info(">> GESTOR: clasificarCatalogo()")
+        if self.base_datos is not None:
+            clasificaciones = self.clasificador.clasificar(*self.base_datos.atributosClasificacion())
+            self.base_datos.guardarClasificaciones(clasificaciones.filas(), self.clasificador.firma)
+            # Los eventos ya materializados se reclasifican aparte (son pocos)
+            self._asignarClasificaciones(list(self.eventos_sismicos_en_memoria))
+        else:
+            clasificaciones = self._asignarClasificaciones(list(self.eventos_sismicos_en_memoria))
+        _traza.info(">> GESTOR: %s eventos clasificados: %s", len(clasificaciones),
+                    clasificaciones.conteo("clasificacion"))
+        return len(clasificaciones)
+
+    def actualizarReglas(self, reglas=None):
+        """
+        Reemplaza las reglas (por defecto, las vuelve a leer del archivo) y
+        reclasifica el catálogo. Devuelve la cantidad de eventos clasificados.
+        """
+        self.clasificador.reglas = reglas if reglas is not None else self._cargar_reglas()
+        return self.clasificarCatalogo()
+
+    def _asignarClasificaciones(self, eventos):
+        """Clasifica EventoSismico ya materializados y les asigna el resultado"""
+        if self.base_datos is not None:
+            rasgos_onda = {}
+            for evento in eventos:
+                rasgos = self.base_datos.rasgosOnda(evento.id_sismo)
+                if rasgos is not None:
+                    rasgos_onda[evento.id_sismo] = rasgos
+        else:
+            rasgos_onda = self.rasgos_onda
+        clasificaciones = self.clasificador.clasificarEventos(eventos, rasgos_onda)
+        for evento, valores in zip(eventos, zip(*(clasificaciones.columna(atributo) for atributo in ATRIBUTOS))):
+            evento.asignarClasificacion(*valores)
+        return clasificaciones
+
+    def _clasificarEventos(self, eventos):
+        """Clasifica eventos nuevos o con rasgos nuevos y guarda el resultado"""
+        if not eventos:
+            return
+        clasificaciones = self._asignarClasificaciones(eventos)
+        if self.base_datos is not None:
+            self.base_datos.guardarClasificaciones(clasificaciones.filas())
+
+    def _actualizarRasgosOnda(self, evento, resumenes):
+        """Registra los rasgos de onda del evento; si cambiaron, lo vuelve a clasificar"""
+        rasgos = rasgos_de_onda(resumenes)
+        if self.base_datos is not None:
+            anteriores = self.base_datos.rasgosOnda(evento.id_sismo)
+        else:
+            anteriores = self.rasgos_onda.get(evento.id_sismo)
+        if anteriores is not None:
+            # La base guarda NaN como NULL
+            anteriores = tuple(math.nan if valor is None else valor for valor in anteriores)
+            if all(a == b or (math.isnan(a) and math.isnan(b)) for a, b in zip(anteriores, rasgos)):
+                return
+        self._guardarRasgosOnda(evento.id_sismo, rasgos)
+        self._clasificarEventos([evento])
+
+    def _guardarRasgosOnda(self, id_sismo, rasgos):
+        if self.base_datos is not None:
+            self.base_datos.guardarRasgosOnda(id_sismo, *rasgos)
+        else:
+            self.rasgos_onda[id_sismo] = rasgos
 
     def buscarSismosAutoDetectadosYPendienteDeRevision(self):
         """
@@ -44,305 +431,557 @@ class GestorRegistroResultadoRevisionManual:
         - Validación de fechaHoraFin == null (CORRECCIÓN 1)
         - Ordenamiento movido fuera del loop (CORRECCIÓN 2)
         """
-        print("\n>> GESTOR: buscarSismosAutoDetectadosYPendienteDeRevision()")
-        
-        # ============= INICIO DEL LOOP PARA TODOS LOS EVENTOS SÍSMICOS =============
-        sismos_filtrados = []
+        _traza.info("\n>> GESTOR: buscarSismosAutoDetectadosYPendienteDeRevision()")
         
-        for evento_sismico in self.eventos_sismicos_en_memoria:
-            print(f">> GESTOR: Procesando evento {evento_sismico.id_sismo}")
-            
-            # CORRECCIÓN 1: Validar que el estado actual tenga fechaHoraFin == null
-            if not evento_sismico.estadoActual.esEstadoActual():
-                print(f"   -> Evento {evento_sismico.id_sismo} excluido por tener estado finalizado")
-                continue
-            
-            # VALIDACIÓN PREVENTIVA: Excluir eventos ya procesados
-            estado_actual = evento_sismico.estadoActual.actual.nombre
-            if estado_actual in ["Rechazado", "Confirmado", "Bloqueado en Revisión"]:
-                print(f"   -> Evento {evento_sismico.id_sismo} excluido por estar en estado '{estado_actual}'")
-                continue
-            
-            # ===== 1. CHEQUEO "AutoDetectado" =====
-            if evento_sismico.estaEnEstadoAutoDetectado():
-                print(f"   -> Evento {evento_sismico.id_sismo} está en estado Auto-Detectado")
-                datos_evento = evento_sismico.getDatosEventoSismico()
-                sismos_filtrados.append(evento_sismico)
-                continue
-            
-            # ===== 2. CHEQUEO "PendienteDeRevision" =====
-            if evento_sismico.estaEnEstadoPendienteDeRevision():
-                print(f"   -> Evento {evento_sismico.id_sismo} está en estado Pendiente de Revisión")
-                datos_evento = evento_sismico.getDatosEventoSismico()
-                sismos_filtrados.append(evento_sismico)
-                continue
-                
-            print(f"   -> Evento {evento_sismico.id_sismo} no cumple criterios de filtrado")
+        # Los candidatos salen de un índice por estado y fecha (consulta SQL sobre (estado_actual, fecha),
+        # o el índice temporal por estado del catálogo en memoria): llegan ya ordenados por fecha y
+        # el costo es proporcional a los eventos encontrados.
+        # Se listan como filas livianas; cada EventoSismico se materializa recién al seleccionarlo.
+        if self.base_datos is not None:
+            # La columna estado_actual guarda sólo el estado vigente de cada evento
+            sismos_filtrados = self.base_datos.filasEnEstados(self.ESTADOS_PENDIENTES_DE_REVISION)
+        else:
+            # ============= LOOP PARA LOS EVENTOS CANDIDATOS =============
+            sismos_filtrados = []
+            for evento_sismico in self.eventos_sismicos_en_memoria.eventosEnEstados(*self.ESTADOS_PENDIENTES_DE_REVISION):
+                # CORRECCIÓN 1: Validar que el estado actual tenga fechaHoraFin == null
+                if not evento_sismico.estadoActual.esEstadoActual():
+                    _traza.debug("   -> Evento %s excluido por tener estado finalizado", evento_sismico.id_sismo)
+                    continue
+
+                sismos_filtrados.append(fila_de_evento(evento_sismico))
         
         # ============= CORRECCIÓN 2: ORDENAMIENTO FUERA DEL LOOP =============
-        print(f">> GESTOR: Se encontraron {len(sismos_filtrados)} eventos que cumplen los criterios")
+        _traza.info(">> GESTOR: Se encontraron %s eventos que cumplen los criterios", len(sismos_filtrados))
         
         # SEGÚN DIAGRAMA: ordenar eventos por fecha y hora
-        eventos_ordenados = self.ordenarEventosSismicosPorFechaYHora(sismos_filtrados)
+        self.listado_eventos = self.ordenarEventosSismicosPorFechaYHora(sismos_filtrados, ya_ordenados=True)
         
         # Mostrar eventos ordenados en pantalla
-        self.pantalla.mostrarEventosSismicosEncontradosOrdenados(eventos_ordenados)
+        self.pantalla.mostrarEventosSismicosEncontradosOrdenados(self.listado_eventos)
         
         # Solicitar selección de evento
         self.pantalla.solicitarSeleccionEventoSismico()
 
-    def ordenarEventosSismicosPorFechaYHora(self, eventos):
-        """SEGÚN DIAGRAMA: Ordena los eventos sísmicos por fecha y hora"""
-        print(">> GESTOR: ordenarEventosSismicosPorFechaYHora()")
-        eventos.sort(key=lambda x: x.getFechaHoraOcurrencia(), reverse=True)
-        return eventos
+    def ordenarEventosSismicosPorFechaYHora(self, filas_eventos, ya_ordenados=False):
+        """
+        SEGÚN DIAGRAMA: Ordena los eventos sísmicos por fecha y hora.
+        Devuelve un ListadoEventos: la pantalla puede reordenarlo por otra columna.
+        """
+        _traza.info(">> GESTOR: ordenarEventosSismicosPorFechaYHora()")
+        return ListadoEventos(filas_eventos, columna="fecha", descendente=True, ya_ordenadas=ya_ordenados)
+
+    # === VENTANAS DE TIEMPO ===
+
+    def buscarEventosEntre(self, desde=None, hasta=None, estados=None, descendente=False):
+        """
+        Filas livianas de los eventos ocurridos en [desde, hasta) (None: sin límite),
+        en orden cronológico o inverso; con 'estados', sólo los que están en alguno
+        de ellos. Sale del índice por fecha (SQL o catálogo en memoria), sin ordenar.
+        """
+        _traza.info(">> GESTOR: buscarEventosEntre(%s, %s)", desde, hasta)
+        if self.base_datos is not None:
+            return self.base_datos.filasEntre(desde, hasta, estados, descendente)
+        eventos = self.eventos_sismicos_en_memoria.eventosEntre(desde, hasta, estados, descendente)
+        return [fila_de_evento(evento) for evento in eventos]
+
+    def buscarUltimosEventosPendientes(self, cantidad):
+        """Filas de los 'cantidad' eventos pendientes de revisión más recientes"""
+        _traza.info(">> GESTOR: buscarUltimosEventosPendientes(%s)", cantidad)
+        if self.base_datos is not None:
+            return self.base_datos.filasEnEstados(self.ESTADOS_PENDIENTES_DE_REVISION, limite=cantidad)
+        eventos = self.eventos_sismicos_en_memoria.ultimosEventos(cantidad, self.ESTADOS_PENDIENTES_DE_REVISION)
+        return [fila_de_evento(evento) for evento in eventos]
+
+    def _cambioEstadoEvento(self, evento, estado_anterior, estado_nuevo):
+        """
+        Observador del catálogo: cuando un evento entra o sale de los estados
+        pendientes de revisión se inserta o quita sólo su fila del listado.
+        Los vencimientos de bloqueos llegan desde otro hilo; el listado se
+        modifica siempre en el hilo principal, que es el que lo muestra.
+        """
+        if self.listado_eventos is None:
+            return
+        if estado_anterior not in self.ESTADOS_PENDIENTES_DE_REVISION and \
+                estado_nuevo not in self.ESTADOS_PENDIENTES_DE_REVISION:
+            return
+        fila = fila_de_evento(evento) if estado_nuevo in self.ESTADOS_PENDIENTES_DE_REVISION else None
+        if threading.current_thread() is threading.main_thread():
+            self._actualizarListado(evento.id_sismo, fila)
+        else:
+            self.pantalla.ejecutarEnHiloPrincipal(self._actualizarListado, evento.id_sismo, fila)
+
+    def _actualizarListado(self, id_sismo, fila):
+        """Quita la fila del evento o la inserta (o reemplaza) en su lugar del orden vigente"""
+        if fila is None:
+            self.listado_eventos.quitar(id_sismo)
+            _traza.debug("   -> Evento %s quitado del listado", id_sismo)
+        else:
+            self.listado_eventos.insertar(fila)
+            _traza.debug("   -> Evento %s agregado al listado", id_sismo)
+        self.pantalla.actualizarEventosSismicosListados()
 
     def tomarSeleccionEventoSismico(self, id_sismo: str):
         """
         CORRECCIÓN 4 APLICADA: Usa método intermedio procesarSeriesTemporales()
         """
-        print(f"\n>> GESTOR: tomarSeleccionEventoSismico({id_sismo})")
+        _traza.info("\n>> GESTOR: tomarSeleccionEventoSismico(%s)", id_sismo)
+
+        # Una selección nueva reemplaza a la que se esté preparando
+        if self._tarea is not None:
+            self.cancelarPreparacion()
         
-        # Buscar el sismo seleccionado
-        for sismo in self.eventos_sismicos_en_memoria:
-            if sismo.id_sismo == id_sismo:
-                self.seleccionado = sismo
-                break
+        # Buscar el sismo seleccionado por id (en memoria o en la base de datos)
+        self.seleccionado = self.obtenerEvento(id_sismo)
         
         if not self.seleccionado:
-            print(f">> GESTOR: ERROR - No se encontró el sismo {id_sismo}")
+            _traza.error(">> GESTOR: ERROR - No se encontró el sismo %s", id_sismo)
             return
-            
-        # Cambiar estado a Bloqueado en Revisión
-        self.cambiarEventoSismicoSeleccionadoABloqueadoEnRevision()
-        
-        # Buscar datos sísmicos registrados
-        self.buscarDatosSismicosRegistradosParaElEventoSismicoSeleccionado()
-        
+
+        # Cambiar estado a Bloqueado en Revisión (falla si otro analista lo tomó antes)
+        if not self.cambiarEventoSismicoSeleccionadoABloqueadoEnRevision():
+            concesion = self.administrador_bloqueos.concesionDe(id_sismo)
+            self.seleccionado = None
+            motivo = (f"El evento {id_sismo} está siendo revisado por {concesion.analista}."
+                      if concesion else f"El evento {id_sismo} ya no está pendiente de revisión.")
+            self.pantalla.informarEventoNoDisponible(motivo)
+            return
+
+        if not self.segundo_plano:
+            self.aplicarPreparacion(self.seleccionado, *self.prepararEventoSeleccionado(evento=self.seleccionado))
+            self.presentarEventoSeleccionado()
+            return
+
+        # La decodificación y el procesamiento de las series corren fuera del hilo de la
+        # interfaz; la pantalla sigue respondiendo y muestra el avance
+        tarea = TareaSegundoPlano(f"preparar {id_sismo}")
+        tarea.alProgresar(partial(self._informarProgresoEnPantalla, tarea))
+        self._tarea = tarea
+        if self._ejecutor is None:
+            self._ejecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="PreparacionEvento")
+        self._ejecutor.submit(self._prepararEnSegundoPlano, tarea, self.seleccionado)
+
+    def prepararEventoSeleccionado(self, tarea=None, evento=None):
+        """
+        Parte costosa de la selección (no toca la interfaz ni el estado del
+        gestor): carga de series, datos sísmicos, recorrido de las series,
+        clasificación por estación y pirámide de decimación del sismograma.
+        Con una tarea, informa el avance y se interrumpe si se la cancela.
+        Devuelve (resúmenes de las series, clasificación por estación), que
+        aplicarPreparacion() asigna en el hilo principal.
+        """
+        evento = evento if evento is not None else self.seleccionado
+        self._tarea_en_curso = tarea
+        try:
+            self._informarProgreso(0.0, "Cargando series temporales")
+            # Recién ahora se decodifican las series del evento (o se reutilizan si siguen en la cache)
+            self.cache_series.abrir(evento)
+
+            # Buscar datos sísmicos registrados
+            self._informarProgreso(0.3, "Obteniendo datos sísmicos")
+            self.buscarDatosSismicosRegistradosParaElEventoSismicoSeleccionado(evento)
+
+            # CORRECCIÓN 4: Usar método intermedio para procesamiento de series
+            resumenes, clasificacion = self.procesarSeriesTemporales(evento)
+
+            # La pirámide de decimación y la imagen del sismograma se arman aquí y no al graficar
+            self._informarProgreso(0.95, "Preparando sismograma")
+            SismogramaGenerator.preparar(evento, self.cache_sismogramas, self._seriesPorEstacion(clasificacion))
+            self._informarProgreso(1.0, "Listo")
+            return resumenes, clasificacion
+        finally:
+            self._tarea_en_curso = None
+
+    def aplicarPreparacion(self, evento, resumenes, clasificacion):
+        """
+        Asigna el resultado de prepararEventoSeleccionado() al gestor (hilo
+        principal) y registra los rasgos de onda del evento
+        """
+        self.resumenes_series = resumenes
+        self.clasificacion_estaciones = clasificacion
+        # Los rasgos de las formas de onda entran en las reglas de clasificación
+        self._actualizarRasgosOnda(evento, resumenes)
+
+    def presentarEventoSeleccionado(self):
+        """Parte de la selección que usa la interfaz; corre en el hilo principal"""
         # Mostrar datos en pantalla
         self.pantalla.mostrarDatosEventoSismicoSeleccionado(self.seleccionado)
-        
-        # CORRECCIÓN 4: Usar método intermedio para procesamiento de series
-        self.procesarSeriesTemporales()
 
-    def procesarSeriesTemporales(self):
+        # Llamar al caso de uso de generación de sismograma
+        self.llamarAlCasoDeUsoGenerarSismograma()
+
+        # Habilitar opción de visualización de mapa
+        self.pantalla.habilitarOpcionVisualizacionMapaConEstacionesSismologicasInvolucradas()
+
+    # === PREPARACIÓN EN SEGUNDO PLANO ===
+
+    def _informarProgreso(self, fraccion, mensaje):
+        """Avance de la preparación en curso (no hace nada si corre en el hilo principal)"""
+        if self._tarea_en_curso is not None:
+            self._tarea_en_curso.informarProgreso(fraccion, mensaje)
+
+    def _informarProgresoEnPantalla(self, tarea, fraccion, mensaje):
+        self.pantalla.ejecutarEnHiloPrincipal(self._mostrarProgreso, tarea, fraccion, mensaje)
+
+    def _mostrarProgreso(self, tarea, fraccion, mensaje):
+        if tarea is self._tarea:  # descarta avances de preparaciones ya canceladas
+            self.pantalla.mostrarProgresoPreparacion(fraccion, mensaje)
+
+    def _prepararEnSegundoPlano(self, tarea, evento):
+        """
+        Corre en el hilo del ejecutor y sólo usa el evento recibido; el resultado
+        se entrega en el hilo principal, que descarta el de una selección ya reemplazada
+        """
+        if tarea.cancelada:
+            return
+        try:
+            resultado = self.prepararEventoSeleccionado(tarea, evento)
+        except TareaCancelada:
+            _traza.info(">> GESTOR: Preparación de %s cancelada", evento.id_sismo)
+            return
+        except Exception as e:
+            _traza.error(">> GESTOR: ERROR al preparar el evento %s: %s", evento.id_sismo, e)
+            self.pantalla.ejecutarEnHiloPrincipal(self._preparacionFallida, tarea, e)
+            return
+        self.pantalla.ejecutarEnHiloPrincipal(self._preparacionTerminada, tarea, evento, resultado)
+
+    def _preparacionTerminada(self, tarea, evento, resultado):
+        if tarea is not self._tarea or tarea.cancelada or evento is not self.seleccionado:
+            return  # la selección cambió mientras se preparaba
+        self._tarea = None
+        self.pantalla.ocultarProgresoPreparacion()
+        self.aplicarPreparacion(evento, *resultado)
+        self.presentarEventoSeleccionado()
+
+    def _preparacionFallida(self, tarea, error):
+        if tarea is not self._tarea:
+            return
+        self._tarea = None
+        self.pantalla.ocultarProgresoPreparacion()
+        id_sismo = self.seleccionado.id_sismo if self.seleccionado else ""
+        self.cancelarRevision()
+        self.pantalla.informarEventoNoDisponible(f"No se pudo preparar el evento {id_sismo}: {error}")
+
+    def cancelarPreparacion(self):
+        """Cancela la preparación en curso y libera el bloqueo del evento (hilo principal)"""
+        _traza.info(">> GESTOR: cancelarPreparacion()")
+        if self._tarea is not None:
+            self._tarea.cancelar()
+            self._tarea = None
+            self.pantalla.ocultarProgresoPreparacion()
+        self.cancelarRevision()
+
+    def procesarSeriesTemporales(self, evento=None):
         """
         CORRECCIÓN 4: Método intermedio que encadena el procesamiento
         Actúa como enlace en la cadena de procesamiento según el diagrama
         """
-        print(">> GESTOR: procesarSeriesTemporales() - Método intermedio de enlace")
+        _traza.info(">> GESTOR: procesarSeriesTemporales() - Método intermedio de enlace")
         
         # Delegar al método de obtención de valores
-        self.obtenerValoresAlcanzadosDeSeriesTemporales()
+        return self.obtenerValoresAlcanzadosDeSeriesTemporales(evento)
 
     def cambiarEventoSismicoSeleccionadoABloqueadoEnRevision(self):
         """
         Implementa la secuencia completa del diagrama para cambio de estado
         """
-        print(">> GESTOR: cambiarEventoSismicoSeleccionadoABloqueadoEnRevision()")
+        _traza.info(">> GESTOR: cambiarEventoSismicoSeleccionadoABloqueadoEnRevision()")
         
         if not self.seleccionado:
-            return
+            return False
             
-        # Buscar el estado "Bloqueado en Revisión" iterando estados
-        estados_disponibles = [
-            Estado("Auto-Detectado"),
-            Estado("Pendiente de Revisión"), 
-            Estado("Bloqueado en Revisión"),
-            Estado("Confirmado"),
-            Estado("Rechazado")
-        ]
+        # Los estados son instancias canónicas: se obtiene directamente por nombre
+        estado_bloqueado = Estado.obtener("Bloqueado en Revisión")
+        _traza.debug("   -> Encontrado estado: %s", estado_bloqueado.nombre)
         
-        estado_bloqueado = None
-        for estado in estados_disponibles:
-            if estado.nombre == "Bloqueado en Revisión":
-                print(f"   -> Encontrado estado: {estado.nombre}")
-                estado_bloqueado = estado
-                break
-        
-        # Cambiar estado del evento seleccionado
-        self.seleccionado.cambiarEstadoEventoSismicoABloqueadoEnRevision()
+        # El administrador cambia el estado del evento seleccionado sólo si nadie lo
+        # bloqueó antes y sigue pendiente de revisión (compare-and-set)
+        self.concesion = self.administrador_bloqueos.adquirir(
+            self.seleccionado, self, self.obtenerEmpleadoSesion(), self.ESTADOS_PENDIENTES_DE_REVISION
+        )
+        return self.concesion is not None
+
+    def _liberarBloqueo(self, revertir=False):
+        """Libera el bloqueo del evento seleccionado (revirtiendo su estado si se abandona la revisión)"""
+        if self.concesion is not None:
+            self.administrador_bloqueos.liberar(self.concesion, revertir=revertir)
+            self.concesion = None
+
+    def cancelarRevision(self):
+        """El analista abandona la revisión: el evento vuelve al estado previo al bloqueo"""
+        _traza.info(">> GESTOR: cancelarRevision()")
+        self._liberarBloqueo(revertir=True)
+        self.seleccionado = None
+
+    def _bloqueoVencido(self, concesion):
+        """
+        Observador del administrador de bloqueos (se invoca desde su hilo): el
+        evento se revierte en el hilo principal, como los demás cambios de estado
+        """
+        if concesion.titular is self:
+            self.pantalla.ejecutarEnHiloPrincipal(self._vencerBloqueo, concesion)
+
+    def _vencerBloqueo(self, concesion):
+        if concesion is self.concesion:
+            self.concesion = None
+        if self.administrador_bloqueos.vencer(concesion):
+            _traza.warning(">> GESTOR: Venció el bloqueo del evento %s; volvió a '%s'",
+                           concesion.id_sismo, concesion.estado_previo.nombre)
+
+    def _registrarResultado(self, cambiarEstado) -> bool:
+        """
+        Registra el resultado de la revisión con cambiarEstado() sólo si el bloqueo
+        sigue vigente (no venció ni lo tomó otro), en el mismo paso que lo libera
+        """
+        concesion, self.concesion = self.concesion, None
+        if self.administrador_bloqueos.finalizar(concesion, cambiarEstado):
+            return True
+        id_sismo = self.seleccionado.id_sismo
+        self.seleccionado = None
+        self.pantalla.informarEventoNoDisponible(
+            f"El bloqueo del evento {id_sismo} venció; la revisión no se registró."
+        )
+        return False
 
-    def buscarDatosSismicosRegistradosParaElEventoSismicoSeleccionado(self):
+    def buscarDatosSismicosRegistradosParaElEventoSismicoSeleccionado(self, evento=None):
         """
         Obtiene los datos sísmicos del evento seleccionado
         """
-        print(">> GESTOR: buscarDatosSismicosRegistradosParaElEventoSismicoSeleccionado()")
+        _traza.info(">> GESTOR: buscarDatosSismicosRegistradosParaElEventoSismicoSeleccionado()")
         
-        if not self.seleccionado:
+        evento = evento if evento is not None else self.seleccionado
+        if not evento:
             return
             
-        self.seleccionado.getDatosSismicosRegistradosParaEventoSismicoSeleccionado()
+        evento.getDatosSismicosRegistradosParaEventoSismicoSeleccionado()
 
-    def obtenerValoresAlcanzadosDeSeriesTemporales(self):
+    def obtenerValoresAlcanzadosDeSeriesTemporales(self, evento=None):
         """
-        Implementa los loops anidados según el diagrama
-        Loop para series temporales -> Loop para muestras -> Loop para detalles
+        Según el diagrama: Loop para series temporales -> Loop para muestras -> Loop para detalles.
+        Los valores alcanzados de cada serie (pico y su instante, RMS, media, duración y
+        cantidad de muestras por tipo de dato) se calculan sobre sus columnas en una
+        pasada vectorial (SerieTemporal.getResumen) y quedan guardados en la serie.
+        Devuelve (resúmenes de las series, clasificación por estación) sin asignarlos.
         """
-        print(">> GESTOR: obtenerValoresAlcanzadosDeSeriesTemporales()")
+        _traza.info(">> GESTOR: obtenerValoresAlcanzadosDeSeriesTemporales()")
+        evento = evento if evento is not None else self.seleccionado
+        resumenes_series = []
         
-        if not self.seleccionado or not self.seleccionado.series_temporales:
-            print(">> GESTOR: No hay series temporales para procesar")
-            return
+        if not evento or not evento.series_temporales:
+            _traza.info(">> GESTOR: No hay series temporales para procesar")
+            return resumenes_series, {}
             
         # Obtener datos sísmicos registrados
-        self.seleccionado.getDatosSismicosRegistradosParaEventoSismicoSeleccionado()
+        evento.getDatosSismicosRegistradosParaEventoSismicoSeleccionado()
         
         # ============= LOOP PARA TODAS LAS SERIES TEMPORALES =============
-        print(">> GESTOR: Iniciando Loop para todas las series temporales")
+        _traza.info(">> GESTOR: Iniciando Loop para todas las series temporales")
         
-        for indice_serie, serie_temporal in enumerate(self.seleccionado.series_temporales):
-            print(f">> GESTOR: Procesando serie temporal #{indice_serie + 1}")
-            
-            self.seleccionado.getValoresAlcanzadosPorCadaInstanteDeTiempo()
-            
-            datos_serie = serie_temporal.getDatos()
-            print(f"   -> Serie con {datos_serie['cantidad_muestras']} muestras")
+        cantidad_series = len(evento.series_temporales)
+        for indice_serie, serie_temporal in enumerate(evento.series_temporales):
+            if self._tarea_en_curso is not None:
+                self._tarea_en_curso.verificarCancelacion()
+            self._informarProgreso(
+                0.4 + 0.5 * indice_serie / cantidad_series,
+                f"Procesando serie temporal {indice_serie + 1} de {cantidad_series}"
+            )
             
-            # ========= LOOP PARA TODAS LAS MUESTRAS SÍSMICAS =========
-            print("   >> GESTOR: Iniciando Loop para todas las muestras sísmicas")
+            evento.getValoresAlcanzadosPorCadaInstanteDeTiempo()
             
-            for indice_muestra, muestra_sismica in enumerate(serie_temporal.muestras):
-                print(f"      -> Procesando muestra sísmica #{indice_muestra + 1}")
-                
-                datos_muestra = muestra_sismica.getDatos()
-                print(f"         Muestra con {datos_muestra['cantidad_detalles']} detalles")
-                
-                # ======= LOOP PARA TODOS LOS DETALLES DE LA MUESTRA =======
-                print("         >> GESTOR: Iniciando Loop para todos los detalles")
-                
-                for indice_detalle, detalle_muestra in enumerate(muestra_sismica.detalles):
-                    print(f"            -> Procesando detalle #{indice_detalle + 1}")
-                    
-                    datos_detalle = detalle_muestra.getDatos()
-                    
-                    tipo_dato = detalle_muestra.getTipoDeDato()
-                    es_velocidad = tipo_dato.esVelocidadDeOnda()
-                    es_frecuencia = tipo_dato.esFrecuenciaDeOnda()
-                    es_longitud = tipo_dato.esLongitud()
-                    denominacion = tipo_dato.getDenominacion()
-                    
-                    print(f"               Tipo: {denominacion}, Valor: {datos_detalle['valor']}")
-                    print(f"               ¿Es velocidad?: {es_velocidad}")
-                    print(f"               ¿Es frecuencia?: {es_frecuencia}")
-                    print(f"               ¿Es longitud?: {es_longitud}")
-            
-            es_de_estacion = self.seleccionado.esDeEstacionSismologica()
-            print(f"   -> ¿Es de estación sismológica?: {es_de_estacion}")
+            # Muestras y detalles: una pasada sobre las columnas por tipo de dato
+            resumen = serie_temporal.getResumen()
+            resumenes_series.append(resumen)
+            _traza.debug("   -> Serie temporal #%s: %s muestras", indice_serie + 1, serie_temporal.cantidadMuestras())
+            for tipo, valores in resumen.items():
+                _traza.debug("      %s: pico %.4g en %s, RMS %.4g, media %.4g, %.1f s, %s muestras",
+                             tipo, valores["pico"], valores["instante_pico"], valores["rms"],
+                             valores["media"], valores["duracion_s"], valores["cantidad"])
+        
+        es_de_estacion = evento.esDeEstacionSismologica()
+        _traza.debug("   -> ¿Es de estación sismológica?: %s", es_de_estacion)
         
         # ============= FUERA DEL LOOP DE LAS SERIES TEMPORALES =============
-        print(">> GESTOR: Finalizando procesamiento de series temporales")
+        _traza.info(">> GESTOR: Finalizando procesamiento de series temporales")
         
         # Clasificar muestras por estación
-        self.clasificarMuestrasPorEstacionSismologica()
-        
-        # Llamar al caso de uso de generación de sismograma
-        self.llamarAlCasoDeUsoGenerarSismograma()
-        
-        # Habilitar opción de visualización de mapa
-        self.pantalla.habilitarOpcionVisualizacionMapaConEstacionesSismologicasInvolucradas()
+        self._informarProgreso(0.9, "Clasificando muestras por estación")
+        clasificacion_estaciones = self.clasificarMuestrasPorEstacionSismologica(evento)
 
-    def clasificarMuestrasPorEstacionSismologica(self):
+        # La generación del sismograma y la habilitación del mapa usan la interfaz:
+        # las hace presentarEventoSeleccionado() en el hilo principal
+        return resumenes_series, clasificacion_estaciones
+
+    def obtenerValoresAlcanzados(self):
+        """
+        Valores alcanzados del evento seleccionado para la pantalla de detalle:
+        (código de estación, tipo de dato, resumen) por serie y tipo de dato.
+        """
+        estacion_de_serie = {
+            indice: codigo
+            for codigo, datos in self.clasificacion_estaciones.items()
+            for indice in datos['serie_indices']
+        }
+        return [
+            (estacion_de_serie.get(indice, f"Serie {indice + 1}"), tipo, valores)
+            for indice, resumen in enumerate(self.resumenes_series)
+            for tipo, valores in resumen.items()
+        ]
+
+    def clasificarMuestrasPorEstacionSismologica(self, evento=None):
         """
         CORRECCIÓN 5: Implementación completa de clasificación por estación
         Agrupa las muestras sísmicas según la estación que las registró
+        (devuelve la clasificación; la asigna aplicarPreparacion())
         """
-        print(">> GESTOR: clasificarMuestrasPorEstacionSismologica()")
+        _traza.info(">> GESTOR: clasificarMuestrasPorEstacionSismologica()")
         
-        if not self.seleccionado or not self.seleccionado.series_temporales:
-            print("   -> No hay series temporales para clasificar")
+        evento = evento if evento is not None else self.seleccionado
+        if not evento or not evento.series_temporales:
+            _traza.debug("   -> No hay series temporales para clasificar")
             return {}
         
         clasificacion_por_estacion = {}
+        estaciones = self.estacionesCercanasAlEpicentro(len(evento.series_temporales), evento)
         
         # Procesar cada serie temporal
-        for indice_serie, serie in enumerate(self.seleccionado.series_temporales):
+        for indice_serie, serie in enumerate(evento.series_temporales):
             # Obtener código de estación para esta serie
-            codigo_estacion = self._obtenerCodigoEstacion(serie, indice_serie)
+            codigo_estacion = self._obtenerCodigoEstacion(serie, indice_serie, estaciones)
             
             if codigo_estacion not in clasificacion_por_estacion:
                 clasificacion_por_estacion[codigo_estacion] = {
                     'serie_indices': [],
-                    'muestras': [],
+                    'series': [],
                     'total_muestras': 0
                 }
             
+            # Las muestras quedan en la serie en modo columnar; sólo se agrupan referencias
             clasificacion_por_estacion[codigo_estacion]['serie_indices'].append(indice_serie)
-            
-            # Clasificar las muestras de esta serie
-            for muestra in serie.muestras:
-                muestra_info = {
-                    'fecha_hora': muestra.fecha_hora_muestra,
-                    'cantidad_detalles': len(muestra.detalles),
-                    'detalles': []
-                }
-                
-                # Procesar detalles de la muestra
-                for detalle in muestra.detalles:
-                    muestra_info['detalles'].append({
-                        'tipo': detalle.tipo_dato,
-                        'valor': detalle.valor
-                    })
-                
-                clasificacion_por_estacion[codigo_estacion]['muestras'].append(muestra_info)
-                clasificacion_por_estacion[codigo_estacion]['total_muestras'] += 1
+            clasificacion_por_estacion[codigo_estacion]['series'].append(serie)
+            clasificacion_por_estacion[codigo_estacion]['total_muestras'] += serie.cantidadMuestras()
         
         # Mostrar resumen de clasificación
-        print(f"   -> Muestras clasificadas en {len(clasificacion_por_estacion)} estación(es):")
+        _traza.debug("   -> Muestras clasificadas en %s estación(es):", len(clasificacion_por_estacion))
         for estacion, datos in clasificacion_por_estacion.items():
-            print(f"      Estación {estacion}: {datos['total_muestras']} muestras en {len(datos['serie_indices'])} serie(s)")
+            _traza.debug("      Estación %s: %s muestras en %s serie(s)", estacion, datos['total_muestras'], len(datos['serie_indices']))
         
-        self.clasificacion_estaciones = clasificacion_por_estacion
         return clasificacion_por_estacion
 
-    def _obtenerCodigoEstacion(self, serie, indice):
+    def _obtenerCodigoEstacion(self, serie, indice, estaciones):
         """
         Método auxiliar para obtener el código de estación de una serie
-        En un sistema real, esto vendría de la serie temporal
+        Si la serie lo trae (por ejemplo, las de eventos detectados) se usa ese; como
+        las series del catálogo no lo traen, se asignan en orden a las estaciones más
+        cercanas al epicentro
         """
-        # Simular diferentes estaciones para diferentes series
-        estaciones_disponibles = ["CBA-01", "CBA-02", "CBA-03", "MDZ-01", "SJN-01"]
-        return estaciones_disponibles[indice % len(estaciones_disponibles)]
-        
+        if serie.codigo_estacion is not None:
+            return serie.codigo_estacion
+        if not estaciones:
+            return f"Serie {indice + 1}"
+        return estaciones[indice % len(estaciones)][1].getCodigoEstacion()
+
+    def estacionesCercanasAlEpicentro(self, cantidad, evento=None):
+        """Las 'cantidad' estaciones más cercanas al epicentro del evento (por defecto, el seleccionado), como (distancia_km, estación)"""
+        evento = evento if evento is not None else self.seleccionado
+        if evento is None:
+            return []
+        latitud, longitud = evento.latitudEpicentro, evento.longitudEpicentro
+        if latitud is None or longitud is None:
+            # Sin epicentro no hay distancias: las estaciones se toman en el orden del registro
+            return [(None, estacion) for estacion in list(self.registro_estaciones)[:cantidad]]
+        return self.registro_estaciones.estacionesMasCercanas(latitud, longitud, cantidad)
+
+    def estacionesEnRadioDelEpicentro(self, radio_km):
+        """Estaciones a no más de 'radio_km' del epicentro del evento seleccionado, como (distancia_km, estación)"""
+        if self.seleccionado is None or self.seleccionado.latitudEpicentro is None \
+                or self.seleccionado.longitudEpicentro is None:
+            return []
+        return self.registro_estaciones.estacionesEnRadio(
+            self.seleccionado.latitudEpicentro, self.seleccionado.longitudEpicentro, radio_km
+        )
+
+    def obtenerEstacionesInvolucradas(self):
+        """Estaciones que registraron las series del evento seleccionado, como (distancia_km, estación), por distancia"""
+        cercanas = {estacion.codigo: distancia for distancia, estacion in
+                    self.estacionesCercanasAlEpicentro(len(self.registro_estaciones))}
+        involucradas = [
+            (cercanas.get(codigo), self.registro_estaciones.obtener(codigo))
+            for codigo in self.clasificacion_estaciones if codigo in self.registro_estaciones
+        ]
+        return sorted(involucradas, key=lambda par: (par[0] is None, par[0] or 0.0))
+
+    # === ÍNDICE DE EPICENTROS ===
+
+    def indiceEpicentros(self):
+        """IndiceEspacial de los epicentros del catálogo (id_sismo -> latitud, longitud)"""
+        if self._indice_epicentros is None:
+            indice = IndiceEspacial(self.TAMANO_CELDA_EPICENTROS_GRADOS)
+            if self.base_datos is not None:
+                epicentros = self.base_datos.epicentros()
+            else:
+                epicentros = [
+                    (evento.id_sismo, evento.latitudEpicentro, evento.longitudEpicentro)
+                    for evento in self.eventos_sismicos_en_memoria
+                    if evento.latitudEpicentro is not None and evento.longitudEpicentro is not None
+                ]
+            for id_sismo, latitud, longitud in epicentros:
+                indice.agregar(id_sismo, latitud, longitud)
+            self._indice_epicentros = indice
+        return self._indice_epicentros
+
+    def buscarEventosCercanos(self, latitud, longitud, radio_km):
+        """Pares (distancia_km, id_sismo) de los eventos con epicentro a no más de 'radio_km' del punto"""
+        return self.indiceEpicentros().dentroDeRadio(latitud, longitud, radio_km)
+
+    def buscarEventosMasCercanos(self, latitud, longitud, cantidad):
+        """Los 'cantidad' pares (distancia_km, id_sismo) de los epicentros más cercanos al punto"""
+        return self.indiceEpicentros().masCercanos(latitud, longitud, cantidad)
+
+    def _seriesPorEstacion(self, clasificacion=None):
+        """Series a graficar por estación (una fila del sismograma por código), o None sin clasificar"""
+        clasificacion = clasificacion if clasificacion is not None else self.clasificacion_estaciones
+        if not clasificacion:
+            return None
+        return {codigo: datos['series'] for codigo, datos in clasificacion.items()}
+
     def llamarAlCasoDeUsoGenerarSismograma(self):
         """
         Invoca el Caso de Uso 18: Generar Sismograma
         """
-        print(">> GESTOR: llamarAlCasoDeUsoGenerarSismograma()")
+        _traza.info(">> GESTOR: llamarAlCasoDeUsoGenerarSismograma()")
         if self.seleccionado:
-            SismogramaGenerator.generar_y_mostrar(self.seleccionado)
+            SismogramaGenerator.generar_y_mostrar(
+                self.seleccionado, self.cache_sismogramas, self._seriesPorEstacion()
+            )
 
     def solicitarConfirmacionDeRevision(self):
         """Solicita al usuario confirmar, rechazar o derivar el evento"""
-        print(">> GESTOR: solicitarConfirmacionDeRevision()")
+        _traza.info(">> GESTOR: solicitarConfirmacionDeRevision()")
         self.pantalla.solicitarConfirmarRechazarRevisarEvento()
 
     def tomarSeleccionConfirmacion(self):
         """
         Procesa la confirmación del evento sísmico
         """
-        print("\n>> GESTOR: tomarSeleccionConfirmacion()")
+        _traza.info("\n>> GESTOR: tomarSeleccionConfirmacion()")
         
-        if self.validarDatosEvento():
-            self.cambiarEventoSismicoAConfirmado()
+        if self.validarDatosEvento() and self._registrarResultado(self.cambiarEventoSismicoAConfirmado):
             self.finCU()
     
     def tomarSeleccionRechazo(self):
         """
         Procesa el rechazo del evento sísmico
         """
-        print("\n>> GESTOR: tomarSeleccionRechazo()")
+        _traza.info("\n>> GESTOR: tomarSeleccionRechazo()")
         
-        if self.validarDatosEvento():
-            self.cambiarEventoSismicoSeleccionadoARechazado()
+        if self.validarDatosEvento() and self._registrarResultado(self.cambiarEventoSismicoSeleccionadoARechazado):
             self.finCU()
     
     def tomarSeleccionDerivacion(self):
         """Procesa la derivación del evento a un experto"""
-        print("\n>> GESTOR: tomarSeleccionDerivacion()")
+        _traza.info("\n>> GESTOR: tomarSeleccionDerivacion()")
         
-        if self.validarDatosEvento():
-            self.cambiarEventoSismicoAPendienteRevisionExperto()
+        if self.validarDatosEvento() and self._registrarResultado(self.cambiarEventoSismicoAPendienteRevisionExperto):
             self.registrarDerivacionAExperto()
             self.finCU()
         
@@ -353,8 +992,8 @@ class GestorRegistroResultadoRevisionManual:
         if not self.seleccionado: 
             return False
             
-        print(">> GESTOR: validarDatosEvento()")
-        
+        _traza.info(">> GESTOR: validarDatosEvento()")
+
         # Validar datos sísmicos
         self.seleccionado.validarDatosSismo()
         
@@ -367,27 +1006,27 @@ class GestorRegistroResultadoRevisionManual:
         """
         Valida la selección y registra información de auditoría
         """
-        print(">> GESTOR: validarSeleccionConfirmacion()")
+        _traza.info(">> GESTOR: validarSeleccionConfirmacion()")
         
         fecha_hora = self.obtenerFechaHoraActual()
         empleado = self.obtenerEmpleadoSesion()
         
-        print(f"   -> Acción registrada: {fecha_hora} por {empleado}")
+        _traza.debug("   -> Acción registrada: %s por %s", fecha_hora, empleado)
 
     def obtenerFechaHoraActual(self):
         """Obtiene la fecha y hora actual del sistema"""
         fecha_hora = datetime.now()
-        print(f">> GESTOR: obtenerFechaHoraActual() = {fecha_hora}")
+        _traza.info(">> GESTOR: obtenerFechaHoraActual() = %s", fecha_hora)
         return fecha_hora
 
     def obtenerEmpleadoSesion(self):
         """
         Obtiene el empleado de la sesión actual
         """
-        print(">> GESTOR: obtenerEmpleadoSesion()")
+        _traza.info(">> GESTOR: obtenerEmpleadoSesion()")
         sesion_actual = Sesion()
         empleado = sesion_actual.getEmpleado()
-        print(f">> GESTOR: Empleado en sesión: {empleado}")
+        _traza.info(">> GESTOR: Empleado en sesión: %s", empleado)
         return empleado
 
     def cambiarEventoSismicoSeleccionadoARechazado(self):
@@ -395,33 +1034,47 @@ class GestorRegistroResultadoRevisionManual:
         Cambia el estado del evento seleccionado a Rechazado
         """
         if self.seleccionado:
-            print(f">> GESTOR: cambiarEventoSismicoSeleccionadoARechazado()")
+            _traza.info(">> GESTOR: cambiarEventoSismicoSeleccionadoARechazado()")
             self.seleccionado.cambiarEventoSismicoSeleccionadoARechazado()
     
     def cambiarEventoSismicoAConfirmado(self):
         """Cambia el estado del evento seleccionado a Confirmado"""
         if self.seleccionado:
-            print(f">> GESTOR: cambiarEventoSismicoAConfirmado()")
+            _traza.info(">> GESTOR: cambiarEventoSismicoAConfirmado()")
             self.seleccionado.cambiarEventoSismicoAConfirmado()
     
     def cambiarEventoSismicoAPendienteRevisionExperto(self):
         """Cambia el estado del evento a Pendiente de Revisión Experto"""
         if self.seleccionado:
-            print(f">> GESTOR: cambiarEventoSismicoAPendienteRevisionExperto()")
+            _traza.info(">> GESTOR: cambiarEventoSismicoAPendienteRevisionExperto()")
             self.seleccionado.cambiarEstadoEventoSismico("Pendiente de Revisión Experto")
     
     def registrarDerivacionAExperto(self):
         """Registra la derivación del evento a un experto"""
         fecha_hora = self.obtenerFechaHoraActual()
         empleado = self.obtenerEmpleadoSesion()
-        print(f"   -> Derivación registrada: {fecha_hora} por {empleado}")
+        _traza.debug("   -> Derivación registrada: %s por %s", fecha_hora, empleado)
+
+    def cerrar(self):
+        """Libera la base de datos o confirma el diario de estados (al salir de la aplicación)"""
+        if self._tarea is not None:
+            self._tarea.cancelar()
+            self._tarea = None
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown(wait=True)
+        self._liberarBloqueo(revertir=True)
+        self.administrador_bloqueos.quitarObservador(self._bloqueoVencido)
+        if self.base_datos is not None:
+            self.base_datos.cerrar()
+        if self.diario is not None:
+            self.diario.cerrar()
 
     def finCU(self):
         """
         Finaliza el Caso de Uso actual
         """
-        print("\n>> GESTOR: finCU() - Fin del Caso de Uso")
-        print(">> GESTOR: El evento ha sido procesado exitosamente.")
+        _traza.info("\n>> GESTOR: finCU() - Fin del Caso de Uso")
+        _traza.info(">> GESTOR: El evento ha sido procesado exitosamente.")
         
         # Notificar a la pantalla que el CU ha finalizado
         self.pantalla.finCU()
\ No newline at end of file
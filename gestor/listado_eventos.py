@@ -0,0 +1,155 @@
+# gestor/listado_eventos.py
+
+from bisect import bisect_left, insort
+from operator import itemgetter
+
+# Columnas de cada fila del listado
+COLUMNAS = ("id_sismo", "fecha", "magnitud", "estado")
+# Columnas que siempre tienen valor
+COLUMNAS_OBLIGATORIAS = ("id_sismo", "fecha", "estado")
+
+
+def fila_de_evento(evento):
+    """Fila liviana (id_sismo, fecha ISO, magnitud, nombre del estado) de un EventoSismico"""
+    return (
+        evento.id_sismo,
+        evento.fechaHoraOcurrencia.isoformat(timespec="microseconds"),
+        evento.valorMagnitud,
+        evento.estadoActual.actual.nombre,
+    )
+
+
+class ListadoEventos:
+    """
+    Resultado de una búsqueda de eventos, como filas livianas
+    (id_sismo, fecha ISO, magnitud, nombre del estado) ordenadas por una columna.
+
+    La pantalla no recibe los EventoSismico: pide sólo las filas que muestra
+    (filas(desde, hasta)) y el evento se materializa recién al seleccionarlo.
+    El orden es total (a igual valor en la columna decide el id_sismo), así que
+    la posición de una fila se encuentra por búsqueda binaria: posicionDe(),
+    insertar() y quitar() no recorren el listado. La búsqueda por prefijo de id
+    usa un índice de ids ordenados (bisect); ese índice y el de id -> fila se
+    arman en la primera consulta y después se mantienen al insertar y quitar.
+    """
+
+    def __init__(self, filas, columna="fecha", descendente=True, ya_ordenadas=False):
+        """'ya_ordenadas' indica que las filas vienen en el orden pedido (por ejemplo, de un índice SQL)"""
+        self._filas = list(filas)
+        self.columna = columna
+        self.descendente = descendente
+        self._clave = self._clave_de(columna, descendente)
+        self._ids = None            # [(id en minúsculas, id)] ordenados, para buscar por prefijo
+        self._por_id = None         # id_sismo -> fila
+        if not ya_ordenadas:
+            self._ordenar()
+
+    # === ORDEN ===
+
+    @staticmethod
+    def _clave_de(columna, descendente):
+        indice = COLUMNAS.index(columna)
+        if indice == 0:
+            return itemgetter(0)
+        if columna in COLUMNAS_OBLIGATORIAS:
+            return itemgetter(indice, 0)
+        # Las filas sin valor en la columna quedan al final en ambos sentidos
+        if descendente:
+            return lambda fila: (fila[indice] is not None, fila[indice], fila[0])
+        return lambda fila: (fila[indice] is None, fila[indice], fila[0])
+
+    def _ordenar(self):
+        self._clave = self._clave_de(self.columna, self.descendente)
+        self._filas.sort(key=self._clave, reverse=self.descendente)
+
+    def ordenar(self, columna, descendente=None):
+        """
+        Ordena por la columna. Sin 'descendente', una columna nueva se ordena
+        en forma ascendente y la vigente invierte su sentido.
+        """
+        if descendente is None:
+            descendente = not self.descendente if columna == self.columna else False
+        self.columna = columna
+        self.descendente = descendente
+        self._ordenar()
+
+    def _posicion_para(self, fila):
+        """Posición de 'fila' en el orden vigente (donde está o donde iría), por búsqueda binaria"""
+        clave = self._clave
+        buscada = clave(fila)
+        desde, hasta = 0, len(self._filas)
+        while desde < hasta:
+            medio = (desde + hasta) // 2
+            actual = clave(self._filas[medio])
+            if (actual > buscada) if self.descendente else (actual < buscada):
+                desde = medio + 1
+            else:
+                hasta = medio
+        return desde
+
+    # === CONSULTA ===
+
+    def __len__(self):
+        return len(self._filas)
+
+    def __iter__(self):
+        return iter(self._filas)
+
+    def __contains__(self, id_sismo):
+        return id_sismo in self._indice_por_id()
+
+    def filas(self, desde, hasta):
+        """Filas en las posiciones [desde, hasta) del orden vigente"""
+        return self._filas[max(desde, 0):hasta]
+
+    def fila(self, posicion):
+        return self._filas[posicion]
+
+    def _indice_por_id(self):
+        if self._por_id is None:
+            self._por_id = {fila[0]: fila for fila in self._filas}
+        return self._por_id
+
+    def posicionDe(self, id_sismo):
+        """Posición del evento en el orden vigente, o None si no está en el listado"""
+        fila = self._indice_por_id().get(id_sismo)
+        return None if fila is None else self._posicion_para(fila)
+
+    def buscarPorPrefijo(self, prefijo):
+        """
+        Posición del primer id (en orden alfabético, sin distinguir mayúsculas)
+        que empieza con 'prefijo', o None si ninguno coincide.
+        """
+        if self._ids is None:
+            self._ids = sorted((fila[0].casefold(), fila[0]) for fila in self._filas)
+        prefijo = prefijo.casefold()
+        indice = bisect_left(self._ids, (prefijo,))
+        if indice == len(self._ids) or not self._ids[indice][0].startswith(prefijo):
+            return None
+        return self.posicionDe(self._ids[indice][1])
+
+    # === MODIFICACIÓN ===
+
+    def insertar(self, fila):
+        """
+        Agrega la fila en su lugar del orden vigente (reemplaza a la del mismo
+        id_sismo, si la había). Devuelve su posición.
+        """
+        self.quitar(fila[0])
+        posicion = self._posicion_para(fila)
+        self._filas.insert(posicion, fila)
+        self._indice_por_id()[fila[0]] = fila
+        if self._ids is not None:
+            insort(self._ids, (fila[0].casefold(), fila[0]))
+        return posicion
+
+    def quitar(self, id_sismo):
+        """Quita la fila del evento; devuelve la posición que ocupaba, o None si no estaba"""
+        fila = self._indice_por_id().pop(id_sismo, None)
+        if fila is None:
+            return None
+        posicion = self._posicion_para(fila)
+        del self._filas[posicion]
+        if self._ids is not None:
+            del self._ids[bisect_left(self._ids, (id_sismo.casefold(), id_sismo))]
+        return posicion
@@ -0,0 +1,46 @@
+# gestor/tarea_segundo_plano.py
+
+import threading
+
+
+class TareaCancelada(Exception):
+    """Se cancela la tarea en curso; la lanza verificarCancelacion() en el hilo que la ejecuta"""
+
+
+class TareaSegundoPlano:
+    """
+    Estado compartido entre quien lanza un trabajo en otro hilo y ese hilo:
+    pedido de cancelación y avance (fracción entre 0 y 1 con un mensaje).
+    El trabajo consulta verificarCancelacion() entre pasos; el avance se
+    entrega al invocable 'al_progresar', desde el hilo del trabajo.
+    """
+
+    def __init__(self, descripcion, al_progresar=None):
+        self.descripcion = descripcion
+        self._al_progresar = al_progresar
+        self._cancelada = threading.Event()
+        self.fraccion = 0.0
+        self.mensaje = ""
+
+    def alProgresar(self, al_progresar):
+        """Reemplaza el invocable que recibe el avance"""
+        self._al_progresar = al_progresar
+
+    def cancelar(self):
+        self._cancelada.set()
+
+    @property
+    def cancelada(self) -> bool:
+        return self._cancelada.is_set()
+
+    def verificarCancelacion(self):
+        if self._cancelada.is_set():
+            raise TareaCancelada(self.descripcion)
+
+    def informarProgreso(self, fraccion, mensaje=""):
+        """Registra el avance y verifica la cancelación (cada paso es un punto de corte)"""
+        self.verificarCancelacion()
+        self.fraccion = fraccion
+        self.mensaje = mensaje
+        if self._al_progresar is not None:
+            self._al_progresar(fraccion, mensaje)
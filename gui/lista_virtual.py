@@ -0,0 +1,217 @@
+# gui/lista_virtual.py
+
+import time
+from tkinter import ttk
+
+
+class ListaVirtual(ttk.Frame):
+    """
+    Lista con columnas sobre una fuente paginable (por ejemplo ListadoEventos):
+    len(fuente), fuente.filas(desde, hasta), fuente.ordenar(columna),
+    fuente.posicionDe(id) y fuente.buscarPorPrefijo(texto). Si la fuente
+    cambia (filas agregadas o quitadas), basta con llamar a refrescar().
+
+    El Treeview sólo contiene tantos ítems como filas entran en pantalla; al
+    desplazarse se reescriben sus valores con la ventana de filas visible, de
+    modo que mostrar la lista cuesta lo mismo con diez eventos que con cien mil.
+    La selección se recuerda por id (la primera columna de cada fila), así que
+    sobrevive al desplazamiento y al reordenamiento; si su fila sale de la
+    fuente, la lista queda sin selección.
+
+    - Clic en un encabezado: ordena por esa columna (otro clic invierte el sentido).
+    - Escribir sobre la lista: salta al primer id que empieza con lo escrito.
+    - Al cambiar la selección se genera el evento virtual <<SeleccionVirtual>>.
+    """
+
+    ALTO_FILA_PX = 20
+    ALTO_ENCABEZADO_PX = 24
+    PAUSA_BUSQUEDA_S = 1.0    # tras esta pausa, lo que se escribe inicia una búsqueda nueva
+    FILAS_POR_RUEDA = 3
+
+    def __init__(self, master, columnas, formatear=None, **opciones):
+        """
+        'columnas' son pares (clave en la fuente, título). 'formatear' convierte
+        una fila de la fuente en los valores que se muestran.
+        """
+        super().__init__(master, **opciones)
+        self._columnas = list(columnas)
+        self._formatear = formatear or (lambda fila: fila)
+        self._fuente = None
+        self._inicio = 0
+        self._capacidad = 1
+        self._items = []
+        self._ids_visibles = []
+        self._seleccionado = None
+        self._busqueda = ""
+        self._ultima_tecla = 0.0
+
+        claves = [clave for clave, _ in self._columnas]
+        self.tree = ttk.Treeview(self, columns=claves, show="headings", selectmode="browse", height=1)
+        for clave, titulo in self._columnas:
+            self.tree.heading(clave, text=titulo, command=lambda c=clave: self.ordenarPor(c))
+        self.barra = ttk.Scrollbar(self, orient="vertical", command=self._desplazar)
+        self.tree.grid(row=0, column=0, sticky="new")
+        self.barra.grid(row=0, column=1, sticky="ns")
+        self.grid_rowconfigure(0, weight=1)
+        self.grid_columnconfigure(0, weight=1)
+        # El tamaño lo decide quien contiene la lista; de él sale cuántas filas se muestran
+        self.grid_propagate(False)
+
+        self.bind("<Configure>", self._al_redimensionar)
+        self.tree.bind("<<TreeviewSelect>>", self._al_seleccionar)
+        self.tree.bind("<MouseWheel>", self._al_girar_rueda)
+        self.tree.bind("<Button-4>", lambda e: self._desplazar("scroll", -self.FILAS_POR_RUEDA, "units"))
+        self.tree.bind("<Button-5>", lambda e: self._desplazar("scroll", self.FILAS_POR_RUEDA, "units"))
+        for tecla, paso in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "-pagina"), ("<Next>", "+pagina"),
+                            ("<Home>", "inicio"), ("<End>", "fin")):
+            self.tree.bind(tecla, lambda e, p=paso: self._mover_seleccion(p))
+        self.tree.bind("<Key>", self._al_escribir)
+
+    # === FUENTE Y SELECCIÓN ===
+
+    def mostrar(self, fuente):
+        """Muestra una fuente nueva desde el principio, sin selección"""
+        self._fuente = fuente
+        self._inicio = 0
+        self._seleccionado = None
+        self._actualizar_encabezados()
+        self.refrescar()
+
+    def idSeleccionado(self):
+        return self._seleccionado
+
+    def ordenarPor(self, columna):
+        if self._fuente is None:
+            return
+        self._fuente.ordenar(columna)
+        self._actualizar_encabezados()
+        # Se conserva a la vista la fila seleccionada, si la hay
+        posicion = self._posicion_seleccionada()
+        self._inicio = 0 if posicion is None else posicion - self._capacidad // 2
+        self.refrescar()
+
+    def seleccionarPosicion(self, posicion):
+        """Selecciona la fila en esa posición de la fuente y la lleva a la vista"""
+        if self._fuente is None or len(self._fuente) == 0:
+            return
+        posicion = min(max(posicion, 0), len(self._fuente) - 1)
+        fila = self._fuente.fila(posicion)
+        if posicion < self._inicio:
+            self._inicio = posicion
+        elif posicion >= self._inicio + self._capacidad:
+            self._inicio = posicion - self._capacidad + 1
+        self._cambiar_seleccion(fila[0])
+        self.refrescar()
+
+    def _posicion_seleccionada(self):
+        if self._seleccionado is None or self._fuente is None:
+            return None
+        return self._fuente.posicionDe(self._seleccionado)
+
+    def _cambiar_seleccion(self, id_fila):
+        if id_fila != self._seleccionado:
+            self._seleccionado = id_fila
+            self.event_generate("<<SeleccionVirtual>>")
+
+    def _al_seleccionar(self, evento):
+        # Cuando la fila seleccionada sale de la vista el Treeview queda sin selección:
+        # la selección de la lista se mantiene
+        seleccion = self.tree.selection()
+        if seleccion:
+            self._cambiar_seleccion(self._ids_visibles[self._items.index(seleccion[0])])
+
+    # === VENTANA VISIBLE ===
+
+    def refrescar(self):
+        """Vuelve a leer de la fuente las filas visibles (tras desplazar, ordenar o modificar la fuente)"""
+        total = len(self._fuente) if self._fuente is not None else 0
+        if self._seleccionado is not None and self._posicion_seleccionada() is None:
+            self._cambiar_seleccion(None)    # la fila seleccionada ya no está en la fuente
+        self._inicio = min(max(self._inicio, 0), max(total - self._capacidad, 0))
+        filas = self._fuente.filas(self._inicio, self._inicio + self._capacidad) if total else []
+
+        # Se reutilizan los ítems del Treeview; sólo se crean o borran los que sobran o faltan
+        while len(self._items) < len(filas):
+            self._items.append(self.tree.insert("", "end"))
+        while len(self._items) > len(filas):
+            self.tree.delete(self._items.pop())
+        for item, fila in zip(self._items, filas):
+            self.tree.item(item, values=self._formatear(fila))
+        self._ids_visibles = [fila[0] for fila in filas]
+
+        if self._seleccionado in self._ids_visibles:
+            item = self._items[self._ids_visibles.index(self._seleccionado)]
+            if self.tree.selection() != (item,):
+                self.tree.selection_set(item)
+            self.tree.focus(item)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+
+        if total:
+            self.barra.set(self._inicio / total, (self._inicio + len(filas)) / total)
+        else:
+            self.barra.set(0.0, 1.0)
+
+    def _al_redimensionar(self, evento):
+        capacidad = max((evento.height - self.ALTO_ENCABEZADO_PX) // self.ALTO_FILA_PX, 1)
+        if capacidad != self._capacidad:
+            self._capacidad = capacidad
+            self.tree.configure(height=capacidad)
+            self.refrescar()
+
+    def _desplazar(self, accion, cantidad, unidad=None):
+        """Comando de la barra de desplazamiento: ('moveto', fracción) o ('scroll', n, 'units'|'pages')"""
+        if self._fuente is None:
+            return
+        if accion == "moveto":
+            self._inicio = int(float(cantidad) * len(self._fuente))
+        else:
+            paso = self._capacidad if unidad == "pages" else 1
+            self._inicio += int(cantidad) * paso
+        self.refrescar()
+
+    def _al_girar_rueda(self, evento):
+        self._desplazar("scroll", -self.FILAS_POR_RUEDA if evento.delta > 0 else self.FILAS_POR_RUEDA, "units")
+
+    def _actualizar_encabezados(self):
+        for clave, titulo in self._columnas:
+            if self._fuente is not None and clave == self._fuente.columna:
+                titulo += " ▼" if self._fuente.descendente else " ▲"
+            self.tree.heading(clave, text=titulo)
+
+    # === TECLADO ===
+
+    def _mover_seleccion(self, paso):
+        if self._fuente is None or len(self._fuente) == 0:
+            return "break"
+        posicion = self._posicion_seleccionada()
+        if paso == "inicio":
+            destino = 0
+        elif paso == "fin":
+            destino = len(self._fuente) - 1
+        elif posicion is None:
+            destino = self._inicio    # sin selección, se empieza por la primera fila visible
+        elif paso == "-pagina":
+            destino = posicion - self._capacidad
+        elif paso == "+pagina":
+            destino = posicion + self._capacidad
+        else:
+            destino = posicion + paso
+        self.seleccionarPosicion(destino)
+        return "break"
+
+    def _al_escribir(self, evento):
+        """Búsqueda al escribir: acumula las teclas y salta al primer id con ese prefijo"""
+        if self._fuente is None or len(evento.char) != 1 or not evento.char.isprintable():
+            return None
+        ahora = time.monotonic()
+        if ahora - self._ultima_tecla > self.PAUSA_BUSQUEDA_S:
+            self._busqueda = ""
+        self._ultima_tecla = ahora
+        self._busqueda += evento.char
+        posicion = self._fuente.buscarPorPrefijo(self._busqueda)
+        if posicion is not None:
+            self.seleccionarPosicion(posicion)
+        else:
+            self.bell()
+        return "break"
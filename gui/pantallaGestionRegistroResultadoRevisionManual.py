@@ -1,8 +1,15 @@
 # gui/pantallaGestionRegistroResultadoRevisionManual.py
 
+import logging
+import queue
 import tkinter as tk
 from tkinter import ttk, messagebox
 from gestor.gestorRegistroResultadoRevisionManual import GestorRegistroResultadoRevisionManual
+from modelos.tipo_de_dato import TipoDeDato
+from utilidades import perfil_arranque
+from .lista_virtual import ListaVirtual
+
+_traza = logging.getLogger(__name__)
 
 class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
     """
@@ -10,15 +17,24 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
     SEGÚN ANOTACIONES: "Apenas se runea el main, que muestre el MENU PRINCIPAL directamente, 
     le quitaría la ventana de bienvenida y el botón de aceptar"
     """
+
+    # Cada cuántos milisegundos se atienden los pedidos que llegan de otros hilos
+    INTERVALO_COLA_MS = 50
     
-    def __init__(self, master=None):
+    def __init__(self, master=None, ruta_sismos="sismos.json"):
         super().__init__(master)
         self.master = master
         self.master.title("Sistema de Red Sísmica")
         self.master.geometry("900x700")
         self.pack(fill="both", expand=True)
 
-        self.gestor = GestorRegistroResultadoRevisionManual(self)
+        # Tkinter sólo puede usarse desde el hilo principal: los hilos de trabajo del
+        # gestor encolan llamadas que se ejecutan aquí mediante after()
+        self._cola_hilo_principal = queue.Queue()
+        self.after(self.INTERVALO_COLA_MS, self._atenderColaHiloPrincipal)
+
+        with perfil_arranque.medir("Crear gestor y cargar catálogo"):
+            self.gestor = GestorRegistroResultadoRevisionManual(self, ruta_sismos, segundo_plano=True)
         self.sismo_seleccionado_id = None
 
         # Crear las tres vistas principales
@@ -72,17 +88,18 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         frame_lista = ttk.LabelFrame(self.vista_lista, text="Sismos No Revisados")
         frame_lista.pack(pady=10, padx=10, fill="both", expand=True)
         
-        self.tree_sismos = ttk.Treeview(
-            frame_lista, 
-            columns=("ID", "Fecha", "Magnitud", "Estado"), 
-            show="headings"
+        # Lista virtual: sólo las filas visibles existen en el Treeview
+        self.lista_sismos = ListaVirtual(
+            frame_lista,
+            columnas=(("id_sismo", "ID"), ("fecha", "Fecha/Hora"), ("magnitud", "Magnitud"), ("estado", "Estado Actual")),
+            formatear=self._valores_fila_sismo
         )
-        self.tree_sismos.heading("ID", text="ID")
-        self.tree_sismos.heading("Fecha", text="Fecha/Hora")
-        self.tree_sismos.heading("Magnitud", text="Magnitud")
-        self.tree_sismos.heading("Estado", text="Estado Actual")
-        self.tree_sismos.pack(pady=5, padx=5, fill="both", expand=True)
-        self.tree_sismos.bind("<<TreeviewSelect>>", self.on_sismo_select)
+        self.lista_sismos.pack(pady=5, padx=5, fill="both", expand=True)
+        self.lista_sismos.bind("<<SeleccionVirtual>>", self.on_sismo_select)
+        ttk.Label(
+            frame_lista,
+            text="Clic en un encabezado para ordenar; escriba un ID sobre la lista para buscarlo."
+        ).pack(padx=5, anchor="w")
         
         frame_botones = ttk.Frame(self.vista_lista)
         frame_botones.pack(pady=10, padx=10, fill="x")
@@ -102,6 +119,18 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         )
         btn_volver.pack(side="left", padx=5)
 
+        # Avance de la preparación del evento seleccionado (visible sólo mientras se prepara)
+        self.frame_progreso = ttk.Frame(self.vista_lista)
+        self.lbl_progreso = ttk.Label(self.frame_progreso, text="")
+        self.lbl_progreso.pack(side="left", padx=5)
+        self.barra_progreso = ttk.Progressbar(self.frame_progreso, mode="determinate", maximum=1.0)
+        self.barra_progreso.pack(side="left", padx=5, fill="x", expand=True)
+        ttk.Button(
+            self.frame_progreso,
+            text="Cancelar",
+            command=self.cancelarPreparacion
+        ).pack(side="right", padx=5)
+
     def _crear_widgets_detalle(self):
         """Vista de detalle con información completa del evento y opciones de acción"""
         frame_detalles = ttk.LabelFrame(self.vista_detalle, text="Detalles del Evento y Acciones")
@@ -115,6 +144,25 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
             anchor="nw"
         )
         self.lbl_detalles.pack(pady=10, padx=10, fill="both", expand=True)
+
+        # Valores alcanzados por cada serie temporal (una fila por serie y tipo de dato)
+        frame_valores = ttk.LabelFrame(self.vista_detalle, text="Valores Alcanzados por Serie Temporal")
+        frame_valores.pack(pady=(0, 10), padx=10, fill="x")
+        columnas_valores = (
+            ("estacion", "Estación", 80), ("tipo", "Tipo de Dato", 150), ("pico", "Pico", 80),
+            ("instante", "Instante del Pico", 150), ("rms", "RMS", 80), ("media", "Media", 80),
+            ("duracion", "Duración (s)", 90), ("muestras", "Muestras", 80),
+        )
+        self.tree_valores = ttk.Treeview(
+            frame_valores, columns=[clave for clave, _, _ in columnas_valores], show="headings", height=6
+        )
+        for clave, titulo, ancho in columnas_valores:
+            self.tree_valores.heading(clave, text=titulo)
+            self.tree_valores.column(clave, width=ancho, anchor="e" if clave not in ("estacion", "tipo") else "w")
+        barra_valores = ttk.Scrollbar(frame_valores, orient="vertical", command=self.tree_valores.yview)
+        self.tree_valores.configure(yscrollcommand=barra_valores.set)
+        self.tree_valores.pack(side="left", fill="x", expand=True, padx=(5, 0), pady=5)
+        barra_valores.pack(side="right", fill="y", pady=5)
         
         self.frame_acciones = ttk.LabelFrame(self.vista_detalle, text="Tomar una Acción")
         self.frame_acciones.pack(pady=10, padx=10, fill="x")
@@ -143,7 +191,7 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         btn_volver = ttk.Button(
             self.vista_detalle, 
             text="Volver a la Lista", 
-            command=lambda: self._mostrar_vista('lista')
+            command=self.cancelarRevision
         )
         btn_volver.pack(pady=10)
 
@@ -152,7 +200,7 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         SEGÚN DIAGRAMA: :PantallaGestionRegistroResultadoRevisionManual → :PantallaGestionRegistroResultadoRevisionManual (self): habilitarVentana()
         SEGÚN ANOTACIONES PDF: "que muestre el MENU PRINCIPAL directamente"
         """
-        print("** PANTALLA: habilitarVentana() **")
+        _traza.info("** PANTALLA: habilitarVentana() **")
         self._mostrar_vista('menu')
 
     def seleccionarOpcionRegistrarResultadoDeRevisionManual(self):
@@ -160,46 +208,44 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         SEGÚN DIAGRAMA: :AnalistaEnSismos → :PantallaGestionRegistroResultadoRevisionManual: seleccionarOpciónRegistrarResultadoDeRevisiónManual()
         LUEGO: :PantallaGestionRegistroResultadoRevisionManual → :GestorRegistroResultradoRevisionManual: buscarSismosAutoDetectradosYPendienteDeRevision()
         """
-        print("** PANTALLA: seleccionarOpcionRegistrarResultadoDeRevisionManual() **")
-        print("** PANTALLA: Analista seleccionó 'Registrar Resultado de Revisión Manual' **")
+        _traza.info("** PANTALLA: seleccionarOpcionRegistrarResultadoDeRevisionManual() **")
+        _traza.info("** PANTALLA: Analista seleccionó 'Registrar Resultado de Revisión Manual' **")
         
         # SEGÚN DIAGRAMA: llamar al gestor para buscar sismos
         self.gestor.buscarSismosAutoDetectadosYPendienteDeRevision()
 
-    def mostrarEventosSismicosEncontradosOrdenados(self, lista_sismos):
+    def mostrarEventosSismicosEncontradosOrdenados(self, listado_sismos):
         """
         SEGÚN DIAGRAMA: GestorRegistroResultadoRevisionManual → :PantallaGestionRegistroResultadoRevisionManual: mostrarEventosSismicosEncontradosOrdenados()
         """
-        print("** PANTALLA: mostrarEventosSismicosEncontradosOrdenados() **")
-        print("** PANTALLA: El Gestor me ordenó mostrar los sismos encontrados **")
+        _traza.info("** PANTALLA: mostrarEventosSismicosEncontradosOrdenados() **")
+        _traza.info("** PANTALLA: El Gestor me ordenó mostrar los sismos encontrados **")
         
         self.btn_seleccionar.config(state="disabled")
         
-        # Limpiar la tabla
-        for i in self.tree_sismos.get_children(): 
-            self.tree_sismos.delete(i)
-        
-        # Cargar los sismos encontrados
-        for sismo in lista_sismos:
-            self.tree_sismos.insert(
-                "", 
-                "end", 
-                values=(
-                    sismo.id_sismo, 
-                    sismo.fechaHoraOcurrencia.strftime("%Y-%m-%d %H:%M"), 
-                    sismo.valorMagnitud, 
-                    sismo.estadoActual.actual.nombre
-                )
-            )
+        # La lista pide al listado sólo las filas que entran en pantalla
+        self.sismo_seleccionado_id = None
+        self.lista_sismos.mostrar(listado_sismos)
         
         self._mostrar_vista('lista')
 
+    def actualizarEventosSismicosListados(self):
+        """El gestor agregó o quitó eventos del listado que se muestra: se redibujan las filas visibles"""
+        self.lista_sismos.refrescar()
+
+    @staticmethod
+    def _valores_fila_sismo(fila):
+        """Valores a mostrar de una fila (id_sismo, fecha ISO, magnitud, estado) del listado"""
+        id_sismo, fecha, magnitud, estado = fila
+        # Los eventos detectados automáticamente no tienen magnitud hasta que se revisan
+        return (id_sismo, fecha[:16].replace("T", " "), "-" if magnitud is None else magnitud, estado)
+
     def solicitarSeleccionEventoSismico(self):
         """
         SEGÚN DIAGRAMA: GestorRegistroResultadoRevisionManual → :PantallaGestionRegistroResultadoRevisionManual: solicitarSeleccionEventoSismico()
         """
-        print("** PANTALLA: solicitarSeleccionEventoSismico() **")
-        print("** PANTALLA: El Gestor me ordenó solicitar una selección **")
+        _traza.info("** PANTALLA: solicitarSeleccionEventoSismico() **")
+        _traza.info("** PANTALLA: El Gestor me ordenó solicitar una selección **")
         
         messagebox.showinfo(
             "Siguiente Paso", 
@@ -208,10 +254,10 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         
     def on_sismo_select(self, event):
         """Maneja la selección de un sismo en la tabla"""
-        selected_item = self.tree_sismos.selection()
-        if selected_item:
-            self.sismo_seleccionado_id = self.tree_sismos.item(selected_item)['values'][0]
-            self.btn_seleccionar.config(state="normal")
+        id_sismo = self.lista_sismos.idSeleccionado()
+        self.sismo_seleccionado_id = id_sismo
+        # El evento seleccionado puede salir del listado (por ejemplo, al registrarse su revisión)
+        self.btn_seleccionar.config(state="normal" if id_sismo is not None else "disabled")
 
     def tomarSeleccionEventoSismico(self):
         """
@@ -219,17 +265,51 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         LUEGO: :PantallaGestionRegistroResultadoRevisionManual: → GestorRegistroResultradoRevisionManual: tomarSeleccionEventoSismico()
         """
         if self.sismo_seleccionado_id:
-            print(f"** PANTALLA: tomarSeleccionEventoSismico({self.sismo_seleccionado_id}) **")
-            print(f"** PANTALLA: Enviando selección de sismo {self.sismo_seleccionado_id} al gestor **")
+            _traza.info("** PANTALLA: tomarSeleccionEventoSismico(%s) **", self.sismo_seleccionado_id)
+            _traza.info("** PANTALLA: Enviando selección de sismo %s al gestor **", self.sismo_seleccionado_id)
             
             # SEGÚN DIAGRAMA: enviar selección al gestor
             self.gestor.tomarSeleccionEventoSismico(self.sismo_seleccionado_id)
 
+    # === EJECUCIÓN DESDE OTROS HILOS ===
+
+    def ejecutarEnHiloPrincipal(self, funcion, *argumentos):
+        """Encola una llamada hecha desde otro hilo; se ejecuta en el próximo ciclo de la cola"""
+        self._cola_hilo_principal.put((funcion, argumentos))
+
+    def _atenderColaHiloPrincipal(self):
+        try:
+            while True:
+                funcion, argumentos = self._cola_hilo_principal.get_nowait()
+                try:
+                    funcion(*argumentos)
+                except Exception as e:
+                    _traza.error("** PANTALLA: ERROR en una llamada desde otro hilo: %s **", e)
+        except queue.Empty:
+            pass
+        self.after(self.INTERVALO_COLA_MS, self._atenderColaHiloPrincipal)
+
+    def mostrarProgresoPreparacion(self, fraccion, mensaje):
+        """Avance de la preparación del evento seleccionado; la lista sigue disponible"""
+        if not self.frame_progreso.winfo_ismapped():
+            self.frame_progreso.pack(pady=5, padx=10, fill="x")
+        self.barra_progreso["value"] = fraccion
+        self.lbl_progreso.config(text=mensaje)
+
+    def ocultarProgresoPreparacion(self):
+        self.frame_progreso.pack_forget()
+        self.barra_progreso["value"] = 0.0
+
+    def cancelarPreparacion(self):
+        """El analista cancela la preparación: el evento se libera y se sigue en la lista"""
+        _traza.info("** PANTALLA: cancelarPreparacion() **")
+        self.gestor.cancelarPreparacion()
+
     def mostrarDatosEventoSismicoSeleccionado(self, sismo):
         """
         SEGÚN DIAGRAMA: GestorRegistroResultadoRevisionManual → :PantallaGestionRegistroResultadoRevisionManual: mostrarDatosEventoSismicoSeleccionado()
         """
-        print(f"** PANTALLA: mostrarDatosEventoSismicoSeleccionado({sismo.id_sismo}) **")
+        _traza.info("** PANTALLA: mostrarDatosEventoSismicoSeleccionado(%s) **", sismo.id_sismo)
         
         sismo_info = sismo.getDatosEventoSismico()
         texto = (
@@ -249,13 +329,29 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         )
         
         self.lbl_detalles.config(text=texto)
+        self._mostrarValoresAlcanzados(self.gestor.obtenerValoresAlcanzados())
         self._mostrar_vista('detalle')
 
+    def _mostrarValoresAlcanzados(self, valores_alcanzados):
+        """Llena la tabla de valores alcanzados: (estación, tipo de dato, resumen) por fila"""
+        self.tree_valores.delete(*self.tree_valores.get_children())
+        for estacion, tipo, valores in valores_alcanzados:
+            self.tree_valores.insert("", "end", values=(
+                estacion,
+                TipoDeDato.obtener(tipo).getDenominacion(),
+                f"{valores['pico']:.4g}",
+                valores["instante_pico"].strftime("%H:%M:%S.%f")[:-3],
+                f"{valores['rms']:.4g}",
+                f"{valores['media']:.4g}",
+                f"{valores['duracion_s']:.1f}",
+                valores["cantidad"],
+            ))
+
     def habilitarOpcionVisualizacionMapaConEstacionesSismologicasInvolucradas(self):
         """
         SEGÚN DIAGRAMA: GestorRegistroResultradoRevisionManual → :PantallaGestionRegistroResultradoRevisionManual: habilitarOpcionVisualizacionMapaConEstacionesSismologicasInvolucradas()
         """
-        print("** PANTALLA: habilitarOpcionVisualizacionMapaConEstacionesSismologicasInvolucradas() **")
+        _traza.info("** PANTALLA: habilitarOpcionVisualizacionMapaConEstacionesSismologicasInvolucradas() **")
         
         # Continuar con el flujo según el diagrama
         self.tomarSeleccionDeNoVisualizacionMapa()
@@ -264,33 +360,43 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         """
         SEGÚN DIAGRAMA: :AnalistaEnSismos → :PantallaGestionRegistroResultradoRevisionManual: tomarSeleccionDeNoVisualizacionMapa()
         """
-        print("** PANTALLA: tomarSeleccionDeNoVisualizacionMapa() **")
+        _traza.info("** PANTALLA: tomarSeleccionDeNoVisualizacionMapa() **")
         
         if not messagebox.askyesno("Visualizar Mapa", "¿Desea visualizar en mapa el evento?"):
-            print("** PANTALLA: Usuario seleccionó NO visualizar el mapa **")
+            _traza.info("** PANTALLA: Usuario seleccionó NO visualizar el mapa **")
             self.consultarModificacionDatos()
         else:
-            print("** PANTALLA: Usuario desea ver el mapa (funcionalidad no implementada) **")
+            _traza.info("** PANTALLA: Usuario desea ver el mapa (se listan las estaciones involucradas) **")
+            estaciones = self.gestor.obtenerEstacionesInvolucradas()
+            lineas = [
+                f"{estacion.getCodigoEstacion()}  {estacion.getNombreEstacion()}"
+                + (f"  ({distancia:.1f} km del epicentro)" if distancia is not None else "")
+                for distancia, estacion in estaciones
+            ]
+            messagebox.showinfo(
+                "Estaciones Sismológicas Involucradas",
+                "\n".join(lineas) if lineas else "El evento no tiene estaciones registradas asociadas."
+            )
             self.consultarModificacionDatos()
 
     def consultarModificacionDatos(self):
         """
         SEGÚN DIAGRAMA: GestorRegistroResultadoRevisionManual → :PantallaGestionRegistroResultradoRevisionManual: consultarModificacionDatos()
         """
-        print("** PANTALLA: consultarModificacionDatos() **")
+        _traza.info("** PANTALLA: consultarModificacionDatos() **")
         
         if not messagebox.askyesno("Modificar Datos", "¿Desea modificar los datos del evento sísmico?"):
-            print("** PANTALLA: Usuario seleccionó NO modificar datos **")
+            _traza.info("** PANTALLA: Usuario seleccionó NO modificar datos **")
             self.tomarSeleccionDeNoModificacion()
         else:
-            print("** PANTALLA: Usuario desea modificar datos (funcionalidad no implementada) **")
+            _traza.info("** PANTALLA: Usuario desea modificar datos (funcionalidad no implementada) **")
             self.tomarSeleccionDeNoModificacion()
 
     def tomarSeleccionDeNoModificacion(self):
         """
         SEGÚN DIAGRAMA: :AnalistaEnSismos → :PantallaGestionRegistroResultradoRevisionManual: tomarSeleccionDeNoModificacion()
         """
-        print("** PANTALLA: tomarSeleccionDeNoModificacion() **")
+        _traza.info("** PANTALLA: tomarSeleccionDeNoModificacion() **")
         
         # Continuar con la solicitud de confirmación según el diagrama
         self.gestor.solicitarConfirmacionDeRevision()
@@ -300,8 +406,8 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         CORRECCIÓN 7: Método ajustado según diagrama de secuencia
         Este método debe solo mostrar las opciones en pantalla sin llamar al gestor
         """
-        print("** PANTALLA: solicitarConfirmarRechazarRevisarEvento() **")
-        print("** PANTALLA: Mostrando opciones de confirmación/rechazo/derivación **")
+        _traza.info("** PANTALLA: solicitarConfirmarRechazarRevisarEvento() **")
+        _traza.info("** PANTALLA: Mostrando opciones de confirmación/rechazo/derivación **")
     
         # Solo mostrar las opciones en la interfaz
         self.frame_acciones.pack_forget()
@@ -326,8 +432,8 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         (Aunque en el diagrama no aparece explícitamente, es parte del flujo lógico)
         """
         if messagebox.askyesno("Confirmar Evento", "¿Está seguro de que desea CONFIRMAR este evento como sismo válido?"):
-            print("** PANTALLA: tomarSeleccionConfirmacion() **")
-            print("** PANTALLA: Usuario confirmó el evento **")
+            _traza.info("** PANTALLA: tomarSeleccionConfirmacion() **")
+            _traza.info("** PANTALLA: Usuario confirmó el evento **")
             self.gestor.tomarSeleccionConfirmacion()
 
     def tomarSeleccionRechazo(self):
@@ -336,8 +442,8 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
         LUEGO: :PantallaGestionRegistroResultradoRevisionManual: → GestorRegistroResultradoRevisionManual: tomarSeleccionRechazo()
         """
         if messagebox.askyesno("Confirmar Rechazo", "¿Está seguro de que desea RECHAZAR la revisión?"):
-            print("** PANTALLA: tomarSeleccionRechazo() **")
-            print("** PANTALLA: Usuario confirmó el rechazo **")
+            _traza.info("** PANTALLA: tomarSeleccionRechazo() **")
+            _traza.info("** PANTALLA: Usuario confirmó el rechazo **")
             
             # SEGÚN DIAGRAMA: enviar la selección de rechazo al gestor
             self.gestor.tomarSeleccionRechazo()
@@ -345,17 +451,31 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
     def tomarSeleccionDerivacion(self):
         """Procesa la derivación del evento a un experto."""
         if messagebox.askyesno("Derivar a Experto", "¿Está seguro de que desea derivar este evento a un experto?"):
-            print("** PANTALLA: tomarSeleccionDerivacion() **")
-            print("** PANTALLA: Usuario confirmó la derivación **")
+            _traza.info("** PANTALLA: tomarSeleccionDerivacion() **")
+            _traza.info("** PANTALLA: Usuario confirmó la derivación **")
             self.gestor.tomarSeleccionDerivacion()
 
+    def cancelarRevision(self):
+        """Vuelve a la lista sin registrar un resultado: el gestor libera el bloqueo del evento"""
+        _traza.info("** PANTALLA: cancelarRevision() **")
+        self.gestor.cancelarRevision()
+        self.sismo_seleccionado_id = None
+        self._mostrar_vista('lista')
+
+    def informarEventoNoDisponible(self, mensaje):
+        """El evento elegido está bloqueado por otro analista o el bloqueo propio venció"""
+        _traza.info("** PANTALLA: informarEventoNoDisponible() **")
+        self.sismo_seleccionado_id = None
+        messagebox.showwarning("Evento no disponible", mensaje)
+        self.gestor.buscarSismosAutoDetectadosYPendienteDeRevision()
+
     def finCU(self):
         """
         CORRECCIÓN: Finaliza el caso de uso según el diagrama
-        Resetea la selección y recarga la lista de eventos.
+        Resetea la selección y vuelve a la lista de eventos.
         """
-        print("** PANTALLA: finCU() **")
-        print("** PANTALLA: Finalizando caso de uso **")
+        _traza.info("** PANTALLA: finCU() **")
+        _traza.info("** PANTALLA: Finalizando caso de uso **")
         
         # Resetear la selección
         self.sismo_seleccionado_id = None
@@ -365,5 +485,5 @@ class PantallaGestionRegistroResultadoRevisionManual(tk.Frame):
             "El evento ha sido procesado. Volviendo a la lista de sismos."
         )
         
-        # Recargar la lista de sismos para reflejar los cambios
-        self.gestor.buscarSismosAutoDetectadosYPendienteDeRevision()
\ No newline at end of file
+        # La lista ya refleja el cambio: el gestor quitó la fila del evento al cambiar su estado
+        self._mostrar_vista('lista')
\ No newline at end of file
@@ -0,0 +1,129 @@
+# ingesta/buffer_circular.py
+
+from modelos.serie_temporal import SerieTemporal
+from utilidades.importacion_diferida import modulo_diferido
+
+np = modulo_diferido("numpy")
+
+UN_SEGUNDO_US = 1_000_000
+
+
+class BufferCircular:
+    """
+    Últimas 'capacidad' muestras de una estación, en arreglos NumPy asignados
+    una sola vez: un vector de instantes (microsegundos desde la época) y una
+    columna float64 por tipo de dato. Las muestras nuevas pisan a las más viejas.
+
+    Cada arreglo mide el doble de la capacidad y cada muestra se escribe en su
+    posición y en la misma posición de la segunda mitad (buffer espejo): las
+    últimas N muestras quedan siempre contiguas, de modo que serie() entrega una
+    SerieTemporal cuyas columnas son vistas de los arreglos, sin copiar.
+
+    Las vistas son de sólo lectura y siguen reflejando el buffer: son válidas
+    hasta que lleguen otras 'capacidad' - N muestras. Quien necesite conservarlas
+    más tiempo debe copiarlas (serie(copiar=True)).
+
+    Los instantes sólo avanzan: de un bloque que empieza antes de la última
+    muestra guardada (una estación que reenvía tramas al reconectarse) se
+    descartan las muestras ya cubiertas.
+    """
+
+    __slots__ = ("codigo_estacion", "capacidad", "tipos", "_tiempos", "_columnas", "total")
+
+    def __init__(self, codigo_estacion, tipos, capacidad):
+        if capacidad <= 0:
+            raise ValueError(f"Capacidad inválida: {capacidad}")
+        self.codigo_estacion = codigo_estacion
+        self.capacidad = capacidad
+        self.tipos = tuple(tipos)
+        self._tiempos = np.zeros(2 * capacidad, dtype=np.int64)
+        self._columnas = np.full((len(self.tipos), 2 * capacidad), np.nan)
+        self.total = 0      # muestras recibidas desde que se creó el buffer
+
+    def __len__(self):
+        return min(self.total, self.capacidad)
+
+    def _escribir(self, destino, datos):
+        """Escribe datos (..., m) a partir de la posición actual, en ambas mitades"""
+        capacidad = self.capacidad
+        posicion = self.total % capacidad
+        cantidad = datos.shape[-1]
+        primera = min(cantidad, capacidad - posicion)
+        destino[..., posicion:posicion + primera] = datos[..., :primera]
+        destino[..., capacidad + posicion:capacidad + posicion + primera] = datos[..., :primera]
+        if primera < cantidad:
+            resto = cantidad - primera
+            destino[..., :resto] = datos[..., primera:]
+            destino[..., capacidad:capacidad + resto] = datos[..., primera:]
+
+    def ultimoInstante(self):
+        """Instante (microsegundos desde la época) de la última muestra guardada, o None"""
+        return int(self._tiempos[(self.total - 1) % self.capacidad]) if self.total else None
+
+    def agregar(self, inicio_us, tasa_muestreo, valores) -> int:
+        """
+        Agrega un bloque de muestras equiespaciadas: 'valores' es un arreglo
+        (tipos, muestras) y la primera muestra corresponde a 'inicio_us'.
+        Devuelve cuántas muestras se agregaron (no cuentan las que no son
+        posteriores a la última muestra guardada).
+        """
+        cantidad = valores.shape[1]
+        if cantidad == 0:
+            return 0
+        instantes = np.arange(cantidad, dtype=np.float64)
+        instantes *= UN_SEGUNDO_US / tasa_muestreo
+        np.rint(instantes, out=instantes)
+        tiempos = instantes.astype(np.int64)
+        tiempos += inicio_us
+        ultimo = self.ultimoInstante()
+        if ultimo is not None and tiempos[0] <= ultimo:
+            repetidas = int(np.searchsorted(tiempos, ultimo, side="right"))
+            tiempos, valores = tiempos[repetidas:], valores[:, repetidas:]
+            cantidad -= repetidas
+            if cantidad == 0:
+                return 0
+        agregadas = cantidad
+        if cantidad > self.capacidad:
+            # Sólo entran las últimas: las primeras se pisarían en el mismo bloque
+            descartadas = cantidad - self.capacidad
+            tiempos, valores = tiempos[descartadas:], valores[:, descartadas:]
+            self.total += descartadas
+            cantidad = self.capacidad
+        self._escribir(self._tiempos, tiempos)
+        self._escribir(self._columnas, valores)
+        self.total += cantidad
+        return agregadas
+
+    def _tramo(self, cantidad):
+        """Posiciones [desde, hasta) de las últimas 'cantidad' muestras, contiguas gracias al espejo"""
+        cantidad = len(self) if cantidad is None else min(max(cantidad, 0), len(self))
+        hasta = self.capacidad + self.total % self.capacidad
+        return hasta - cantidad, hasta
+
+    def serie(self, cantidad=None, copiar=False):
+        """
+        Las últimas 'cantidad' muestras (todas las disponibles si no se indica)
+        como SerieTemporal de la estación, con vistas de sólo lectura del buffer
+        (o, con 'copiar', con copias que las muestras nuevas no pisan).
+        """
+        desde, hasta = self._tramo(cantidad)
+        tiempos = self._tiempos[desde:hasta].view("datetime64[us]")
+        if copiar:
+            tiempos = tiempos.copy()
+        tiempos.flags.writeable = False
+        valores = {}
+        for tipo, columna in zip(self.tipos, self._columnas):
+            vista = columna[desde:hasta].copy() if copiar else columna[desde:hasta]
+            vista.flags.writeable = False
+            valores[tipo] = vista
+        return SerieTemporal(tiempos, valores, self.codigo_estacion)
+
+    def serieDesde(self, total_previo):
+        """
+        Muestras llegadas después de que el buffer tuviera 'total_previo' muestras
+        (por ejemplo, el 'total' visto en la consulta anterior), y cuántas de ellas
+        ya se habían pisado antes de esta consulta.
+        """
+        nuevas = self.total - total_previo
+        perdidas = max(nuevas - self.capacidad, 0)
+        return self.serie(nuevas - perdidas), perdidas
@@ -0,0 +1,174 @@
+# ingesta/estacion_simulada.py
+
+import argparse
+import asyncio
+import logging
+import time
+from utilidades.importacion_diferida import modulo_diferido
+from utilidades.traza import configurar_traza
+from . import protocolo
+
+_traza = logging.getLogger(__name__)
+
+np = modulo_diferido("numpy")
+
+UN_SEGUNDO_US = 1_000_000
+
+
+class EstacionSimulada:
+    """
+    Estación de prueba que envía ruido (y, si se indica, sismos simulados) al
+    servidor de ingesta con el protocolo real: presentación, tramas de
+    'muestras_por_trama' muestras y espera de acuses cuando tiene 'ventana'
+    tramas sin acusar.
+
+    En tiempo real envía cada trama cuando sus muestras "ya ocurrieron"; si no,
+    envía tan rápido como lo permita el servidor (para medir throughput).
+    """
+
+    def __init__(self, codigo, tasa_muestreo=100.0, muestras_por_trama=100, tipos=("velocidad_onda",),
+                 ventana=16, tiempo_real=True, sismos=(), semilla=None):
+        self.codigo = codigo
+        self.tasa_muestreo = tasa_muestreo
+        self.muestras_por_trama = muestras_por_trama
+        self.tipos = tuple(tipos)
+        self.ventana = ventana
+        self.tiempo_real = tiempo_real
+        # Segundos (desde el comienzo del envío) en que empieza cada sismo simulado
+        self.sismos = tuple(sismos)
+        self._azar = np.random.default_rng(semilla)
+        self.tramas_enviadas = 0
+        self.tramas_acusadas = 0
+        self.error = None           # motivo, si el servidor rechazó la conexión
+        self.conectada = False
+        self._lector = None
+        self._escritor = None
+        self._acuses = None
+        self._tarea_acuses = None
+
+    async def conectar(self, host="127.0.0.1", puerto=None, ruta_unix=None):
+        if ruta_unix is not None:
+            self._lector, self._escritor = await asyncio.open_unix_connection(ruta_unix)
+        else:
+            self._lector, self._escritor = await asyncio.open_connection(host, puerto)
+        self._acuses = asyncio.Condition()
+        self.conectada = True
+        self._tarea_acuses = asyncio.ensure_future(self._recibir_acuses())
+        self._escritor.write(protocolo.trama_presentacion(self.codigo, self.tipos, self.ventana))
+        await self._escritor.drain()
+
+    async def _recibir_acuses(self):
+        try:
+            while True:
+                recibida = await protocolo.leer_trama(self._lector)
+                if recibida is None:
+                    break
+                tipo, cuerpo = recibida
+                if tipo == protocolo.ERROR:
+                    self.error = bytes(cuerpo).decode("utf-8", "replace")
+                    _traza.warning("Estación %s: el servidor rechazó la conexión: %s", self.codigo, self.error)
+                    break
+                if tipo == protocolo.ACUSE:
+                    async with self._acuses:
+                        self.tramas_acusadas = protocolo.leer_acuse(cuerpo)
+                        self._acuses.notify_all()
+        except (ConnectionError, protocolo.ErrorProtocolo, asyncio.IncompleteReadError) as e:
+            _traza.warning("Estación %s: conexión interrumpida: %r", self.codigo, e)
+        finally:
+            # Quien espere un acuse no debe quedar bloqueado si la conexión terminó
+            async with self._acuses:
+                self.conectada = False
+                self._acuses.notify_all()
+
+    def _muestras(self, desde, cantidad):
+        """Valores (tipos, cantidad) a partir de la muestra número 'desde'"""
+        valores = self._azar.normal(0.0, 1.0, (len(self.tipos), cantidad))
+        for inicio_sismo in self.sismos:
+            # Sismo simulado: 20 s de ruido de amplitud mayor que decae
+            primera = round(inicio_sismo * self.tasa_muestreo)
+            duracion = round(20 * self.tasa_muestreo)
+            desde_sismo, hasta_sismo = max(primera, desde), min(primera + duracion, desde + cantidad)
+            if desde_sismo < hasta_sismo:
+                decaimiento = np.exp(-(np.arange(desde_sismo, hasta_sismo) - primera) / (5 * self.tasa_muestreo))
+                valores[:, desde_sismo - desde:hasta_sismo - desde] *= 1 + 15 * decaimiento
+        return valores
+
+    async def enviar(self, tramas, inicio_us=None):
+        """Envía 'tramas' tramas de muestras consecutivas; devuelve cuántas se enviaron"""
+        if inicio_us is None:
+            inicio_us = time.time_ns() // 1000
+        comienzo = time.monotonic()
+        duracion_trama = self.muestras_por_trama / self.tasa_muestreo
+        enviadas = 0
+        for numero in range(tramas):
+            # Contrapresión: con 'ventana' tramas sin acusar se espera al servidor
+            async with self._acuses:
+                await self._acuses.wait_for(
+                    lambda: not self.conectada or self.tramas_enviadas - self.tramas_acusadas < self.ventana
+                )
+                if not self.conectada:
+                    break
+            if self.tiempo_real:
+                espera = comienzo + (numero + 1) * duracion_trama - time.monotonic()
+                if espera > 0:
+                    await asyncio.sleep(espera)
+            desde = numero * self.muestras_por_trama
+            self._escritor.write(protocolo.trama_muestras(
+                inicio_us + round(desde * UN_SEGUNDO_US / self.tasa_muestreo),
+                self.tasa_muestreo,
+                self._muestras(desde, self.muestras_por_trama),
+            ))
+            await self._escritor.drain()
+            self.tramas_enviadas += 1
+            enviadas += 1
+        return enviadas
+
+    async def cerrar(self):
+        """Espera el acuse de lo enviado (si el servidor lo envía) y cierra la conexión"""
+        if self._escritor is None:
+            return
+        self._escritor.write_eof()
+        await self._tarea_acuses
+        self._escritor.close()
+        try:
+            await self._escritor.wait_closed()
+        except ConnectionError:
+            pass
+        self._escritor = None
+
+
+async def simular(cantidad_estaciones, tramas, host="127.0.0.1", puerto=None, ruta_unix=None, **opciones):
+    """Conecta 'cantidad_estaciones' estaciones simuladas y envía 'tramas' tramas desde cada una"""
+    estaciones = [EstacionSimulada(f"SIM-{numero:04d}", semilla=numero, **opciones)
+                  for numero in range(cantidad_estaciones)]
+    await asyncio.gather(*(estacion.conectar(host, puerto, ruta_unix) for estacion in estaciones))
+    await asyncio.gather(*(estacion.enviar(tramas) for estacion in estaciones))
+    await asyncio.gather(*(estacion.cerrar() for estacion in estaciones))
+    return estaciones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estaciones simuladas para el servidor de ingesta")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=7300)
+    parser.add_argument("--unix", help="ruta del socket UNIX del servidor (en lugar de TCP)")
+    parser.add_argument("--estaciones", type=int, default=1)
+    parser.add_argument("--segundos", type=float, default=60.0, help="segundos de muestras que envía cada estación")
+    parser.add_argument("--tasa", type=float, default=100.0, help="tasa de muestreo en Hz")
+    parser.add_argument("--sin-tiempo-real", action="store_true", help="envía tan rápido como acepte el servidor")
+    parser.add_argument("--sismo", type=float, action="append", default=[],
+                        help="segundo en que empieza un sismo simulado (puede repetirse)")
+    parser.add_argument("--traza", help="niveles de traza, como en main.py")
+    argumentos = parser.parse_args()
+    configurar_traza(argumentos.traza)
+
+    tramas = max(1, round(argumentos.segundos))   # una trama por segundo de muestras
+    inicio = time.perf_counter()
+    asyncio.run(simular(
+        argumentos.estaciones, tramas, argumentos.host, argumentos.puerto, argumentos.unix,
+        tasa_muestreo=argumentos.tasa, muestras_por_trama=round(argumentos.tasa),
+        tiempo_real=not argumentos.sin_tiempo_real, sismos=argumentos.sismo,
+    ))
+    segundos = time.perf_counter() - inicio
+    muestras = argumentos.estaciones * tramas * round(argumentos.tasa)
+    print(f"{argumentos.estaciones} estaciones, {muestras} muestras en {segundos:.1f} s ({muestras / segundos:.0f} muestras/s)")
@@ -0,0 +1,124 @@
+# ingesta/protocolo.py
+#
+# Protocolo de ingesta de muestras: tramas binarias little-endian, cada una con
+# una cabecera fija (marca, versión, tipo de trama, longitud del cuerpo) seguida
+# del cuerpo.
+#
+# Estación -> servidor
+#   PRESENTACION  primera trama de cada conexión: (ventana, longitud del código)
+#                 + código de la estación en UTF-8 + (cantidad de canales) y, por
+#                 canal, (longitud del nombre) + nombre del tipo de dato en UTF-8.
+#                 'ventana' es cuántas tramas MUESTRAS envía la estación sin
+#                 esperar un ACUSE.
+#   MUESTRAS      (inicio en microsegundos desde la época, tasa de muestreo en Hz,
+#                 cantidad de muestras) + las muestras float64, canal por canal
+#                 en el orden de la presentación.
+# Servidor -> estación
+#   ACUSE         cantidad de tramas MUESTRAS procesadas desde la presentación.
+#   ERROR         motivo en UTF-8; después el servidor cierra la conexión.
+
+import asyncio
+import struct
+from utilidades.importacion_diferida import modulo_diferido
+
+np = modulo_diferido("numpy")
+
+MARCA = b"RS"
+VERSION = 1
+
+PRESENTACION = 1
+MUESTRAS = 2
+ACUSE = 3
+ERROR = 4
+
+CABECERA = struct.Struct("<2sBBI")
+_PRESENTACION = struct.Struct("<HB")
+_MUESTRAS = struct.Struct("<qdI")
+_ACUSE = struct.Struct("<Q")
+
+# Cuerpo más grande que se acepta (una trama de varios minutos de muestras a 100 Hz entra holgada)
+MAXIMO_CUERPO = 16 * 1024 * 1024
+
+
+class ErrorProtocolo(ValueError):
+    """La trama recibida no respeta el protocolo de ingesta"""
+
+
+def trama(tipo, cuerpo=b""):
+    return CABECERA.pack(MARCA, VERSION, tipo, len(cuerpo)) + cuerpo
+
+
+def trama_presentacion(codigo_estacion, tipos, ventana):
+    codigo = codigo_estacion.encode("utf-8")
+    partes = [_PRESENTACION.pack(ventana, len(codigo)), codigo, bytes([len(tipos)])]
+    for tipo in tipos:
+        nombre = tipo.encode("utf-8")
+        partes += [bytes([len(nombre)]), nombre]
+    return trama(PRESENTACION, b"".join(partes))
+
+
+def leer_presentacion(cuerpo):
+    """(código de la estación, tipos de dato, ventana) de una trama PRESENTACION"""
+    try:
+        ventana, longitud = _PRESENTACION.unpack_from(cuerpo, 0)
+        posicion = _PRESENTACION.size
+        codigo = bytes(cuerpo[posicion:posicion + longitud]).decode("utf-8")
+        posicion += longitud
+        tipos = []
+        for _ in range(cuerpo[posicion]):
+            longitud = cuerpo[posicion + 1]
+            tipos.append(bytes(cuerpo[posicion + 2:posicion + 2 + longitud]).decode("utf-8"))
+            posicion += 1 + longitud
+    except (struct.error, IndexError, UnicodeDecodeError) as e:
+        raise ErrorProtocolo(f"presentación inválida ({e})") from e
+    if not codigo or not tipos or ventana == 0 or posicion + 1 != len(cuerpo):
+        raise ErrorProtocolo("presentación inválida: falta el código, los tipos de dato o la ventana")
+    return codigo, tipos, ventana
+
+
+def trama_muestras(inicio_us, tasa_muestreo, valores):
+    """'valores' es un arreglo (canales, muestras); se envía canal por canal"""
+    valores = np.ascontiguousarray(valores, dtype="<f8")
+    return trama(MUESTRAS, _MUESTRAS.pack(inicio_us, tasa_muestreo, valores.shape[1]) + valores.tobytes())
+
+
+def leer_muestras(cuerpo, canales):
+    """
+    (inicio en microsegundos, tasa de muestreo, valores) de una trama MUESTRAS;
+    'valores' es una vista (canales, muestras) sobre el cuerpo, sin copia.
+    """
+    try:
+        inicio_us, tasa_muestreo, cantidad = _MUESTRAS.unpack_from(cuerpo, 0)
+    except struct.error as e:
+        raise ErrorProtocolo(f"muestras inválidas ({e})") from e
+    if len(cuerpo) != _MUESTRAS.size + 8 * canales * cantidad:
+        raise ErrorProtocolo(f"muestras inválidas: se esperaban {cantidad} muestras de {canales} canales")
+    if not tasa_muestreo > 0:
+        raise ErrorProtocolo(f"muestras inválidas: tasa de muestreo {tasa_muestreo}")
+    valores = np.frombuffer(cuerpo, dtype="<f8", offset=_MUESTRAS.size).reshape(canales, cantidad)
+    return inicio_us, tasa_muestreo, valores
+
+
+def trama_acuse(tramas):
+    return trama(ACUSE, _ACUSE.pack(tramas))
+
+
+def leer_acuse(cuerpo):
+    return _ACUSE.unpack(cuerpo)[0]
+
+
+async def leer_trama(lector):
+    """(tipo, cuerpo) de la siguiente trama del StreamReader, o None si la conexión se cerró entre tramas"""
+    try:
+        cabecera = await lector.readexactly(CABECERA.size)
+    except asyncio.IncompleteReadError as e:
+        if e.partial:
+            raise ErrorProtocolo("la conexión se cerró en medio de una cabecera") from e
+        return None
+    marca, version, tipo, longitud = CABECERA.unpack(cabecera)
+    if marca != MARCA or version != VERSION:
+        raise ErrorProtocolo(f"cabecera inválida ({marca!r}, versión {version})")
+    if longitud > MAXIMO_CUERPO:
+        raise ErrorProtocolo(f"trama de {longitud} bytes (máximo {MAXIMO_CUERPO})")
+    cuerpo = await lector.readexactly(longitud) if longitud else b""
+    return tipo, cuerpo
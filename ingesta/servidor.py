@@ -0,0 +1,282 @@
+# ingesta/servidor.py
+
+import argparse
+import asyncio
+import logging
+import math
+import threading
+import time
+from utilidades.traza import configurar_traza
+from . import protocolo
+from .buffer_circular import BufferCircular
+from .protocolo import ErrorProtocolo
+
+_traza = logging.getLogger(__name__)
+
+
+class EstadisticasConexion:
+    """Contadores de throughput de una conexión de estación"""
+
+    __slots__ = ("remoto", "codigo_estacion", "tramas", "muestras", "bytes", "inicio", "fin")
+
+    def __init__(self, remoto):
+        self.remoto = remoto
+        self.codigo_estacion = None
+        self.tramas = 0
+        self.muestras = 0
+        self.bytes = 0
+        self.inicio = time.monotonic()
+        self.fin = None
+
+    def segundos(self):
+        return (self.fin if self.fin is not None else time.monotonic()) - self.inicio
+
+    def muestrasPorSegundo(self):
+        segundos = self.segundos()
+        return self.muestras / segundos if segundos > 0 else 0.0
+
+    def bytesPorSegundo(self):
+        segundos = self.segundos()
+        return self.bytes / segundos if segundos > 0 else 0.0
+
+    def __repr__(self):
+        return (f"EstadisticasConexion({self.codigo_estacion or self.remoto!r}, {self.tramas} tramas, "
+                f"{self.muestrasPorSegundo():.0f} muestras/s)")
+
+
+class ServidorIngesta:
+    """
+    Servidor asyncio que recibe las muestras que envían las estaciones (ver
+    ingesta.protocolo), por TCP o por un socket UNIX, y las agrega al
+    BufferCircular de cada estación. trazas() entrega esos buffers como
+    SerieTemporal, por ejemplo para DetectorStaLta: desde otro hilo, copias
+    tomadas en el bucle del servidor entre dos bloques; en el hilo del bucle,
+    vistas sin copiar de a lo sumo capacidad · (1 - FRACCION_MARGEN) muestras,
+    que siguen siendo válidas mientras no lleguen otras capacidad · FRACCION_MARGEN.
+
+    Contrapresión: cada conexión lee una trama recién después de haber agregado
+    la anterior, así que si el servidor se atrasa se llenan los buffers del
+    socket y TCP frena a la estación. Además la estación no envía más de
+    'ventana' tramas (declarada en su presentación) sin recibir un ACUSE, y el
+    servidor acusa cada ventana / 2 tramas ya agregadas.
+    """
+
+    # Parte de cada buffer que las vistas de trazas() dejan libre para las muestras que sigan llegando
+    FRACCION_MARGEN = 0.25
+
+    def __init__(self, host="127.0.0.1", puerto=0, ruta_unix=None, segundos_buffer=600.0):
+        self.host = host
+        self.puerto = puerto
+        self.ruta_unix = ruta_unix
+        # Cada buffer guarda los últimos 'segundos_buffer' segundos a la tasa de su estación
+        self.segundos_buffer = segundos_buffer
+        self.buffers = {}           # código de estación -> BufferCircular
+        self.conexiones = {}        # código de estación -> EstadisticasConexion de su conexión activa
+        self.tramas_totales = 0
+        self.muestras_totales = 0
+        self._servidor = None
+        self._bucle = None
+        self._hilo = None
+
+    # === CICLO DE VIDA ===
+
+    async def iniciar(self):
+        self._bucle = asyncio.get_running_loop()
+        if self.ruta_unix is not None:
+            self._servidor = await asyncio.start_unix_server(self._atender, path=self.ruta_unix)
+            _traza.info("Ingesta: escuchando en %s", self.ruta_unix)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, self.host, self.puerto)
+            # Con puerto 0 el sistema elige uno libre
+            self.puerto = self._servidor.sockets[0].getsockname()[1]
+            _traza.info("Ingesta: escuchando en %s:%s", self.host, self.puerto)
+
+    async def detener(self):
+        if self._servidor is None:
+            return
+        self._servidor.close()
+        await self._servidor.wait_closed()
+        self._servidor = None
+        _traza.info("Ingesta: servidor detenido (%s tramas, %s muestras)", self.tramas_totales, self.muestras_totales)
+
+    def iniciarEnSegundoPlano(self):
+        """Corre el servidor en un hilo con su propio bucle asyncio (por ejemplo, junto a la interfaz Tk)"""
+        iniciado = threading.Event()
+        errores = []
+
+        def ejecutar():
+            self._bucle = asyncio.new_event_loop()
+            try:
+                self._bucle.run_until_complete(self.iniciar())
+            except OSError as e:
+                errores.append(e)
+                iniciado.set()
+                self._bucle.close()
+                return
+            iniciado.set()
+            self._bucle.run_forever()
+            self._bucle.close()
+
+        self._hilo = threading.Thread(target=ejecutar, name="ServidorIngesta", daemon=True)
+        self._hilo.start()
+        iniciado.wait()
+        if errores:
+            raise errores[0]
+
+    def detenerSegundoPlano(self):
+        if self._hilo is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.detener(), self._bucle).result()
+        self._bucle.call_soon_threadsafe(self._bucle.stop)
+        self._hilo.join()
+        self._hilo = None
+
+    # === CONEXIONES ===
+
+    async def _atender(self, lector, escritor):
+        estadisticas = EstadisticasConexion(escritor.get_extra_info("peername") or self.ruta_unix)
+        codigo = None
+        try:
+            primera = await protocolo.leer_trama(lector)
+            if primera is None:
+                return
+            tipo, cuerpo = primera
+            if tipo != protocolo.PRESENTACION:
+                raise ErrorProtocolo("la primera trama debe ser la presentación de la estación")
+            codigo, tipos, ventana = protocolo.leer_presentacion(cuerpo)
+            if codigo in self.conexiones:
+                raise ErrorProtocolo("la estación ya tiene una conexión activa")
+            buffer = self.buffers.get(codigo)
+            if buffer is not None and buffer.tipos != tuple(tipos):
+                raise ErrorProtocolo(f"la estación envió antes los tipos de dato {list(buffer.tipos)}")
+            estadisticas.codigo_estacion = codigo
+            estadisticas.bytes += protocolo.CABECERA.size + len(cuerpo)
+            self.conexiones[codigo] = estadisticas
+            _traza.info("Ingesta: estación %s conectada (%s, ventana %s)", codigo, ", ".join(tipos), ventana)
+
+            acuse_cada = max(1, ventana // 2)
+            while True:
+                recibida = await protocolo.leer_trama(lector)
+                if recibida is None:
+                    break
+                tipo, cuerpo = recibida
+                if tipo != protocolo.MUESTRAS:
+                    raise ErrorProtocolo(f"trama inesperada de tipo {tipo}")
+                inicio_us, tasa_muestreo, valores = protocolo.leer_muestras(cuerpo, len(tipos))
+                if buffer is None:
+                    capacidad = max(1, round(self.segundos_buffer * tasa_muestreo))
+                    buffer = self.buffers[codigo] = BufferCircular(codigo, tipos, capacidad)
+                cantidad = valores.shape[1]
+                agregadas = buffer.agregar(inicio_us, tasa_muestreo, valores)
+                if agregadas < cantidad:
+                    # Al reconectarse la estación reenvía tramas que ya se habían agregado
+                    _traza.debug("Ingesta: estación %s: %s muestras repetidas o anteriores a la última descartadas",
+                                 codigo, cantidad - agregadas)
+                estadisticas.tramas += 1
+                estadisticas.muestras += cantidad
+                estadisticas.bytes += protocolo.CABECERA.size + len(cuerpo)
+                self.tramas_totales += 1
+                self.muestras_totales += cantidad
+                if estadisticas.tramas % acuse_cada == 0:
+                    escritor.write(protocolo.trama_acuse(estadisticas.tramas))
+                    # Si la estación no lee los acuses, el servidor deja de leer sus muestras
+                    await escritor.drain()
+        except ErrorProtocolo as e:
+            _traza.warning("Ingesta: conexión %s rechazada: %s", codigo or estadisticas.remoto, e)
+            escritor.write(protocolo.trama(protocolo.ERROR, str(e).encode("utf-8")))
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            _traza.warning("Ingesta: se interrumpió la conexión de %s: %r", codigo or estadisticas.remoto, e)
+        finally:
+            estadisticas.fin = time.monotonic()
+            if codigo is not None and self.conexiones.get(codigo) is estadisticas:
+                del self.conexiones[codigo]
+                _traza.info("Ingesta: estación %s desconectada tras %s tramas (%.0f muestras/s)",
+                            codigo, estadisticas.tramas, estadisticas.muestrasPorSegundo())
+            escritor.close()
+            try:
+                await escritor.wait_closed()
+            except ConnectionError:
+                pass
+
+    # === CONSULTA ===
+
+    def _consultar(self, consulta, *argumentos):
+        """
+        Desde otro hilo, con el bucle del servidor en marcha, corre la consulta en
+        ese bucle con copias (los buffers sólo cambian allí); en el mismo hilo, con vistas
+        """
+        bucle = self._bucle
+        if bucle is not None and bucle.is_running():
+            try:
+                en_el_bucle = asyncio.get_running_loop() is bucle
+            except RuntimeError:
+                en_el_bucle = False
+            if not en_el_bucle:
+                async def copiar():
+                    return consulta(*argumentos, copiar=True)
+                return asyncio.run_coroutine_threadsafe(copiar(), bucle).result()
+        return consulta(*argumentos, copiar=False)
+
+    def _cantidad(self, buffer, cantidad, copiar):
+        """Las vistas no abarcan el margen del buffer que pisarán las próximas muestras"""
+        if copiar:
+            return cantidad
+        limite = max(1, buffer.capacidad - math.ceil(buffer.capacidad * self.FRACCION_MARGEN))
+        return limite if cantidad is None else min(cantidad, limite)
+
+    def serie(self, codigo_estacion, cantidad=None):
+        """Las últimas muestras de la estación como SerieTemporal (ver trazas()), o None"""
+        return self._consultar(self._serie, codigo_estacion, cantidad)
+
+    def _serie(self, codigo_estacion, cantidad, copiar):
+        buffer = self.buffers.get(codigo_estacion)
+        return None if buffer is None else buffer.serie(self._cantidad(buffer, cantidad, copiar), copiar)
+
+    def trazas(self, segundos=None):
+        """
+        {código de estación: SerieTemporal} con lo que hay en los buffers (o sólo
+        los últimos 'segundos'): la entrada de DetectorStaLta.detectar(). Copias
+        si se llama desde otro hilo; vistas acotadas en el hilo del servidor.
+        """
+        return self._consultar(self._trazas, segundos)
+
+    def _trazas(self, segundos, copiar):
+        resultado = {}
+        # Una estación nueva agrega su buffer mientras se recorren los demás
+        for codigo, buffer in list(self.buffers.items()):
+            cantidad = None
+            if segundos is not None and len(buffer) > 1:
+                tasa = buffer.serie(2).getTasaMuestreo()
+                cantidad = round(segundos * tasa) if tasa else None
+            resultado[codigo] = buffer.serie(self._cantidad(buffer, cantidad, copiar), copiar)
+        return resultado
+
+
+async def _servir(argumentos):
+    servidor = ServidorIngesta(argumentos.host, argumentos.puerto, argumentos.unix, argumentos.segundos_buffer)
+    await servidor.iniciar()
+    try:
+        while True:
+            await asyncio.sleep(argumentos.informe)
+            conexiones = list(servidor.conexiones.values())
+            print(f"{len(conexiones)} estaciones conectadas, {servidor.muestras_totales} muestras, "
+                  f"{sum(c.muestrasPorSegundo() for c in conexiones):.0f} muestras/s")
+    finally:
+        await servidor.detener()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor de ingesta de muestras de estaciones")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=7300)
+    parser.add_argument("--unix", help="ruta de un socket UNIX (en lugar de TCP)")
+    parser.add_argument("--segundos-buffer", type=float, default=600.0,
+                        help="segundos de muestras que se conservan por estación")
+    parser.add_argument("--informe", type=float, default=10.0, help="segundos entre informes de throughput")
+    parser.add_argument("--traza", help="niveles de traza, como en main.py")
+    argumentos = parser.parse_args()
+    configurar_traza(argumentos.traza)
+    try:
+        asyncio.run(_servir(argumentos))
+    except KeyboardInterrupt:
+        pass
@@ -1,17 +1,60 @@
 # main.py
 
-import tkinter as tk
-from gui.pantallaGestionRegistroResultadoRevisionManual import PantallaGestionRegistroResultadoRevisionManual
+import argparse
+from utilidades import perfil_arranque
+from utilidades.traza import configurar_traza
 
 if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Sistema de Red Sísmica")
+    parser.add_argument(
+        "--traza",
+        help="niveles de traza, p. ej. 'DEBUG' o 'gestor=INFO,modelos=DEBUG' "
+             "(por defecto, la variable de entorno REDSISMICA_TRAZA)"
+    )
+    parser.add_argument(
+        "--catalogo", default="sismos.json",
+        help="catálogo de eventos: un archivo JSON o un directorio de fragmentos JSON, que se leen en paralelo"
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="informa cuánto tarda cada etapa del arranque (importaciones y carga del catálogo) hasta el menú"
+    )
+    parser.add_argument(
+        "--sin-precarga", action="store_true",
+        help="no importa NumPy y matplotlib en segundo plano tras mostrar el menú (se importan al abrir un evento)"
+    )
+    argumentos = parser.parse_args()
+    configurar_traza(argumentos.traza)
+    perfil = perfil_arranque.activar() if argumentos.profile_startup else None
+
     print("=== INICIANDO SISTEMA DE RED SÍSMICA ===")
     print("Mostrando MENU PRINCIPAL directamente (sin ventana de bienvenida)")
-    
-    root = tk.Tk()
-    app = PantallaGestionRegistroResultadoRevisionManual(master=root)
-    
+
+    # La interfaz se importa aquí (y no arriba) para que el perfil mida su importación
+    with perfil_arranque.medir("Importar interfaz, gestor y modelos"):
+        import tkinter as tk
+        from gui.pantallaGestionRegistroResultadoRevisionManual import PantallaGestionRegistroResultadoRevisionManual
+
+    with perfil_arranque.medir("Crear ventana Tk"):
+        root = tk.Tk()
+    with perfil_arranque.medir("Construir pantalla"):
+        app = PantallaGestionRegistroResultadoRevisionManual(master=root, ruta_sismos=argumentos.catalogo)
+
     # El sistema ya está configurado para mostrar el menú principal directamente
     # gracias al método habilitarVentana() que se llama en el constructor
-    
-    app.mainloop()
\ No newline at end of file
+
+    if perfil is not None:
+        with perfil_arranque.medir("Dibujar el menú"):
+            root.update()
+        print(perfil.informe())
+
+    if not argumentos.sin_precarga:
+        # Con el menú ya visible, NumPy y matplotlib se importan mientras el analista elige
+        from utilidades.importacion_diferida import precargar
+        root.after_idle(precargar, "numpy", "matplotlib.pyplot")
+
+    app.mainloop()
+
+    # Cierra la persistencia de estados (base de datos o diario) al salir
+    app.gestor.cerrar()
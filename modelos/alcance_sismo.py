@@ -1,4 +1,15 @@
+import logging
+
+_traza = logging.getLogger(__name__)
+
 class AlcanceSismo:
+    """Alcance del sismo (Local, Regional, Nacional, etc.); el valor lo asignan las reglas de casos_de_uso.clasificador_sismos"""
+
+    SIN_DATOS = "Sin determinar"
+
+    def __init__(self, nombre=None):
+        self.nombre = nombre
+
     def getDatosAlcance(self) -> str:
-        print("-> AlcanceSismo: Obteniendo datos del alcance")
-        return "Nacional"
\ No newline at end of file
+        _traza.debug("-> AlcanceSismo: Obteniendo datos del alcance")
+        return self.nombre if self.nombre is not None else self.SIN_DATOS
\ No newline at end of file
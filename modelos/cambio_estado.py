@@ -1,21 +1,35 @@
 # modelos/cambio_estado.py
 
+import logging
 from datetime import datetime
 from .estado import Estado
 
+_traza = logging.getLogger(__name__)
+
 class CambioEstado:
+    __slots__ = ("fechaHoraInicio", "fechaHoraFin", "actual")
+
     def __init__(self, estado: Estado):
         self.fechaHoraInicio = datetime.now()
         self.fechaHoraFin = None
         self.actual = estado
-        print(f"-> Creada instancia de CambioEstado para el estado '{estado.nombre}'")
+        _traza.debug("-> Creada instancia de CambioEstado para el estado '%s'", estado.nombre)
 
     @classmethod
     def crearCambioEstado(cls, estado: Estado):
         """Método de clase para crear un nuevo cambio de estado"""
-        print(f"-> CambioEstado: Creando nueva instancia (vía método de clase) para el estado '{estado.nombre}'")
+        _traza.debug("-> CambioEstado: Creando nueva instancia (vía método de clase) para el estado '%s'", estado.nombre)
         return cls(estado)
 
+    @classmethod
+    def restaurar(cls, estado: Estado, fecha_hora_inicio: datetime, fecha_hora_fin: datetime = None):
+        """Reconstruye un cambio de estado ya registrado (por ejemplo, leído de la base de datos)"""
+        cambio = cls.__new__(cls)
+        cambio.fechaHoraInicio = fecha_hora_inicio
+        cambio.fechaHoraFin = fecha_hora_fin
+        cambio.actual = estado
+        return cambio
+
     def esEstadoActual(self) -> bool:
         """
         CORRECCIÓN: Verifica si este es el estado actual (sin fecha de fin)
@@ -23,7 +37,7 @@ class CambioEstado:
         si ese estado está vigente (osea si fechaHoraFin esta en None)"
         """
         resultado = self.fechaHoraFin is None
-        print(f"-> CambioEstado: esEstadoActual() = {resultado} (fechaHoraFin: {self.fechaHoraFin})")
+        _traza.debug("-> CambioEstado: esEstadoActual() = %s (fechaHoraFin: %s)", resultado, self.fechaHoraFin)
         return resultado
 
     def esAutoDetectado(self) -> bool:
@@ -31,9 +45,9 @@ class CambioEstado:
         CORRECCIÓN: Verifica si el estado es 'Auto-Detectado'
         SEGÚN DIAGRAMA: estadoActual:CambioEstado → actual:Estado: esAutoDetectado()
         """
-        print(f"-> CambioEstado: Delegando esAutoDetectado() al Estado")
+        _traza.debug("-> CambioEstado: Delegando esAutoDetectado() al Estado")
         resultado = self.actual.esAutoDetectado()
-        print(f"-> CambioEstado: esAutoDetectado() = {resultado}")
+        _traza.debug("-> CambioEstado: esAutoDetectado() = %s", resultado)
         return resultado
 
     def esPendienteDeRevision(self) -> bool:
@@ -42,13 +56,13 @@ class CambioEstado:
         SEGÚN DIAGRAMA: estadoActual:CambioEstado → actual:Estado: esPendienteDeRevision()
         SEGÚN ANOTACIONES PDF: "CambioEstado delega a su Estado para que compare su nombreEstado"
         """
-        print(f"-> CambioEstado: Delegando esPendienteDeRevision() al Estado")
+        _traza.debug("-> CambioEstado: Delegando esPendienteDeRevision() al Estado")
         resultado = self.actual.esPendienteDeRevision()
-        print(f"-> CambioEstado: esPendienteDeRevision() = {resultado}")
+        _traza.debug("-> CambioEstado: esPendienteDeRevision() = %s", resultado)
         
         # SEGÚN DIAGRAMA: si es PendienteDeRevision, verificar el ámbito
         if resultado:
-            print(f"-> CambioEstado: Es PendienteDeRevision, verificando ámbito...")
+            _traza.debug("-> CambioEstado: Es PendienteDeRevision, verificando ámbito...")
             self.esDelAmbito()
         
         return resultado
@@ -59,9 +73,9 @@ class CambioEstado:
         SEGÚN DIAGRAMA: estadoActual:CambioEstado → :Estado: esÁmbitoEventoSismico()
         SEGÚN ANOTACIONES PDF: "se consulta el ámbito desde la clase Estado con esÁmbitoEventoSismico()"
         """
-        print("-> CambioEstado: esDelAmbito() - Delegando a Estado")
+        _traza.debug("-> CambioEstado: esDelAmbito() - Delegando a Estado")
         resultado = self.actual.esAmbitoEventoSismico()
-        print(f"-> CambioEstado: esDelAmbito() = {resultado}")
+        _traza.debug("-> CambioEstado: esDelAmbito() = %s", resultado)
         return resultado
 
     def setFechHoraFin(self):
@@ -70,7 +84,7 @@ class CambioEstado:
         SEGÚN DIAGRAMA: seleccionado:EventoSismico: → estadoActual:CambioEstado: setFechHoraFin()
         """
         self.fechaHoraFin = datetime.now()
-        print(f"-> CambioEstado: setFechHoraFin() establecida a {self.fechaHoraFin}")
+        _traza.debug("-> CambioEstado: setFechHoraFin() establecida a %s", self.fechaHoraFin)
 
     def getNombreEstado(self) -> str:
         """Obtiene el nombre del estado actual"""
@@ -0,0 +1,137 @@
+# modelos/catalogo_eventos.py
+
+import heapq
+from itertools import islice
+from .indice_temporal import IndiceTemporal
+
+
+class CatalogoEventos:
+    """
+    Catálogo de eventos sísmicos en memoria con tres índices:
+    - id_sismo -> EventoSismico, para seleccionar un evento en O(1)
+    - un IndiceTemporal de todos los eventos, por fechaHoraOcurrencia, para las
+      ventanas de tiempo (eventosEntre) y el recorrido en orden inverso
+    - Estado (instancia canónica) -> IndiceTemporal de sus eventos, para listar los
+      eventos de un estado, ya ordenados por fecha, en tiempo proporcional al
+      resultado y no al tamaño del catálogo, y Estado -> conjunto de ids, para
+      saber en O(1) si un evento está en un estado y cuántos hay.
+
+    El índice por estado lo mantiene el propio EventoSismico: cada vez que
+    cambiarEstadoEventoSismico() crea un nuevo CambioEstado, notifica al catálogo.
+    El catálogo, a su vez, reenvía la notificación a sus observadores (por
+    ejemplo, la base de datos que persiste el historial de estados).
+    """
+
+    def __init__(self):
+        self._por_id = {}
+        self._por_fecha = IndiceTemporal()
+        self._por_estado = {}
+        self._ids_por_estado = {}
+        self._observadores = []
+
+    def agregarObservador(self, observador):
+        """Registra un invocable observador(evento, estado_anterior, estado_nuevo)"""
+        self._observadores.append(observador)
+
+    def quitarObservador(self, observador):
+        self._observadores.remove(observador)
+
+    def agregar(self, evento):
+        """Incorpora un evento al catálogo (reemplaza a otro con el mismo id_sismo)"""
+        if evento.id_sismo in self._por_id:
+            self.quitar(evento.id_sismo)
+        self._por_id[evento.id_sismo] = evento
+        self._por_fecha.agregar(evento.fechaHoraOcurrencia, evento.id_sismo)
+        self._agregar_en_estado(evento.estadoActual.actual, evento)
+        evento.catalogo = self
+
+    def quitar(self, id_sismo):
+        evento = self._por_id.pop(id_sismo)
+        self._por_fecha.quitar(evento.fechaHoraOcurrencia, id_sismo)
+        self._quitar_de_estado(evento.estadoActual.actual, evento)
+        evento.catalogo = None
+        return evento
+
+    def _agregar_en_estado(self, estado, evento):
+        indice = self._por_estado.get(estado)
+        if indice is None:
+            indice = self._por_estado[estado] = IndiceTemporal()
+            self._ids_por_estado[estado] = set()
+        indice.agregar(evento.fechaHoraOcurrencia, evento.id_sismo)
+        self._ids_por_estado[estado].add(evento.id_sismo)
+
+    def _quitar_de_estado(self, estado, evento):
+        ids = self._ids_por_estado.get(estado)
+        if ids is not None and evento.id_sismo in ids:
+            ids.discard(evento.id_sismo)
+            self._por_estado[estado].quitar(evento.fechaHoraOcurrencia, evento.id_sismo)
+
+    def obtener(self, id_sismo):
+        """Evento con el id indicado, o None si no está en el catálogo"""
+        return self._por_id.get(id_sismo)
+
+    def idsEnEstado(self, estado):
+        """Ids de los eventos en el estado, en orden cronológico"""
+        return [id_sismo for _, id_sismo in self._por_estado.get(estado, ())]
+
+    def estaEnEstado(self, id_sismo, estado) -> bool:
+        return id_sismo in self._ids_por_estado.get(estado, ())
+
+    def cantidadEnEstado(self, estado) -> int:
+        return len(self._ids_por_estado.get(estado, ()))
+
+    def _intercalar(self, estados, desde, hasta, descendente):
+        """Pares (fecha, id_sismo) de los estados indicados, intercalados en orden de fecha"""
+        rangos = [
+            self._por_estado[estado].entre(desde, hasta, descendente)
+            for estado in dict.fromkeys(estados) if estado in self._por_estado
+        ]
+        if len(rangos) == 1:
+            return rangos[0]
+        return heapq.merge(*rangos, reverse=descendente)
+
+    def eventosEnEstados(self, *estados, descendente=True):
+        """Eventos cuyo estado actual es alguno de los indicados, del más reciente al más antiguo"""
+        return [self._por_id[id_sismo] for _, id_sismo in self._intercalar(estados, None, None, descendente)]
+
+    def eventosEntre(self, desde=None, hasta=None, estados=None, descendente=False):
+        """
+        Eventos ocurridos en [desde, hasta) (None: sin límite), en orden cronológico
+        o inverso; con 'estados', sólo los que están en alguno de ellos.
+        """
+        if estados is None:
+            entradas = self._por_fecha.entre(desde, hasta, descendente)
+        else:
+            entradas = self._intercalar(estados, desde, hasta, descendente)
+        return [self._por_id[id_sismo] for _, id_sismo in entradas]
+
+    def ultimosEventos(self, cantidad, estados=None):
+        """Los 'cantidad' eventos más recientes (de alguno de los 'estados', si se indican)"""
+        if estados is None:
+            entradas = self._por_fecha.entre(descendente=True)
+        else:
+            entradas = self._intercalar(estados, None, None, True)
+        return [self._por_id[id_sismo] for _, id_sismo in islice(entradas, cantidad)]
+
+    def notificarCambioEstado(self, evento, estado_anterior, estado_nuevo):
+        """Actualiza el índice por estado; lo invoca EventoSismico al cambiar de estado"""
+        if self._por_id.get(evento.id_sismo) is not evento:
+            return
+        if estado_anterior is not None:
+            self._quitar_de_estado(estado_anterior, evento)
+        self._agregar_en_estado(estado_nuevo, evento)
+        for observador in self._observadores:
+            observador(evento, estado_anterior, estado_nuevo)
+
+    def __contains__(self, id_sismo):
+        return id_sismo in self._por_id
+
+    def __iter__(self):
+        return iter(self._por_id.values())
+
+    def __reversed__(self):
+        """Eventos del más reciente al más antiguo"""
+        return (self._por_id[id_sismo] for _, id_sismo in reversed(self._por_fecha))
+
+    def __len__(self):
+        return len(self._por_id)
@@ -1,4 +1,15 @@
+import logging
+
+_traza = logging.getLogger(__name__)
+
 class ClasificacionSismo:
+    """Clasificación del sismo por su magnitud (Leve, Moderado, Fuerte, etc.); el valor lo asignan las reglas de casos_de_uso.clasificador_sismos"""
+
+    SIN_DATOS = "Sin determinar"
+
+    def __init__(self, nombre=None):
+        self.nombre = nombre
+
     def getDatosClasificacion(self) -> str:
-        print("-> ClasificacionSismo: Obteniendo datos de clasificación")
-        return "Moderado"
\ No newline at end of file
+        _traza.debug("-> ClasificacionSismo: Obteniendo datos de clasificación")
+        return self.nombre if self.nombre is not None else self.SIN_DATOS
\ No newline at end of file
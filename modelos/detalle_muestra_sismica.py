@@ -1,14 +1,23 @@
+import logging
 from .tipo_de_dato import TipoDeDato
 
+_traza = logging.getLogger(__name__)
+
 class DetalleMuestraSismica:
+    __slots__ = ("valor", "_tipo_de_dato_obj")
+
     def __init__(self, tipo_dato, valor):
-        self.tipo_dato = tipo_dato
         self.valor = valor
-        self._tipo_de_dato_obj = TipoDeDato(tipo_dato)  # Crear instancia del objeto TipoDeDato
+        self._tipo_de_dato_obj = TipoDeDato(tipo_dato)  # Instancia canónica compartida (flyweight)
+
+    @property
+    def tipo_dato(self):
+        """Nombre del tipo de dato (se toma de la instancia compartida, no se duplica)"""
+        return self._tipo_de_dato_obj.nombre_tipo
 
     def getDatos(self):
         """Obtener datos del detalle de muestra sísmica"""
-        print("-> DetalleMuestraSismica: getDatos()")
+        _traza.debug("-> DetalleMuestraSismica: getDatos()")
         return {
             "tipo_dato": self.tipo_dato,
             "valor": self.valor
@@ -16,5 +25,5 @@ class DetalleMuestraSismica:
 
     def getTipoDeDato(self):
         """Obtener objeto TipoDeDato asociado"""
-        print("-> DetalleMuestraSismica: getTipoDeDato()")
+        _traza.debug("-> DetalleMuestraSismica: getTipoDeDato()")
         return self._tipo_de_dato_obj
\ No newline at end of file
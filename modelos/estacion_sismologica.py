@@ -1,26 +1,29 @@
 # CORRECCIÓN 6: modelos/estacion_sismologica.py
-# Agregar más estaciones sismológicas
+# Las estaciones se cargan del registro de estaciones (ver modelos.registro_estaciones)
+
+import logging
+
+_traza = logging.getLogger(__name__)
+
 
 class EstacionSismologica:
-    # Diccionario de estaciones disponibles
-    ESTACIONES = {
-        "CBA-01": {"nombre": "Córdoba Central", "lat": -31.4201, "lon": -64.1888},
-        "CBA-02": {"nombre": "Córdoba Norte", "lat": -31.3501, "lon": -64.1788},
-        "CBA-03": {"nombre": "Córdoba Sur", "lat": -31.4901, "lon": -64.1988},
-        "MDZ-01": {"nombre": "Mendoza Central", "lat": -32.8908, "lon": -68.8272},
-        "SJN-01": {"nombre": "San Juan Central", "lat": -31.5351, "lon": -68.5364},
-    }
-    
-    def __init__(self, codigo="CBA-01"):
+    __slots__ = ("codigo", "nombre", "latitud", "longitud")
+
+    def __init__(self, codigo, nombre=None, latitud=None, longitud=None):
         self.codigo = codigo
-        self.info = self.ESTACIONES.get(codigo, self.ESTACIONES["CBA-01"])
-    
+        self.nombre = nombre or codigo
+        self.latitud = latitud
+        self.longitud = longitud
+
     def getCodigoEstacion(self) -> str:
-        print(f"-> EstacionSismologica: Obteniendo código de estación: {self.codigo}")
+        _traza.debug("-> EstacionSismologica: Obteniendo código de estación: %s", self.codigo)
         return self.codigo
     
     def getNombreEstacion(self) -> str:
-        return self.info["nombre"]
+        return self.nombre
     
     def getCoordenadas(self) -> tuple:
-        return (self.info["lat"], self.info["lon"])
\ No newline at end of file
+        return (self.latitud, self.longitud)
+
+    def __repr__(self):
+        return f"EstacionSismologica({self.codigo!r}, {self.nombre!r}, {self.latitud}, {self.longitud})"
@@ -1,47 +1,124 @@
 # modelos/estado.py
 
+import logging
+
+_traza = logging.getLogger(__name__)
+
+# Estados del ámbito EventoSismico: el código de cada uno es su posición en la tupla
+NOMBRES_CANONICOS = (
+    "Auto-Detectado",
+    "Pendiente de Revisión",
+    "Bloqueado en Revisión",
+    "Confirmado",
+    "Rechazado",
+    "Pendiente de Revisión Experto",
+)
+
+
 class Estado:
-    def __init__(self, nombre: str):
-        self.nombre = nombre
-        print(f"-> Creada instancia de Estado: {self.nombre}")
+    """
+    Estado de un evento sísmico (flyweight). Hay una única instancia inmutable
+    por nombre, compartida por todo el catálogo: Estado("Confirmado") devuelve
+    siempre el mismo objeto, que además tiene un código entero compacto.
+    Por eso las consultas es*() comparan por identidad y no por texto.
+
+    Los estados de NOMBRES_CANONICOS tienen códigos fijos (0 a 5). Los demás
+    reciben el siguiente código libre al crearse, así que su código depende del
+    orden de creación y sólo vale dentro del proceso: lo que se persiste (base de
+    datos, diario) es el nombre, nunca el código.
+    """
+
+    __slots__ = ("nombre", "codigo")
+
+    _por_nombre = {}
+    # Los lugares de los estados canónicos quedan reservados aunque se creen después que otros
+    _por_codigo = [None] * len(NOMBRES_CANONICOS)
+
+    def __new__(cls, nombre: str):
+        estado = cls._por_nombre.get(nombre)
+        if estado is None:
+            estado = super().__new__(cls)
+            object.__setattr__(estado, "nombre", nombre)
+            if nombre in NOMBRES_CANONICOS:
+                codigo = NOMBRES_CANONICOS.index(nombre)
+                cls._por_codigo[codigo] = estado
+            else:
+                codigo = len(cls._por_codigo)
+                cls._por_codigo.append(estado)
+            object.__setattr__(estado, "codigo", codigo)
+            cls._por_nombre[nombre] = estado
+            _traza.debug("-> Creada instancia de Estado: %s (código %s)", nombre, estado.codigo)
+        return estado
+
+    @classmethod
+    def obtener(cls, nombre: str) -> "Estado":
+        """Instancia canónica del estado con ese nombre"""
+        return cls(nombre)
+
+    @classmethod
+    def desdeCodigo(cls, codigo: int) -> "Estado":
+        """Instancia canónica correspondiente a un código entero de este proceso"""
+        estado = cls._por_codigo[codigo] if 0 <= codigo < len(cls._por_codigo) else None
+        if estado is None:
+            raise ValueError(f"Código de estado desconocido: {codigo}")
+        return estado
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("Estado es inmutable")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("Estado es inmutable")
+
+    def __reduce__(self):
+        # Al copiar o serializar se vuelve a obtener la instancia canónica
+        return (Estado, (self.nombre,))
 
     def esPendienteDeRevision(self) -> bool:
         """Verifica si el estado es 'Pendiente de Revisión'"""
-        resultado = self.nombre == "Pendiente de Revisión"
-        print(f"-> Estado '{self.nombre}': esPendienteDeRevision() = {resultado}")
+        resultado = self is PENDIENTE_DE_REVISION
+        _traza.debug("-> Estado '%s': esPendienteDeRevision() = %s", self.nombre, resultado)
         return resultado
 
     def esAutoDetectado(self) -> bool:
         """Verifica si el estado es 'Auto-Detectado'"""
-        resultado = self.nombre == "Auto-Detectado"
-        print(f"-> Estado '{self.nombre}': esAutoDetectado() = {resultado}")
+        resultado = self is AUTO_DETECTADO
+        _traza.debug("-> Estado '%s': esAutoDetectado() = %s", self.nombre, resultado)
         return resultado
 
     def esBloqueadoEnRevision(self) -> bool:
         """Verifica si el estado es 'Bloqueado en Revisión'"""
-        resultado = self.nombre == "Bloqueado en Revisión"
-        print(f"-> Estado '{self.nombre}': esBloqueadoEnRevision() = {resultado}")
+        resultado = self is BLOQUEADO_EN_REVISION
+        _traza.debug("-> Estado '%s': esBloqueadoEnRevision() = %s", self.nombre, resultado)
         return resultado
 
     def esRechazado(self) -> bool:
         """Verifica si el estado es 'Rechazado'"""
-        resultado = self.nombre == "Rechazado"
-        print(f"-> Estado '{self.nombre}': esRechazado() = {resultado}")
+        resultado = self is RECHAZADO
+        _traza.debug("-> Estado '%s': esRechazado() = %s", self.nombre, resultado)
         return resultado
 
     def esConfirmado(self) -> bool:
         """Verifica si el estado es 'Confirmado'"""
-        resultado = self.nombre == "Confirmado"
-        print(f"-> Estado '{self.nombre}': esConfirmado() = {resultado}")
+        resultado = self is CONFIRMADO
+        _traza.debug("-> Estado '%s': esConfirmado() = %s", self.nombre, resultado)
         return resultado
 
     def esAmbitoEventoSismico(self) -> bool:
         """Verifica si el estado pertenece al ámbito de evento sísmico"""
-        print(f"-> Estado '{self.nombre}': esAmbitoEventoSismico() = True")
+        _traza.debug("-> Estado '%s': esAmbitoEventoSismico() = True", self.nombre)
         return True
 
     def __str__(self):
         return self.nombre
 
     def __repr__(self):
-        return f"Estado('{self.nombre}')"
\ No newline at end of file
+        return f"Estado('{self.nombre}')"
+
+
+# Instancias canónicas de los estados del ámbito EventoSismico (códigos fijos 0 a 5)
+AUTO_DETECTADO = Estado("Auto-Detectado")
+PENDIENTE_DE_REVISION = Estado("Pendiente de Revisión")
+BLOQUEADO_EN_REVISION = Estado("Bloqueado en Revisión")
+CONFIRMADO = Estado("Confirmado")
+RECHAZADO = Estado("Rechazado")
+PENDIENTE_DE_REVISION_EXPERTO = Estado("Pendiente de Revisión Experto")
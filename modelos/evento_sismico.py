@@ -1,5 +1,6 @@
 # modelos/evento_sismico.py
 
+import logging
 from datetime import datetime
 from .cambio_estado import CambioEstado
 from .estado import Estado
@@ -7,48 +8,90 @@ from .alcance_sismo import AlcanceSismo
 from .clasificacion_sismo import ClasificacionSismo
 from .origen_de_generacion import OrigenDeGeneracion
 from .serie_temporal import SerieTemporal
-from .muestra_sismica import MuestraSismica
-from .detalle_muestra_sismica import DetalleMuestraSismica
+
+_traza = logging.getLogger(__name__)
 
 # CORRECCIÓN 3: modelos/evento_sismico.py
 # Agregar atributo fechaHoraFin al EventoSismico
 
 class EventoSismico:
-    def __init__(self, id_sismo: str, fecha: datetime, magnitud: float, estado_inicial: str = "Auto-Detectado", series_data=None):
+    __slots__ = (
+        "id_sismo", "fechaHoraOcurrencia", "fechaHoraFin", "valorMagnitud",
+        "latitudEpicentro", "longitudEpicentro", "profundidad",
+        "estadoActual", "historial_estados", "alcance", "clasificacion", "origen",
+        "_cargador_series", "_series_temporales", "catalogo",
+    )
+
+    def __init__(self, id_sismo: str, fecha: datetime, magnitud: float, estado_inicial: str = "Auto-Detectado", series_data=None,
+                 latitud_epicentro=None, longitud_epicentro=None, profundidad=None, cargador_series=None):
         self.id_sismo = id_sismo
         self.fechaHoraOcurrencia = fecha
         self.fechaHoraFin = None  # CORRECCIÓN 3: Nuevo atributo
         self.valorMagnitud = magnitud
-        self.estadoActual = CambioEstado(Estado(estado_inicial))
+        self.latitudEpicentro = latitud_epicentro
+        self.longitudEpicentro = longitud_epicentro
+        self.profundidad = profundidad
+        self.estadoActual = CambioEstado(Estado.obtener(estado_inicial))
         self.historial_estados = [self.estadoActual]
+        self.catalogo = None  # CatalogoEventos que indexa este evento (se asigna al agregarlo)
         self.alcance = None
         self.clasificacion = None
         self.origen = None
-        self.series_temporales = self._cargar_series(series_data)
+        # Si se indica un cargador, las series se decodifican recién cuando se usan
+        self._cargador_series = cargador_series
+        self._series_temporales = None if cargador_series else self._cargar_series(series_data)
         
-        print(f"-> Creada instancia de EventoSismico ID: {self.id_sismo} en estado '{estado_inicial}'")
+        _traza.debug("-> Creada instancia de EventoSismico ID: %s en estado '%s'", self.id_sismo, estado_inicial)
 
     def setFechaHoraFin(self, fecha_hora=None):
         """Establece la fecha/hora de finalización del evento sísmico"""
         if fecha_hora is None:
             fecha_hora = datetime.now()
         self.fechaHoraFin = fecha_hora
-        print(f"-> EventoSismico {self.id_sismo}: fechaHoraFin establecida a {self.fechaHoraFin}")
+        _traza.debug("-> EventoSismico %s: fechaHoraFin establecida a %s", self.id_sismo, self.fechaHoraFin)
 
     def _cargar_series(self, series_data):
-        """Carga las series temporales desde los datos proporcionados"""
-        lista_series = []
-        if series_data:
-            for serie_d in series_data:
-                serie_obj = SerieTemporal()
-                for muestra_d in serie_d.get('muestras', []):
-                    muestra_obj = MuestraSismica(datetime.fromisoformat(muestra_d['fecha_hora_muestra']))
-                    for detalle_d in muestra_d.get('detalles', []):
-                        detalle_obj = DetalleMuestraSismica(detalle_d['tipo_dato'], detalle_d['valor'])
-                        muestra_obj.agregar_detalle(detalle_obj)
-                    serie_obj.agregar_muestra(muestra_obj)
-                lista_series.append(serie_obj)
-        return lista_series
+        """Carga las series temporales (en modo columnar) desde los datos proporcionados"""
+        if not series_data:
+            return []
+        return [SerieTemporal.desde_datos(serie_d) for serie_d in series_data]
+
+    @property
+    def series_temporales(self):
+        """Series temporales del evento; si son diferidas, se cargan en el primer acceso"""
+        if self._series_temporales is None:
+            self.cargarSeries()
+        return self._series_temporales
+
+    @series_temporales.setter
+    def series_temporales(self, series):
+        self._series_temporales = series
+
+    def cargarSeries(self):
+        """Decodifica las series diferidas mediante el cargador del evento"""
+        if self._series_temporales is None:
+            _traza.debug("-> EventoSismico %s: cargando series temporales diferidas", self.id_sismo)
+            self._series_temporales = self._cargador_series() if self._cargador_series else []
+        return self._series_temporales
+
+    def liberarSeries(self) -> bool:
+        """Descarta las series cargadas si pueden volver a obtenerse del cargador"""
+        if self._cargador_series is None or self._series_temporales is None:
+            return False
+        self._series_temporales = None
+        return True
+
+    def tieneSeriesCargadas(self) -> bool:
+        return self._series_temporales is not None
+
+    def esSeriesDiferidas(self) -> bool:
+        return self._cargador_series is not None
+
+    def getTamanoSeriesBytes(self) -> int:
+        """Bytes ocupados por los arreglos de las series actualmente cargadas"""
+        if self._series_temporales is None:
+            return 0
+        return sum(serie.getTamanoBytes() for serie in self._series_temporales)
 
     # === MÉTODOS DE ESTADO SEGÚN EL DIAGRAMA ===
     
@@ -58,14 +101,14 @@ class EventoSismico:
         SEGÚN EL DIAGRAMA: EventoSismico → :CambioEstado: *esEstadoActual() (iterando estados del evento)
         LUEGO: :EventoSismico → estadoActual:CambioEstado: esAutoDetectado()
         """
-        print(f"-> EventoSismico {self.id_sismo}: estaEnEstadoAutoDetectado()")
+        _traza.debug("-> EventoSismico %s: estaEnEstadoAutoDetectado()", self.id_sismo)
         
         # CORRECCIÓN: Según las anotaciones del PDF, primero verificar si esEstadoActual()
         # Iterando estados del evento para encontrar el estado actual
         for cambio_estado in self.historial_estados:
             if cambio_estado.esEstadoActual():  # Chequeo si fechaHoraFin está en None
                 resultado = cambio_estado.esAutoDetectado()
-                print(f"-> EventoSismico {self.id_sismo}: estaEnEstadoAutoDetectado() = {resultado}")
+                _traza.debug("-> EventoSismico %s: estaEnEstadoAutoDetectado() = %s", self.id_sismo, resultado)
                 return resultado
         
         return False
@@ -76,22 +119,33 @@ class EventoSismico:
         SEGÚN EL DIAGRAMA: EventoSismico → estadoActual:CambioEstado: esPendienteDeRevision()
         LUEGO: estadoActual:CambioEstado → estadoActual:CambioEstado: esDelAmbito()
         """
-        print(f"-> EventoSismico {self.id_sismo}: estaEnEstadoPendienteDeRevision()")
+        _traza.debug("-> EventoSismico %s: estaEnEstadoPendienteDeRevision()", self.id_sismo)
         
         # CORRECCIÓN: Verificar primero si es el estado actual vigente
         if self.estadoActual.esEstadoActual():
             resultado = self.estadoActual.esPendienteDeRevision()
-            print(f"-> EventoSismico {self.id_sismo}: estaEnEstadoPendienteDeRevision() = {resultado}")
+            _traza.debug("-> EventoSismico %s: estaEnEstadoPendienteDeRevision() = %s", self.id_sismo, resultado)
             return resultado
         
         return False
 
     def sosBloqueadoEnRevision(self) -> bool:
         """Verifica si el evento está bloqueado en revisión"""
-        resultado = self.estadoActual.actual.nombre == "Bloqueado en Revisión"
-        print(f"-> EventoSismico {self.id_sismo}: sosBloqueadoEnRevision() = {resultado}")
+        resultado = self.estadoActual.actual.esBloqueadoEnRevision()
+        _traza.debug("-> EventoSismico %s: sosBloqueadoEnRevision() = %s", self.id_sismo, resultado)
         return resultado
 
+    def restaurarHistorialEstados(self, cambios_estado):
+        """
+        Reemplaza el historial inicial por uno ya registrado (en orden cronológico).
+        El último cambio pasa a ser el estado actual; no se notifica al catálogo,
+        por lo que debe hacerse antes de agregar el evento.
+        """
+        if not cambios_estado:
+            return
+        self.historial_estados = list(cambios_estado)
+        self.estadoActual = self.historial_estados[-1]
+
     # === MÉTODOS DE CAMBIO DE ESTADO ===
     
     def cambiarEstadoEventoSismico(self, nuevo_estado_nombre: str):
@@ -102,10 +156,13 @@ class EventoSismico:
         2. Crea nuevo cambio de estado
         3. Actualiza estado actual y agrega al historial
         """
-        print(f"-> EventoSismico {self.id_sismo}: Cambiando estado a '{nuevo_estado_nombre}'")
+        _traza.debug("-> EventoSismico %s: Cambiando estado a '%s'", self.id_sismo, nuevo_estado_nombre)
+        
+        estado_anterior = None
         
         # Finalizar el estado actual
         if self.estadoActual: 
+            estado_anterior = self.estadoActual.actual
             self.estadoActual.setFechHoraFin()
         
         # Crear nuevo cambio de estado
@@ -115,14 +172,18 @@ class EventoSismico:
         self.estadoActual = nuevo_cambio_estado
         self.historial_estados.append(self.estadoActual)
 
+        # Mantener actualizado el índice por estado del catálogo
+        if self.catalogo is not None:
+            self.catalogo.notificarCambioEstado(self, estado_anterior, nuevo_cambio_estado.actual)
+
     def crearCambioEstado(self, nombre_estado: str):
         """
         Crear nuevo cambio de estado según el diagrama.
         Utiliza el método de clase de CambioEstado.
         """
-        print(f"-> EventoSismico {self.id_sismo}: crearCambioEstado('{nombre_estado}')")
+        _traza.debug("-> EventoSismico %s: crearCambioEstado('%s')", self.id_sismo, nombre_estado)
         
-        nuevo_estado = Estado(nombre_estado)
+        nuevo_estado = Estado.obtener(nombre_estado)
         return CambioEstado.crearCambioEstado(nuevo_estado)
 
     def cambiarEstadoEventoSismicoABloqueadoEnRevision(self):
@@ -131,14 +192,14 @@ class EventoSismico:
         LUEGO: seleccionado:EventoSismico → seleccionado:EventoSismico: crearCambioEstado()
         FINALMENTE: seleccionado:EventoSismico → BloqueadoEnRevision:CambioEstado : new()
         """
-        print(f"-> EventoSismico {self.id_sismo}: cambiarEstadoEventoSismicoABloqueadoEnRevision()")
+        _traza.debug("-> EventoSismico %s: cambiarEstadoEventoSismicoABloqueadoEnRevision()", self.id_sismo)
         self.cambiarEstadoEventoSismico("Bloqueado en Revisión")
 
     def cambiarEventoSismicoSeleccionadoARechazado(self):
         """
         CORRECCIÓN: Método específico para rechazo según el diagrama
         """
-        print(f"-> EventoSismico {self.id_sismo}: cambiarEventoSismicoSeleccionadoARechazado()")
+        _traza.debug("-> EventoSismico %s: cambiarEventoSismicoSeleccionadoARechazado()", self.id_sismo)
         self.cambiarEstadoEventoSismico("Rechazado")
 
     def cambiarEventoSismicoARechazado(self):
@@ -163,7 +224,7 @@ class EventoSismico:
         getFechaHoraOcurrencia(), getLatitudEpicentro(), getLongitudEpicentro(),
         getLatitudHipocentro(), getLongitudHipocentro(), getValorMagnitud()
         """
-        print(f"-> EventoSismico {self.id_sismo}: getDatosEventoSismico()")
+        _traza.debug("-> EventoSismico %s: getDatosEventoSismico()", self.id_sismo)
         
         fecha_hora = self.getFechaHoraOcurrencia()
         latitud_epicentro = self.getLatitudEpicentro()
@@ -184,32 +245,36 @@ class EventoSismico:
 
     def getLatitudHipocentro(self) -> float:
         """Obtener latitud del hipocentro (punto de origen bajo tierra)"""
-        print(f"-> EventoSismico {self.id_sismo}: getLatitudHipocentro()")
+        _traza.debug("-> EventoSismico %s: getLatitudHipocentro()", self.id_sismo)
         return -31.4301  # Coordenadas de ejemplo (más profundo que epicentro)
 
     def getLongitudHipocentro(self) -> float:
         """Obtener longitud del hipocentro (punto de origen bajo tierra)"""
-        print(f"-> EventoSismico {self.id_sismo}: getLongitudHipocentro()")
+        _traza.debug("-> EventoSismico %s: getLongitudHipocentro()", self.id_sismo)
         return -64.1988  # Coordenadas de ejemplo (más profundo que epicentro)
 
     def getFechaHoraOcurrencia(self) -> datetime:
         """Obtener fecha y hora de ocurrencia del evento"""
-        print(f"-> EventoSismico {self.id_sismo}: getFechaHoraOcurrencia()")
+        _traza.debug("-> EventoSismico %s: getFechaHoraOcurrencia()", self.id_sismo)
         return self.fechaHoraOcurrencia
 
     def getValorMagnitud(self) -> float:
         """Obtener valor de magnitud del evento"""
-        print(f"-> EventoSismico {self.id_sismo}: getValorMagnitud() = {self.valorMagnitud}")
+        _traza.debug("-> EventoSismico %s: getValorMagnitud() = %s", self.id_sismo, self.valorMagnitud)
         return self.valorMagnitud
 
     def getLatitudEpicentro(self) -> float:
         """Obtener latitud del epicentro (punto en superficie)"""
-        print(f"-> EventoSismico {self.id_sismo}: getLatitudEpicentro()")
+        _traza.debug("-> EventoSismico %s: getLatitudEpicentro()", self.id_sismo)
+        if self.latitudEpicentro is not None:
+            return self.latitudEpicentro
         return -31.4201  # Coordenadas de ejemplo (Córdoba, Argentina)
 
     def getLongitudEpicentro(self) -> float:
         """Obtener longitud del epicentro (punto en superficie)"""
-        print(f"-> EventoSismico {self.id_sismo}: getLongitudEpicentro()")
+        _traza.debug("-> EventoSismico %s: getLongitudEpicentro()", self.id_sismo)
+        if self.longitudEpicentro is not None:
+            return self.longitudEpicentro
         return -64.1888  # Coordenadas de ejemplo (Córdoba, Argentina)
 
     # === MÉTODOS DE DATOS SÍSMICOS ===
@@ -221,35 +286,42 @@ class EventoSismico:
         seleccionado:EventoSismico → :ClasificacionSismo: getDatosClasificacion()
         seleccionado:EventoSismico → :OrigenDeGeneracion: getDatosOrigen()
         """
-        print(f"-> EventoSismico {self.id_sismo}: getDatosSismicosRegistradosParaEventoSismicoSeleccionado()")
+        _traza.debug("-> EventoSismico %s: getDatosSismicosRegistradosParaEventoSismicoSeleccionado()", self.id_sismo)
         
+        # Los valores los asignó el clasificador (asignarClasificacion); sin ellos, "Sin determinar"
         # Obtener datos de alcance
-        alcance_obj = AlcanceSismo()
+        alcance_obj = AlcanceSismo(self.alcance)
         self.alcance = alcance_obj.getDatosAlcance()
         
         # Obtener datos de clasificación  
-        clasificacion_obj = ClasificacionSismo()
+        clasificacion_obj = ClasificacionSismo(self.clasificacion)
         self.clasificacion = clasificacion_obj.getDatosClasificacion()
         
         # Obtener datos de origen
-        origen_obj = OrigenDeGeneracion()
+        origen_obj = OrigenDeGeneracion(self.origen)
         self.origen = origen_obj.getDatosOrigen()
         
         return self
 
+    def asignarClasificacion(self, clasificacion, alcance, origen):
+        """Resultado de las reglas de clasificación para este evento"""
+        self.clasificacion = clasificacion
+        self.alcance = alcance
+        self.origen = origen
+
     def getAlcance(self):
         """Obtener alcance del sismo (Local, Regional, Nacional, etc.)"""
-        print(f"-> EventoSismico {self.id_sismo}: getAlcance() = {self.alcance}")
+        _traza.debug("-> EventoSismico %s: getAlcance() = %s", self.id_sismo, self.alcance)
         return self.alcance
 
     def getClasificacion(self):
         """Obtener clasificación del sismo (Leve, Moderado, Fuerte, etc.)"""
-        print(f"-> EventoSismico {self.id_sismo}: getClasificacion() = {self.clasificacion}")
+        _traza.debug("-> EventoSismico %s: getClasificacion() = %s", self.id_sismo, self.clasificacion)
         return self.clasificacion
 
     def getOrigen(self):
         """Obtener origen del sismo (Tectónico, Volcánico, etc.)"""
-        print(f"-> EventoSismico {self.id_sismo}: getOrigen() = {self.origen}")
+        _traza.debug("-> EventoSismico %s: getOrigen() = %s", self.id_sismo, self.origen)
         return self.origen
 
     # === MÉTODOS DE VALIDACIÓN ===
@@ -261,7 +333,7 @@ class EventoSismico:
         seleccionado:EventoSismico: →seleccionado:EventoSismico: getMagnitud()
         seleccionado:EventoSismico: →seleccionado:EventoSismico: getOrigen()
         """
-        print(f"-> EventoSismico {self.id_sismo}: validarDatosSismo()")
+        _traza.debug("-> EventoSismico %s: validarDatosSismo()", self.id_sismo)
         
         # Obtener y validar alcance
         alcance = self.getAlcance()
@@ -277,7 +349,7 @@ class EventoSismico:
 
     def getMagnitud(self) -> float:
         """Obtener magnitud del evento (alias de getValorMagnitud)"""
-        print(f"-> EventoSismico {self.id_sismo}: getMagnitud()")
+        _traza.debug("-> EventoSismico %s: getMagnitud()", self.id_sismo)
         return self.getValorMagnitud()
 
     def esDeEstacionSismologica(self) -> bool:
@@ -286,7 +358,7 @@ class EventoSismico:
         seleccionado:EventoSismico → seleccionado:EventoSismico: esDeEstacionSismologica()
         seleccionado:EventoSismico → :Sismografo: *sosDeSismografo()
         """
-        print(f"-> EventoSismico {self.id_sismo}: esDeEstacionSismologica()")
+        _traza.debug("-> EventoSismico %s: esDeEstacionSismologica()", self.id_sismo)
         # En un sistema real, verificaría si hay estaciones asociadas
         return True
 
@@ -295,6 +367,6 @@ class EventoSismico:
         SEGÚN EL DIAGRAMA:
         seleccionado:EventoSismico → seleccionado:EventoSismico: getValoresAlcanzadosPorCadaInstanteDeTiempo()
         """
-        print(f"-> EventoSismico {self.id_sismo}: getValoresAlcanzadosPorCadaInstanteDeTiempo()")
+        _traza.debug("-> EventoSismico %s: getValoresAlcanzadosPorCadaInstanteDeTiempo()", self.id_sismo)
         # Lógica para procesar valores por instante de tiempo
         return True
\ No newline at end of file
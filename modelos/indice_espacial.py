@@ -0,0 +1,133 @@
+# modelos/indice_espacial.py
+
+import math
+
+RADIO_TIERRA_KM = 6371.0088
+KM_POR_GRADO = math.pi * RADIO_TIERRA_KM / 180.0
+
+
+def distancia_haversine(lat1, lon1, lat2, lon2) -> float:
+    """Distancia en km sobre la superficie terrestre (esfera media) entre dos puntos en grados"""
+    fi1, fi2 = math.radians(lat1), math.radians(lat2)
+    dfi = fi2 - fi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dfi / 2) ** 2 + math.cos(fi1) * math.cos(fi2) * math.sin(dlambda / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class IndiceEspacial:
+    """
+    Índice de puntos (latitud, longitud) en una grilla de celdas de
+    'tamano_celda' grados: cada celda guarda los puntos que caen en ella.
+
+    - dentroDeRadio() recorre sólo las celdas que tocan el casquete de radio R
+      alrededor del punto (teniendo en cuenta que un grado de longitud se achica
+      hacia los polos y que la grilla da la vuelta en el antimeridiano) y mide
+      la distancia haversine a cada candidato.
+    - masCercanos() repite esa búsqueda duplicando el radio hasta reunir K puntos,
+      de modo que el resultado es exacto y el costo depende de la densidad local,
+      no del total de puntos.
+    """
+
+    def __init__(self, tamano_celda=1.0):
+        self.tamano_celda = tamano_celda
+        self._columnas = max(1, round(360.0 / tamano_celda))
+        self._celdas = {}       # (fila, columna) -> {clave: (latitud, longitud en radianes, cos(latitud))}
+        self._puntos = {}       # clave -> (latitud, longitud, celda)
+
+    def _celda(self, latitud, longitud):
+        fila = math.floor(latitud / self.tamano_celda)
+        columna = math.floor((longitud + 180.0) / self.tamano_celda) % self._columnas
+        return fila, columna
+
+    def agregar(self, clave, latitud, longitud):
+        """Agrega (o mueve) el punto identificado por 'clave'"""
+        if clave in self._puntos:
+            self.quitar(clave)
+        celda = self._celda(latitud, longitud)
+        # Con cada punto se guardan sus coordenadas en radianes y el coseno de la latitud
+        fi = math.radians(latitud)
+        self._celdas.setdefault(celda, {})[clave] = (fi, math.radians(longitud), math.cos(fi))
+        self._puntos[clave] = (latitud, longitud, celda)
+
+    def quitar(self, clave) -> bool:
+        punto = self._puntos.pop(clave, None)
+        if punto is None:
+            return False
+        celda = punto[2]
+        contenido = self._celdas[celda]
+        del contenido[clave]
+        if not contenido:
+            del self._celdas[celda]
+        return True
+
+    def posicion(self, clave):
+        """(latitud, longitud) del punto, o None si no está en el índice"""
+        punto = self._puntos.get(clave)
+        return None if punto is None else punto[:2]
+
+    def _columnas_en(self, latitud, radio_km, longitud):
+        """Columnas de la grilla que puede tocar el casquete, o None si son todas"""
+        angulo = radio_km / RADIO_TIERRA_KM
+        coseno = math.cos(math.radians(latitud))
+        if angulo >= math.pi / 2 or math.sin(angulo) >= coseno:
+            return None     # el casquete alcanza un polo: abarca todas las longitudes
+        dlon = math.degrees(math.asin(math.sin(angulo) / coseno))
+        primera = math.floor((longitud - dlon + 180.0) / self.tamano_celda)
+        ultima = math.floor((longitud + dlon + 180.0) / self.tamano_celda)
+        if ultima - primera + 1 >= self._columnas:
+            return None
+        return [columna % self._columnas for columna in range(primera, ultima + 1)]
+
+    def dentroDeRadio(self, latitud, longitud, radio_km):
+        """Pares (distancia_km, clave) de los puntos a no más de 'radio_km', del más cercano al más lejano"""
+        dlat = math.degrees(radio_km / RADIO_TIERRA_KM)
+        fila_min = math.floor(max(latitud - dlat, -90.0) / self.tamano_celda)
+        fila_max = math.floor(min(latitud + dlat, 90.0) / self.tamano_celda)
+        columnas = self._columnas_en(latitud, radio_km, longitud)
+
+        # Haversine en línea, comparando primero el término 'a' (sin raíz ni arcoseno)
+        # con el que corresponde al radio
+        fi0, lambda0 = math.radians(latitud), math.radians(longitud)
+        coseno0 = math.cos(fi0)
+        limite = math.sin(min(radio_km / RADIO_TIERRA_KM, math.pi) / 2) ** 2
+        sin, asin, sqrt = math.sin, math.asin, math.sqrt
+        resultado = []
+        for _, contenido in self._celdas_en(fila_min, fila_max, columnas):
+            for clave, (fi, lambda_, coseno) in contenido.items():
+                a = sin((fi - fi0) / 2) ** 2 + coseno0 * coseno * sin((lambda_ - lambda0) / 2) ** 2
+                if a <= limite:
+                    resultado.append((2 * RADIO_TIERRA_KM * asin(min(1.0, sqrt(a))), clave))
+        resultado.sort()
+        return resultado
+
+    def _celdas_en(self, fila_min, fila_max, columnas):
+        # Con radios grandes hay menos celdas ocupadas que celdas en el rectángulo: se filtran las ocupadas
+        if columnas is None or (fila_max - fila_min + 1) * len(columnas) > len(self._celdas):
+            columnas = None if columnas is None else set(columnas)
+            return [(celda, contenido) for celda, contenido in self._celdas.items()
+                    if fila_min <= celda[0] <= fila_max and (columnas is None or celda[1] in columnas)]
+        celdas = []
+        for fila in range(fila_min, fila_max + 1):
+            for columna in columnas:
+                contenido = self._celdas.get((fila, columna))
+                if contenido:
+                    celdas.append(((fila, columna), contenido))
+        return celdas
+
+    def masCercanos(self, latitud, longitud, cantidad):
+        """Los 'cantidad' pares (distancia_km, clave) más cercanos al punto"""
+        if cantidad <= 0 or not self._puntos:
+            return []
+        radio = self.tamano_celda * KM_POR_GRADO / 4
+        while True:
+            encontrados = self.dentroDeRadio(latitud, longitud, radio)
+            if len(encontrados) >= cantidad or radio >= math.pi * RADIO_TIERRA_KM:
+                return encontrados[:cantidad]
+            radio *= 2
+
+    def __contains__(self, clave):
+        return clave in self._puntos
+
+    def __len__(self):
+        return len(self._puntos)
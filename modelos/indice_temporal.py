@@ -0,0 +1,77 @@
+# modelos/indice_temporal.py
+
+from bisect import bisect_left, insort
+from itertools import islice
+
+
+class IndiceTemporal:
+    """
+    Índice de eventos ordenado por fechaHoraOcurrencia: una lista de pares
+    (fecha, id_sismo) ordenada, de modo que a igual fecha decide el id.
+
+    - entre(desde, hasta) recorre sólo el rango [desde, hasta) (búsqueda binaria).
+    - Se recorre hacia adelante o hacia atrás sin reordenar.
+    - Mientras se carga el catálogo (antes de la primera consulta) agregar()
+      sólo anota la entrada y el orden se restablece con un único ordenamiento.
+      Con la lista ya ordenada, agregar() y quitar() ubican la entrada por
+      búsqueda binaria: un cambio de estado no vuelve a ordenar nada.
+    """
+
+    __slots__ = ("_entradas", "_ordenado")
+
+    def __init__(self, entradas=()):
+        self._entradas = list(entradas)
+        self._ordenado = False
+
+    def _ordenar(self):
+        if not self._ordenado:
+            self._entradas.sort()
+            self._ordenado = True
+        return self._entradas
+
+    def agregar(self, fecha, id_sismo):
+        entrada = (fecha, id_sismo)
+        entradas = self._entradas
+        if self._ordenado and entradas and entrada < entradas[-1]:
+            insort(entradas, entrada)
+        else:
+            # Carga inicial, o lo habitual con eventos nuevos: la entrada va al final
+            entradas.append(entrada)
+
+    def quitar(self, fecha, id_sismo) -> bool:
+        entradas = self._ordenar()
+        posicion = bisect_left(entradas, (fecha, id_sismo))
+        if posicion < len(entradas) and entradas[posicion] == (fecha, id_sismo):
+            del entradas[posicion]
+            return True
+        return False
+
+    def _rango(self, desde, hasta):
+        entradas = self._ordenar()
+        inicio = 0 if desde is None else bisect_left(entradas, (desde,))
+        fin = len(entradas) if hasta is None else bisect_left(entradas, (hasta,))
+        return inicio, max(fin, inicio)
+
+    def entre(self, desde=None, hasta=None, descendente=False):
+        """Pares (fecha, id_sismo) con desde <= fecha < hasta (None: sin límite), en orden cronológico o inverso"""
+        inicio, fin = self._rango(desde, hasta)
+        posiciones = range(fin - 1, inicio - 1, -1) if descendente else range(inicio, fin)
+        entradas = self._entradas
+        return (entradas[i] for i in posiciones)
+
+    def contar(self, desde=None, hasta=None) -> int:
+        inicio, fin = self._rango(desde, hasta)
+        return fin - inicio
+
+    def ultimos(self, cantidad):
+        """Los 'cantidad' pares más recientes, del más reciente al más antiguo"""
+        return list(islice(self.entre(descendente=True), cantidad))
+
+    def __iter__(self):
+        return iter(self._ordenar())
+
+    def __reversed__(self):
+        return reversed(self._ordenar())
+
+    def __len__(self):
+        return len(self._entradas)
@@ -1,4 +1,10 @@
+import logging
+
+_traza = logging.getLogger(__name__)
+
 class MuestraSismica:
+    __slots__ = ("fecha_hora_muestra", "detalles")
+
     def __init__(self, fecha_hora):
         self.fecha_hora_muestra = fecha_hora
         self.detalles = []
@@ -8,7 +14,7 @@ class MuestraSismica:
 
     def getDatos(self):
         """Obtener datos de la muestra sísmica"""
-        print("-> MuestraSismica: getDatos()")
+        _traza.debug("-> MuestraSismica: getDatos()")
         return {
             "fecha_hora": self.fecha_hora_muestra,
             "cantidad_detalles": len(self.detalles),
@@ -1,4 +1,15 @@
+import logging
+
+_traza = logging.getLogger(__name__)
+
 class OrigenDeGeneracion:
+    """Origen de generación del sismo (Tectónico, Volcánico, etc.); el valor lo asignan las reglas de casos_de_uso.clasificador_sismos"""
+
+    SIN_DATOS = "Sin determinar"
+
+    def __init__(self, nombre=None):
+        self.nombre = nombre
+
     def getDatosOrigen(self) -> str:
-        print("-> OrigenDeGeneracion: Obteniendo datos del origen")
-        return "Tectónico"
\ No newline at end of file
+        _traza.debug("-> OrigenDeGeneracion: Obteniendo datos del origen")
+        return self.nombre if self.nombre is not None else self.SIN_DATOS
\ No newline at end of file
@@ -0,0 +1,56 @@
+# modelos/registro_estaciones.py
+
+from .indice_espacial import IndiceEspacial
+
+
+class RegistroEstaciones:
+    """
+    Estaciones sismológicas de la red, por código y por ubicación. Las
+    consultas espaciales ("estaciones a menos de R km del epicentro", "las K
+    más cercanas") usan un IndiceEspacial con distancias haversine y
+    devuelven pares (distancia_km, EstacionSismologica).
+    """
+
+    TAMANO_CELDA_GRADOS = 1.0
+
+    def __init__(self, estaciones=()):
+        self._por_codigo = {}
+        self._indice = IndiceEspacial(self.TAMANO_CELDA_GRADOS)
+        for estacion in estaciones:
+            self.agregar(estacion)
+
+    def agregar(self, estacion):
+        """Incorpora una estación (reemplaza a otra con el mismo código)"""
+        self._por_codigo[estacion.codigo] = estacion
+        if estacion.latitud is not None and estacion.longitud is not None:
+            self._indice.agregar(estacion.codigo, estacion.latitud, estacion.longitud)
+        else:
+            self._indice.quitar(estacion.codigo)
+
+    def quitar(self, codigo):
+        self._indice.quitar(codigo)
+        return self._por_codigo.pop(codigo)
+
+    def obtener(self, codigo):
+        """Estación con el código indicado, o None si no está registrada"""
+        return self._por_codigo.get(codigo)
+
+    def _con_estaciones(self, pares):
+        return [(distancia, self._por_codigo[codigo]) for distancia, codigo in pares]
+
+    def estacionesEnRadio(self, latitud, longitud, radio_km):
+        """Estaciones a no más de 'radio_km' del punto, de la más cercana a la más lejana"""
+        return self._con_estaciones(self._indice.dentroDeRadio(latitud, longitud, radio_km))
+
+    def estacionesMasCercanas(self, latitud, longitud, cantidad):
+        """Las 'cantidad' estaciones más cercanas al punto"""
+        return self._con_estaciones(self._indice.masCercanos(latitud, longitud, cantidad))
+
+    def __contains__(self, codigo):
+        return codigo in self._por_codigo
+
+    def __iter__(self):
+        return iter(self._por_codigo.values())
+
+    def __len__(self):
+        return len(self._por_codigo)
@@ -1,14 +1,259 @@
+# modelos/serie_temporal.py
+
+import logging
+from datetime import datetime
+from utilidades.importacion_diferida import modulo_diferido
+from .muestra_sismica import MuestraSismica
+from .detalle_muestra_sismica import DetalleMuestraSismica
+
+_traza = logging.getLogger(__name__)
+
+# NumPy se importa al usarse por primera vez (ver utilidades.importacion_diferida)
+np = modulo_diferido("numpy")
+
+# Tipos de dato conocidos, en el orden en que se materializan los detalles
+TIPOS_DE_DATO = ("velocidad_onda", "frecuencia_onda", "longitud_onda")
+# Clave bajo la que la serie guarda su resumen (ver getResumen)
+CLAVE_RESUMEN = "serie.resumen"
+# Clave bajo la que la serie guarda sus muestras materializadas como objetos (ver muestras)
+CLAVE_MUESTRAS = "serie.muestras"
+
+
+def _resumir_columna(tiempos, columna):
+    """
+    Valores alcanzados por una columna: pico (el de mayor valor absoluto) y su
+    instante, RMS, media, duración en segundos entre la primera y la última
+    muestra con valor, y cantidad de muestras con valor. None si no tiene valores.
+    """
+    validos = ~np.isnan(columna)
+    cantidad = int(np.count_nonzero(validos))
+    if cantidad == 0:
+        return None
+    if cantidad < len(columna):
+        indices = np.flatnonzero(validos)
+        tiempos, columna = tiempos[indices], columna[indices]
+    # El pico es el máximo o el mínimo, según cuál tenga mayor valor absoluto (sin armar |columna|)
+    indice_maximo, indice_minimo = int(np.argmax(columna)), int(np.argmin(columna))
+    indice_pico = indice_maximo if columna[indice_maximo] >= -columna[indice_minimo] else indice_minimo
+    return {
+        "pico": float(columna[indice_pico]),
+        "instante_pico": tiempos[indice_pico].item(),
+        "rms": float(np.sqrt(np.dot(columna, columna) / cantidad)),
+        "media": float(columna.mean()),
+        "duracion_s": float((tiempos[-1] - tiempos[0]) / np.timedelta64(1, "s")),
+        "cantidad": cantidad,
+    }
+
+
 class SerieTemporal:
-    def __init__(self):
-        self.muestras = []
+    """
+    Serie temporal almacenada en modo columnar: un vector de instantes
+    (datetime64[us]) y un arreglo de floats por tipo de dato. Un valor NaN
+    indica que la muestra no tiene detalle de ese tipo.
+
+    'muestras' sigue disponible para el código que recorre objetos: es una
+    vista de sólo lectura (una tupla) que se materializa en el primer acceso a
+    partir de las columnas y se conserva, como los demás derivados, hasta que
+    la serie cambie o se libere.
+
+    getDerivado() guarda datos calculados a partir de las columnas (por ejemplo
+    la pirámide de decimación del sismograma) hasta que la serie cambie. Por
+    eso las columnas que entrega la serie son de sólo lectura: la serie cambia
+    únicamente con agregar_muestra(), que descarta los derivados.
+    """
+
+    __slots__ = ("_tiempos", "_valores", "_pendientes", "_derivados", "codigo_estacion")
+
+    def __init__(self, tiempos=None, valores=None, codigo_estacion=None):
+        if tiempos is None:
+            tiempos = np.empty(0, dtype="datetime64[us]")
+        self._tiempos = self._solo_lectura(np.asarray(tiempos, dtype="datetime64[us]"))
+        self._valores = {
+            tipo: self._como_columna(columna)
+            for tipo, columna in (valores or {}).items()
+        }
+        # Muestras agregadas como objetos que aún no se volcaron a las columnas
+        # (la lista se crea recién con la primera)
+        self._pendientes = None
+        # Datos derivados de las columnas, por clave (se crea con el primero)
+        self._derivados = None
+        # Estación que registró la serie, si se conoce (las del catálogo JSON no lo indican)
+        self.codigo_estacion = codigo_estacion
+
+    @staticmethod
+    def _solo_lectura(arreglo):
+        """Vista de sólo lectura del arreglo (el arreglo recibido no se modifica)"""
+        if arreglo.flags.writeable:
+            arreglo = arreglo.view()
+            arreglo.flags.writeable = False
+        return arreglo
+
+    @classmethod
+    def _como_columna(cls, columna):
+        """Convierte una secuencia de valores en un arreglo de punto flotante de sólo lectura"""
+        arreglo = np.asarray(columna)
+        if arreglo.dtype.kind != "f":
+            arreglo = arreglo.astype(np.float64)
+        return cls._solo_lectura(arreglo)
+
+    @classmethod
+    def desde_datos(cls, serie_data):
+        """Construye la serie en modo columnar desde el esquema de sismos.json"""
+        muestras_data = serie_data.get("muestras", [])
+        cantidad = len(muestras_data)
+
+        instantes = [m["fecha_hora_muestra"] for m in muestras_data]
+        try:
+            tiempos = np.array(instantes, dtype="datetime64[us]")
+        except ValueError:
+            # Formatos ISO que NumPy no interpreta (por ejemplo con zona horaria)
+            tiempos = np.array(
+                [datetime.fromisoformat(i) for i in instantes], dtype="datetime64[us]"
+            )
+
+        valores = {}
+        for indice, muestra_d in enumerate(muestras_data):
+            for detalle_d in muestra_d.get("detalles", []):
+                columna = valores.get(detalle_d["tipo_dato"])
+                if columna is None:
+                    columna = np.full(cantidad, np.nan)
+                    valores[detalle_d["tipo_dato"]] = columna
+                columna[indice] = detalle_d["valor"]
+
+        return cls(tiempos, valores)
+
+    # === ACCESO COLUMNAR ===
+
+    def _volcar_pendientes(self):
+        """Incorpora a las columnas las muestras agregadas como objetos"""
+        if not self._pendientes:
+            return
+        pendientes, self._pendientes = self._pendientes, None
+        cantidad_previa = len(self._tiempos)
+        cantidad = cantidad_previa + len(pendientes)
+
+        tiempos_nuevos = np.array(
+            [m.fecha_hora_muestra for m in pendientes], dtype="datetime64[us]"
+        )
+        self._tiempos = self._solo_lectura(np.concatenate([self._tiempos, tiempos_nuevos]))
+
+        for tipo, columna in list(self._valores.items()):
+            extendida = np.full(cantidad, np.nan, dtype=columna.dtype)
+            extendida[:cantidad_previa] = columna
+            self._valores[tipo] = extendida
+        for desplazamiento, muestra in enumerate(pendientes):
+            for detalle in muestra.detalles:
+                columna = self._valores.get(detalle.tipo_dato)
+                if columna is None:
+                    columna = np.full(cantidad, np.nan)
+                    self._valores[detalle.tipo_dato] = columna
+                columna[cantidad_previa + desplazamiento] = detalle.valor
+        for tipo, columna in self._valores.items():
+            self._valores[tipo] = self._solo_lectura(columna)
+
+    @property
+    def tiempos(self):
+        """Vector de instantes de las muestras (datetime64[us])"""
+        self._volcar_pendientes()
+        return self._tiempos
+
+    @property
+    def valores(self):
+        """Diccionario tipo_dato -> arreglo de valores"""
+        self._volcar_pendientes()
+        return self._valores
+
+    def getValores(self, tipo_dato):
+        """Arreglo de valores de un tipo de dato, o None si la serie no lo registra"""
+        return self.valores.get(tipo_dato)
+
+    def getTiemposSegundos(self):
+        """Segundos transcurridos desde la primera muestra de la serie"""
+        tiempos = self.tiempos
+        if len(tiempos) == 0:
+            return np.empty(0)
+        return (tiempos - tiempos[0]) / np.timedelta64(1, "s")
+
+    def getTasaMuestreo(self):
+        """Tasa de muestreo en Hz si el intervalo entre muestras es constante, si no None"""
+        tiempos_us = self.tiempos.view(np.int64)
+        if len(tiempos_us) < 2:
+            return None
+        intervalos = np.diff(tiempos_us)
+        if intervalos[0] <= 0 or not np.all(intervalos == intervalos[0]):
+            return None
+        return 1e6 / float(intervalos[0])
+
+    def getDerivado(self, clave, calcular):
+        """
+        Dato derivado de la serie guardado bajo 'clave'; si no está, lo obtiene
+        con calcular(serie) y lo conserva hasta que se agreguen muestras.
+        """
+        self._volcar_pendientes()
+        if self._derivados is None:
+            self._derivados = {}
+        derivado = self._derivados.get(clave)
+        if derivado is None:
+            derivado = calcular(self)
+            self._derivados[clave] = derivado
+        return derivado
+
+    def getResumen(self):
+        """
+        Valores alcanzados por cada tipo de dato ({tipo_dato: dict de _resumir_columna}),
+        calculados sobre las columnas en una sola pasada vectorial y guardados hasta
+        que la serie cambie.
+        """
+        return self.getDerivado(CLAVE_RESUMEN, lambda serie: {
+            tipo: resumen
+            for tipo, resumen in ((tipo, _resumir_columna(serie._tiempos, columna))
+                                  for tipo, columna in serie._valores.items())
+            if resumen is not None
+        })
+
+    def cantidadMuestras(self) -> int:
+        return len(self._tiempos) + len(self._pendientes or ())
+
+    def getTamanoBytes(self) -> int:
+        """Bytes ocupados por los arreglos de la serie"""
+        self._volcar_pendientes()
+        return self._tiempos.nbytes + sum(columna.nbytes for columna in self._valores.values())
+
+    # === VISTA DE OBJETOS ===
 
     def agregar_muestra(self, muestra):
-        self.muestras.append(muestra)
+        # Los datos derivados dejan de corresponder a la serie
+        self._derivados = None
+        if self._pendientes is None:
+            self._pendientes = []
+        self._pendientes.append(muestra)
+
+    @property
+    def muestras(self):
+        """Muestras y sus detalles como objetos, materializados una vez a partir de las columnas"""
+        return self.getDerivado(CLAVE_MUESTRAS, SerieTemporal._materializar_muestras)
+
+    def _materializar_muestras(self):
+        tipos = [t for t in TIPOS_DE_DATO if t in self._valores]
+        tipos += [t for t in self._valores if t not in TIPOS_DE_DATO]
+        columnas = [(tipo, self._valores[tipo].tolist()) for tipo in tipos]
+
+        lista_muestras = []
+        for indice, instante in enumerate(self._tiempos.tolist()):
+            muestra = MuestraSismica(instante)
+            for tipo, valores in columnas:
+                valor = valores[indice]
+                if valor == valor:  # descarta NaN (muestra sin ese tipo de dato)
+                    muestra.agregar_detalle(DetalleMuestraSismica(tipo, valor))
+            lista_muestras.append(muestra)
+        return tuple(lista_muestras)
 
     def getDatos(self):
         """Obtener datos de la serie temporal"""
-        print("-> SerieTemporal: getDatos()")
+        _traza.debug("-> SerieTemporal: getDatos()")
+        # Se entregan las columnas; materializar 'muestras' aquí recorrería toda la serie
         return {
-            "cantidad_muestras": len(self.muestras),
-            "muestras": self.muestras
-        }
\ No newline at end of file
+            "cantidad_muestras": self.cantidadMuestras(),
+            "tiempos": self.tiempos,
+            "valores": self.valores
+        }
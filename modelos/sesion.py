@@ -1,6 +1,10 @@
+import logging
+
+_traza = logging.getLogger(__name__)
+
 class Sesion:
     """ Representa la sesión del usuario actual en el sistema. """
     def getEmpleado(self) -> str:
-        print("-> Sesion: Obteniendo empleado actual")
+        _traza.debug("-> Sesion: Obteniendo empleado actual")
         # Refleja la instancia 'Actual:Sesion'
         return "Analista A"
\ No newline at end of file
@@ -1,9 +1,16 @@
+import logging
+
+_traza = logging.getLogger(__name__)
+
 class Sismografo:
+    def __init__(self, estacion=None):
+        # EstacionSismologica en la que está instalado
+        self.estacion = estacion
+
     def sosDeSismografo(self) -> bool:
-        print("-> Sismografo: Verificando si es de sismógrafo")
+        _traza.debug("-> Sismografo: Verificando si es de sismógrafo")
         return True
 
     def getEstacionSismologica(self):
-        print("-> Sismografo: Obteniendo estación sismológica asociada")
-        from .estacion_sismologica import EstacionSismologica
-        return EstacionSismologica()
\ No newline at end of file
+        _traza.debug("-> Sismografo: Obteniendo estación sismológica asociada")
+        return self.estacion
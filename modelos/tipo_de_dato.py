@@ -1,32 +1,82 @@
+import logging
+
+_traza = logging.getLogger(__name__)
+
 class TipoDeDato:
-    def __init__(self, nombre_tipo):
-        self.nombre_tipo = nombre_tipo
+    """
+    Tipo de dato de un detalle de muestra (flyweight): una única instancia
+    inmutable por nombre, con código entero, compartida por todos los detalles.
+    El código depende del orden de creación: sólo vale dentro del proceso.
+    """
+
+    __slots__ = ("nombre_tipo", "codigo")
+
+    _por_nombre = {}
+    _por_codigo = []
+
+    _DENOMINACIONES = {
+        "velocidad_onda": "Velocidad",
+        "frecuencia_onda": "Frecuencia", 
+        "longitud_onda": "Longitud"
+    }
+
+    def __new__(cls, nombre_tipo):
+        tipo = cls._por_nombre.get(nombre_tipo)
+        if tipo is None:
+            tipo = super().__new__(cls)
+            object.__setattr__(tipo, "nombre_tipo", nombre_tipo)
+            object.__setattr__(tipo, "codigo", len(cls._por_codigo))
+            cls._por_nombre[nombre_tipo] = tipo
+            cls._por_codigo.append(tipo)
+        return tipo
+
+    @classmethod
+    def obtener(cls, nombre_tipo) -> "TipoDeDato":
+        """Instancia canónica del tipo de dato con ese nombre"""
+        return cls(nombre_tipo)
+
+    @classmethod
+    def desdeCodigo(cls, codigo: int) -> "TipoDeDato":
+        return cls._por_codigo[codigo]
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("TipoDeDato es inmutable")
+
+    def __delattr__(self, nombre):
+        raise AttributeError("TipoDeDato es inmutable")
+
+    def __reduce__(self):
+        return (TipoDeDato, (self.nombre_tipo,))
 
     def esVelocidadDeOnda(self) -> bool:
         """Verificar si es Velocidad de Onda"""
-        resultado = self.nombre_tipo == "velocidad_onda"
-        print(f"-> TipoDeDato: esVelocidadDeOnda() = {resultado}")
+        resultado = self is VELOCIDAD_ONDA
+        _traza.debug("-> TipoDeDato: esVelocidadDeOnda() = %s", resultado)
         return resultado
 
     def esFrecuenciaDeOnda(self) -> bool:
         """Verificar si es Frecuencia de Onda"""
-        resultado = self.nombre_tipo == "frecuencia_onda"
-        print(f"-> TipoDeDato: esFrecuenciaDeOnda() = {resultado}")
+        resultado = self is FRECUENCIA_ONDA
+        _traza.debug("-> TipoDeDato: esFrecuenciaDeOnda() = %s", resultado)
         return resultado
 
     def esLongitud(self) -> bool:
         """Verificar si es Longitud"""
-        resultado = self.nombre_tipo == "longitud_onda"
-        print(f"-> TipoDeDato: esLongitud() = {resultado}")
+        resultado = self is LONGITUD_ONDA
+        _traza.debug("-> TipoDeDato: esLongitud() = %s", resultado)
         return resultado
 
     def getDenominacion(self) -> str:
         """Obtener denominación del tipo de dato"""
-        denominaciones = {
-            "velocidad_onda": "Velocidad",
-            "frecuencia_onda": "Frecuencia", 
-            "longitud_onda": "Longitud"
-        }
-        denominacion = denominaciones.get(self.nombre_tipo, "Desconocido")
-        print(f"-> TipoDeDato: getDenominacion() = {denominacion}")
-        return denominacion
\ No newline at end of file
+        denominacion = self._DENOMINACIONES.get(self.nombre_tipo, "Desconocido")
+        _traza.debug("-> TipoDeDato: getDenominacion() = %s", denominacion)
+        return denominacion
+
+    def __repr__(self):
+        return f"TipoDeDato('{self.nombre_tipo}')"
+
+
+# Instancias canónicas de los tipos de dato registrados por las estaciones
+VELOCIDAD_ONDA = TipoDeDato("velocidad_onda")
+FRECUENCIA_ONDA = TipoDeDato("frecuencia_onda")
+LONGITUD_ONDA = TipoDeDato("longitud_onda")
@@ -0,0 +1,148 @@
+# persistencia/almacen_ondas.py
+
+import argparse
+import json
+import os
+from functools import partial
+from modelos.serie_temporal import SerieTemporal
+from utilidades.importacion_diferida import modulo_diferido
+from .lector_json import iterar_eventos_json, firma_archivo, cabecera_evento
+
+np = modulo_diferido("numpy")
+
+EXTENSION_DATOS = ".ondas.bin"
+EXTENSION_INDICE = ".ondas.json"
+VERSION = 1
+_ALINEACION = 8
+
+
+class AlmacenOndas:
+    """
+    Almacén binario de formas de onda. Consta de dos archivos:
+
+    - '<base>.ondas.bin': bloques contiguos (alineados a 8 bytes) con los
+      instantes de cada serie (int64, microsegundos desde la época) y un
+      bloque float32/float64 por tipo de dato.
+    - '<base>.ondas.json': índice id_sismo -> cabecera del evento y, por
+      serie, cantidad de muestras, tasa de muestreo y offset/dtype de cada bloque.
+
+    Las series se abren como vistas de un único numpy.memmap del archivo de
+    datos, sin copiar ni interpretar valores: abrir un evento cuesta los
+    fallos de página de los bloques que efectivamente se leen.
+    """
+
+    def __init__(self, ruta_base):
+        self.ruta_datos = ruta_base + EXTENSION_DATOS
+        self.ruta_indice = ruta_base + EXTENSION_INDICE
+        with open(self.ruta_indice, "r", encoding="utf-8") as archivo:
+            indice = json.load(archivo)
+        if indice.get("version") != VERSION:
+            raise ValueError(f"versión de almacén no soportada: {indice.get('version')}")
+        self.origen = indice.get("origen")
+        self._eventos = indice["eventos"]
+        self._mapa = None
+
+    @staticmethod
+    def existe(ruta_base) -> bool:
+        return os.path.exists(ruta_base + EXTENSION_DATOS) and os.path.exists(ruta_base + EXTENSION_INDICE)
+
+    def _datos(self):
+        """Mapa en memoria (sólo lectura) del archivo de datos, abierto en el primer uso"""
+        if self._mapa is None:
+            if os.path.getsize(self.ruta_datos) == 0:
+                self._mapa = np.empty(0, dtype=np.uint8)
+            else:
+                self._mapa = np.memmap(self.ruta_datos, dtype=np.uint8, mode="r")
+        return self._mapa
+
+    def cabeceras(self):
+        """Cabeceras de los eventos almacenados, en el orden del catálogo original"""
+        return [entrada["cabecera"] for entrada in self._eventos.values()]
+
+    def __contains__(self, id_sismo):
+        return id_sismo in self._eventos
+
+    def abrirSeries(self, id_sismo):
+        """Series del evento como vistas del mapa en memoria (sin copias)"""
+        datos = self._datos()
+        series = []
+        for serie_i in self._eventos[id_sismo]["series"]:
+            cantidad = serie_i["cantidad"]
+            bloque = serie_i["tiempos"]
+            tiempos = np.frombuffer(
+                datos, dtype=bloque["dtype"], count=cantidad, offset=bloque["offset"]
+            ).view("datetime64[us]")
+            valores = {
+                tipo: np.frombuffer(datos, dtype=bloque["dtype"], count=cantidad, offset=bloque["offset"])
+                for tipo, bloque in serie_i["canales"].items()
+            }
+            series.append(SerieTemporal(tiempos, valores))
+        return series
+
+    def cargadorSeries(self, id_sismo):
+        """Cargador diferido para EventoSismico"""
+        return partial(self.abrirSeries, id_sismo)
+
+    def getInfoSeries(self, id_sismo):
+        """Metadatos de las series de un evento (cantidad de muestras, tasa de muestreo y tipos de dato)"""
+        return [
+            {"cantidad": s["cantidad"], "tasa_muestreo": s["tasa_muestreo"], "tipos_dato": list(s["canales"])}
+            for s in self._eventos[id_sismo]["series"]
+        ]
+
+
+def convertir_json_a_almacen(ruta_json, ruta_base, dtype="float64"):
+    """
+    Convierte un catálogo con el esquema de sismos.json en un almacén de ondas.
+    El catálogo se recorre evento por evento, por lo que la memoria necesaria
+    está acotada por el evento más grande. Devuelve la cantidad de eventos.
+    """
+    dtype = np.dtype(dtype)
+    eventos = {}
+    ruta_datos = ruta_base + EXTENSION_DATOS
+    ruta_indice = ruta_base + EXTENSION_INDICE
+    if os.path.exists(ruta_indice):
+        os.remove(ruta_indice)  # el almacén anterior queda inválido mientras se reescribe
+
+    with open(ruta_datos, "wb") as datos:
+        def escribir_bloque(arreglo):
+            relleno = (-datos.tell()) % _ALINEACION
+            if relleno:
+                datos.write(b"\0" * relleno)
+            offset = datos.tell()
+            datos.write(np.ascontiguousarray(arreglo).tobytes())
+            return {"offset": offset, "dtype": arreglo.dtype.str}
+
+        for sismo_data in iterar_eventos_json(ruta_json):
+            series_i = []
+            for serie_d in sismo_data.get("series_temporales", []):
+                serie = SerieTemporal.desde_datos(serie_d)
+                tiempos_us = serie.tiempos.view(np.int64)
+                series_i.append({
+                    "cantidad": serie.cantidadMuestras(),
+                    "tasa_muestreo": serie.getTasaMuestreo(),
+                    "tiempos": escribir_bloque(tiempos_us),
+                    "canales": {
+                        tipo: escribir_bloque(columna.astype(dtype, copy=False))
+                        for tipo, columna in serie.valores.items()
+                    },
+                })
+            eventos[sismo_data["id_sismo"]] = {"cabecera": cabecera_evento(sismo_data), "series": series_i}
+
+    # El índice se escribe al final: un almacén sin índice no se considera válido
+    indice = {"version": VERSION, "origen": firma_archivo(ruta_json), "eventos": eventos}
+    with open(ruta_indice, "w", encoding="utf-8") as archivo:
+        json.dump(indice, archivo, ensure_ascii=False)
+    return len(eventos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convierte sismos.json en un almacén binario de ondas")
+    parser.add_argument("catalogo", help="catálogo JSON de origen (esquema de sismos.json)")
+    parser.add_argument("destino", nargs="?", help="ruta base del almacén (por defecto, la del catálogo sin extensión)")
+    parser.add_argument("--dtype", choices=["float32", "float64"], default="float64")
+    argumentos = parser.parse_args()
+
+    destino = argumentos.destino or os.path.splitext(argumentos.catalogo)[0]
+    cantidad = convertir_json_a_almacen(argumentos.catalogo, destino, argumentos.dtype)
+    print(f"Almacén '{destino}' generado con {cantidad} eventos")
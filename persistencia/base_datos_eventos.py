@@ -0,0 +1,605 @@
+# persistencia/base_datos_eventos.py
+
+import heapq
+import json
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+from operator import itemgetter
+from modelos.cambio_estado import CambioEstado
+from modelos.estado import NOMBRES_CANONICOS, Estado
+from modelos.serie_temporal import SerieTemporal
+from .lector_json import iterar_eventos_ubicados_json, cabecera_evento
+from .catalogo_fragmentado import leer_fragmentos
+
+_traza = logging.getLogger(__name__)
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS metadatos (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS eventos (
+    id_sismo TEXT PRIMARY KEY,
+    fecha_hora_ocurrencia TEXT NOT NULL,
+    valor_magnitud REAL,
+    latitud_epicentro REAL,
+    longitud_epicentro REAL,
+    profundidad REAL,
+    estado_actual TEXT NOT NULL,        -- nombre del estado del cambio de estado vigente
+    fuente_inicio INTEGER,              -- ubicación del evento en el catálogo JSON
+    fuente_longitud INTEGER,
+    fuente_archivo TEXT,                -- fragmento que lo contiene (catálogo en un directorio)
+    bloqueado_por TEXT,                 -- estación que lo tiene Bloqueado en Revisión (o NULL)
+    vence REAL                          -- vencimiento de ese bloqueo (segundos del reloj del sistema)
+);
+-- Índice cubriente del listado por estado: las filas (id, fecha, magnitud) salen
+-- del índice, en orden de fecha, sin leer la tabla
+DROP INDEX IF EXISTS eventos_por_estado;
+CREATE INDEX IF NOT EXISTS eventos_por_estado_fecha
+    ON eventos (estado_actual, fecha_hora_ocurrencia, id_sismo, valor_magnitud);
+CREATE INDEX IF NOT EXISTS eventos_por_fecha ON eventos (fecha_hora_ocurrencia);
+
+CREATE TABLE IF NOT EXISTS cambios_estado (
+    id_cambio INTEGER PRIMARY KEY,
+    id_sismo TEXT NOT NULL REFERENCES eventos (id_sismo),
+    estado TEXT NOT NULL,               -- nombre del estado
+    fecha_hora_inicio TEXT NOT NULL,
+    fecha_hora_fin TEXT
+);
+CREATE INDEX IF NOT EXISTS cambios_por_evento ON cambios_estado (id_sismo, id_cambio);
+
+CREATE TABLE IF NOT EXISTS series (
+    id_sismo TEXT NOT NULL REFERENCES eventos (id_sismo),
+    indice INTEGER NOT NULL,
+    cantidad_muestras INTEGER NOT NULL,
+    tasa_muestreo REAL,
+    tipos_dato TEXT,
+    fecha_hora_inicio TEXT,
+    fecha_hora_fin TEXT,
+    PRIMARY KEY (id_sismo, indice)
+) WITHOUT ROWID;
+
+-- Resultado de las reglas de clasificación (la firma de las reglas usadas está en metadatos)
+CREATE TABLE IF NOT EXISTS clasificaciones (
+    id_sismo TEXT PRIMARY KEY REFERENCES eventos (id_sismo),
+    clasificacion TEXT NOT NULL,
+    alcance TEXT NOT NULL,
+    origen TEXT NOT NULL
+) WITHOUT ROWID;
+
+-- Rasgos de las formas de onda ya procesadas, para que las reglas los usen sin leer las series
+CREATE TABLE IF NOT EXISTS rasgos_onda (
+    id_sismo TEXT PRIMARY KEY REFERENCES eventos (id_sismo),
+    pico_velocidad REAL,
+    frecuencia_media REAL
+) WITHOUT ROWID;
+"""
+
+_COLUMNAS_EVENTO = (
+    "id_sismo, fecha_hora_ocurrencia, valor_magnitud, latitud_epicentro, "
+    "longitud_epicentro, profundidad, estado_actual, fuente_inicio, fuente_longitud, fuente_archivo"
+)
+
+
+def _texto_fecha(fecha):
+    """Fecha en ISO con microsegundos: el orden lexicográfico coincide con el cronológico"""
+    if fecha is None:
+        return None
+    if isinstance(fecha, str):
+        fecha = datetime.fromisoformat(fecha)
+    return fecha.isoformat(timespec="microseconds")
+
+
+def _fecha_desde_texto(texto):
+    return datetime.fromisoformat(texto) if texto is not None else None
+
+
+class BaseDatosEventos:
+    """
+    Persistencia del catálogo en SQLite (modo WAL):
+
+    - 'eventos': cabecera de cada evento y el nombre de su estado actual (indexado junto con
+      la fecha de ocurrencia, de modo que la búsqueda de eventos pendientes de
+      revisión recorre sólo el rango del índice que corresponde a esos estados).
+    - 'cambios_estado': historial completo de CambioEstado (fechaHoraInicio/fechaHoraFin).
+    - 'series': metadatos de las series temporales; las muestras siguen en el
+      catálogo JSON o en el almacén de ondas.
+
+    Las consultas devuelven cabeceras con el esquema de sismos.json para que el
+    gestor construya los EventoSismico como con cualquier otra fuente.
+    La conexión se comparte entre hilos protegida por un lock.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._lock = threading.RLock()
+        self._conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self._conexion.row_factory = sqlite3.Row
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.execute("PRAGMA foreign_keys=ON")
+        with self._conexion:
+            self._conexion.executescript(_ESQUEMA)
+            columnas = {fila["name"] for fila in self._conexion.execute("PRAGMA table_info(eventos)")}
+            if "fuente_archivo" not in columnas:
+                # Base creada antes de los catálogos fragmentados
+                self._conexion.execute("ALTER TABLE eventos ADD COLUMN fuente_archivo TEXT")
+            if "bloqueado_por" not in columnas:
+                # Base creada antes de compartir los bloqueos entre estaciones
+                self._conexion.execute("ALTER TABLE eventos ADD COLUMN bloqueado_por TEXT")
+                self._conexion.execute("ALTER TABLE eventos ADD COLUMN vence REAL")
+            if self._conexion.execute("SELECT 1 FROM metadatos WHERE clave = 'estados'").fetchone() is None:
+                self._migrar_codigos_de_estado()
+                self._conexion.execute("INSERT INTO metadatos (clave, valor) VALUES ('estados', 'nombre')")
+
+    def _migrar_codigos_de_estado(self):
+        """
+        Las bases anteriores guardaban Estado.codigo. Los códigos de los estados
+        canónicos siempre fueron su posición en NOMBRES_CANONICOS; los demás
+        dependían del proceso que los escribió y no se pueden recuperar.
+        """
+        for tabla, columna in (("eventos", "estado_actual"), ("cambios_estado", "estado")):
+            for codigo, nombre in enumerate(NOMBRES_CANONICOS):
+                self._conexion.execute(
+                    f"UPDATE {tabla} SET {columna} = ? WHERE typeof({columna}) = 'integer' AND {columna} = ?",
+                    (nombre, codigo)
+                )
+            perdidos = self._conexion.execute(
+                f"UPDATE {tabla} SET {columna} = 'Código ' || {columna} WHERE typeof({columna}) = 'integer'"
+            ).rowcount
+            if perdidos:
+                _traza.warning("Base %s: %s filas de %s tenían un código de estado no canónico",
+                               self.ruta, perdidos, tabla)
+
+    def cerrar(self):
+        with self._lock:
+            self._conexion.close()
+
+    @contextmanager
+    def transaccion(self):
+        """
+        Transacción que toma el lock de escritura de la base (BEGIN IMMEDIATE), de
+        modo que ninguna otra estación escribe entre una verificación y el cambio
+        que depende de ella. Dentro de otra transacción, se suma a ella.
+        """
+        with self._lock:
+            if self._conexion.in_transaction:
+                yield
+                return
+            self._conexion.execute("BEGIN IMMEDIATE")
+            try:
+                yield
+            except BaseException:
+                self._conexion.rollback()
+                raise
+            self._conexion.commit()
+
+    # === METADATOS ===
+
+    def getOrigen(self):
+        """Firma del catálogo JSON importado por última vez (o None)"""
+        with self._lock:
+            fila = self._conexion.execute("SELECT valor FROM metadatos WHERE clave = 'origen'").fetchone()
+        return json.loads(fila["valor"]) if fila else None
+
+    def cantidadEventos(self) -> int:
+        with self._lock:
+            return self._conexion.execute("SELECT COUNT(*) FROM eventos").fetchone()[0]
+
+    # === IMPORTACIÓN ===
+
+    def importarEventos(self, entradas, origen=None):
+        """
+        Incorpora eventos en una única transacción. Cada entrada es un dict con
+        'cabecera' (esquema de sismos.json), 'fuente' ((inicio, longitud) en el
+        JSON, (inicio, longitud, fragmento) en un catálogo fragmentado, o None) y 'series' (lista de metadatos).
+
+        Los eventos ya registrados conservan su estado y su historial: sólo se
+        actualizan su cabecera, su ubicación en el catálogo y sus series. Los que
+        dejaron de estar en el catálogo pierden la ubicación (ya no es válida).
+        Devuelve la cantidad de eventos nuevos.
+        """
+        ahora = _texto_fecha(datetime.now())
+        nuevos = 0
+        with self._lock, self._conexion:
+            cursor = self._conexion.cursor()
+            cursor.execute("UPDATE eventos SET fuente_inicio = NULL, fuente_longitud = NULL, fuente_archivo = NULL")
+            for entrada in entradas:
+                nuevos += self._guardar_entrada(cursor, entrada, ahora)
+            # Las cabeceras pueden haber cambiado: las clasificaciones guardadas dejan de estar al día
+            cursor.execute("DELETE FROM metadatos WHERE clave = 'reglas'")
+            if origen is not None:
+                cursor.execute(
+                    "INSERT OR REPLACE INTO metadatos (clave, valor) VALUES ('origen', ?)", (json.dumps(origen),)
+                )
+        return nuevos
+
+    def agregarEventos(self, entradas):
+        """
+        Incorpora eventos nuevos (por ejemplo, los detectados automáticamente) sin
+        tocar la ubicación en el catálogo de los demás. Devuelve la cantidad de nuevos.
+        """
+        ahora = _texto_fecha(datetime.now())
+        with self._lock, self._conexion:
+            cursor = self._conexion.cursor()
+            return sum(self._guardar_entrada(cursor, entrada, ahora) for entrada in entradas)
+
+    @staticmethod
+    def _guardar_entrada(cursor, entrada, ahora) -> bool:
+        """Inserta o actualiza un evento y sus series; True si el evento es nuevo"""
+        nuevo = False
+        cabecera = entrada["cabecera"]
+        id_sismo = cabecera["id_sismo"]
+        fuente = entrada.get("fuente") or (None, None)
+        inicio, longitud = fuente[:2]
+        archivo = fuente[2] if len(fuente) > 2 else None
+        datos = (
+            _texto_fecha(cabecera["fecha_hora_ocurrencia"]), cabecera.get("valor_magnitud"),
+            cabecera.get("latitud_epicentro"), cabecera.get("longitud_epicentro"),
+            cabecera.get("profundidad"), inicio, longitud, archivo, id_sismo,
+        )
+        cursor.execute(
+            "UPDATE eventos SET fecha_hora_ocurrencia = ?, valor_magnitud = ?, latitud_epicentro = ?, "
+            "longitud_epicentro = ?, profundidad = ?, fuente_inicio = ?, fuente_longitud = ?, fuente_archivo = ? "
+            "WHERE id_sismo = ?", datos
+        )
+        if cursor.rowcount == 0:
+            estado = Estado.obtener(cabecera.get("estado_inicial", "Auto-Detectado"))
+            cursor.execute(
+                "INSERT INTO eventos (fecha_hora_ocurrencia, valor_magnitud, latitud_epicentro, "
+                "longitud_epicentro, profundidad, fuente_inicio, fuente_longitud, fuente_archivo, id_sismo, "
+                "estado_actual) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", datos + (estado.nombre,)
+            )
+            cursor.execute(
+                "INSERT INTO cambios_estado (id_sismo, estado, fecha_hora_inicio) VALUES (?, ?, ?)",
+                (id_sismo, estado.nombre, ahora)
+            )
+            nuevo = True
+
+        cursor.execute("DELETE FROM series WHERE id_sismo = ?", (id_sismo,))
+        cursor.executemany(
+            "INSERT INTO series (id_sismo, indice, cantidad_muestras, tasa_muestreo, tipos_dato, "
+            "fecha_hora_inicio, fecha_hora_fin) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (id_sismo, indice, serie["cantidad"], serie.get("tasa_muestreo"),
+                 ",".join(serie.get("tipos_dato", ())) or None,
+                 serie.get("inicio"), serie.get("fin"))
+                for indice, serie in enumerate(entrada.get("series", ()))
+            ]
+        )
+        return nuevo
+
+    # === CONSULTAS ===
+
+    def _cabecera(self, fila, cambios):
+        cabecera = {
+            "id_sismo": fila["id_sismo"],
+            "fecha_hora_ocurrencia": fila["fecha_hora_ocurrencia"],
+            "valor_magnitud": fila["valor_magnitud"],
+            "estado_inicial": cambios[0].actual.nombre if cambios else fila["estado_actual"],
+            "latitud_epicentro": fila["latitud_epicentro"],
+            "longitud_epicentro": fila["longitud_epicentro"],
+            "profundidad": fila["profundidad"],
+        }
+        fuente = None
+        if fila["fuente_inicio"] is not None:
+            fuente = (fila["fuente_inicio"], fila["fuente_longitud"])
+            if fila["fuente_archivo"] is not None:
+                fuente += (fila["fuente_archivo"],)
+        return cabecera, fuente, cambios
+
+    @staticmethod
+    def _cambio_estado(fila):
+        return CambioEstado.restaurar(
+            Estado.obtener(fila["estado"]),
+            _fecha_desde_texto(fila["fecha_hora_inicio"]),
+            _fecha_desde_texto(fila["fecha_hora_fin"]),
+        )
+
+    def filasEnEstados(self, estados, limite=None):
+        """
+        Filas livianas (id_sismo, fecha ISO, magnitud, nombre del estado) de los
+        eventos cuyo estado actual es alguno de 'estados', del más reciente al más
+        antiguo (a igual fecha, por id_sismo descendente, el orden de ListadoEventos).
+        No arma cabeceras ni historiales: es lo que necesita un listado.
+        """
+        return self.filasEntre(estados=estados, descendente=True, limite=limite)
+
+    def filasEntre(self, desde=None, hasta=None, estados=None, descendente=False, limite=None):
+        """
+        Filas livianas de los eventos ocurridos en [desde, hasta) (None: sin límite),
+        en orden cronológico o inverso y, con 'estados', sólo los que están en
+        alguno de ellos. Con 'limite', sólo las primeras filas en ese orden.
+        """
+        sentido = "DESC" if descendente else "ASC"
+        rango, parametros = "", []
+        if desde is not None:
+            rango += " AND fecha_hora_ocurrencia >= ?"
+            parametros.append(_texto_fecha(desde))
+        if hasta is not None:
+            rango += " AND fecha_hora_ocurrencia < ?"
+            parametros.append(_texto_fecha(hasta))
+        orden = f" ORDER BY fecha_hora_ocurrencia {sentido}, id_sismo {sentido} LIMIT ?"
+        limite_sql = -1 if limite is None else limite
+
+        with self._lock:
+            # Sin row_factory, sqlite3 entrega directamente las tuplas del listado
+            cursor = self._conexion.cursor()
+            cursor.row_factory = None
+            columnas = "SELECT id_sismo, fecha_hora_ocurrencia, valor_magnitud, estado_actual FROM eventos"
+            if estados is None:
+                return cursor.execute(f"{columnas} WHERE 1{rango}{orden}", (*parametros, limite_sql)).fetchall()
+            # Una consulta por estado: cada una recorre en orden un rango del índice
+            # cubriente (estado_actual, fecha, id_sismo, magnitud)
+            consulta = f"{columnas} WHERE estado_actual = ?{rango}{orden}"
+            por_estado = [
+                cursor.execute(consulta, (estado.nombre, *parametros, limite_sql)).fetchall()
+                for estado in estados
+            ]
+        if len(por_estado) == 1:
+            return por_estado[0]
+        return list(islice(heapq.merge(*por_estado, key=itemgetter(1, 0), reverse=descendente), limite))
+
+    def obtenerEvento(self, id_sismo):
+        """(cabecera, fuente, historial) del evento, o None si no está registrado"""
+        with self._lock:
+            fila = self._conexion.execute(
+                f"SELECT {_COLUMNAS_EVENTO} FROM eventos WHERE id_sismo = ?", (id_sismo,)
+            ).fetchone()
+            if fila is None:
+                return None
+            cambios = self._historiales([id_sismo])
+        return self._cabecera(fila, cambios.get(id_sismo, []))
+
+    def idsEventos(self):
+        with self._lock:
+            return [fila[0] for fila in self._conexion.execute("SELECT id_sismo FROM eventos")]
+
+    def epicentros(self):
+        """(id_sismo, latitud, longitud) de los eventos con epicentro registrado"""
+        with self._lock:
+            return self._conexion.execute(
+                "SELECT id_sismo, latitud_epicentro, longitud_epicentro FROM eventos "
+                "WHERE latitud_epicentro IS NOT NULL AND longitud_epicentro IS NOT NULL"
+            ).fetchall()
+
+    # === CLASIFICACIONES ===
+
+    def getFirmaReglas(self):
+        """Firma de las reglas con las que se clasificó todo el catálogo (o None)"""
+        with self._lock:
+            fila = self._conexion.execute("SELECT valor FROM metadatos WHERE clave = 'reglas'").fetchone()
+        return fila["valor"] if fila else None
+
+    def atributosClasificacion(self):
+        """
+        Columnas que usan las reglas, para todo el catálogo: ids, magnitudes,
+        profundidades, latitudes, longitudes, picos de velocidad y frecuencias
+        medias (None donde no hay dato).
+        """
+        with self._lock:
+            cursor = self._conexion.cursor()
+            cursor.row_factory = None
+            filas = cursor.execute(
+                "SELECT e.id_sismo, e.valor_magnitud, e.profundidad, e.latitud_epicentro, e.longitud_epicentro, "
+                "r.pico_velocidad, r.frecuencia_media FROM eventos e LEFT JOIN rasgos_onda r USING (id_sismo)"
+            ).fetchall()
+        if not filas:
+            return ((),) * 7
+        return tuple(zip(*filas))
+
+    def guardarClasificaciones(self, filas, firma=None):
+        """
+        Guarda tuplas (id_sismo, clasificacion, alcance, origen). Con 'firma' las
+        filas son el catálogo completo clasificado con esas reglas: reemplazan a
+        todas las anteriores y la firma queda registrada.
+        """
+        with self._lock, self._conexion:
+            if firma is not None:
+                self._conexion.execute("DELETE FROM clasificaciones")
+            self._conexion.executemany(
+                "INSERT OR REPLACE INTO clasificaciones (id_sismo, clasificacion, alcance, origen) "
+                "VALUES (?, ?, ?, ?)", filas
+            )
+            if firma is not None:
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO metadatos (clave, valor) VALUES ('reglas', ?)", (firma,)
+                )
+
+    def clasificacionDe(self, id_sismo):
+        """(clasificacion, alcance, origen) guardados del evento, o None"""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT clasificacion, alcance, origen FROM clasificaciones WHERE id_sismo = ?", (id_sismo,)
+            ).fetchone()
+        return tuple(fila) if fila else None
+
+    def rasgosOnda(self, id_sismo):
+        """(pico_velocidad, frecuencia_media) registrados del evento, o None"""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT pico_velocidad, frecuencia_media FROM rasgos_onda WHERE id_sismo = ?", (id_sismo,)
+            ).fetchone()
+        return tuple(fila) if fila else None
+
+    def guardarRasgosOnda(self, id_sismo, pico_velocidad, frecuencia_media):
+        # sqlite3 guarda NaN como NULL
+        with self._lock, self._conexion:
+            self._conexion.execute(
+                "INSERT OR REPLACE INTO rasgos_onda (id_sismo, pico_velocidad, frecuencia_media) VALUES (?, ?, ?)",
+                (id_sismo, pico_velocidad, frecuencia_media)
+            )
+
+    def _historiales(self, ids):
+        """id_sismo -> historial de CambioEstado en orden cronológico (consultas por lotes)"""
+        historiales = {}
+        for desde in range(0, len(ids), 500):
+            lote = ids[desde:desde + 500]
+            filas = self._conexion.execute(
+                f"SELECT id_sismo, estado, fecha_hora_inicio, fecha_hora_fin FROM cambios_estado "
+                f"WHERE id_sismo IN ({', '.join('?' * len(lote))}) ORDER BY id_sismo, id_cambio",
+                lote
+            )
+            for fila in filas:
+                historiales.setdefault(fila["id_sismo"], []).append(self._cambio_estado(fila))
+        return historiales
+
+    def getInfoSeries(self, id_sismo):
+        """Metadatos registrados de las series de un evento"""
+        with self._lock:
+            filas = self._conexion.execute(
+                "SELECT cantidad_muestras, tasa_muestreo, tipos_dato, fecha_hora_inicio, fecha_hora_fin "
+                "FROM series WHERE id_sismo = ? ORDER BY indice", (id_sismo,)
+            ).fetchall()
+        return [
+            {
+                "cantidad": fila["cantidad_muestras"],
+                "tasa_muestreo": fila["tasa_muestreo"],
+                "tipos_dato": fila["tipos_dato"].split(",") if fila["tipos_dato"] else [],
+                "inicio": fila["fecha_hora_inicio"],
+                "fin": fila["fecha_hora_fin"],
+            }
+            for fila in filas
+        ]
+
+    # === CAMBIOS DE ESTADO ===
+
+    def registrarCambioEstado(self, evento, estado_anterior, estado_nuevo):
+        """
+        Persiste el último cambio de estado del evento: cierra el cambio vigente
+        con su fechaHoraFin, inserta el nuevo y actualiza el estado actual.
+        Tiene la firma de un observador de CatalogoEventos.
+        """
+        cambio = evento.estadoActual
+        anterior = evento.historial_estados[-2] if len(evento.historial_estados) > 1 else None
+        with self.transaccion():
+            if anterior is not None:
+                self._conexion.execute(
+                    "UPDATE cambios_estado SET fecha_hora_fin = ? WHERE id_sismo = ? AND fecha_hora_fin IS NULL",
+                    (_texto_fecha(anterior.fechaHoraFin), evento.id_sismo)
+                )
+            self._conexion.execute(
+                "INSERT INTO cambios_estado (id_sismo, estado, fecha_hora_inicio, fecha_hora_fin) VALUES (?, ?, ?, ?)",
+                (evento.id_sismo, estado_nuevo.nombre, _texto_fecha(cambio.fechaHoraInicio),
+                 _texto_fecha(cambio.fechaHoraFin))
+            )
+            self._conexion.execute(
+                "UPDATE eventos SET estado_actual = ? WHERE id_sismo = ?", (estado_nuevo.nombre, evento.id_sismo)
+            )
+
+
+    # === BLOQUEOS ===
+    # Las concesiones de AdministradorBloqueos viven en la tabla 'eventos', que
+    # comparten todas las estaciones que abren la misma base. Cada operación es un
+    # único UPDATE condicional: la propia base decide qué estación se queda con el bloqueo.
+
+    def adquirirBloqueo(self, id_sismo, titular, vence, ahora, estados=None) -> bool:
+        """
+        Pone el bloqueo del evento a nombre de 'titular' hasta 'vence' si nadie lo
+        tiene, si venció o si ya era suyo, y el evento está en alguno de 'estados'
+        (o sigue bloqueado por la concesión vencida). True si quedó a su nombre.
+        """
+        condicion_estado, parametros = "", []
+        if estados is not None:
+            condicion_estado = (
+                f" AND (bloqueado_por IS NOT NULL OR estado_actual IN ({', '.join('?' * len(estados))}))"
+            )
+            parametros = [estado.nombre for estado in estados]
+        with self.transaccion():
+            cursor = self._conexion.execute(
+                "UPDATE eventos SET bloqueado_por = ?, vence = ? WHERE id_sismo = ? "
+                f"AND (bloqueado_por IS NULL OR vence < ? OR bloqueado_por = ?){condicion_estado}",
+                (titular, vence, id_sismo, ahora, titular, *parametros)
+            )
+            return cursor.rowcount == 1
+
+    def renovarBloqueo(self, id_sismo, titular, vence, ahora) -> bool:
+        """Extiende el bloqueo de 'titular' si sigue siendo suyo y no venció"""
+        with self.transaccion():
+            cursor = self._conexion.execute(
+                "UPDATE eventos SET vence = ? WHERE id_sismo = ? AND bloqueado_por = ? AND vence >= ?",
+                (vence, id_sismo, titular, ahora)
+            )
+            return cursor.rowcount == 1
+
+    def liberarBloqueo(self, id_sismo, titular) -> bool:
+        """Quita el bloqueo si sigue a nombre de 'titular' (aunque haya vencido)"""
+        with self.transaccion():
+            cursor = self._conexion.execute(
+                "UPDATE eventos SET bloqueado_por = NULL, vence = NULL WHERE id_sismo = ? AND bloqueado_por = ?",
+                (id_sismo, titular)
+            )
+            return cursor.rowcount == 1
+
+    def tieneBloqueo(self, id_sismo, titular, ahora) -> bool:
+        """El bloqueo del evento es de 'titular' y no venció"""
+        with self._lock:
+            return self._conexion.execute(
+                "SELECT 1 FROM eventos WHERE id_sismo = ? AND bloqueado_por = ? AND vence >= ?",
+                (id_sismo, titular, ahora)
+            ).fetchone() is not None
+
+    def bloqueoDe(self, id_sismo):
+        """(titular, vence) del bloqueo registrado sobre el evento, o None"""
+        with self._lock:
+            fila = self._conexion.execute(
+                "SELECT bloqueado_por, vence FROM eventos WHERE id_sismo = ? AND bloqueado_por IS NOT NULL",
+                (id_sismo,)
+            ).fetchone()
+        return tuple(fila) if fila else None
+
+
+def _info_serie(serie):
+    """Metadatos de una serie temporal para la tabla 'series'"""
+    tiempos = serie.tiempos
+    return {
+        "cantidad": serie.cantidadMuestras(),
+        "tasa_muestreo": serie.getTasaMuestreo(),
+        "tipos_dato": list(serie.valores),
+        "inicio": _texto_fecha(tiempos[0].item()) if len(tiempos) else None,
+        "fin": _texto_fecha(tiempos[-1].item()) if len(tiempos) else None,
+    }
+
+
+def entradas_desde_json(ruta):
+    """Entradas para importarEventos() a partir de un catálogo JSON (recorrido en streaming)"""
+    for sismo_data, inicio, longitud in iterar_eventos_ubicados_json(ruta):
+        yield {
+            "cabecera": cabecera_evento(sismo_data),
+            "fuente": (inicio, longitud),
+            "series": [_info_serie(SerieTemporal.desde_datos(s)) for s in sismo_data.get("series_temporales", [])],
+        }
+
+
+def entradas_desde_fragmentos(directorio, procesos=None):
+    """Como entradas_desde_json, para un directorio de fragmentos recorridos en un pool de procesos"""
+    for cabecera, fuente, series in leer_fragmentos(directorio, procesos, _info_serie):
+        yield {"cabecera": cabecera, "fuente": fuente, "series": series}
+
+
+def entradas_desde_almacen(almacen):
+    """Entradas para importarEventos() a partir del índice de un almacén de ondas"""
+    for cabecera in almacen.cabeceras():
+        yield {"cabecera": cabecera, "fuente": None, "series": almacen.getInfoSeries(cabecera["id_sismo"])}
+
+
+def entrada_desde_evento(evento):
+    """Entrada para agregarEventos() a partir de un EventoSismico creado por el sistema (sin ubicación en el JSON)"""
+    return {
+        "cabecera": {
+            "id_sismo": evento.id_sismo,
+            "fecha_hora_ocurrencia": evento.fechaHoraOcurrencia,
+            "valor_magnitud": evento.valorMagnitud,
+            "estado_inicial": evento.historial_estados[0].actual.nombre,
+            "latitud_epicentro": evento.latitudEpicentro,
+            "longitud_epicentro": evento.longitudEpicentro,
+            "profundidad": evento.profundidad,
+        },
+        "fuente": None,
+        "series": [_info_serie(serie) for serie in evento.series_temporales],
+    }
@@ -0,0 +1,258 @@
+# persistencia/catalogo_fragmentado.py
+#
+# Catálogo repartido en fragmentos: un directorio con varios archivos con el
+# esquema de sismos.json (por ejemplo, uno por día o por región de estaciones).
+#
+# Cada fragmento se recorre en un proceso de un pool. El proceso no devuelve las
+# cabeceras serializadas con pickle: las deja en un bloque de memoria compartida
+# con un formato compacto y devuelve sólo el nombre del bloque. El bloque tiene
+#   - un arreglo estructurado con las columnas numéricas (_COLUMNAS_NUMERICAS), NaN = None,
+#   - los offsets (en caracteres) de los textos de cada evento (int64),
+#   - los textos de todos los eventos concatenados, en UTF-8.
+# El proceso principal lee las columnas del bloque, arma las cabeceras y lo libera.
+# Las cabeceras llevan los campos que usa el sistema (ver _crear_evento_desde_datos
+# del gestor); otros campos de los fragmentos no se conservan.
+
+import json
+import logging
+import os
+from modelos.serie_temporal import SerieTemporal
+from utilidades.importacion_diferida import modulo_diferido
+from .lector_json import (
+    SUFIJO_INDICE, ErrorFormatoCatalogo, firma_archivo, cabecera_evento, leer_cabeceras_json, iterar_eventos_ubicados_json,
+)
+
+_traza = logging.getLogger(__name__)
+
+np = modulo_diferido("numpy")
+# Sólo hacen falta con catálogos en directorio: no demoran el arranque con un único archivo
+multiprocessing = modulo_diferido("multiprocessing")
+shared_memory = modulo_diferido("multiprocessing.shared_memory")
+procesos_futuros = modulo_diferido("concurrent.futures.process")
+
+EXTENSION_FRAGMENTO = ".json"
+
+# Descripción del dtype estructurado (una lista: NumPy lee una tupla como (tipo, forma))
+_COLUMNAS_NUMERICAS = [
+    ("valor_magnitud", "<f8"), ("latitud_epicentro", "<f8"), ("longitud_epicentro", "<f8"),
+    ("profundidad", "<f8"), ("fuente_inicio", "<i8"), ("fuente_longitud", "<i8"),
+]
+# El estado viaja por nombre: los códigos de Estado dependen del orden de creación en cada proceso
+_CAMPOS_TEXTO = ("id_sismo", "fecha_hora_ocurrencia", "estado_inicial")
+_ESTADO_POR_DEFECTO = "Auto-Detectado"
+# Errores con los que se omite un fragmento (datos inválidos, archivo ilegible) sin abortar la carga
+_ERRORES_FRAGMENTO = (OSError, ValueError, KeyError, TypeError)
+
+
+def es_catalogo_fragmentado(ruta) -> bool:
+    return os.path.isdir(ruta)
+
+
+def archivos_de_fragmentos(directorio):
+    """Nombres de los fragmentos del directorio, en orden (sin los índices de leer_cabeceras_json)"""
+    return sorted(
+        nombre for nombre in os.listdir(directorio)
+        if nombre.endswith(EXTENSION_FRAGMENTO) and not nombre.endswith(SUFIJO_INDICE)
+        and os.path.isfile(os.path.join(directorio, nombre))
+    )
+
+
+def firma_catalogo(ruta):
+    """Como firma_archivo, para un catálogo en un archivo o en un directorio de fragmentos"""
+    if not es_catalogo_fragmentado(ruta):
+        return firma_archivo(ruta)
+    return {"fragmentos": {
+        nombre: firma_archivo(os.path.join(ruta, nombre)) for nombre in archivos_de_fragmentos(ruta)
+    }}
+
+
+def _validar_cabecera(cabecera):
+    """Los campos que viajan en el bloque deben tener el tipo que espera el formato compacto"""
+    for campo in ("id_sismo", "fecha_hora_ocurrencia"):
+        if not isinstance(cabecera.get(campo), str) or not cabecera[campo]:
+            raise ErrorFormatoCatalogo(f"evento {cabecera.get('id_sismo')!r} sin '{campo}' válido")
+    if not isinstance(cabecera.get("estado_inicial", _ESTADO_POR_DEFECTO), str):
+        raise ErrorFormatoCatalogo(f"evento {cabecera['id_sismo']!r} con 'estado_inicial' inválido")
+    for campo, _tipo in _COLUMNAS_NUMERICAS[:4]:
+        valor = cabecera.get(campo)
+        if valor is not None and (isinstance(valor, bool) or not isinstance(valor, (int, float))):
+            raise ErrorFormatoCatalogo(f"evento {cabecera['id_sismo']!r} con '{campo}' no numérico: {valor!r}")
+    return cabecera
+
+
+def _entradas_fragmento(ruta, info_series):
+    """(cabecera, inicio, longitud, series) de cada evento del fragmento; series es None sin 'info_series'"""
+    if info_series is None:
+        # Reutiliza el índice del fragmento ('<fragmento>.indice.json') si está al día
+        return [
+            (_validar_cabecera(cabecera), inicio, longitud, None)
+            for cabecera, inicio, longitud in leer_cabeceras_json(ruta)
+        ]
+    return [
+        (_validar_cabecera(cabecera_evento(sismo_data)), inicio, longitud,
+         [info_series(SerieTemporal.desde_datos(s)) for s in sismo_data.get("series_temporales", [])])
+        for sismo_data, inicio, longitud in iterar_eventos_ubicados_json(ruta)
+    ]
+
+
+def _numero(valor):
+    return float("nan") if valor is None else valor
+
+
+def _procesar_fragmento(ruta, info_series=None):
+    """
+    Se ejecuta en un proceso del pool: lee el fragmento y deja sus cabeceras en
+    un bloque de memoria compartida. Devuelve (nombre del bloque, cantidad de
+    eventos, bytes de texto); el bloque lo libera quien lo lee.
+    """
+    entradas = _entradas_fragmento(ruta, info_series)
+    numeros = np.array([
+        (_numero(cabecera.get("valor_magnitud")), _numero(cabecera.get("latitud_epicentro")),
+         _numero(cabecera.get("longitud_epicentro")), _numero(cabecera.get("profundidad")), inicio, longitud)
+        for cabecera, inicio, longitud, _series in entradas
+    ], dtype=_COLUMNAS_NUMERICAS)
+    textos = []
+    for cabecera, _inicio, _longitud, series in entradas:
+        textos += (cabecera["id_sismo"], cabecera["fecha_hora_ocurrencia"],
+                   cabecera.get("estado_inicial", _ESTADO_POR_DEFECTO))
+        if info_series is not None:
+            textos.append(json.dumps(series, ensure_ascii=False))
+    offsets = np.zeros(len(textos) + 1, dtype=np.int64)
+    np.cumsum([len(texto) for texto in textos], out=offsets[1:])
+    texto = "".join(textos).encode("utf-8")
+
+    # Las columnas miden 48 bytes por evento: los offsets quedan alineados a 8
+    bloque = shared_memory.SharedMemory(create=True, size=numeros.nbytes + offsets.nbytes + len(texto))
+    try:
+        posicion = 0
+        for parte in (numeros.tobytes(), offsets.tobytes(), texto):
+            bloque.buf[posicion:posicion + len(parte)] = parte
+            posicion += len(parte)
+    except BaseException:
+        bloque.close()
+        bloque.unlink()
+        raise
+    bloque.close()
+    return bloque.name, len(entradas), len(texto)
+
+
+def _leer_bloque(buffer, cantidad, cantidad_textos, bytes_texto):
+    """Columnas numéricas, offsets y texto del bloque, copiados a objetos de Python"""
+    numeros = np.ndarray(cantidad, dtype=_COLUMNAS_NUMERICAS, buffer=buffer)
+    columnas = {nombre: numeros[nombre].tolist() for nombre in numeros.dtype.names}
+    posicion = numeros.nbytes
+    offsets = np.ndarray(cantidad_textos + 1, dtype=np.int64, buffer=buffer, offset=posicion).tolist()
+    posicion += 8 * (cantidad_textos + 1)
+    texto = bytes(buffer[posicion:posicion + bytes_texto]).decode("utf-8")
+    return columnas, offsets, texto
+
+
+def _entradas_del_bloque(nombre_bloque, cantidad, bytes_texto, nombre_fragmento, con_series):
+    """Lee y libera un bloque de _procesar_fragmento: lista de (cabecera, fuente, series)"""
+    campos = len(_CAMPOS_TEXTO) + con_series
+    bloque = shared_memory.SharedMemory(name=nombre_bloque)
+    try:
+        columnas, offsets, texto = _leer_bloque(bloque.buf, cantidad, cantidad * campos, bytes_texto)
+    finally:
+        bloque.unlink()
+        bloque.close()
+
+    def sin_nan(valores):
+        return [None if valor != valor else valor for valor in valores]
+
+    magnitudes = sin_nan(columnas["valor_magnitud"])
+    latitudes = sin_nan(columnas["latitud_epicentro"])
+    longitudes = sin_nan(columnas["longitud_epicentro"])
+    profundidades = sin_nan(columnas["profundidad"])
+    inicios = columnas["fuente_inicio"]
+    longitudes_bytes = columnas["fuente_longitud"]
+    textos = [texto[desde:hasta] for desde, hasta in zip(offsets, offsets[1:])]
+
+    entradas = []
+    for numero in range(cantidad):
+        base = numero * campos
+        cabecera = {
+            "id_sismo": textos[base],
+            "fecha_hora_ocurrencia": textos[base + 1],
+            "valor_magnitud": magnitudes[numero],
+            "estado_inicial": textos[base + 2],
+            "latitud_epicentro": latitudes[numero],
+            "longitud_epicentro": longitudes[numero],
+            "profundidad": profundidades[numero],
+        }
+        series = json.loads(textos[base + 3]) if con_series else None
+        entradas.append((cabecera, (inicios[numero], longitudes_bytes[numero], nombre_fragmento), series))
+    return entradas
+
+
+def _indice_al_dia(ruta) -> bool:
+    """Estimación sin leerlo: el índice del fragmento es posterior al fragmento (leer_cabeceras_json lo verifica)"""
+    try:
+        return os.stat(ruta + SUFIJO_INDICE).st_mtime_ns >= os.stat(ruta).st_mtime_ns
+    except OSError:
+        return False
+
+
+def leer_fragmentos(directorio, procesos=None, info_series=None):
+    """
+    Genera (cabecera, fuente, series) de cada evento de los fragmentos del
+    directorio, fragmento por fragmento en orden de nombre. 'fuente' es
+    (inicio, longitud, nombre del fragmento). Con 'info_series' (una función de
+    nivel de módulo, SerieTemporal -> dict) los procesos decodifican además las
+    series y 'series' es la lista de sus resultados; si no, es None.
+
+    Los fragmentos se recorren en un pool de 'procesos' procesos (por defecto,
+    uno por núcleo) mientras el llamador consume los ya terminados. Los que
+    tienen su índice al día se leen en este proceso: cargar el índice tarda
+    menos que arrancar un proceso. Un fragmento que no se puede leer (o con un
+    evento inválido) se informa y se omite entero; si un proceso del pool muere,
+    los fragmentos que le quedaban se leen en este proceso.
+    """
+    nombres = archivos_de_fragmentos(directorio)
+    con_series = info_series is not None
+    a_procesar = [
+        nombre for nombre in nombres
+        if con_series or not _indice_al_dia(os.path.join(directorio, nombre))
+    ]
+    procesos = min(procesos or os.cpu_count() or 1, len(a_procesar))
+    pool = None
+    futuros = {}
+    if procesos > 1:
+        # 'spawn': el proceso principal puede tener hilos (diario, interfaz) que fork copiaría a medias
+        pool = procesos_futuros.ProcessPoolExecutor(procesos, mp_context=multiprocessing.get_context("spawn"))
+        futuros = {
+            nombre: pool.submit(_procesar_fragmento, os.path.join(directorio, nombre), info_series)
+            for nombre in a_procesar
+        }
+    try:
+        for nombre in nombres:
+            futuro = futuros.pop(nombre, None)
+            try:
+                entradas = None
+                if futuro is not None:
+                    try:
+                        nombre_bloque, cantidad, bytes_texto = futuro.result()
+                        entradas = _entradas_del_bloque(nombre_bloque, cantidad, bytes_texto, nombre, con_series)
+                    except procesos_futuros.BrokenProcessPool as e:
+                        _traza.warning("Catálogo '%s': el pool de procesos se interrumpió (%s); "
+                                       "el fragmento '%s' se lee en este proceso", directorio, e, nombre)
+                if entradas is None:
+                    entradas = [
+                        (cabecera, (inicio, longitud, nombre), series) for cabecera, inicio, longitud, series
+                        in _entradas_fragmento(os.path.join(directorio, nombre), info_series)
+                    ]
+            except _ERRORES_FRAGMENTO as e:
+                _traza.error("Catálogo '%s': se omite el fragmento '%s': %r", directorio, nombre, e)
+                continue
+            _traza.debug("Catálogo '%s': fragmento '%s' con %s eventos", directorio, nombre, len(entradas))
+            yield from entradas
+    finally:
+        # Si el llamador no consumió todo, se liberan los bloques que ya se crearon
+        for futuro in futuros.values():
+            if futuro.cancel() or futuro.exception() is not None:
+                continue
+            bloque = shared_memory.SharedMemory(name=futuro.result()[0])
+            bloque.unlink()
+            bloque.close()
+        if pool is not None:
+            pool.shutdown()
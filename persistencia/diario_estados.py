@@ -0,0 +1,395 @@
+# persistencia/diario_estados.py
+
+import logging
+import os
+import struct
+import threading
+import zlib
+from datetime import datetime, timedelta
+from modelos.cambio_estado import CambioEstado
+from modelos.estado import NOMBRES_CANONICOS, Estado
+
+_traza = logging.getLogger(__name__)
+
+SUFIJO_INSTANTANEA = ".instantanea"
+
+# El diario empieza con (marca, versión). Los diarios sin cabecera son del formato
+# anterior, que guardaba Estado.codigo en un byte: se convierten al abrirlos.
+_MARCA_DIARIO = b"RSDIARIO"
+_VERSION_DIARIO = 2
+_CABECERA_DIARIO = struct.Struct("<8sH")
+
+# Registro del diario: cabecera (longitud del contenido, crc32 del contenido, secuencia)
+# y contenido (fin del cambio anterior, inicio del nuevo, longitud del nombre del estado)
+# + nombre del estado + id_sismo, ambos en UTF-8. Se guarda el nombre y no Estado.codigo,
+# que sólo vale dentro del proceso.
+_CABECERA_REGISTRO = struct.Struct("<IIq")
+_CONTENIDO_REGISTRO = struct.Struct("<qqH")
+_CONTENIDO_REGISTRO_V1 = struct.Struct("<qqB")
+
+# Instantánea: cabecera (marca, versión, última secuencia, offset del diario, cantidad)
+# y, por evento, (fin del estado inicial del catálogo, cantidad de cambios, longitud
+# del id) + id + (inicio, fin, longitud del nombre) + nombre del estado de cada cambio
+# registrado en el diario. Con una instantánea de otra versión (la 1 guardaba sólo el
+# estado vigente; la 2, códigos de estado) se reproduce el diario completo.
+_MARCA_INSTANTANEA = b"RSESTADO"
+_VERSION_INSTANTANEA = 3
+_CABECERA_INSTANTANEA = struct.Struct("<8sHqqI")
+_ENTRADA_INSTANTANEA = struct.Struct("<qIH")
+_CAMBIO_INSTANTANEA = struct.Struct("<qqH")
+
+_SIN_FECHA = -(1 << 63)
+_EPOCA = datetime(1970, 1, 1)
+_MICROSEGUNDO = timedelta(microseconds=1)
+
+
+def _a_microsegundos(fecha):
+    return _SIN_FECHA if fecha is None else (fecha - _EPOCA) // _MICROSEGUNDO
+
+
+def _desde_microsegundos(valor):
+    return None if valor == _SIN_FECHA else _EPOCA + valor * _MICROSEGUNDO
+
+
+def _contenido(fin_anterior_us, inicio_us, nombre_estado, id_sismo):
+    nombre = nombre_estado.encode("utf-8")
+    return _CONTENIDO_REGISTRO.pack(fin_anterior_us, inicio_us, len(nombre)) + nombre + id_sismo.encode("utf-8")
+
+
+def _registro(secuencia, contenido):
+    return _CABECERA_REGISTRO.pack(len(contenido), zlib.crc32(contenido), secuencia) + contenido
+
+
+def _registros(datos, posicion, secuencia):
+    """
+    (posición siguiente, secuencia, contenido) de cada registro íntegro desde
+    'posicion'; se detiene en el primero incompleto, corrupto o fuera de secuencia
+    """
+    while posicion + _CABECERA_REGISTRO.size <= len(datos):
+        longitud, crc, siguiente = _CABECERA_REGISTRO.unpack_from(datos, posicion)
+        inicio_contenido = posicion + _CABECERA_REGISTRO.size
+        contenido = datos[inicio_contenido:inicio_contenido + longitud]
+        if len(contenido) < longitud or zlib.crc32(contenido) != crc or siguiente != secuencia + 1:
+            return
+        posicion, secuencia = inicio_contenido + longitud, siguiente
+        yield posicion, secuencia, contenido
+
+
+class DiarioEstados:
+    """
+    Diario binario de sólo agregado con los cambios de estado de los eventos.
+
+    Cada cambio se escribe como un registro con su secuencia, el nombre del
+    estado nuevo y un crc32; un hilo
+    de escritura agrupa los registros que llegan mientras se completa el fsync
+    anterior y los confirma con un único fsync (group commit). Quien registra un
+    cambio espera a que su registro sea durable.
+
+    Cada 'registros_por_instantanea' registros se escribe una instantánea
+    compacta con el historial de cambios de cada evento y el offset del diario
+    hasta el que cubre. Al abrir el diario se carga la instantánea y se reproduce sólo
+    la cola posterior, de modo que el arranque no depende de cuántas revisiones
+    se hayan registrado. Un registro final incompleto o corrupto (escritura
+    interrumpida) se descarta.
+
+    El diario completo se conserva: es la traza de auditoría de todos los cambios.
+    """
+
+    def __init__(self, ruta, registros_por_instantanea=10000, espera_grupo=0.0):
+        self.ruta = ruta
+        self.ruta_instantanea = ruta + SUFIJO_INSTANTANEA
+        self.registros_por_instantanea = registros_por_instantanea
+        # Espera opcional antes de cada fsync para juntar más registros en el grupo
+        self.espera_grupo = espera_grupo
+
+        # Historial reconstruido: id_sismo -> [fin del estado inicial, [[nombre del estado, inicio, fin], ...]]
+        # en microsegundos; y el mismo historial como CambioEstado, para aplicar a cada evento
+        self._historiales = {}
+        self._recuperados = {}
+        self._secuencia = 0
+        self._offset = _CABECERA_DIARIO.size
+        self._registros_desde_instantanea = 0
+        self._recuperar()
+
+        self._condicion = threading.Condition()
+        self._pendientes = []           # registros ya serializados que esperan el próximo fsync
+        self._secuencia_durable = self._secuencia
+        self._cerrando = False
+        self._instantanea_solicitada = False
+        self._error = None
+        self._archivo = open(self.ruta, "ab")
+        self._hilo = threading.Thread(target=self._escribir_grupos, name="DiarioEstados", daemon=True)
+        self._hilo.start()
+
+    # === RECUPERACIÓN ===
+
+    def _recuperar(self):
+        self._cargar_instantanea()
+        self._preparar_diario()
+        self._reproducir_cola()
+        self._preparar_recuperados()
+
+    def _preparar_diario(self):
+        """Crea el diario con su cabecera, o convierte uno del formato anterior"""
+        with open(self.ruta, "a+b") as archivo:
+            archivo.seek(0)
+            cabecera = archivo.read(_CABECERA_DIARIO.size)
+            if len(cabecera) == _CABECERA_DIARIO.size:
+                marca, version = _CABECERA_DIARIO.unpack(cabecera)
+                if marca == _MARCA_DIARIO and version == _VERSION_DIARIO:
+                    return
+            elif _MARCA_DIARIO.startswith(cabecera):
+                # Diario nuevo (o cabecera a medio escribir)
+                archivo.truncate(0)
+                archivo.write(_CABECERA_DIARIO.pack(_MARCA_DIARIO, _VERSION_DIARIO))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+                return
+        self._convertir_diario_anterior()
+
+    def _convertir_diario_anterior(self):
+        """
+        Reescribe un diario del formato anterior (código de estado en un byte) con
+        los nombres de los estados, conservando cada registro y su secuencia. Los
+        códigos de los estados canónicos siempre fueron fijos; los demás dependían
+        del proceso que los escribió y no se pueden recuperar.
+        """
+        with open(self.ruta, "rb") as archivo:
+            datos = archivo.read()
+        partes = [_CABECERA_DIARIO.pack(_MARCA_DIARIO, _VERSION_DIARIO)]
+        perdidos = 0
+        for _, secuencia, contenido in _registros(datos, 0, 0):
+            fin_anterior_us, inicio_us, codigo = _CONTENIDO_REGISTRO_V1.unpack_from(contenido, 0)
+            if codigo < len(NOMBRES_CANONICOS):
+                nombre = NOMBRES_CANONICOS[codigo]
+            else:
+                nombre, perdidos = f"Código {codigo}", perdidos + 1
+            id_sismo = contenido[_CONTENIDO_REGISTRO_V1.size:].decode("utf-8")
+            partes.append(_registro(secuencia, _contenido(fin_anterior_us, inicio_us, nombre, id_sismo)))
+        if perdidos:
+            _traza.warning("Diario '%s': %s registros tenían un código de estado no canónico", self.ruta, perdidos)
+
+        temporal = self.ruta + ".tmp"
+        with open(temporal, "wb") as archivo:
+            archivo.write(b"".join(partes))
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self.ruta)
+        # Una instantánea del formato anterior ya se descartó; los offsets cambiaron
+        self._historiales, self._secuencia, self._offset = {}, 0, _CABECERA_DIARIO.size
+        _traza.info("Diario '%s': convertido al formato %s (%s registros)", self.ruta, _VERSION_DIARIO, len(partes) - 1)
+
+    def _reproducir_cola(self):
+        if os.path.getsize(self.ruta) < self._offset:
+            _traza.warning("Diario '%s': la instantánea no corresponde al diario; se reproduce completo", self.ruta)
+            self._historiales, self._secuencia, self._offset = {}, 0, _CABECERA_DIARIO.size
+        with open(self.ruta, "r+b") as archivo:
+            archivo.seek(self._offset)
+            cola = archivo.read()
+            posicion = 0
+            for posicion, secuencia, contenido in _registros(cola, 0, self._secuencia):
+                self._aplicar_registro(contenido)
+                self._secuencia = secuencia
+                self._registros_desde_instantanea += 1
+
+            if posicion < len(cola):
+                _traza.warning("Diario '%s': se descartan %s bytes finales incompletos", self.ruta, len(cola) - posicion)
+                archivo.truncate(self._offset + posicion)
+            self._offset += posicion
+        _traza.debug("Diario '%s': %s registros reproducidos desde la instantánea", self.ruta, self._registros_desde_instantanea)
+
+    def _preparar_recuperados(self):
+        for id_sismo, (fin_inicial_us, cambios) in self._historiales.items():
+            self._recuperados[id_sismo] = [_desde_microsegundos(fin_inicial_us), [
+                CambioEstado.restaurar(Estado.obtener(nombre), _desde_microsegundos(inicio_us),
+                                       _desde_microsegundos(fin_us))
+                for nombre, inicio_us, fin_us in cambios
+            ]]
+
+    def _cargar_instantanea(self):
+        try:
+            with open(self.ruta_instantanea, "rb") as archivo:
+                datos = archivo.read()
+            marca, version, secuencia, offset, cantidad = _CABECERA_INSTANTANEA.unpack_from(datos, 0)
+        except (OSError, struct.error):
+            return
+        if marca != _MARCA_INSTANTANEA or version != _VERSION_INSTANTANEA:
+            # El diario nunca se trunca: reproducirlo entero recupera el historial completo
+            _traza.warning("Diario '%s': instantánea con formato %s; se reproduce el diario completo", self.ruta, version)
+            return
+
+        historiales = {}
+        try:
+            posicion = _CABECERA_INSTANTANEA.size
+            for _ in range(cantidad):
+                fin_inicial_us, cantidad_cambios, longitud = _ENTRADA_INSTANTANEA.unpack_from(datos, posicion)
+                posicion += _ENTRADA_INSTANTANEA.size
+                id_sismo = datos[posicion:posicion + longitud].decode("utf-8")
+                posicion += longitud
+                cambios = []
+                for _ in range(cantidad_cambios):
+                    inicio_us, fin_us, longitud = _CAMBIO_INSTANTANEA.unpack_from(datos, posicion)
+                    posicion += _CAMBIO_INSTANTANEA.size
+                    nombre = datos[posicion:posicion + longitud].decode("utf-8")
+                    posicion += longitud
+                    cambios.append([nombre, inicio_us, fin_us])
+                historiales[id_sismo] = [fin_inicial_us, cambios]
+        except (struct.error, UnicodeDecodeError):
+            _traza.warning("Diario '%s': instantánea truncada; se reproduce el diario completo", self.ruta)
+            return
+
+        self._historiales = historiales
+        self._secuencia = secuencia
+        self._offset = offset
+
+    def _aplicar(self, id_sismo, fin_anterior_us, inicio_us, nombre_estado):
+        """Agrega un cambio de estado al historial reconstruido del evento"""
+        historial = self._historiales.get(id_sismo)
+        if historial is None:
+            historial = self._historiales[id_sismo] = [_SIN_FECHA, []]
+        cambios = historial[1]
+        if cambios:
+            cambios[-1][2] = fin_anterior_us
+        else:
+            # El cambio anterior es el estado inicial del catálogo
+            historial[0] = fin_anterior_us
+        cambios.append([nombre_estado, inicio_us, _SIN_FECHA])
+
+    def _aplicar_registro(self, contenido):
+        fin_anterior_us, inicio_us, longitud = _CONTENIDO_REGISTRO.unpack_from(contenido, 0)
+        posicion = _CONTENIDO_REGISTRO.size + longitud
+        nombre_estado = contenido[_CONTENIDO_REGISTRO.size:posicion].decode("utf-8")
+        self._aplicar(contenido[posicion:].decode("utf-8"), fin_anterior_us, inicio_us, nombre_estado)
+
+    def restaurarEvento(self, evento) -> bool:
+        """
+        Aplica al evento (recién creado desde el catálogo) los cambios de estado
+        recuperados. Debe llamarse antes de agregarlo al catálogo de eventos.
+        """
+        recuperado = self._recuperados.pop(evento.id_sismo, None)
+        if recuperado is None:
+            return False
+        fin_previo, cambios = recuperado
+        if fin_previo is not None:
+            evento.estadoActual.fechaHoraFin = fin_previo
+            cambios = evento.historial_estados + cambios
+        evento.restaurarHistorialEstados(cambios)
+        return True
+
+    # === ESCRITURA ===
+
+    def registrarCambioEstado(self, evento, estado_anterior, estado_nuevo):
+        """
+        Agrega el último cambio de estado del evento al diario y espera a que sea
+        durable. Tiene la firma de un observador de CatalogoEventos.
+        """
+        anterior = evento.historial_estados[-2] if len(evento.historial_estados) > 1 else None
+        fin_anterior_us = _a_microsegundos(anterior.fechaHoraFin if anterior else None)
+        inicio_us = _a_microsegundos(evento.estadoActual.fechaHoraInicio)
+        contenido = _contenido(fin_anterior_us, inicio_us, estado_nuevo.nombre, evento.id_sismo)
+
+        with self._condicion:
+            if self._error is not None or self._cerrando:
+                raise OSError(f"el diario '{self.ruta}' no admite más escrituras") from self._error
+            self._secuencia += 1
+            secuencia = self._secuencia
+            registro = _registro(secuencia, contenido)
+            self._pendientes.append((registro, evento.id_sismo, fin_anterior_us, inicio_us, estado_nuevo.nombre))
+            self._condicion.notify_all()
+            while self._secuencia_durable < secuencia and self._error is None:
+                self._condicion.wait()
+            if self._error is not None:
+                raise OSError(f"no se pudo escribir el diario '{self.ruta}'") from self._error
+
+    def _escribir_grupos(self):
+        """Hilo de escritura: un write y un fsync por cada grupo de registros pendientes"""
+        while True:
+            with self._condicion:
+                while not (self._pendientes or self._cerrando or self._instantanea_solicitada):
+                    self._condicion.wait()
+                cerrando = self._cerrando
+                solicitada, self._instantanea_solicitada = self._instantanea_solicitada, False
+
+            if self._pendientes:
+                if self.espera_grupo and not cerrando:
+                    threading.Event().wait(self.espera_grupo)
+                if not self._confirmar_grupo():
+                    return
+
+            # Al cerrar también se toma una instantánea, para que el próximo arranque no reproduzca nada
+            if solicitada or self._registros_desde_instantanea >= self.registros_por_instantanea or (
+                    cerrando and self._registros_desde_instantanea):
+                self._escribir_instantanea(self._secuencia_durable)
+            if cerrando:
+                return
+
+    def _confirmar_grupo(self) -> bool:
+        """Escribe los registros pendientes con un único fsync y despierta a quienes los esperan"""
+        with self._condicion:
+            grupo, self._pendientes = self._pendientes, []
+            ultima = self._secuencia
+
+        try:
+            self._archivo.write(b"".join(registro for registro, *_ in grupo))
+            self._archivo.flush()
+            os.fsync(self._archivo.fileno())
+        except OSError as e:
+            _traza.error("Diario '%s': error de escritura: %s", self.ruta, e)
+            with self._condicion:
+                self._error = e
+                self._condicion.notify_all()
+            return False
+
+        for registro, id_sismo, fin_anterior_us, inicio_us, nombre_estado in grupo:
+            self._aplicar(id_sismo, fin_anterior_us, inicio_us, nombre_estado)
+            self._offset += len(registro)
+        self._registros_desde_instantanea += len(grupo)
+
+        with self._condicion:
+            self._secuencia_durable = ultima
+            self._condicion.notify_all()
+        _traza.debug("Diario '%s': %s registros confirmados con un fsync", self.ruta, len(grupo))
+        return True
+
+    def _escribir_instantanea(self, secuencia):
+        """Escribe la instantánea en un archivo temporal y la reemplaza de forma atómica"""
+        partes = [_CABECERA_INSTANTANEA.pack(
+            _MARCA_INSTANTANEA, _VERSION_INSTANTANEA, secuencia, self._offset, len(self._historiales)
+        )]
+        for id_sismo, (fin_inicial_us, cambios) in self._historiales.items():
+            id_bytes = id_sismo.encode("utf-8")
+            partes.append(_ENTRADA_INSTANTANEA.pack(fin_inicial_us, len(cambios), len(id_bytes)))
+            partes.append(id_bytes)
+            for nombre_estado, inicio_us, fin_us in cambios:
+                nombre = nombre_estado.encode("utf-8")
+                partes.append(_CAMBIO_INSTANTANEA.pack(inicio_us, fin_us, len(nombre)))
+                partes.append(nombre)
+
+        temporal = self.ruta_instantanea + ".tmp"
+        try:
+            with open(temporal, "wb") as archivo:
+                archivo.write(b"".join(partes))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+            os.replace(temporal, self.ruta_instantanea)
+        except OSError as e:
+            _traza.error("Diario '%s': no se pudo escribir la instantánea: %s", self.ruta, e)
+            return
+        self._registros_desde_instantanea = 0
+        _traza.debug("Diario '%s': instantánea de %s eventos hasta la secuencia %s", self.ruta, len(self._historiales), secuencia)
+
+    def tomarInstantanea(self):
+        """Solicita al hilo de escritura una instantánea tras confirmar los registros pendientes"""
+        with self._condicion:
+            self._instantanea_solicitada = True
+            self._condicion.notify_all()
+
+    def cerrar(self):
+        """Confirma los registros pendientes, toma una instantánea y detiene el hilo de escritura"""
+        with self._condicion:
+            if self._cerrando:
+                return
+            self._cerrando = True
+            self._condicion.notify_all()
+        self._hilo.join()
+        self._archivo.close()
@@ -0,0 +1,231 @@
+# persistencia/lector_json.py
+
+import json
+import os
+import re
+from modelos.serie_temporal import SerieTemporal
+from modelos.estacion_sismologica import EstacionSismologica
+
+_ESPACIOS = re.compile(r"[ \t\r\n]*")
+_SEPARADOR = re.compile(r"[ \t\r\n]*,[ \t\r\n]*")
+SUFIJO_INDICE = ".indice.json"
+
+
+class ErrorFormatoCatalogo(ValueError):
+    """El archivo de catálogo no tiene la forma esperada (un arreglo JSON de eventos)"""
+
+
+def _longitud_bytes(texto: str) -> int:
+    """Cantidad de bytes UTF-8 que ocupa un fragmento de texto del archivo"""
+    return len(texto) if texto.isascii() else len(texto.encode("utf-8"))
+
+
+def _iterar_elementos(archivo, tamano_bloque):
+    """
+    Recorre el arreglo JSON de nivel superior de 'archivo' (abierto en modo texto)
+    y genera (elemento, inicio_en_bytes, longitud_en_bytes) para cada elemento.
+    El archivo debe abrirse con newline="" para que los offsets coincidan.
+    Sólo mantiene en memoria el bloque leído y el texto del elemento que se está decodificando.
+
+    Los elementos se decodifican en el lugar ('cursor' avanza sobre el buffer);
+    lo ya consumido se descarta recién al leer el bloque siguiente y sólo si
+    ocupa más de la mitad del buffer, de modo que cada carácter se copia una
+    cantidad acotada de veces sin importar el tamaño del bloque.
+    """
+    decodificador = json.JSONDecoder()
+    espacios = _ESPACIOS.match
+    buffer = ""
+    cursor = 0          # primer carácter de 'buffer' aún no consumido
+    posicion = 0        # offset en bytes de buffer[cursor] dentro del archivo
+    fin_de_archivo = False
+    # Mientras todo lo leído sea ASCII, caracteres y bytes coinciden y no hace falta codificar
+    solo_ascii = True
+
+    def leer(cantidad):
+        nonlocal buffer, cursor, fin_de_archivo, solo_ascii
+        bloque = archivo.read(cantidad)
+        if not bloque:
+            fin_de_archivo = True
+        solo_ascii = solo_ascii and bloque.isascii()
+        if cursor > len(buffer) // 2:
+            buffer = buffer[cursor:]
+            cursor = 0
+        buffer += bloque
+
+    def siguiente_caracter():
+        """Descarta espacios (siempre ASCII) y devuelve el próximo carácter significativo (o '' al final)"""
+        nonlocal cursor, posicion
+        while True:
+            fin = espacios(buffer, cursor).end()
+            posicion += fin - cursor
+            cursor = fin
+            if cursor < len(buffer) or fin_de_archivo:
+                return buffer[cursor:cursor + 1]
+            leer(tamano_bloque)
+
+    leer(tamano_bloque)
+    if buffer.startswith("\ufeff"):
+        cursor, posicion = 1, len("\ufeff".encode("utf-8"))
+    if siguiente_caracter() != "[":
+        raise ErrorFormatoCatalogo("se esperaba un arreglo JSON de eventos")
+    cursor += 1
+    posicion += 1
+
+    esperando_elemento = True
+    while True:
+        caracter = buffer[cursor] if cursor < len(buffer) else ""
+        if caracter == "" or caracter in " \t\r\n":
+            caracter = siguiente_caracter()
+        if caracter == "]":
+            return
+        if caracter == "":
+            raise ErrorFormatoCatalogo("el arreglo de eventos no está cerrado")
+        if not esperando_elemento:
+            if caracter != ",":
+                raise ErrorFormatoCatalogo(f"se esperaba ',' o ']' y se encontró {caracter!r}")
+            cursor += 1
+            posicion += 1
+            esperando_elemento = True
+            continue
+
+        try:
+            elemento, fin = decodificador.raw_decode(buffer, cursor)
+        except json.JSONDecodeError:
+            if fin_de_archivo:
+                raise
+            # El elemento todavía no está completo: se duplica la lectura para que
+            # los reintentos sobre eventos grandes sigan siendo lineales
+            leer(max(tamano_bloque, len(buffer) - cursor))
+            continue
+
+        inicio = posicion
+        longitud = fin - cursor if solo_ascii else _longitud_bytes(buffer[cursor:fin])
+        posicion += longitud
+        cursor = fin
+        # Caso habitual: la coma y los espacios hasta el elemento siguiente ya están en el buffer
+        separador = _SEPARADOR.match(buffer, cursor)
+        esperando_elemento = separador is not None and separador.end() < len(buffer)
+        if esperando_elemento:
+            posicion += separador.end() - cursor
+            cursor = separador.end()
+        yield elemento, inicio, longitud
+
+
+def iterar_eventos_json(ruta, tamano_bloque=1 << 20):
+    """
+    Genera los eventos de un catálogo con el esquema de sismos.json de a uno,
+    sin decodificar el documento completo. El consumo de memoria queda acotado
+    por el tamaño del evento más grande, no por el tamaño del archivo.
+    """
+    for elemento, _inicio, _longitud in iterar_eventos_ubicados_json(ruta, tamano_bloque):
+        yield elemento
+
+
+def iterar_eventos_ubicados_json(ruta, tamano_bloque=1 << 20):
+    """Como iterar_eventos_json, pero genera (evento, inicio_en_bytes, longitud_en_bytes)"""
+    # newline="" evita la traducción de finales de línea, que desplazaría los offsets
+    with open(ruta, "r", encoding="utf-8", newline="") as archivo:
+        yield from _iterar_elementos(archivo, tamano_bloque)
+
+
+def firma_archivo(ruta):
+    """Tamaño y fecha de modificación de un archivo, para detectar índices desactualizados"""
+    estado = os.stat(ruta)
+    return {"tamano": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+
+
+def cabecera_evento(sismo_data):
+    """Datos del evento sin sus series temporales"""
+    if not isinstance(sismo_data, dict):
+        raise ErrorFormatoCatalogo(f"se esperaba un objeto por evento y se encontró {type(sismo_data).__name__}")
+    return {clave: valor for clave, valor in sismo_data.items() if clave != "series_temporales"}
+
+
+def leer_cabeceras_json(ruta, usar_indice=True, tamano_bloque=1 << 20):
+    """
+    Devuelve una lista de (cabecera, inicio, longitud) con los datos de cada
+    evento sin sus series y la ubicación en bytes del evento dentro del archivo.
+
+    El primer recorrido escribe un índice junto al catálogo ('<ruta>.indice.json');
+    mientras el catálogo no cambie (mismo tamaño y fecha de modificación) los
+    arranques siguientes leen sólo ese índice, en tiempo proporcional a la
+    cantidad de eventos y no al volumen de las formas de onda.
+    """
+    firma = firma_archivo(ruta)
+    ruta_indice = ruta + SUFIJO_INDICE
+
+    if usar_indice:
+        try:
+            with open(ruta_indice, "r", encoding="utf-8") as archivo:
+                indice = json.load(archivo)
+            if indice.get("firma") == firma:
+                return [tuple(entrada) for entrada in indice["eventos"]]
+        except (OSError, ValueError, KeyError):
+            pass  # índice ausente o corrupto: se reconstruye
+
+    with open(ruta, "r", encoding="utf-8", newline="") as archivo:
+        entradas = [
+            (cabecera_evento(elemento), inicio, longitud)
+            for elemento, inicio, longitud in _iterar_elementos(archivo, tamano_bloque)
+        ]
+
+    if usar_indice:
+        try:
+            with open(ruta_indice, "w", encoding="utf-8") as archivo:
+                json.dump({"firma": firma, "eventos": entradas}, archivo, ensure_ascii=False)
+        except OSError:
+            pass  # sin permisos de escritura: el índice es sólo una optimización
+    return entradas
+
+
+class CargadorSeriesJson:
+    """
+    Cargador diferido de las series de un evento: relee sólo el fragmento del
+    catálogo que ocupa el evento y lo convierte a series en modo columnar.
+    """
+
+    def __init__(self, ruta, inicio, longitud):
+        self.ruta = ruta
+        self.inicio = inicio
+        self.longitud = longitud
+
+    def __call__(self):
+        with open(self.ruta, "rb") as archivo:
+            archivo.seek(self.inicio)
+            sismo_data = json.loads(archivo.read(self.longitud))
+        return [SerieTemporal.desde_datos(serie_d) for serie_d in sismo_data.get("series_temporales", [])]
+
+
+def leer_estaciones_json(ruta):
+    """
+    Lee el registro de estaciones: un arreglo JSON de objetos con 'codigo',
+    'nombre', 'latitud' y 'longitud' (en grados). Devuelve EstacionSismologica.
+    """
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    if not isinstance(datos, list):
+        raise ErrorFormatoCatalogo(f"{ruta}: se esperaba un arreglo JSON de estaciones")
+    estaciones = []
+    for posicion, estacion_data in enumerate(datos):
+        try:
+            estaciones.append(EstacionSismologica(
+                estacion_data["codigo"],
+                estacion_data.get("nombre"),
+                float(estacion_data["latitud"]),
+                float(estacion_data["longitud"]),
+            ))
+        except (KeyError, TypeError, ValueError) as e:
+            raise ErrorFormatoCatalogo(f"{ruta}: estación {posicion} inválida ({e!r})") from e
+    return estaciones
+
+
+def leer_reglas_clasificacion_json(ruta):
+    """
+    Lee las reglas de clasificación, alcance y origen: un objeto JSON con la
+    forma de casos_de_uso.clasificador_sismos.REGLAS_POR_DEFECTO.
+    """
+    with open(ruta, "r", encoding="utf-8") as archivo:
+        datos = json.load(archivo)
+    if not isinstance(datos, dict):
+        raise ErrorFormatoCatalogo(f"{ruta}: se esperaba un objeto JSON de reglas")
+    return datos
@@ -0,0 +1,184 @@
+# tests/test_administrador_bloqueos.py
+
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime
+from gestor.administrador_bloqueos import AdministradorBloqueos
+from modelos.catalogo_eventos import CatalogoEventos
+from modelos.estado import PENDIENTE_DE_REVISION, BLOQUEADO_EN_REVISION, CONFIRMADO, RECHAZADO, AUTO_DETECTADO
+from modelos.evento_sismico import EventoSismico
+from persistencia.base_datos_eventos import BaseDatosEventos
+
+_PENDIENTES = (AUTO_DETECTADO, PENDIENTE_DE_REVISION)
+
+
+class Reloj:
+    """Reloj manual: el hilo de vencimientos duerme en tiempo real, pero compara contra este"""
+
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class Estacion:
+    """Una estación de revisión: su propia conexión a la base y sus propios eventos en memoria"""
+
+    def __init__(self, ruta, reloj):
+        self.base_datos = BaseDatosEventos(ruta)
+        self.administrador = AdministradorBloqueos(duracion_concesion=60.0, reloj=reloj, base_datos=self.base_datos)
+        self.catalogo = CatalogoEventos()
+        self.catalogo.agregarObservador(self.base_datos.registrarCambioEstado)
+        # Como el gestor: las filas del listado y, por cada una, la cabecera y el historial
+        for id_sismo, *_ in self.base_datos.filasEnEstados(_PENDIENTES + (BLOQUEADO_EN_REVISION,)):
+            cabecera, _, cambios = self.base_datos.obtenerEvento(id_sismo)
+            evento = EventoSismico(cabecera["id_sismo"], datetime.fromisoformat(cabecera["fecha_hora_ocurrencia"]),
+                                   cabecera["valor_magnitud"], cabecera["estado_inicial"])
+            evento.restaurarHistorialEstados(cambios)
+            self.catalogo.agregar(evento)
+
+    def estadoEnBase(self, id_sismo):
+        return self.base_datos.obtenerEvento(id_sismo)[2][-1].actual
+
+
+class TestAdministradorBloqueosEnProceso(unittest.TestCase):
+
+    def setUp(self):
+        self.evento = EventoSismico("S1", datetime(2025, 5, 1), 4.2, PENDIENTE_DE_REVISION.nombre)
+
+    def test_contencion(self):
+        administrador = AdministradorBloqueos(duracion_concesion=60.0)
+        estacion_a, estacion_b = object(), object()
+        concesion = administrador.adquirir(self.evento, estacion_a, "ana", _PENDIENTES)
+        self.assertIsNotNone(concesion)
+        self.assertIs(self.evento.estadoActual.actual, BLOQUEADO_EN_REVISION)
+        self.assertIsNone(administrador.adquirir(self.evento, estacion_b, "beto", _PENDIENTES))
+        self.assertEqual(administrador.concesionDe("S1").analista, "ana")
+        # El mismo titular la renueva
+        self.assertIs(administrador.adquirir(self.evento, estacion_a, "ana", _PENDIENTES), concesion)
+
+        self.assertTrue(administrador.liberar(concesion, revertir=True))
+        self.assertIs(self.evento.estadoActual.actual, PENDIENTE_DE_REVISION)
+        self.assertIsNotNone(administrador.adquirir(self.evento, estacion_b, "beto", _PENDIENTES))
+
+    def test_vencimiento_se_revierte_en_el_hilo_que_lo_pide(self):
+        administrador = AdministradorBloqueos(duracion_concesion=0.05)
+        avisos, avisado = [], threading.Event()
+
+        def alVencer(concesion):
+            avisos.append((concesion, threading.current_thread()))
+            avisado.set()
+
+        administrador.alVencer(alVencer)
+        concesion = administrador.adquirir(self.evento, self, "ana", _PENDIENTES)
+        self.assertTrue(avisado.wait(5))
+        vencida, hilo = avisos[0]
+        self.assertIs(vencida, concesion)
+        self.assertIsNot(hilo, threading.current_thread())
+        # El hilo de vencimientos no toca el evento
+        self.assertIs(self.evento.estadoActual.actual, BLOQUEADO_EN_REVISION)
+        self.assertFalse(administrador.esVigente(concesion))
+
+        self.assertTrue(administrador.vencer(concesion))
+        self.assertIs(self.evento.estadoActual.actual, PENDIENTE_DE_REVISION)
+        self.assertFalse(administrador.vencer(concesion))
+
+    def test_finalizar_no_registra_una_concesion_vencida(self):
+        reloj = Reloj()
+        administrador = AdministradorBloqueos(duracion_concesion=60.0, reloj=reloj)
+        concesion = administrador.adquirir(self.evento, self, "ana", _PENDIENTES)
+        reloj.ahora += 61.0
+        registrados = []
+        self.assertFalse(administrador.finalizar(concesion, lambda: registrados.append(True)))
+        self.assertEqual(registrados, [])
+
+        # Vencida y aún sin revertir: otro titular la hereda con el estado previo original
+        otra = administrador.adquirir(self.evento, object(), "beto", _PENDIENTES)
+        self.assertIs(otra.estado_previo, PENDIENTE_DE_REVISION)
+        self.assertFalse(administrador.vencer(concesion))
+        self.assertTrue(administrador.finalizar(otra, self.evento.cambiarEventoSismicoAConfirmado))
+        self.assertIs(self.evento.estadoActual.actual, CONFIRMADO)
+        self.assertIsNone(administrador.concesionDe("S1"))
+
+
+class TestAdministradorBloqueosEnBase(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "sismos.db")
+        base_datos = BaseDatosEventos(self.ruta)
+        base_datos.importarEventos([
+            {"cabecera": {"id_sismo": id_sismo, "fecha_hora_ocurrencia": datetime(2025, 5, dia),
+                          "valor_magnitud": 4.0, "estado_inicial": PENDIENTE_DE_REVISION.nombre},
+             "fuente": None, "series": []}
+            for dia, id_sismo in enumerate(("S1", "S2"), start=1)
+        ])
+        base_datos.cerrar()
+        self.reloj = Reloj()
+        self.a = Estacion(self.ruta, self.reloj)
+        self.b = Estacion(self.ruta, self.reloj)
+
+    def tearDown(self):
+        self.a.base_datos.cerrar()
+        self.b.base_datos.cerrar()
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def test_contencion_entre_estaciones(self):
+        concesion = self.a.administrador.adquirir(self.a.catalogo.obtener("S1"), self.a, "ana", _PENDIENTES)
+        self.assertIsNotNone(concesion)
+        self.assertIs(self.b.estadoEnBase("S1"), BLOQUEADO_EN_REVISION)
+
+        # La otra estación aún ve el evento pendiente en memoria: decide la base
+        evento_b = self.b.catalogo.obtener("S1")
+        self.assertIs(evento_b.estadoActual.actual, PENDIENTE_DE_REVISION)
+        self.assertIsNone(self.b.administrador.adquirir(evento_b, self.b, "beto", _PENDIENTES))
+        self.assertIs(evento_b.estadoActual.actual, PENDIENTE_DE_REVISION)
+        self.assertEqual(self.b.administrador.concesionDe("S1").analista, "ana")
+        self.assertIsNotNone(self.b.administrador.adquirir(self.b.catalogo.obtener("S2"), self.b, "beto", _PENDIENTES))
+
+        self.assertTrue(self.a.administrador.finalizar(concesion, self.a.catalogo.obtener("S1").cambiarEventoSismicoARechazado))
+        self.assertIs(self.b.estadoEnBase("S1"), RECHAZADO)
+        self.assertIsNone(self.b.base_datos.bloqueoDe("S1"))
+
+    def test_vencimiento_y_toma_por_otra_estacion(self):
+        concesion = self.a.administrador.adquirir(self.a.catalogo.obtener("S1"), self.a, "ana", _PENDIENTES)
+        self.reloj.ahora += 61.0
+        self.assertIsNone(self.b.administrador.concesionDe("S1"))
+
+        evento_b = self.b.catalogo.obtener("S1")
+        otra = self.b.administrador.adquirir(evento_b, self.b, "beto", _PENDIENTES)
+        self.assertIsNotNone(otra)
+        self.assertEqual(self.b.base_datos.bloqueoDe("S1")[0], otra.clave)
+
+        # La estación que perdió el bloqueo no registra su resultado ni revierte el evento
+        confirmado = []
+        self.assertFalse(self.a.administrador.finalizar(concesion, lambda: confirmado.append(True)))
+        self.assertEqual(confirmado, [])
+        self.assertFalse(self.a.administrador.vencer(concesion))
+        self.assertIs(self.a.estadoEnBase("S1"), BLOQUEADO_EN_REVISION)
+
+        self.assertTrue(self.b.administrador.finalizar(otra, evento_b.cambiarEventoSismicoAConfirmado))
+        self.assertIs(self.a.estadoEnBase("S1"), CONFIRMADO)
+
+    def test_bloqueo_vencido_de_una_sesion_anterior(self):
+        self.a.administrador.adquirir(self.a.catalogo.obtener("S1"), self.a, "ana", _PENDIENTES)
+        self.a.base_datos.cerrar()
+        self.reloj.ahora += 61.0
+
+        # Una sesión nueva ve el evento bloqueado, con el bloqueo vencido en la base
+        self.a = Estacion(self.ruta, self.reloj)
+        evento = self.a.catalogo.obtener("S1")
+        self.assertIs(evento.estadoActual.actual, BLOQUEADO_EN_REVISION)
+        concesion = self.a.administrador.adquirir(evento, self.a, "ana", _PENDIENTES)
+        self.assertIsNotNone(concesion)
+        self.assertIs(concesion.estado_previo, PENDIENTE_DE_REVISION)
+        self.assertTrue(self.a.administrador.liberar(concesion, revertir=True))
+        self.assertIs(self.b.estadoEnBase("S1"), PENDIENTE_DE_REVISION)
+
+
+if __name__ == "__main__":
+    unittest.main()
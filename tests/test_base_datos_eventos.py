@@ -0,0 +1,109 @@
+# tests/test_base_datos_eventos.py
+
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+from datetime import datetime
+from modelos.estado import CONFIRMADO, PENDIENTE_DE_REVISION, Estado
+from modelos.evento_sismico import EventoSismico
+from persistencia.base_datos_eventos import BaseDatosEventos, entrada_desde_evento
+
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _en_otro_interprete(codigo, *argumentos):
+    """Ejecuta 'codigo' en un intérprete nuevo (con sus propios códigos de Estado) y devuelve su salida"""
+    resultado = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(codigo), *argumentos],
+        cwd=_RAIZ, capture_output=True, text=True, timeout=60,
+    )
+    if resultado.returncode != 0:
+        raise AssertionError(resultado.stderr)
+    return resultado.stdout
+
+
+class TestBaseDatosEventos(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "sismos.db")
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio)
+
+    def test_estados_no_canonicos_entre_procesos(self):
+        # Cada proceso crea otro estado no canónico antes, de modo que sus códigos no coinciden
+        _en_otro_interprete("""
+            import sys
+            from datetime import datetime
+            from modelos.estado import Estado
+            from modelos.evento_sismico import EventoSismico
+            from persistencia.base_datos_eventos import BaseDatosEventos, entrada_desde_evento
+            Estado("Otro estado")
+            evento = EventoSismico("A", datetime(2025, 5, 1), 3.0, "Derivado")
+            base_datos = BaseDatosEventos(sys.argv[1])
+            base_datos.agregarEventos([entrada_desde_evento(evento)])
+            base_datos.cerrar()
+        """, self.ruta)
+        salida = _en_otro_interprete("""
+            import sys
+            from modelos.estado import Estado
+            from persistencia.base_datos_eventos import BaseDatosEventos
+            Estado("Tercer estado")
+            base_datos = BaseDatosEventos(sys.argv[1])
+            cabecera, _, cambios = base_datos.obtenerEvento("A")
+            print(cabecera["estado_inicial"], cambios[-1].actual.nombre, base_datos.filasEntre()[0][3], sep="|")
+            print(len(base_datos.filasEnEstados([Estado("Derivado")])))
+        """, self.ruta)
+        self.assertEqual(salida.splitlines(), ["Derivado|Derivado|Derivado", "1"])
+
+    def test_cambios_de_estado_guardan_el_nombre(self):
+        base_datos = BaseDatosEventos(self.ruta)
+        evento = EventoSismico("S1", datetime(2025, 5, 1), 4.0, PENDIENTE_DE_REVISION.nombre)
+        base_datos.agregarEventos([entrada_desde_evento(evento)])
+        evento.cambiarEstadoEventoSismico(CONFIRMADO.nombre)
+        base_datos.registrarCambioEstado(evento, PENDIENTE_DE_REVISION, CONFIRMADO)
+        base_datos.cerrar()
+
+        conexion = sqlite3.connect(self.ruta)
+        self.assertEqual(conexion.execute("SELECT estado_actual FROM eventos").fetchall(), [("Confirmado",)])
+        self.assertEqual(conexion.execute("SELECT estado FROM cambios_estado ORDER BY id_cambio").fetchall(),
+                         [("Pendiente de Revisión",), ("Confirmado",)])
+        conexion.close()
+
+    def test_migracion_de_codigos_de_estado(self):
+        # Base escrita por una versión anterior, que guardaba Estado.codigo en columnas INTEGER
+        conexion = sqlite3.connect(self.ruta)
+        with conexion:
+            conexion.executescript("""
+                CREATE TABLE eventos (
+                    id_sismo TEXT PRIMARY KEY, fecha_hora_ocurrencia TEXT NOT NULL, valor_magnitud REAL,
+                    latitud_epicentro REAL, longitud_epicentro REAL, profundidad REAL,
+                    estado_actual INTEGER NOT NULL, fuente_inicio INTEGER, fuente_longitud INTEGER
+                );
+                CREATE TABLE cambios_estado (
+                    id_cambio INTEGER PRIMARY KEY, id_sismo TEXT NOT NULL REFERENCES eventos (id_sismo),
+                    estado INTEGER NOT NULL, fecha_hora_inicio TEXT NOT NULL, fecha_hora_fin TEXT
+                );
+                INSERT INTO eventos (id_sismo, fecha_hora_ocurrencia, estado_actual)
+                    VALUES ('S1', '2025-05-01T00:00:00.000000', 3), ('S2', '2025-05-02T00:00:00.000000', 9);
+                INSERT INTO cambios_estado (id_sismo, estado, fecha_hora_inicio)
+                    VALUES ('S1', 3, '2025-05-01T00:00:00.000000');
+            """)
+        conexion.close()
+
+        with self.assertLogs("persistencia.base_datos_eventos", "WARNING"):
+            base_datos = BaseDatosEventos(self.ruta)
+        self.assertIs(base_datos.obtenerEvento("S1")[2][-1].actual, CONFIRMADO)
+        self.assertEqual([fila[3] for fila in base_datos.filasEntre()], ["Confirmado", "Código 9"])
+        self.assertEqual([fila[0] for fila in base_datos.filasEnEstados([Estado("Confirmado")])], ["S1"])
+        base_datos.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+# tests/test_buffer_circular.py
+
+import random
+import unittest
+import numpy as np
+from ingesta.buffer_circular import BufferCircular, UN_SEGUNDO_US
+
+_TASA = 50.0
+_PERIODO_US = round(UN_SEGUNDO_US / _TASA)
+
+
+class TestBufferCircular(unittest.TestCase):
+
+    def setUp(self):
+        self.buffer = BufferCircular("EST", ("velocidad_onda", "frecuencia_onda"), 37)
+        # Referencia: todas las muestras recibidas, en orden
+        self.tiempos, self.valores = [], []
+        self.siguiente = 0
+
+    def _agregar(self, cantidad):
+        inicio_us = 1_700_000_000_000_000 + self.siguiente * _PERIODO_US
+        valores = np.vstack([np.arange(self.siguiente, self.siguiente + cantidad, dtype=float),
+                             -np.arange(self.siguiente, self.siguiente + cantidad, dtype=float)])
+        self.assertEqual(self.buffer.agregar(inicio_us, _TASA, valores), cantidad)
+        self.tiempos.extend(inicio_us + k * _PERIODO_US for k in range(cantidad))
+        self.valores.extend(range(self.siguiente, self.siguiente + cantidad))
+        self.siguiente += cantidad
+
+    def _verificar(self, cantidad=None):
+        serie = self.buffer.serie(cantidad)
+        esperadas = min(len(self.tiempos), self.buffer.capacidad)
+        if cantidad is not None:
+            esperadas = min(cantidad, esperadas)
+        desde = len(self.tiempos) - esperadas
+        self.assertEqual(serie.tiempos.astype(np.int64).tolist(), self.tiempos[desde:])
+        self.assertEqual(serie.valores["velocidad_onda"].tolist(), [float(v) for v in self.valores[desde:]])
+        self.assertEqual(serie.valores["frecuencia_onda"].tolist(), [-float(v) for v in self.valores[desde:]])
+        return serie
+
+    def test_vuelta_completa_con_bloques_al_azar(self):
+        azar = random.Random(3)
+        for _ in range(300):
+            # Bloques que cruzan el final del arreglo, de una muestra y mayores que la capacidad
+            self._agregar(azar.choice((1, 2, azar.randrange(1, 37), 36, 37, 38, 80)))
+            self.assertEqual(self.buffer.total, len(self.tiempos))
+            self.assertEqual(self.buffer.ultimoInstante(), self.tiempos[-1])
+            self._verificar()
+            self._verificar(azar.randrange(0, 45))
+
+    def test_vistas_sin_copia_y_copias(self):
+        self._agregar(50)
+        vista = self._verificar(10)
+        copia = self.buffer.serie(10, copiar=True)
+        self.assertTrue(np.shares_memory(vista.valores["velocidad_onda"], self.buffer._columnas))
+        self.assertFalse(np.shares_memory(copia.valores["velocidad_onda"], self.buffer._columnas))
+        with self.assertRaises(ValueError):
+            vista.valores["velocidad_onda"][0] = 0.0
+
+        # La vista de N muestras sigue válida durante otras capacidad - N muestras; la copia, siempre
+        antes = copia.valores["velocidad_onda"].tolist()
+        self._agregar(self.buffer.capacidad - 10)
+        self.assertEqual(vista.valores["velocidad_onda"].tolist(), antes)
+        self._agregar(1)
+        self.assertNotEqual(vista.valores["velocidad_onda"].tolist(), antes)
+        self.assertEqual(copia.valores["velocidad_onda"].tolist(), antes)
+
+    def test_serie_desde(self):
+        self._agregar(20)
+        total = self.buffer.total
+        self._agregar(15)
+        nuevas, perdidas = self.buffer.serieDesde(total)
+        self.assertEqual((len(nuevas.tiempos), perdidas), (15, 0))
+        total = self.buffer.total
+        self._agregar(50)
+        nuevas, perdidas = self.buffer.serieDesde(total)
+        self.assertEqual((len(nuevas.tiempos), perdidas), (37, 13))
+        self.assertEqual(nuevas.valores["velocidad_onda"].tolist(), [float(v) for v in self.valores[-37:]])
+
+    def test_bloques_repetidos_o_anteriores(self):
+        self._agregar(30)
+        # Reenvío tras reconectar: el bloque se superpone con lo ya guardado
+        inicio_us = self.tiempos[-10]
+        valores = np.full((2, 25), 7.0)
+        self.assertEqual(self.buffer.agregar(inicio_us, _TASA, valores), 15)
+        ultimo = self.tiempos[-1]
+        self.tiempos.extend(ultimo + k * _PERIODO_US for k in range(1, 16))
+        self.valores.extend([7] * 15)
+        serie = self.buffer.serie()
+        self.assertEqual(serie.tiempos.astype(np.int64).tolist(), self.tiempos[-37:])
+        self.assertTrue(np.all(np.diff(serie.tiempos.astype(np.int64)) > 0))
+        self.assertEqual(serie.valores["velocidad_onda"][-15:].tolist(), [7.0] * 15)
+
+        # Un bloque completamente anterior no agrega nada
+        total = self.buffer.total
+        self.assertEqual(self.buffer.agregar(self.tiempos[0], _TASA, np.zeros((2, 30))), 0)
+        self.assertEqual(self.buffer.total, total)
+        self.assertEqual(self.buffer.serie().tiempos.astype(np.int64).tolist(), self.tiempos[-37:])
+
+    def test_capacidad_invalida(self):
+        with self.assertRaises(ValueError):
+            BufferCircular("EST", ("velocidad_onda",), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,84 @@
+# tests/test_catalogo_eventos.py
+
+import random
+import unittest
+from datetime import datetime, timedelta
+from modelos.catalogo_eventos import CatalogoEventos
+from modelos.estado import AUTO_DETECTADO, PENDIENTE_DE_REVISION, CONFIRMADO, RECHAZADO, BLOQUEADO_EN_REVISION
+from modelos.evento_sismico import EventoSismico
+
+_ESTADOS = (AUTO_DETECTADO, PENDIENTE_DE_REVISION, BLOQUEADO_EN_REVISION, CONFIRMADO, RECHAZADO)
+
+
+class TestCatalogoEventos(unittest.TestCase):
+
+    def setUp(self):
+        self.azar = random.Random(11)
+        self.inicio = datetime(2025, 1, 1)
+        self.catalogo = CatalogoEventos()
+        self.eventos = []
+        for numero in range(400):
+            # Fechas repetidas: a igual fecha decide el id
+            fecha = self.inicio + timedelta(hours=self.azar.randrange(200))
+            estado = self.azar.choice((AUTO_DETECTADO, PENDIENTE_DE_REVISION)).nombre
+            self.eventos.append(EventoSismico(f"S{numero:03d}", fecha, 3.0, estado))
+        for evento in self.eventos:
+            self.catalogo.agregar(evento)
+        self.cambios = []
+        self.catalogo.agregarObservador(lambda *cambio: self.cambios.append(cambio))
+
+    def _esperados(self, estados, desde=None, hasta=None):
+        return sorted(
+            (evento for evento in self.catalogo
+             if evento.estadoActual.actual in estados
+             and (desde is None or evento.fechaHoraOcurrencia >= desde)
+             and (hasta is None or evento.fechaHoraOcurrencia < hasta)),
+            key=lambda evento: (evento.fechaHoraOcurrencia, evento.id_sismo),
+        )
+
+    def _verificar(self):
+        for estado in _ESTADOS:
+            esperados = self._esperados((estado,))
+            self.assertEqual(self.catalogo.idsEnEstado(estado), [evento.id_sismo for evento in esperados])
+            self.assertEqual(self.catalogo.cantidadEnEstado(estado), len(esperados))
+        desde, hasta = self.inicio + timedelta(hours=50), self.inicio + timedelta(hours=120)
+        pendientes = (AUTO_DETECTADO, PENDIENTE_DE_REVISION)
+        self.assertEqual(self.catalogo.eventosEntre(desde, hasta, pendientes), self._esperados(pendientes, desde, hasta))
+        self.assertEqual(self.catalogo.eventosEnEstados(*pendientes), self._esperados(pendientes)[::-1])
+
+    def test_los_indices_siguen_los_cambios_de_estado(self):
+        self._verificar()
+        for _ in range(300):
+            evento = self.azar.choice(self.eventos)
+            evento.cambiarEstadoEventoSismico(self.azar.choice(_ESTADOS).nombre)
+        self._verificar()
+        self.assertEqual(len(self.cambios), 300)
+        evento = self.eventos[0]
+        self.assertTrue(self.catalogo.estaEnEstado(evento.id_sismo, evento.estadoActual.actual))
+        self.assertFalse(self.catalogo.estaEnEstado(evento.id_sismo, object()))
+
+    def test_agregar_y_quitar_con_el_indice_ya_ordenado(self):
+        self._verificar()
+        for numero in range(50):
+            fecha = self.inicio + timedelta(hours=self.azar.randrange(-10, 250))
+            self.catalogo.agregar(EventoSismico(f"N{numero:02d}", fecha, 2.0, "Auto-Detectado"))
+        for evento in self.eventos[:100]:
+            self.catalogo.quitar(evento.id_sismo)
+        self.assertEqual(len(self.catalogo), 350)
+        self._verificar()
+        self.assertEqual([evento.id_sismo for evento in self.catalogo.ultimosEventos(5)],
+                         [evento.id_sismo for evento in list(reversed(self.catalogo))[:5]])
+
+    def test_reemplazo_de_un_evento_con_el_mismo_id(self):
+        original = self.eventos[5]
+        nuevo = EventoSismico(original.id_sismo, self.inicio - timedelta(days=1), 5.0, "Confirmado")
+        self.catalogo.agregar(nuevo)
+        self.assertIs(self.catalogo.obtener(original.id_sismo), nuevo)
+        self.assertIsNone(original.catalogo)
+        # Los cambios de un evento que ya no está en el catálogo no tocan los índices
+        original.cambiarEstadoEventoSismico("Rechazado")
+        self._verificar()
+
+
+if __name__ == "__main__":
+    unittest.main()
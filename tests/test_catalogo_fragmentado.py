@@ -0,0 +1,122 @@
+# tests/test_catalogo_fragmentado.py
+
+import json
+import os
+import tempfile
+import unittest
+from persistencia.base_datos_eventos import _info_serie
+from persistencia.catalogo_fragmentado import leer_fragmentos, firma_catalogo
+from persistencia.lector_json import CargadorSeriesJson
+
+_VARIABLE_PROCESO_PRINCIPAL = "REDSISMICA_PRUEBA_PID"
+
+
+def _info_serie_que_mata_al_proceso_del_pool(serie):
+    """Simula un proceso del pool que muere (por ejemplo, por falta de memoria)"""
+    if os.environ.get(_VARIABLE_PROCESO_PRINCIPAL) != str(os.getpid()):
+        os._exit(1)
+    return _info_serie(serie)
+
+
+def _evento(id_sismo, **cambios):
+    evento = {
+        "id_sismo": id_sismo,
+        "fecha_hora_ocurrencia": "2025-03-01T10:00:00",
+        "valor_magnitud": 3.5,
+        "estado_inicial": "Auto-Detectado",
+        "latitud_epicentro": -31.4,
+        "series_temporales": [{
+            "fecha_hora_inicio": "2025-03-01T10:00:00", "frecuencia_muestreo": 2.0,
+            "muestras": [
+                {"fecha_hora_muestra": "2025-03-01T10:00:00", "detalles": [{"tipo_dato": "velocidad_onda", "valor": 1.0}]},
+                {"fecha_hora_muestra": "2025-03-01T10:00:00.5", "detalles": [{"tipo_dato": "velocidad_onda", "valor": 2.0}]},
+            ],
+        }],
+    }
+    evento.update(cambios)
+    return evento
+
+
+class TestLeerFragmentos(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta = self.directorio.name
+        for numero in range(4):
+            self._escribir(f"parte{numero}.json", [_evento(f"S{numero}-{indice}") for indice in range(3)])
+
+    def _escribir(self, nombre, contenido):
+        with open(os.path.join(self.ruta, nombre), "w", encoding="utf-8") as archivo:
+            archivo.write(contenido if isinstance(contenido, str) else json.dumps(contenido))
+
+    def _sin_indices(self):
+        """Sin índices de cabeceras los fragmentos van al pool de procesos"""
+        for nombre in os.listdir(self.ruta):
+            if nombre.endswith(".indice.json"):
+                os.remove(os.path.join(self.ruta, nombre))
+
+    def _ids(self, filas):
+        return sorted(cabecera["id_sismo"] for cabecera, _fuente, _series in filas)
+
+    def test_cabeceras_y_ubicacion_de_cada_evento(self):
+        for procesos in (1, 2):
+            with self.subTest(procesos=procesos):
+                self._sin_indices()
+                filas = list(leer_fragmentos(self.ruta, procesos))
+                self.assertEqual(len(filas), 12)
+                cabecera, (inicio, longitud, fragmento), series = filas[-1]
+                self.assertEqual((cabecera["id_sismo"], fragmento, series), ("S3-2", "parte3.json", None))
+                self.assertIsNone(cabecera.get("profundidad"))
+                self.assertEqual(cabecera["latitud_epicentro"], -31.4)
+                muestras = CargadorSeriesJson(os.path.join(self.ruta, fragmento), inicio, longitud)()
+                self.assertEqual(muestras[0].cantidadMuestras(), 2)
+
+    def test_con_metadatos_de_series(self):
+        filas = list(leer_fragmentos(self.ruta, 2, _info_serie))
+        self.assertEqual(filas[0][2][0]["cantidad"], 2)
+        self.assertEqual(filas[0][2][0]["tasa_muestreo"], 2.0)
+
+    def test_un_fragmento_invalido_no_aborta_la_carga(self):
+        self._escribir("roto_a.json", [_evento("X1"), {"fecha_hora_ocurrencia": "2025-03-01T10:00:00"}])
+        self._escribir("roto_b.json", [_evento("X2", valor_magnitud="grande")])
+        self._escribir("roto_c.json", [_evento("X3"), 42])
+        self._escribir("roto_d.json", '[{"id_sismo": "X4", ')
+        self._escribir("roto_e.json", [_evento("X5", series_temporales=[{"muestras": 3}])])
+        antes = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+        for procesos in (1, 2):
+            for info_series in (None, _info_serie):
+                with self.subTest(procesos=procesos, series=info_series is not None), \
+                        self.assertLogs("persistencia.catalogo_fragmentado", "ERROR"):
+                    self._sin_indices()
+                    filas = list(leer_fragmentos(self.ruta, procesos, info_series))
+                    # Las series de X5 sólo se decodifican al pedir sus metadatos
+                    validos = ["X5"] if info_series is None else []
+                    self.assertEqual([id_sismo for id_sismo in self._ids(filas) if id_sismo.startswith("X")], validos)
+                    self.assertEqual(len(filas), 12 + len(validos))
+        if os.path.isdir("/dev/shm"):
+            self.assertEqual(set(os.listdir("/dev/shm")) - antes, set())
+
+    def test_proceso_del_pool_que_muere(self):
+        os.environ[_VARIABLE_PROCESO_PRINCIPAL] = str(os.getpid())
+        self.addCleanup(os.environ.pop, _VARIABLE_PROCESO_PRINCIPAL)
+        with self.assertLogs("persistencia.catalogo_fragmentado", "WARNING"):
+            filas = list(leer_fragmentos(self.ruta, 2, _info_serie_que_mata_al_proceso_del_pool))
+        self.assertEqual(len(filas), 12)
+
+    def test_consumo_parcial_libera_los_bloques(self):
+        antes = set(os.listdir("/dev/shm")) if os.path.isdir("/dev/shm") else set()
+        filas = leer_fragmentos(self.ruta, 2, _info_serie)
+        next(filas)
+        filas.close()
+        if os.path.isdir("/dev/shm"):
+            self.assertEqual(set(os.listdir("/dev/shm")) - antes, set())
+
+    def test_firma_cambia_con_un_fragmento(self):
+        firma = firma_catalogo(self.ruta)
+        self._escribir("parte9.json", [_evento("S9")])
+        self.assertNotEqual(firma_catalogo(self.ruta), firma)
+
+
+if __name__ == "__main__":
+    unittest.main()
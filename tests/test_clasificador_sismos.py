@@ -0,0 +1,161 @@
+# tests/test_clasificador_sismos.py
+
+import math
+import random
+import unittest
+from casos_de_uso.clasificador_sismos import (
+    ATRIBUTOS, REGLAS_POR_DEFECTO, RASGOS, ClasificadorSismos, ReglasSismo, rasgos_de_onda,
+)
+from modelos.estacion_sismologica import EstacionSismologica
+from modelos.indice_espacial import RADIO_TIERRA_KM
+
+_COMPARACIONES = {
+    "<": lambda a, b: a < b, "<=": lambda a, b: a <= b, ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b, "==": lambda a, b: a == b, "!=": lambda a, b: a != b,
+}
+
+# Reglas de prueba con "falta", "!=" y condiciones sobre todos los rasgos
+_REGLAS = {
+    "radio_estaciones_km": 300.0,
+    "clasificacion": REGLAS_POR_DEFECTO["clasificacion"],
+    "alcance": {
+        "por_defecto": "Local",
+        "reglas": [
+            {"valor": "Sin datos", "si": {"magnitud": {"falta": True}}},
+            {"valor": "Lejano", "si": {"distancia_estacion_km": {">": 800.0}}},
+            {"valor": "Regional", "si": {"estaciones_en_radio": {">=": 2}, "magnitud": {">=": 3.0}}},
+            {"valor": "Cubierto", "si": {"distancia_estacion_km": {"falta": False, "<=": 100.0}}},
+        ],
+    },
+    "origen": {
+        "por_defecto": "Tectónico",
+        "reglas": [
+            {"valor": "Explosión", "si": {"profundidad": {"<": 2.0}, "frecuencia_media": {">=": 20.0}}},
+            {"valor": "Volcánico", "si": {"profundidad": {"<": 20.0}, "frecuencia_media": {"<": 5.0}}},
+            {"valor": "Intenso", "si": {"pico_velocidad": {">": 8.0}, "magnitud": {"!=": 5.0}}},
+        ],
+    },
+}
+
+
+def _haversine_km(latitud_a, longitud_a, latitud_b, longitud_b):
+    fi_a, fi_b = math.radians(latitud_a), math.radians(latitud_b)
+    a = (math.sin((fi_b - fi_a) / 2) ** 2
+         + math.cos(fi_a) * math.cos(fi_b) * math.sin(math.radians(longitud_b - longitud_a) / 2) ** 2)
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _clasificar_uno(definicion, rasgos):
+    """Evaluación de referencia, evento por evento y regla por regla"""
+    resultado = {}
+    for atributo in ATRIBUTOS:
+        reglas = definicion[atributo]
+        resultado[atributo] = reglas["por_defecto"]
+        for regla in reglas.get("reglas", ()):
+            cumple = True
+            for rasgo, condiciones in regla["si"].items():
+                valor = rasgos[rasgo]
+                for operador, umbral in condiciones.items():
+                    if operador == "falta":
+                        cumple &= math.isnan(valor) == bool(umbral)
+                    else:
+                        cumple &= not math.isnan(valor) and _COMPARACIONES[operador](valor, umbral)
+            if cumple:
+                resultado[atributo] = regla["valor"]
+                break
+    return resultado
+
+
+class TestClasificadorSismos(unittest.TestCase):
+
+    def setUp(self):
+        azar = random.Random(5)
+        self.estaciones = [
+            EstacionSismologica(f"E{numero}", latitud=azar.uniform(-40, -20), longitud=azar.uniform(-75, -55))
+            for numero in range(6)
+        ] + [EstacionSismologica("SIN-UBICACION")]
+
+        def talvez(valor):
+            return None if azar.random() < 0.15 else valor
+
+        self.eventos = []
+        for numero in range(600):
+            latitud, longitud = talvez(azar.uniform(-50, -10)), azar.uniform(-80, -50)
+            self.eventos.append({
+                "id": f"S{numero}",
+                # Valores sobre los umbrales para probar los bordes de cada comparación
+                "magnitud": talvez(azar.choice((1.9, 2.0, 4.0, 5.0, 5.5, 7.0, 8.0, azar.uniform(0, 9)))),
+                "profundidad": talvez(azar.choice((1.0, 2.0, 19.9, 20.0, 70.0, azar.uniform(0, 300)))),
+                "latitud": latitud,
+                "longitud": longitud if latitud is not None else None,
+                "pico_velocidad": talvez(azar.uniform(0, 12)),
+                "frecuencia_media": talvez(azar.choice((4.9, 5.0, 20.0, azar.uniform(0, 30)))),
+            })
+
+    def _rasgos_de_referencia(self, evento, radio_km):
+        def valor(clave):
+            return math.nan if evento[clave] is None else float(evento[clave])
+
+        rasgos = {rasgo: valor(rasgo) for rasgo in ("magnitud", "profundidad", "pico_velocidad", "frecuencia_media")}
+        if evento["latitud"] is None:
+            rasgos["distancia_estacion_km"] = rasgos["estaciones_en_radio"] = math.nan
+        else:
+            distancias = [
+                _haversine_km(evento["latitud"], evento["longitud"], estacion.latitud, estacion.longitud)
+                for estacion in self.estaciones if estacion.latitud is not None
+            ]
+            rasgos["distancia_estacion_km"] = min(distancias)
+            rasgos["estaciones_en_radio"] = float(sum(distancia <= radio_km for distancia in distancias))
+        self.assertEqual(set(rasgos), set(RASGOS))
+        return rasgos
+
+    def _verificar(self, definicion):
+        clasificador = ClasificadorSismos(ReglasSismo(definicion), self.estaciones)
+        columnas = {clave: [evento[clave] for evento in self.eventos] for clave in self.eventos[0]}
+        clasificaciones = clasificador.clasificar(
+            columnas["id"], columnas["magnitud"], columnas["profundidad"], columnas["latitud"],
+            columnas["longitud"], columnas["pico_velocidad"], columnas["frecuencia_media"],
+        )
+        self.assertEqual(clasificaciones.ids, columnas["id"])
+        radio_km = clasificador.reglas.radio_estaciones_km
+        esperadas = [
+            (evento["id"], *_clasificar_uno(definicion, self._rasgos_de_referencia(evento, radio_km)).values())
+            for evento in self.eventos
+        ]
+        self.assertEqual(clasificaciones.filas(), esperadas)
+        for posicion, atributo in enumerate(ATRIBUTOS, start=1):
+            conteo = {}
+            for fila in esperadas:
+                conteo[fila[posicion]] = conteo.get(fila[posicion], 0) + 1
+            self.assertEqual({valor: cantidad for valor, cantidad in clasificaciones.conteo(atributo).items()
+                              if cantidad}, conteo)
+
+    def test_reglas_por_defecto_contra_evaluacion_de_referencia(self):
+        self._verificar(REGLAS_POR_DEFECTO)
+
+    def test_reglas_con_falta_y_distancias(self):
+        self._verificar(_REGLAS)
+
+    def test_reglas_invalidas(self):
+        for definicion in (
+            {**_REGLAS, "origen": {"reglas": []}},
+            {**_REGLAS, "origen": {"por_defecto": "X", "reglas": [{"valor": "Y", "si": {"color": {"==": 1}}}]}},
+            {**_REGLAS, "origen": {"por_defecto": "X", "reglas": [{"valor": "Y", "si": {"magnitud": {"~": 1}}}]}},
+        ):
+            with self.assertRaises(ValueError):
+                ReglasSismo(definicion)
+        self.assertNotEqual(ReglasSismo(_REGLAS).firma, ReglasSismo().firma)
+
+    def test_rasgos_de_onda(self):
+        resumenes = [
+            {"velocidad_onda": {"pico": -9.5}, "frecuencia_onda": {"media": 10.0, "cantidad": 3}},
+            {"velocidad_onda": {"pico": 4.0}, "frecuencia_onda": {"media": 2.0, "cantidad": 1}},
+            {"longitud": {"pico": 1.0}},
+        ]
+        self.assertEqual(rasgos_de_onda(resumenes), (9.5, 8.0))
+        pico, frecuencia = rasgos_de_onda([{"longitud": {"pico": 1.0}}])
+        self.assertTrue(math.isnan(pico) and math.isnan(frecuencia))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+# tests/test_detector_sta_lta.py
+
+import random
+import unittest
+import numpy as np
+from casos_de_uso.detector_sta_lta import UN_SEGUNDO_US, DetectorStaLta, Disparo, disparos, sta_lta
+from modelos.serie_temporal import SerieTemporal
+
+_INICIO_US = 1_700_000_000_000_000
+
+
+def _sta_lta_de_referencia(valores, muestras_sta, muestras_lta):
+    """Cociente recalculando ambas ventanas en cada muestra"""
+    presentes = [valor for valor in valores if not np.isnan(valor)]
+    media = sum(presentes) / len(presentes) if presentes else 0.0
+    energia = [0.0 if np.isnan(valor) else (valor - media) ** 2 for valor in valores]
+    cociente = [0.0] * len(valores)
+    if not 0 < muestras_sta < muestras_lta <= len(valores):
+        return cociente
+    for k in range(muestras_lta - 1, len(valores)):
+        corta = sum(energia[k + 1 - muestras_sta:k + 1]) / muestras_sta
+        larga = sum(energia[k + 1 - muestras_lta:k + 1]) / muestras_lta
+        cociente[k] = corta / larga if larga > 0 else 0.0
+    return cociente
+
+
+def _disparos_de_referencia(cociente, umbral_activacion, umbral_desactivacion):
+    """Disparos recorriendo el cociente muestra por muestra"""
+    resultado = []
+    inicio = None
+    for k, valor in enumerate(cociente):
+        if inicio is None and valor > umbral_activacion:
+            inicio = k
+        elif inicio is not None and valor < umbral_desactivacion:
+            resultado.append((inicio, k))
+            inicio = None
+    if inicio is not None:
+        resultado.append((inicio, len(cociente) - 1))
+    return resultado
+
+
+def _traza(azar, cantidad, sismos=(), huecos=()):
+    """Ruido con trenes de onda crecientes en los índices de 'sismos' y NaN en los tramos de 'huecos'"""
+    valores = np.array([azar.gauss(0.0, 1.0) for _ in range(cantidad)])
+    for inicio in sismos:
+        duracion = min(azar.randrange(30, 150), cantidad - inicio)
+        amplitud = azar.uniform(5.0, 40.0)
+        valores[inicio:inicio + duracion] += amplitud * np.sin(np.arange(duracion) * 0.7) * np.exp(
+            -np.arange(duracion) / (duracion / 3))
+    for inicio, fin in huecos:
+        valores[inicio:fin] = np.nan
+    return valores
+
+
+class TestStaLta(unittest.TestCase):
+
+    def _verificar(self, valores, muestras_sta, muestras_lta, umbrales=(3.5, 1.5)):
+        cociente = sta_lta(valores, muestras_sta, muestras_lta)
+        referencia = _sta_lta_de_referencia(valores.tolist(), muestras_sta, muestras_lta)
+        np.testing.assert_allclose(cociente, referencia, rtol=1e-7, atol=1e-9)
+        # Los disparos se comparan sobre el mismo cociente: los umbrales no dependen del redondeo
+        self.assertEqual(disparos(cociente, *umbrales).tolist(),
+                         [list(par) for par in _disparos_de_referencia(cociente.tolist(), *umbrales)])
+        return cociente
+
+    def test_cociente_y_disparos_contra_referencia(self):
+        azar = random.Random(11)
+        for _ in range(25):
+            cantidad = azar.randrange(50, 1500)
+            sismos = sorted(azar.randrange(0, cantidad) for _ in range(azar.randrange(0, 5)))
+            valores = _traza(azar, cantidad, sismos)
+            muestras_sta = azar.randrange(1, 20)
+            muestras_lta = azar.randrange(muestras_sta + 1, min(cantidad, 300) + 1)
+            with self.subTest(cantidad=cantidad, sta=muestras_sta, lta=muestras_lta):
+                self._verificar(valores, muestras_sta, muestras_lta, (azar.uniform(2.0, 5.0), azar.uniform(0.5, 1.5)))
+
+    def test_huecos_y_tramos_sin_energia(self):
+        azar = random.Random(12)
+        # Un hueco más largo que la ventana larga deja ventanas sin energía: el cociente debe valer 0
+        valores = _traza(azar, 3000, sismos=(300, 2500), huecos=((800, 1600), (2000, 2010)))
+        cociente = self._verificar(valores, 10, 200)
+        self.assertTrue(np.all(cociente[1000:1600] == 0.0))
+
+        plana = np.full(500, 3.0)
+        self.assertTrue(np.all(self._verificar(plana, 5, 50) == 0.0))
+        self.assertTrue(np.all(self._verificar(np.full(100, np.nan), 5, 50) == 0.0))
+
+    def test_ventanas_invalidas(self):
+        valores = _traza(random.Random(13), 40)
+        for muestras_sta, muestras_lta in ((0, 10), (10, 10), (12, 10), (5, 41)):
+            self.assertTrue(np.all(sta_lta(valores, muestras_sta, muestras_lta) == 0.0))
+        self.assertEqual(disparos(np.zeros(0), 3.5, 1.5).shape, (0, 2))
+
+    def test_disparos_en_los_bordes(self):
+        cociente = np.array([5.0, 4.0, 1.0, 0.5, 4.0, 2.0, 5.0, 1.0, 0.0, 6.0, 6.0])
+        esperados = _disparos_de_referencia(cociente.tolist(), 3.5, 1.5)
+        self.assertEqual(esperados, [(0, 2), (4, 7), (9, 10)])
+        self.assertEqual(disparos(cociente, 3.5, 1.5).tolist(), [list(par) for par in esperados])
+
+
+class TestDetectorStaLta(unittest.TestCase):
+
+    def _serie(self, codigo, valores, tasa=100.0):
+        tiempos = _INICIO_US + np.arange(len(valores)) * round(UN_SEGUNDO_US / tasa)
+        return SerieTemporal(tiempos.astype("datetime64[us]"), {"velocidad_onda": valores}, codigo)
+
+    def test_coincidencia_entre_estaciones(self):
+        azar = random.Random(14)
+        detector = DetectorStaLta(segundos_sta=0.2, segundos_lta=5.0, minimo_estaciones=3,
+                                  segundos_antes=1.0, segundos_despues=1.0)
+        # El sismo llega a cuatro estaciones con pocas muestras de diferencia; el ruido de E5, sólo a ella
+        trazas = {
+            f"E{numero}": self._serie(f"E{numero}", _traza(azar, 3000, sismos=(1500 + 20 * numero,)))
+            for numero in range(4)
+        }
+        trazas["E5"] = self._serie("E5", _traza(azar, 3000, sismos=(2500,)))
+        detecciones = detector.detectar(trazas)
+
+        self.assertEqual(len(detecciones), 1)
+        deteccion = detecciones[0]
+        self.assertEqual(deteccion.estaciones(), ["E0", "E1", "E2", "E3"])
+        self.assertEqual(deteccion.inicio, min(disparo.inicio for disparo in deteccion.disparos))
+        self.assertTrue(_INICIO_US + 1500 * 10_000 <= deteccion.inicio <= _INICIO_US + 1510 * 10_000)
+
+        eventos = detector.crearEventos(detecciones, trazas)
+        self.assertEqual(len(eventos), 1)
+        self.assertEqual([serie.codigo_estacion for serie in eventos[0].series_temporales],
+                         ["E0", "E1", "E2", "E3"])
+
+    def test_coincidencias_contra_referencia(self):
+        azar = random.Random(15)
+        detector = DetectorStaLta(minimo_estaciones=2)
+        por_estacion = []
+        for numero in range(5):
+            inicio = 0
+            lista = []
+            for _ in range(azar.randrange(0, 8)):
+                inicio += azar.randrange(1, 50)
+                fin = inicio + azar.randrange(0, 30)
+                lista.append(Disparo(f"E{numero}", inicio, fin, 1.0))
+                inicio = fin
+            por_estacion.append(lista)
+
+        # Referencia: componentes conexas del grafo de superposición entre disparos
+        todos = sorted((disparo for lista in por_estacion for disparo in lista), key=lambda disparo: disparo.inicio)
+        grupos = []
+        for disparo in todos:
+            if grupos and disparo.inicio <= max(otro.fin for otro in grupos[-1]):
+                grupos[-1].append(disparo)
+            else:
+                grupos.append([disparo])
+        esperadas = [grupo for grupo in grupos if len({disparo.codigo_estacion for disparo in grupo}) >= 2]
+
+        detecciones = detector.coincidencias(por_estacion)
+        self.assertEqual([deteccion.disparos for deteccion in detecciones], esperadas)
+        for deteccion in detecciones:
+            self.assertEqual(deteccion.fin, max(disparo.fin for disparo in deteccion.disparos))
+
+    def test_traza_sin_velocidad(self):
+        serie = SerieTemporal(np.arange(10).astype("datetime64[us]"), {"frecuencia_onda": np.zeros(10)}, "E0")
+        with self.assertLogs("casos_de_uso.detector_sta_lta", "WARNING"):
+            self.assertEqual(DetectorStaLta().detectarDisparos("E0", serie), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,209 @@
+# tests/test_diario_estados.py
+
+import os
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+import zlib
+from datetime import datetime
+from modelos.estado import AUTO_DETECTADO, PENDIENTE_DE_REVISION, BLOQUEADO_EN_REVISION, CONFIRMADO, RECHAZADO
+from modelos.evento_sismico import EventoSismico
+from persistencia.diario_estados import DiarioEstados
+
+_RECORRIDO = (BLOQUEADO_EN_REVISION, RECHAZADO, PENDIENTE_DE_REVISION, BLOQUEADO_EN_REVISION, CONFIRMADO)
+_RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cada proceso crea otros estados no canónicos antes, de modo que sus códigos no coinciden
+_ESCRIBIR_EN_OTRO_PROCESO = """
+    import sys
+    from datetime import datetime
+    from modelos.estado import Estado
+    from modelos.evento_sismico import EventoSismico
+    from persistencia.diario_estados import DiarioEstados
+    Estado("Otro estado")
+    diario = DiarioEstados(sys.argv[1], registros_por_instantanea=int(sys.argv[2]))
+    evento = EventoSismico("S0", datetime(2025, 3, 1), 4.0, "Auto-Detectado")
+    for nombre in ("Bloqueado en Revisión", "Derivado", "Confirmado"):
+        anterior = evento.estadoActual.actual
+        evento.cambiarEstadoEventoSismico(nombre)
+        diario.registrarCambioEstado(evento, anterior, evento.estadoActual.actual)
+    diario.cerrar()
+"""
+
+_LEER_EN_OTRO_PROCESO = """
+    import sys
+    from datetime import datetime
+    from modelos.estado import Estado
+    from modelos.evento_sismico import EventoSismico
+    from persistencia.diario_estados import DiarioEstados
+    Estado("Tercer estado")
+    Estado("Cuarto estado")
+    diario = DiarioEstados(sys.argv[1])
+    evento = EventoSismico("S0", datetime(2025, 3, 1), 4.0, "Auto-Detectado")
+    diario.restaurarEvento(evento)
+    print("|".join(cambio.actual.nombre for cambio in evento.historial_estados))
+    diario.cerrar()
+"""
+
+
+def _en_otro_interprete(codigo, *argumentos):
+    resultado = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(codigo), *map(str, argumentos)],
+        cwd=_RAIZ, capture_output=True, text=True, timeout=60,
+    )
+    if resultado.returncode != 0:
+        raise AssertionError(resultado.stderr)
+    return resultado.stdout.strip()
+
+
+class TestDiarioEstados(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "sismos.diario")
+        self.fechas = {f"S{numero}": datetime(2025, 3, 1, numero) for numero in range(4)}
+
+    def tearDown(self):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def _eventos(self):
+        return [EventoSismico(id_sismo, fecha, 4.0, AUTO_DETECTADO.nombre) for id_sismo, fecha in self.fechas.items()]
+
+    def _recorrer(self, diario, evento, estados):
+        for estado in estados:
+            anterior = evento.estadoActual.actual
+            evento.cambiarEstadoEventoSismico(estado.nombre)
+            diario.registrarCambioEstado(evento, anterior, evento.estadoActual.actual)
+
+    @staticmethod
+    def _historial(evento):
+        # El inicio del estado inicial lo fija el catálogo al crear el evento en cada sesión
+        return [(cambio.actual.nombre, cambio.fechaHoraInicio if posicion else None, cambio.fechaHoraFin)
+                for posicion, cambio in enumerate(evento.historial_estados)]
+
+    def _reabrir(self, **opciones):
+        diario = DiarioEstados(self.ruta, **opciones)
+        eventos = self._eventos()
+        for evento in eventos:
+            diario.restaurarEvento(evento)
+        return diario, {evento.id_sismo: evento for evento in eventos}
+
+    def _escribir(self, **opciones):
+        diario = DiarioEstados(self.ruta, **opciones)
+        eventos = self._eventos()
+        self._recorrer(diario, eventos[0], _RECORRIDO)
+        self._recorrer(diario, eventos[1], _RECORRIDO[:2])
+        return diario, {evento.id_sismo: self._historial(evento) for evento in eventos}
+
+    def _verificar(self, eventos, esperados):
+        for id_sismo, historial in esperados.items():
+            self.assertEqual(self._historial(eventos[id_sismo]), historial, id_sismo)
+
+    def test_reapertura_sin_instantanea(self):
+        diario, esperados = self._escribir()
+        diario.cerrar()
+        # Sólo el diario: se reproduce completo
+        os.remove(diario.ruta_instantanea)
+        diario, eventos = self._reabrir()
+        self._verificar(eventos, esperados)
+        diario.cerrar()
+
+    def test_historial_completo_tras_instantanea(self):
+        diario, esperados = self._escribir(registros_por_instantanea=3)
+        diario.cerrar()
+        self.assertTrue(os.path.exists(diario.ruta_instantanea))
+        self.assertEqual(len(esperados["S0"]), len(_RECORRIDO) + 1)
+
+        diario, eventos = self._reabrir()
+        self.assertEqual(diario._registros_desde_instantanea, 0)
+        self._verificar(eventos, esperados)
+
+        # Otra sesión sobre el historial restaurado, y una tercera apertura
+        self._recorrer(diario, eventos["S1"], (PENDIENTE_DE_REVISION,))
+        esperados["S1"] = self._historial(eventos["S1"])
+        diario.cerrar()
+        diario, eventos = self._reabrir()
+        self._verificar(eventos, esperados)
+        diario.cerrar()
+
+    def test_instantanea_de_formato_anterior_reproduce_el_diario(self):
+        diario, esperados = self._escribir()
+        diario.cerrar()
+        with open(diario.ruta_instantanea, "r+b") as archivo:
+            archivo.seek(8)
+            archivo.write((1).to_bytes(2, "little"))
+        diario, eventos = self._reabrir()
+        self._verificar(eventos, esperados)
+        diario.cerrar()
+
+    def test_cola_truncada_o_corrupta(self):
+        diario, esperados = self._escribir()
+        diario.cerrar()
+        os.remove(diario.ruta_instantanea)
+        tamano = os.path.getsize(self.ruta)
+
+        # Registro final a medio escribir: se descarta sólo ese cambio
+        with open(self.ruta, "r+b") as archivo:
+            archivo.truncate(tamano - 3)
+        diario, eventos = self._reabrir()
+        esperados["S1"] = esperados["S1"][:-1]
+        esperados["S1"][-1] = esperados["S1"][-1][:2] + (None,)
+        self._verificar(eventos, esperados)
+        diario.cerrar()
+        os.remove(diario.ruta_instantanea)
+        self.assertLess(os.path.getsize(self.ruta), tamano)
+
+        # Un byte alterado en el último registro: el CRC lo descarta
+        tamano = os.path.getsize(self.ruta)
+        with open(self.ruta, "r+b") as archivo:
+            archivo.seek(tamano - 1)
+            ultimo = archivo.read(1)
+            archivo.seek(tamano - 1)
+            archivo.write(bytes([ultimo[0] ^ 0xFF]))
+        diario, eventos = self._reabrir()
+        self.assertEqual(eventos["S1"].estadoActual.actual, AUTO_DETECTADO)
+        self.assertEqual(len(eventos["S1"].historial_estados), 1)
+        self._verificar(eventos, {"S0": esperados["S0"]})
+        diario.cerrar()
+
+    def test_estado_no_canonico_entre_procesos(self):
+        esperado = "Auto-Detectado|Bloqueado en Revisión|Derivado|Confirmado"
+        for registros_por_instantanea in (10000, 2):
+            with self.subTest(registros_por_instantanea=registros_por_instantanea):
+                _en_otro_interprete(_ESCRIBIR_EN_OTRO_PROCESO, self.ruta, registros_por_instantanea)
+                # Con la instantánea de cierre y, después, reproduciendo sólo el diario
+                self.assertEqual(_en_otro_interprete(_LEER_EN_OTRO_PROCESO, self.ruta), esperado)
+                os.remove(self.ruta + ".instantanea")
+                self.assertEqual(_en_otro_interprete(_LEER_EN_OTRO_PROCESO, self.ruta), esperado)
+                os.remove(self.ruta)
+                os.remove(self.ruta + ".instantanea")
+
+    def test_diario_de_formato_anterior(self):
+        # Formato anterior: sin cabecera y con el código de estado en un byte (9: no canónico)
+        registros = []
+        for secuencia, (codigo, inicio_us) in enumerate(((2, 10), (9, 20), (3, 30)), start=1):
+            contenido = struct.pack("<qqB", inicio_us - 1, inicio_us, codigo) + b"S0"
+            registros.append(struct.pack("<IIq", len(contenido), zlib.crc32(contenido), secuencia) + contenido)
+        with open(self.ruta, "wb") as archivo:
+            archivo.write(b"".join(registros))
+
+        with self.assertLogs("persistencia.diario_estados", "WARNING"):
+            diario, eventos = self._reabrir()
+        self.assertEqual([cambio.actual.nombre for cambio in eventos["S0"].historial_estados],
+                         ["Auto-Detectado", "Bloqueado en Revisión", "Código 9", "Confirmado"])
+        # Los cambios nuevos siguen la secuencia del diario convertido
+        self._recorrer(diario, eventos["S0"], (RECHAZADO,))
+        esperados = {"S0": self._historial(eventos["S0"])}
+        diario.cerrar()
+        os.remove(diario.ruta_instantanea)
+        diario, eventos = self._reabrir()
+        self._verificar(eventos, esperados)
+        diario.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
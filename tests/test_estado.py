@@ -0,0 +1,32 @@
+# tests/test_estado.py
+
+import copy
+import pickle
+import unittest
+from modelos.estado import NOMBRES_CANONICOS, Estado, CONFIRMADO, PENDIENTE_DE_REVISION_EXPERTO
+
+
+class TestEstado(unittest.TestCase):
+
+    def test_codigos_fijos_de_los_estados_canonicos(self):
+        self.assertEqual([Estado(nombre).codigo for nombre in NOMBRES_CANONICOS], list(range(len(NOMBRES_CANONICOS))))
+        self.assertEqual((CONFIRMADO.codigo, PENDIENTE_DE_REVISION_EXPERTO.codigo), (3, 5))
+        self.assertIs(Estado.desdeCodigo(3), CONFIRMADO)
+
+    def test_estados_no_canonicos(self):
+        derivado = Estado("Derivado (prueba)")
+        self.assertGreaterEqual(derivado.codigo, len(NOMBRES_CANONICOS))
+        self.assertIs(Estado.desdeCodigo(derivado.codigo), derivado)
+        self.assertIs(pickle.loads(pickle.dumps(derivado)), derivado)
+        self.assertIs(copy.deepcopy(derivado), derivado)
+        for codigo in (-1, 10_000):
+            with self.assertRaises(ValueError):
+                Estado.desdeCodigo(codigo)
+
+    def test_inmutable(self):
+        with self.assertRaises(AttributeError):
+            CONFIRMADO.codigo = 0
+
+
+if __name__ == "__main__":
+    unittest.main()
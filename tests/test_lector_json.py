@@ -0,0 +1,67 @@
+# tests/test_lector_json.py
+
+import json
+import os
+import tempfile
+import unittest
+from persistencia.lector_json import iterar_eventos_ubicados_json, leer_cabeceras_json, ErrorFormatoCatalogo
+
+
+def _evento(numero):
+    return {
+        "id_sismo": f"S{numero}",
+        "fecha_hora_ocurrencia": "2025-01-01T00:00:00",
+        "valor_magnitud": numero / 7,
+        "estado_inicial": "Auto-Detectado",
+        "lugar": "Córdoba ñ" if numero % 3 == 0 else "Salta",
+        "series_temporales": [{"muestras": [[numero, 1.5]] * (numero % 5)}],
+    }
+
+
+class TestLectorIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def _escribir(self, texto):
+        ruta = os.path.join(self.directorio.name, "catalogo.json")
+        with open(ruta, "w", encoding="utf-8", newline="") as archivo:
+            archivo.write(texto)
+        return ruta
+
+    def test_coincide_con_json_load_y_los_offsets_ubican_cada_evento(self):
+        eventos = [_evento(numero) for numero in range(300)]
+        for texto in (json.dumps(eventos), json.dumps(eventos, ensure_ascii=False, indent=2).replace("\n", "\r\n")):
+            ruta = self._escribir(texto)
+            crudo = open(ruta, "rb").read()
+            # Bloques más chicos que un evento obligan a reintentar y a compactar el buffer
+            for tamano_bloque in (7, 64, 1 << 20):
+                leidos = list(iterar_eventos_ubicados_json(ruta, tamano_bloque))
+                self.assertEqual([evento for evento, _, _ in leidos], json.loads(texto))
+                for evento, inicio, longitud in leidos:
+                    self.assertEqual(json.loads(crudo[inicio:inicio + longitud]), evento)
+
+    def test_marca_de_orden_de_bytes_y_arreglo_vacio(self):
+        ruta = self._escribir("\ufeff [ " + json.dumps(_evento(3), ensure_ascii=False) + " ]")
+        (evento, inicio, longitud), = iterar_eventos_ubicados_json(ruta, 5)
+        self.assertEqual(json.loads(open(ruta, "rb").read()[inicio:inicio + longitud]), evento)
+        self.assertEqual(list(iterar_eventos_ubicados_json(self._escribir(" [ ] "))), [])
+
+    def test_formato_invalido(self):
+        for texto in ('{"id_sismo": 1}', '[{"id_sismo": 1} {"id_sismo": 2}]', '[{"id_sismo": 1},'):
+            with self.subTest(texto=texto), self.assertRaises(ValueError):
+                list(iterar_eventos_ubicados_json(self._escribir(texto), 4))
+        with self.assertRaises(ErrorFormatoCatalogo):
+            list(iterar_eventos_ubicados_json(self._escribir("{}")))
+
+    def test_indice_de_cabeceras(self):
+        ruta = self._escribir(json.dumps([_evento(numero) for numero in range(10)]))
+        primera = leer_cabeceras_json(ruta)
+        self.assertTrue(os.path.exists(ruta + ".indice.json"))
+        self.assertEqual(leer_cabeceras_json(ruta), primera)
+        self.assertNotIn("series_temporales", primera[0][0])
+
+
+if __name__ == "__main__":
+    unittest.main()
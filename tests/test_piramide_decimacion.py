@@ -0,0 +1,51 @@
+# tests/test_piramide_decimacion.py
+
+import unittest
+import numpy as np
+from casos_de_uso.piramide_decimacion import PiramideDecimacion
+
+
+class TestPiramideDecimacion(unittest.TestCase):
+
+    def setUp(self):
+        azar = np.random.default_rng(7)
+        self.tiempos = np.arange(100_003, dtype=np.float64) / 100.0
+        self.valores = azar.normal(0.0, 1.0, len(self.tiempos))
+        # Picos aislados de una muestra: no deben perderse a ningún zoom
+        self.picos = [17, 40_001, 99_998]
+        self.valores[self.picos] = [50.0, -60.0, 70.0]
+        self.piramide = PiramideDecimacion(self.tiempos, self.valores)
+
+    def test_extremos_exactos(self):
+        self.assertEqual(self.piramide.extremos(), (-60.0, 70.0))
+
+    def test_consulta_conserva_los_picos_en_sus_instantes(self):
+        for desde, hasta, puntos in ((None, None, 1000), (0.0, 500.0, 300), (399.0, 401.0, 50), (900.0, None, 64)):
+            with self.subTest(desde=desde, hasta=hasta, puntos=puntos):
+                tiempos, valores = self.piramide.consultar(desde, hasta, puntos)
+                self.assertLessEqual(len(valores), puntos + 2 * self.piramide.factor + 2)
+                # Cada punto es una muestra real de la señal
+                indices = np.rint(tiempos * 100).astype(int)
+                np.testing.assert_array_equal(self.valores[indices], valores)
+                en_rango = (self.tiempos >= (desde if desde is not None else -np.inf)) & \
+                           (self.tiempos <= (hasta if hasta is not None else np.inf))
+                self.assertEqual(valores.max(), self.valores[en_rango].max())
+                self.assertEqual(valores.min(), self.valores[en_rango].min())
+                self.assertTrue(np.all(np.diff(tiempos) >= 0))
+
+    def test_serie_sin_niveles(self):
+        piramide = PiramideDecimacion(np.arange(250.0), np.sin(np.arange(250.0)))
+        self.assertEqual(piramide.niveles, [])
+        tiempos, valores = piramide.consultar(puntos=100)
+        self.assertEqual(len(valores), 250)
+        tiempos, valores = piramide.consultar(10.0, 20.0, puntos=4)
+        self.assertEqual((tiempos[0], tiempos[-1]), (9.0, 21.0))
+
+    def test_serie_vacia(self):
+        piramide = PiramideDecimacion(np.array([]), np.array([]))
+        self.assertEqual(piramide.extremos(), (0.0, 0.0))
+        self.assertEqual(len(piramide.consultar(puntos=10)[0]), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/test_serie_temporal.py
+
+import unittest
+from datetime import datetime
+import numpy as np
+from modelos.detalle_muestra_sismica import DetalleMuestraSismica
+from modelos.muestra_sismica import MuestraSismica
+from modelos.serie_temporal import SerieTemporal
+
+_DATOS = {
+    "muestras": [
+        {"fecha_hora_muestra": "2025-02-10T08:00:00",
+         "detalles": [{"tipo_dato": "velocidad_onda", "valor": 1.5}, {"tipo_dato": "longitud_onda", "valor": 7.0}]},
+        {"fecha_hora_muestra": "2025-02-10T08:00:00.500000",
+         "detalles": [{"tipo_dato": "velocidad_onda", "valor": -4.0}]},
+        {"fecha_hora_muestra": "2025-02-10T08:00:01",
+         "detalles": [{"tipo_dato": "velocidad_onda", "valor": 2.0}, {"tipo_dato": "longitud_onda", "valor": 9.0}]},
+    ],
+}
+
+
+class TestSerieTemporal(unittest.TestCase):
+
+    def test_columnas_desde_el_esquema_json(self):
+        serie = SerieTemporal.desde_datos(_DATOS)
+        self.assertEqual(serie.cantidadMuestras(), 3)
+        self.assertEqual(serie.getTasaMuestreo(), 2.0)
+        np.testing.assert_array_equal(serie.getValores("velocidad_onda"), [1.5, -4.0, 2.0])
+        np.testing.assert_array_equal(np.isnan(serie.getValores("longitud_onda")), [False, True, False])
+        np.testing.assert_array_equal(serie.getTiemposSegundos(), [0.0, 0.5, 1.0])
+
+    def test_muestras_se_materializan_una_vez(self):
+        serie = SerieTemporal.desde_datos(_DATOS)
+        muestras = serie.muestras
+        self.assertIs(serie.muestras, muestras)
+        self.assertEqual([len(muestra.detalles) for muestra in muestras], [2, 1, 2])
+        self.assertEqual(muestras[1].fecha_hora_muestra, datetime(2025, 2, 10, 8, 0, 0, 500000))
+        self.assertEqual((muestras[0].detalles[0].tipo_dato, muestras[0].detalles[0].valor), ("velocidad_onda", 1.5))
+
+    def test_agregar_muestra_invalida_los_derivados(self):
+        serie = SerieTemporal.desde_datos(_DATOS)
+        antes = serie.muestras
+        self.assertEqual(serie.getResumen()["velocidad_onda"]["pico"], -4.0)
+        muestra = MuestraSismica(datetime(2025, 2, 10, 8, 0, 1, 500000))
+        muestra.agregar_detalle(DetalleMuestraSismica("velocidad_onda", 10.0))
+        serie.agregar_muestra(muestra)
+        self.assertEqual(len(serie.muestras), 4)
+        self.assertIsNot(serie.muestras, antes)
+        resumen = serie.getResumen()["velocidad_onda"]
+        self.assertEqual((resumen["pico"], resumen["cantidad"]), (10.0, 4))
+        self.assertEqual(serie.getResumen()["longitud_onda"]["cantidad"], 2)
+
+    def test_columnas_de_solo_lectura(self):
+        velocidades = np.array([1.0, 2.0, 3.0])
+        serie = SerieTemporal(np.arange(3).astype("datetime64[s]"), {"velocidad_onda": velocidades})
+        resumen = serie.getResumen()
+        # Escribir en una columna dejaría desactualizados el resumen y los demás derivados
+        for arreglo in (serie.tiempos, serie.getValores("velocidad_onda")):
+            with self.assertRaises(ValueError):
+                arreglo[0] = arreglo[1]
+        self.assertIs(serie.getResumen(), resumen)
+        # El arreglo recibido sigue siendo del llamador
+        self.assertTrue(velocidades.flags.writeable)
+
+        muestra = MuestraSismica(datetime(1970, 1, 1, 0, 0, 3))
+        muestra.agregar_detalle(DetalleMuestraSismica("frecuencia_onda", 5.0))
+        serie.agregar_muestra(muestra)
+        self.assertFalse(serie.tiempos.flags.writeable)
+        self.assertFalse(any(columna.flags.writeable for columna in serie.valores.values()))
+        np.testing.assert_array_equal(serie.getValores("velocidad_onda")[:3], velocidades)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+# tests/test_servidor_ingesta.py
+
+import asyncio
+import unittest
+import numpy as np
+from ingesta.buffer_circular import BufferCircular
+from ingesta.estacion_simulada import EstacionSimulada
+from ingesta.servidor import ServidorIngesta
+
+
+class TestServidorIngesta(unittest.TestCase):
+
+    def setUp(self):
+        self.servidor = ServidorIngesta(segundos_buffer=4.0)
+        self.servidor.iniciarEnSegundoPlano()
+
+    def tearDown(self):
+        self.servidor.detenerSegundoPlano()
+
+    def _en_el_bucle(self, corrutina):
+        return asyncio.run_coroutine_threadsafe(corrutina, self.servidor._bucle).result(30)
+
+    def _enviar(self, estacion, tramas, inicio_us):
+        async def enviar():
+            await estacion.conectar(puerto=self.servidor.puerto)
+            await estacion.enviar(tramas, inicio_us)
+            await estacion.cerrar()
+        asyncio.run(enviar())
+
+    def test_reconexion_con_tramas_repetidas(self):
+        inicio_us = 1_700_000_000_000_000
+        self._enviar(EstacionSimulada("EST", tiempo_real=False, semilla=1), 3, inicio_us)
+        # La estación vuelve a conectarse y reenvía desde la segunda trama
+        self._enviar(EstacionSimulada("EST", tiempo_real=False, semilla=2), 4, inicio_us + 1_000_000)
+
+        buffer = self.servidor.buffers["EST"]
+        self.assertEqual(buffer.total, 500)
+        tiempos = self.servidor.serie("EST").tiempos.astype(np.int64)
+        self.assertTrue(np.all(np.diff(tiempos) == 10_000))
+        self.assertEqual(int(tiempos[-1]), inicio_us + 499 * 10_000)
+
+    def test_trazas_desde_otro_hilo_son_copias(self):
+        self._enviar(EstacionSimulada("EST", tiempo_real=False, semilla=1), 2, 1_700_000_000_000_000)
+        buffer = self.servidor.buffers["EST"]
+        trazas = self.servidor.trazas()
+        serie = trazas["EST"]
+        self.assertEqual(len(serie.tiempos), 200)
+        self.assertFalse(np.shares_memory(serie.valores["velocidad_onda"], buffer._columnas))
+        self.assertEqual(len(self.servidor.trazas(segundos=0.5)["EST"].tiempos), 50)
+
+    def test_vistas_en_el_hilo_del_bucle_dejan_margen(self):
+        async def consultar():
+            buffer = self.servidor.buffers["EST"] = BufferCircular("EST", ("velocidad_onda",), 400)
+            buffer.agregar(0, 100.0, np.arange(400, dtype=float).reshape(1, -1))
+            return buffer, self.servidor.trazas()["EST"], self.servidor.trazas(segundos=1.0)["EST"]
+
+        buffer, serie, ultimo_segundo = self._en_el_bucle(consultar())
+        self.assertEqual(len(serie.tiempos), 300)
+        self.assertTrue(np.shares_memory(serie.valores["velocidad_onda"], buffer._columnas))
+        self.assertEqual(serie.valores["velocidad_onda"].tolist(), list(np.arange(100, 400, dtype=float)))
+        self.assertEqual(len(ultimo_segundo.tiempos), 100)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+# utilidades/importacion_diferida.py
+#
+# Importación diferida de módulos pesados (NumPy, matplotlib). En lugar de
+#
+#     import numpy as np
+#
+# los módulos del sistema declaran
+#
+#     np = modulo_diferido("numpy")
+#
+# y el módulo real se importa recién cuando se usa un atributo (np.array, ...).
+# Así el menú principal aparece sin esperar bibliotecas que sólo hacen falta
+# al abrir un evento. precargar() las importa en un hilo aparte para que, si
+# el analista tarda en elegir un evento, ya estén listas.
+
+import importlib
+import logging
+import sys
+import threading
+import types
+
+_traza = logging.getLogger(__name__)
+
+# Atributos que copy, pickle o inspect consultan sin usar el módulo: no deben forzar la importación
+_PROTOCOLOS = frozenset((
+    "__copy__", "__deepcopy__", "__reduce__", "__reduce_ex__", "__getstate__",
+    "__getnewargs__", "__getnewargs_ex__", "__wrapped__",
+))
+
+
+class ModuloDiferido(types.ModuleType):
+    """
+    Representante de un módulo que se importa en el primer acceso a uno de sus
+    atributos. Tras importarlo copia los atributos del módulo real, de modo que
+    los accesos siguientes no pasan por __getattr__.
+    """
+
+    def __getattr__(self, atributo):
+        if atributo in _PROTOCOLOS:
+            raise AttributeError(atributo)
+        modulo = importlib.import_module(self.__name__)
+        self.__dict__.update(modulo.__dict__)
+        return getattr(modulo, atributo)
+
+    def __repr__(self):
+        cargado = "cargado" if self.__name__ in sys.modules else "diferido"
+        return f"<módulo {self.__name__!r} ({cargado})>"
+
+
+def modulo_diferido(nombre):
+    """El módulo si ya está importado; si no, un representante que lo importa al usarse"""
+    return sys.modules.get(nombre) or ModuloDiferido(nombre)
+
+
+def precargar(*nombres):
+    """Importa los módulos en un hilo de fondo; devuelve el hilo"""
+    def importar():
+        for nombre in nombres:
+            try:
+                importlib.import_module(nombre)
+                _traza.debug("-> Precargado %s", nombre)
+            except ImportError as e:
+                _traza.warning("No se pudo precargar %s: %s", nombre, e)
+
+    hilo = threading.Thread(target=importar, name="Precarga", daemon=True)
+    hilo.start()
+    return hilo
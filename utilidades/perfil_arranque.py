@@ -0,0 +1,67 @@
+# utilidades/perfil_arranque.py
+#
+# Perfil del arranque (main.py --profile-startup): cuánto tarda cada etapa hasta
+# que se ve el menú principal. Las etapas se marcan con
+#
+#     with perfil_arranque.medir("Cargar catálogo"):
+#         ...
+#
+# y sólo se miden si el perfil fue activado; si no, medir() no hace nada.
+
+import sys
+import time
+from contextlib import contextmanager
+
+# Módulos pesados cuyo estado (cargado o no) se informa junto con las etapas
+MODULOS_PESADOS = ("numpy", "matplotlib", "matplotlib.pyplot", "sqlite3")
+
+_perfil = None
+
+
+class PerfilArranque:
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.etapas = []    # [profundidad, etapa, segundos], en el orden en que empiezan
+        self._profundidad = 0
+
+    @contextmanager
+    def medir(self, etapa):
+        registro = [self._profundidad, etapa, None]
+        self.etapas.append(registro)
+        self._profundidad += 1
+        comienzo = time.perf_counter()
+        try:
+            yield
+        finally:
+            registro[2] = time.perf_counter() - comienzo
+            self._profundidad -= 1
+
+    def informe(self) -> str:
+        lineas = ["=== PERFIL DE ARRANQUE ==="]
+        for profundidad, etapa, segundos in self.etapas:
+            if segundos is not None:
+                lineas.append(f"{'  ' * profundidad}{etapa:<{44 - 2 * profundidad}} {segundos * 1000:9.1f} ms")
+        lineas.append(f"{'Total hasta el menú':<44} {(time.perf_counter() - self.inicio) * 1000:9.1f} ms")
+        for nombre in MODULOS_PESADOS:
+            lineas.append(f"  {nombre:<42} {'cargado' if nombre in sys.modules else 'diferido':>12}")
+        return "\n".join(lineas)
+
+
+def activar():
+    """Activa el perfil del proceso (a partir de aquí, medir() registra las etapas)"""
+    global _perfil
+    _perfil = PerfilArranque()
+    return _perfil
+
+
+def activo():
+    return _perfil
+
+
+@contextmanager
+def medir(etapa):
+    if _perfil is None:
+        yield
+    else:
+        with _perfil.medir(etapa):
+            yield
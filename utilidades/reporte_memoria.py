@@ -0,0 +1,126 @@
+# utilidades/reporte_memoria.py
+#
+# Reporte del consumo de memoria del catálogo cargado: bytes por evento,
+# por cambio de estado y por muestra, y su extrapolación a un millón de eventos.
+#
+#   python -m utilidades.reporte_memoria [catalogo.json] [--cargar-series]
+
+import argparse
+import sys
+import types
+from functools import partial
+import numpy as np
+from modelos.estado import Estado
+from modelos.tipo_de_dato import TipoDeDato
+
+# Objetos compartidos por todo el catálogo o ajenos a él: no se atribuyen a ningún evento
+_COMPARTIDOS = (Estado, TipoDeDato, type, types.ModuleType, types.FunctionType, types.MethodType)
+# Atributos que apuntan fuera del evento (el catálogo completo) o a sus series
+_ATRIBUTOS_EXCLUIDOS = {"catalogo", "_series_temporales", "historial_estados", "estadoActual"}
+
+
+def _atributos(objeto):
+    """Valores de los atributos de instancia (por __dict__ o por __slots__)"""
+    if hasattr(objeto, "__dict__"):
+        yield from vars(objeto).items()
+    for clase in type(objeto).__mro__:
+        for nombre in getattr(clase, "__slots__", ()):
+            if hasattr(objeto, nombre):
+                yield nombre, getattr(objeto, nombre)
+
+
+def tamano_profundo(objeto, vistos=None, excluir=frozenset()):
+    """
+    Bytes de memoria de 'objeto' y de todo lo que referencia, contando cada
+    objeto una sola vez. Los arreglos NumPy suman sus datos sólo si son dueños
+    de ellos (las vistas de un memmap no ocupan memoria del proceso).
+    """
+    if vistos is None:
+        vistos = set()
+    total = 0
+    pila = [objeto]
+    while pila:
+        actual = pila.pop()
+        if actual is None or id(actual) in vistos or isinstance(actual, _COMPARTIDOS):
+            continue
+        vistos.add(id(actual))
+        total += sys.getsizeof(actual)
+
+        if isinstance(actual, np.ndarray):
+            continue  # getsizeof ya incluye los datos propios del arreglo
+        if isinstance(actual, dict):
+            pila.extend(actual.keys())
+            pila.extend(actual.values())
+        elif isinstance(actual, (list, tuple, set, frozenset)):
+            pila.extend(actual)
+        elif isinstance(actual, partial):
+            pila.extend(actual.args)
+        elif not isinstance(actual, (str, bytes, int, float, complex, bool)):
+            if hasattr(actual, "__dict__"):
+                total += sys.getsizeof(vars(actual))  # el diccionario de instancia no está en getsizeof
+            pila.extend(valor for nombre, valor in _atributos(actual) if nombre not in excluir)
+    return total
+
+
+def medir_catalogo(eventos):
+    """Totales de bytes y cantidades del catálogo, separados por componente"""
+    medicion = {
+        "eventos": 0, "bytes_eventos": 0,
+        "cambios_estado": 0, "bytes_cambios_estado": 0,
+        "series": 0, "muestras": 0, "bytes_series": 0,
+    }
+    for evento in eventos:
+        medicion["eventos"] += 1
+        medicion["bytes_eventos"] += tamano_profundo(evento, excluir=_ATRIBUTOS_EXCLUIDOS)
+
+        medicion["cambios_estado"] += len(evento.historial_estados)
+        medicion["bytes_cambios_estado"] += tamano_profundo(evento.historial_estados)
+
+        if evento.tieneSeriesCargadas():
+            series = evento.series_temporales
+            medicion["series"] += len(series)
+            medicion["muestras"] += sum(serie.cantidadMuestras() for serie in series)
+            medicion["bytes_series"] += tamano_profundo(series)
+    return medicion
+
+
+def _por(total, cantidad):
+    return total / cantidad if cantidad else 0.0
+
+
+def imprimir_reporte(medicion):
+    eventos = medicion["eventos"]
+    por_evento = _por(medicion["bytes_eventos"], eventos)
+    por_cambio = _por(medicion["bytes_cambios_estado"], medicion["cambios_estado"])
+    por_muestra = _por(medicion["bytes_series"], medicion["muestras"])
+    cambios_por_evento = _por(medicion["cambios_estado"], eventos)
+
+    print("=== REPORTE DE MEMORIA DEL CATÁLOGO ===")
+    print(f"Eventos:            {eventos:>12}   {por_evento:>10.1f} bytes/evento (cabecera)")
+    print(f"Cambios de estado:  {medicion['cambios_estado']:>12}   {por_cambio:>10.1f} bytes/cambio de estado")
+    print(f"Muestras cargadas:  {medicion['muestras']:>12}   {por_muestra:>10.1f} bytes/muestra "
+          f"({medicion['series']} series)")
+    total = medicion["bytes_eventos"] + medicion["bytes_cambios_estado"] + medicion["bytes_series"]
+    print(f"Total medido:       {total / 2**20:>12.1f} MiB")
+
+    # Memoria residente por millón de eventos sin series cargadas (sólo cabeceras e historial)
+    por_millon = 1_000_000 * (por_evento + cambios_por_evento * por_cambio)
+    print(f"Estimado por millón de eventos (sin series): {por_millon / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    from gestor.gestorRegistroResultadoRevisionManual import GestorRegistroResultadoRevisionManual
+
+    parser = argparse.ArgumentParser(description="Reporte de memoria del catálogo de eventos")
+    parser.add_argument("catalogo", nargs="?", default="sismos.json")
+    parser.add_argument("--cargar-series", action="store_true",
+                        help="carga todas las series para medir también los bytes por muestra")
+    argumentos = parser.parse_args()
+
+    # Base de datos en memoria: se importa el catálogo y se materializan todos sus eventos
+    gestor = GestorRegistroResultadoRevisionManual(None, argumentos.catalogo, ruta_base_datos=":memory:")
+    for id_sismo in gestor.base_datos.idsEventos():
+        evento = gestor.obtenerEvento(id_sismo)
+        if argumentos.cargar_series:
+            evento.cargarSeries()
+    imprimir_reporte(medir_catalogo(gestor.eventos_sismicos_en_memoria))
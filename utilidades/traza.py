@@ -0,0 +1,55 @@
+# utilidades/traza.py
+#
+# Traza del sistema al estilo de los diagramas de secuencia ("-> Clase: metodo()").
+# Se apoya en logging: cada módulo obtiene su logger con logging.getLogger(__name__)
+# y emite los mensajes con argumentos diferidos (_traza.debug("... %s", valor)),
+# de modo que con la traza desactivada no se formatea ningún texto.
+#
+# Niveles usados:
+#   DEBUG   -> llamadas de los modelos y detalle por evento/muestra
+#   INFO    -> pasos del gestor y de la pantalla
+#   WARNING -> advertencias (visibles por defecto)
+#   ERROR   -> errores (visibles por defecto)
+
+import logging
+import os
+import sys
+
+VARIABLE_ENTORNO = "REDSISMICA_TRAZA"
+PAQUETES = ("modelos", "gestor", "gui", "casos_de_uso", "persistencia", "utilidades", "ingesta")
+NIVEL_POR_DEFECTO = logging.WARNING
+
+
+def _interpretar_nivel(texto):
+    nivel = logging.getLevelName(texto.strip().upper())
+    if not isinstance(nivel, int):
+        raise ValueError(f"nivel de traza desconocido: {texto!r}")
+    return nivel
+
+
+def configurar_traza(especificacion=None):
+    """
+    Configura la traza a partir de una especificación del tipo
+    "DEBUG" (todos los paquetes) o "gestor=INFO,modelos.estado=DEBUG"
+    (por paquete o módulo). Sin especificación se usa la variable de entorno
+    REDSISMICA_TRAZA; si tampoco está definida sólo se muestran advertencias y errores.
+    """
+    if especificacion is None:
+        especificacion = os.environ.get(VARIABLE_ENTORNO, "")
+
+    manejador = logging.StreamHandler(sys.stdout)
+    manejador.setFormatter(logging.Formatter("%(message)s"))
+    for paquete in PAQUETES:
+        logger = logging.getLogger(paquete)
+        logger.handlers[:] = [manejador]
+        logger.propagate = False
+        logger.setLevel(NIVEL_POR_DEFECTO)
+
+    for parte in filter(None, (p.strip() for p in especificacion.split(","))):
+        if "=" in parte:
+            modulo, nivel = parte.split("=", 1)
+            logging.getLogger(modulo.strip()).setLevel(_interpretar_nivel(nivel))
+        else:
+            nivel = _interpretar_nivel(parte)
+            for paquete in PAQUETES:
+                logging.getLogger(paquete).setLevel(nivel)